@@ -8,16 +8,24 @@ import os
 
 import uvicorn
 
-from bjjsim.web.app import create_app
-
 if __name__ == "__main__":
-    app = create_app()
     # Configure for Replit environment: bind to all interfaces, use PORT env var if available
     port = int(os.environ.get("PORT", 5000))
-    uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=port,
-        log_level="info",
-        access_log=True,
-    )
+    workers = int(os.environ.get("BJJSIM_WORKERS", 1))
+    if workers > 1:
+        # One simulation owner plus N workers reading its state from shared
+        # memory; plain uvicorn workers would each get their own sessions.
+        from bjjsim.web.workers import serve
+
+        serve(workers=workers, host="0.0.0.0", port=port)
+    else:
+        # Pass the factory by import string so the app is built inside uvicorn's
+        # startup rather than eagerly in this process before it binds.
+        uvicorn.run(
+            "bjjsim.web.app:create_app",
+            factory=True,
+            host="0.0.0.0",
+            port=port,
+            log_level="info",
+            access_log=True,
+        )
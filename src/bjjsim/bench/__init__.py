@@ -0,0 +1,9 @@
+"""Benchmarks and performance guards for BJJSim.
+
+Modules here are runnable with ``python -m bjjsim.bench.<name>`` and print
+machine-readable JSON; tests import them to enforce budgets.
+"""
+
+from __future__ import annotations
+
+__all__: list[str] = []
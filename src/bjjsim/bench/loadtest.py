@@ -0,0 +1,363 @@
+"""Async load generator for the web API and ``/ws/events``.
+
+Virtual HTTP clients share one :class:`httpx.AsyncClient` and pick requests
+from a weighted :class:`TrafficMix` of step, state, frame and event traffic;
+WebSocket clients hold ``/ws/events`` open and time the gap between state
+messages.  Results are reported per route as request counts, error rate,
+throughput and p50/p95/p99 latency.  Run against a locally launched app::
+
+    python -m bjjsim.bench.loadtest --clients 32 --ws-clients 8 --duration 15
+
+or against an already running server with ``--url http://host:port``.  The
+exit status is non-zero when the overall error rate exceeds
+``--max-error-rate``.
+
+A step that returns 409 means the episode hit ``max_steps_per_episode``; the
+client restarts the episode and the 409 is not counted as an error.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Final, Literal
+
+import httpx
+
+from bjjsim.bench.startup import local_server
+
+RouteName = Literal["step", "state", "frame", "events"]
+
+_REQUESTS: Final[dict[RouteName, tuple[str, str]]] = {
+    "step": ("POST", "/api/sim/step"),
+    "state": ("GET", "/api/sim/state"),
+    "frame": ("GET", "/api/frames/current"),
+    "events": ("GET", "/api/events"),
+}
+WS_CONNECT: Final[str] = "WS /ws/events connect"
+WS_MESSAGE: Final[str] = "WS /ws/events message gap"
+
+
+@dataclass(slots=True, frozen=True)
+class TrafficMix:
+    """Relative request weights for HTTP clients; they need not sum to one."""
+
+    step: float = 0.4
+    state: float = 0.4
+    frame: float = 0.1
+    events: float = 0.1
+
+    def weights(self) -> tuple[list[RouteName], list[float]]:
+        routes: list[RouteName] = ["step", "state", "frame", "events"]
+        weights = [self.step, self.state, self.frame, self.events]
+        if any(w < 0 for w in weights) or not any(weights):
+            msg = "traffic mix weights must be non-negative and not all zero"
+            raise ValueError(msg)
+        return routes, weights
+
+
+@dataclass(slots=True)
+class LoadTestConfig:
+    clients: int = 8
+    websocket_clients: int = 2
+    duration_s: float = 10.0
+    mix: TrafficMix = field(default_factory=TrafficMix)
+    num_steps: int = 1
+    think_time_s: float = 0.0
+    # Give every HTTP client (and its paired WebSocket) a session of its own
+    # instead of sharing the default session.
+    isolated_sessions: bool = False
+    ws_interval_ms: int = 100
+    seed: int = 0
+    timeout_s: float = 10.0
+
+
+@dataclass(slots=True)
+class RouteStats:
+    route: str
+    requests: int
+    errors: int
+    error_rate: float
+    throughput_rps: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    latency_p99_ms: float
+    latency_max_ms: float
+
+
+@dataclass(slots=True)
+class LoadTestReport:
+    base_url: str
+    duration_s: float
+    routes: list[RouteStats]
+    total_requests: int
+    total_errors: int
+
+    @property
+    def error_rate(self) -> float:
+        return self.total_errors / self.total_requests if self.total_requests else 0.0
+
+    def route(self, name: str) -> RouteStats:
+        for stats in self.routes:
+            if stats.route == name:
+                return stats
+        raise KeyError(name)
+
+
+class _Recorder:
+    """Collects latencies per route; all clients run on one event loop."""
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+
+    def record(self, route: str, seconds: float, *, error: bool = False) -> None:
+        self.latencies.setdefault(route, []).append(seconds)
+        if error:
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+    def summarize(self, duration_s: float) -> list[RouteStats]:
+        stats: list[RouteStats] = []
+        for route in sorted(self.latencies):
+            samples = sorted(self.latencies[route])
+            errors = self.errors.get(route, 0)
+            stats.append(
+                RouteStats(
+                    route=route,
+                    requests=len(samples),
+                    errors=errors,
+                    error_rate=errors / len(samples),
+                    throughput_rps=len(samples) / duration_s if duration_s > 0 else 0.0,
+                    latency_p50_ms=_percentile(samples, 0.50) * 1e3,
+                    latency_p95_ms=_percentile(samples, 0.95) * 1e3,
+                    latency_p99_ms=_percentile(samples, 0.99) * 1e3,
+                    latency_max_ms=samples[-1] * 1e3,
+                )
+            )
+        return stats
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    idx = min(len(sorted_values) - 1, round(q * (len(sorted_values) - 1)))
+    return sorted_values[idx]
+
+
+async def _timed(
+    client: httpx.AsyncClient,
+    recorder: _Recorder,
+    method: str,
+    path: str,
+    *,
+    json_body: dict[str, Any] | None = None,
+    headers: dict[str, str] | None = None,
+    ok_statuses: frozenset[int] = frozenset(),
+) -> httpx.Response | None:
+    label = f"{method} {path}"
+    started = time.perf_counter()
+    try:
+        res = await client.request(method, path, json=json_body, headers=headers)
+    except httpx.HTTPError:
+        recorder.record(label, time.perf_counter() - started, error=True)
+        return None
+    error = res.status_code >= 400 and res.status_code not in ok_statuses
+    recorder.record(label, time.perf_counter() - started, error=error)
+    return res
+
+
+async def _http_client(
+    client: httpx.AsyncClient,
+    config: LoadTestConfig,
+    recorder: _Recorder,
+    deadline: float,
+    rng: random.Random,
+    session_id: str | None,
+) -> None:
+    headers = {"X-Session-ID": session_id} if session_id else None
+    routes, weights = config.mix.weights()
+    step_body = {"num_steps": config.num_steps}
+    loop = asyncio.get_running_loop()
+    # In shared mode another client may already have started the episode.
+    already_running = frozenset({409})
+    await _timed(
+        client,
+        recorder,
+        "POST",
+        "/api/sim/start",
+        json_body={},
+        headers=headers,
+        ok_statuses=already_running,
+    )
+    while loop.time() < deadline:
+        route = rng.choices(routes, weights)[0]
+        method, path = _REQUESTS[route]
+        res = await _timed(
+            client,
+            recorder,
+            method,
+            path,
+            json_body=step_body if route == "step" else None,
+            headers=headers,
+            ok_statuses=already_running if route == "step" else frozenset(),
+        )
+        if route == "step" and res is not None and res.status_code == 409:
+            await _timed(
+                client,
+                recorder,
+                "POST",
+                "/api/sim/start",
+                json_body={},
+                headers=headers,
+                ok_statuses=already_running,
+            )
+        if config.think_time_s > 0:
+            await asyncio.sleep(config.think_time_s)
+
+
+async def _ws_client(
+    ws_url: str,
+    recorder: _Recorder,
+    deadline: float,
+    timeout_s: float,
+) -> None:
+    from websockets.asyncio.client import connect
+    from websockets.exceptions import WebSocketException
+
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    try:
+        async with connect(ws_url, open_timeout=timeout_s) as ws:
+            await ws.recv()  # hello
+            recorder.record(WS_CONNECT, time.perf_counter() - started)
+            last = time.perf_counter()
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    await asyncio.wait_for(ws.recv(), timeout=remaining)
+                except TimeoutError:
+                    break
+                now = time.perf_counter()
+                recorder.record(WS_MESSAGE, now - last)
+                last = now
+    except (OSError, TimeoutError, WebSocketException):
+        recorder.record(WS_CONNECT, time.perf_counter() - started, error=True)
+
+
+async def run(base_url: str, config: LoadTestConfig | None = None) -> LoadTestReport:
+    """Drive ``config``'s traffic against ``base_url`` and summarize it per route."""
+
+    config = config or LoadTestConfig()
+    if config.clients < 0 or config.websocket_clients < 0:
+        msg = "client counts must be non-negative"
+        raise ValueError(msg)
+    if config.duration_s <= 0:
+        msg = "duration_s must be positive"
+        raise ValueError(msg)
+    config.mix.weights()  # validate before spawning clients
+
+    recorder = _Recorder()
+    limits = httpx.Limits(max_connections=max(1, config.clients), max_keepalive_connections=None)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=config.timeout_s
+    ) as client:
+        session_ids: list[str | None] = [None] * max(config.clients, config.websocket_clients)
+        if config.isolated_sessions:
+            for idx in range(len(session_ids)):
+                res = await client.post("/api/sessions")
+                res.raise_for_status()
+                session_ids[idx] = str(res.json()["session_id"])
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        deadline = loop.time() + config.duration_s
+        ws_base = base_url.replace("http://", "ws://", 1).replace("https://", "wss://", 1)
+        tasks = [
+            _http_client(client, config, recorder, deadline, random.Random(config.seed + idx), sid)
+            for idx, sid in enumerate(session_ids[: config.clients])
+        ]
+        for sid in session_ids[: config.websocket_clients]:
+            query = f"interval_ms={config.ws_interval_ms}"
+            if sid is not None:
+                query += f"&session_id={sid}"
+            tasks.append(
+                _ws_client(f"{ws_base}/ws/events?{query}", recorder, deadline, config.timeout_s)
+            )
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+        if config.isolated_sessions:
+            for sid in session_ids:
+                await client.delete(f"/api/sessions/{sid}")
+
+    routes = recorder.summarize(elapsed)
+    return LoadTestReport(
+        base_url=base_url,
+        duration_s=elapsed,
+        routes=routes,
+        total_requests=sum(r.requests for r in routes),
+        total_errors=sum(r.errors for r in routes),
+    )
+
+
+@contextmanager
+def _target(url: str | None) -> Iterator[str]:
+    if url is not None:
+        yield url
+        return
+    with local_server() as server:
+        yield server.base_url
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--url", help="target server; default launches one locally")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--ws-clients", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument(
+        "--mix",
+        default="0.4,0.4,0.1,0.1",
+        help="step,state,frame,events weights (default %(default)s)",
+    )
+    parser.add_argument("--num-steps", type=int, default=1, help="num_steps per step request")
+    parser.add_argument("--think-time", type=float, default=0.0, help="pause between requests")
+    parser.add_argument("--isolated-sessions", action="store_true")
+    parser.add_argument("--ws-interval-ms", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    args = parser.parse_args(argv)
+
+    step, state, frame, events = (float(w) for w in args.mix.split(","))
+    config = LoadTestConfig(
+        clients=args.clients,
+        websocket_clients=args.ws_clients,
+        duration_s=args.duration,
+        mix=TrafficMix(step, state, frame, events),
+        num_steps=args.num_steps,
+        think_time_s=args.think_time,
+        isolated_sessions=args.isolated_sessions,
+        ws_interval_ms=args.ws_interval_ms,
+        seed=args.seed,
+    )
+    with _target(args.url) as base_url:
+        report = asyncio.run(run(base_url, config))
+    print(json.dumps({**asdict(report), "error_rate": report.error_rate}, indent=2))
+    return 1 if report.error_rate > args.max_error_rate else 0
+
+
+__all__ = [
+    "LoadTestConfig",
+    "LoadTestReport",
+    "RouteStats",
+    "TrafficMix",
+    "WS_CONNECT",
+    "WS_MESSAGE",
+    "run",
+]
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry
+    raise SystemExit(main())
@@ -0,0 +1,201 @@
+"""Cold-start benchmark: import latency and time to first ``/healthz``.
+
+Each measurement runs in a fresh interpreter so module caches from the
+calling process do not hide import costs.  Run as::
+
+    python -m bjjsim.bench.startup [--skip-server]
+
+The exit status is non-zero when any measurement exceeds its budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Final
+
+# Modules that rollout workers importing ``bjjsim.env`` must never pay for.
+ENV_FORBIDDEN_MODULES: Final[tuple[str, ...]] = (
+    "fastapi",
+    "starlette",
+    "uvicorn",
+    "jinja2",
+    "PIL",
+    "bjjsim.web",
+)
+# Deferred until the first page render, static asset or frame request.
+WEB_DEFERRED_MODULES: Final[tuple[str, ...]] = ("PIL", "jinja2", "fastapi.templating")
+
+_IMPORT_PROBE: Final[str] = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+loaded = sorted(
+    name for name in {watch!r}
+    if any(m == name or m.startswith(name + ".") for m in sys.modules)
+)
+print(json.dumps({{"seconds": elapsed, "loaded": loaded}}))
+"""
+
+
+@dataclass(slots=True)
+class ImportTiming:
+    module: str
+    seconds: float
+    unexpected_modules: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class StartupBudget:
+    """Upper bounds enforced by :func:`check_budget`."""
+
+    import_env_s: float = 0.5
+    import_web_s: float = 2.0
+    time_to_healthz_s: float = 5.0
+
+
+@dataclass(slots=True)
+class StartupReport:
+    imports: list[ImportTiming]
+    time_to_healthz_s: float | None
+    violations: list[str] = field(default_factory=list)
+
+
+def measure_import(module: str, *, forbidden: tuple[str, ...] = ()) -> ImportTiming:
+    """Import ``module`` in a fresh interpreter and report time and stray imports."""
+
+    probe = _IMPORT_PROBE.format(module=module, watch=forbidden)
+    out = subprocess.run(
+        [sys.executable, "-c", probe], check=True, capture_output=True, text=True
+    ).stdout
+    payload = json.loads(out.strip().splitlines()[-1])
+    return ImportTiming(module, float(payload["seconds"]), list(payload["loaded"]))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+@dataclass(slots=True, frozen=True)
+class LocalServer:
+    base_url: str
+    ready_s: float
+
+
+@contextmanager
+def local_server(
+    *, timeout_s: float = 30.0, extra_args: Sequence[str] = ()
+) -> Iterator[LocalServer]:
+    """Launch uvicorn with the app factory and yield once ``/healthz`` answers.
+
+    ``ready_s`` is the time from spawning the process to the first successful
+    ``/healthz``.  The server is terminated when the context exits.
+    """
+
+    port = _free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "bjjsim.web.app:create_app",
+            "--factory",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+            *extra_args,
+        ],
+        env=os.environ.copy(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        while True:
+            try:
+                with urllib.request.urlopen(f"{base_url}/healthz", timeout=1.0) as res:
+                    if res.status == 200:
+                        break
+            except (urllib.error.URLError, ConnectionError, TimeoutError):
+                pass
+            if proc.poll() is not None:
+                msg = f"server exited early with status {proc.returncode}"
+                raise RuntimeError(msg)
+            if time.perf_counter() - started >= timeout_s:
+                msg = "server did not answer /healthz in time"
+                raise RuntimeError(msg)
+            time.sleep(0.01)
+        yield LocalServer(base_url, time.perf_counter() - started)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def measure_time_to_healthz(*, timeout_s: float = 30.0) -> float:
+    """Launch uvicorn with the app factory and time the first successful ``/healthz``."""
+
+    with local_server(timeout_s=timeout_s) as server:
+        return server.ready_s
+
+
+def check_budget(report: StartupReport, budget: StartupBudget) -> list[str]:
+    """Return human-readable budget violations for ``report``."""
+
+    limits = {"bjjsim.env": budget.import_env_s, "bjjsim.web.app": budget.import_web_s}
+    violations: list[str] = []
+    for timing in report.imports:
+        limit = limits.get(timing.module)
+        if limit is not None and timing.seconds > limit:
+            violations.append(f"import {timing.module} took {timing.seconds:.3f}s > {limit}s")
+        if timing.unexpected_modules:
+            violations.append(
+                f"import {timing.module} loaded {', '.join(timing.unexpected_modules)}"
+            )
+    healthz = report.time_to_healthz_s
+    if healthz is not None and healthz > budget.time_to_healthz_s:
+        violations.append(f"time to /healthz {healthz:.3f}s > {budget.time_to_healthz_s}s")
+    return violations
+
+
+def run(*, include_server: bool = True, budget: StartupBudget | None = None) -> StartupReport:
+    imports = [
+        measure_import("bjjsim.env", forbidden=ENV_FORBIDDEN_MODULES),
+        measure_import("bjjsim.web.app", forbidden=WEB_DEFERRED_MODULES),
+    ]
+    healthz = measure_time_to_healthz() if include_server else None
+    report = StartupReport(imports, healthz)
+    report.violations = check_budget(report, budget or StartupBudget())
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--skip-server", action="store_true", help="skip the /healthz timing")
+    args = parser.parse_args(argv)
+    report = run(include_server=not args.skip_server)
+    print(json.dumps(asdict(report), indent=2))
+    return 1 if report.violations else 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry
+    raise SystemExit(main())
@@ -0,0 +1,363 @@
+"""Environment throughput benchmark with regression baselines.
+
+Sweeps :class:`~bjjsim.env.EnvConfig` dimensions, agent count, batch size and
+``physics_steps_per_action`` across several targets:
+
+- ``physics``: :class:`~bjjsim.physics.DeterministicCounterAdapter` alone.
+- ``env``: ``batch_size`` dict-API :class:`~bjjsim.env.BJJMultiAgentEnv`
+  instances stepped in turn.
+- ``vector``: :class:`~bjjsim.env.array.VectorArrayEnv` (needs NumPy and
+  Gymnasium; skipped when they are missing).
+
+Each case reports env-steps per second, per-call latency percentiles and peak
+traced memory.  Memory is measured in a separate, shorter pass because
+``tracemalloc`` slows every allocation and would distort the timings.  Run as::
+
+    python -m bjjsim.bench.throughput [--quick] [--output results.json]
+        [--baseline benchmarks/throughput_baseline.json] [--tolerance 0.25]
+
+With ``--baseline`` the exit status is non-zero when any case's steps/s fall
+more than ``tolerance`` below the stored value; ``--write-baseline`` stores
+the current results instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Final, Literal
+
+from bjjsim.env import BJJMultiAgentEnv, EnvConfig
+from bjjsim.physics import DeterministicCounterAdapter
+
+Target = Literal["physics", "env", "vector"]
+
+TARGETS: Final[tuple[Target, ...]] = ("physics", "env", "vector")
+DEFAULT_TOLERANCE: Final[float] = 0.25
+
+# A benchmark body performs one timed call and returns how many env-steps it covered.
+type _StepFn = Callable[[], int]
+
+
+@dataclass(slots=True, frozen=True)
+class BenchCase:
+    target: Target
+    observation_dim: int = 12
+    action_dim: int = 6
+    num_agents: int = 2
+    batch_size: int = 1
+    physics_steps_per_action: int = 1
+
+    @property
+    def name(self) -> str:
+        """Stable key used to match results against a baseline."""
+
+        return (
+            f"{self.target}/obs{self.observation_dim}/act{self.action_dim}"
+            f"/agents{self.num_agents}/batch{self.batch_size}"
+            f"/phys{self.physics_steps_per_action}"
+        )
+
+    def env_config(self) -> EnvConfig:
+        return EnvConfig(
+            agent_names=tuple(f"agent{i + 1}" for i in range(self.num_agents)),
+            observation_dim=self.observation_dim,
+            action_dim=self.action_dim,
+            physics_steps_per_action=self.physics_steps_per_action,
+        )
+
+
+@dataclass(slots=True)
+class BenchResult:
+    name: str
+    case: BenchCase
+    calls: int
+    env_steps: int
+    seconds: float
+    steps_per_s: float
+    latency_p50_us: float
+    latency_p90_us: float
+    latency_p99_us: float
+    peak_memory_kib: float
+
+
+@dataclass(slots=True)
+class ThroughputReport:
+    results: list[BenchResult]
+    skipped: list[str] = field(default_factory=list)
+    regressions: list[str] = field(default_factory=list)
+    python: str = field(default_factory=platform.python_version)
+    machine: str = field(default_factory=platform.machine)
+
+
+def default_cases(*, quick: bool = False) -> list[BenchCase]:
+    """One-factor-at-a-time sweep around the default configuration per target.
+
+    A full cross product would be dominated by uninteresting combinations;
+    varying one knob at a time keeps the suite short while still showing how
+    each dimension scales.
+    """
+
+    sweeps: dict[str, Sequence[int]] = {
+        "observation_dim": (12, 64) if quick else (12, 64, 256),
+        "action_dim": (6, 24) if quick else (6, 24, 96),
+        "num_agents": (2, 4) if quick else (2, 4, 8),
+        "batch_size": (1, 8) if quick else (1, 8, 32),
+        "physics_steps_per_action": (1, 8) if quick else (1, 8, 32),
+    }
+    cases: dict[str, BenchCase] = {}
+    for target in TARGETS:
+        for knob, values in sweeps.items():
+            if target == "physics" and knob != "physics_steps_per_action":
+                continue
+            for value in values:
+                case = BenchCase(target, **{knob: value})
+                cases.setdefault(case.name, case)
+    return list(cases.values())
+
+
+def _zero_actions(env: BJJMultiAgentEnv) -> dict[str, list[float]]:
+    return {agent: [0.0] * env.config.action_dim for agent in env.agents}
+
+
+def _physics_step_fn(case: BenchCase) -> _StepFn:
+    adapter = DeterministicCounterAdapter()
+    adapter.start(0)
+    num_steps = case.physics_steps_per_action
+
+    def step() -> int:
+        adapter.step(num_steps)
+        return 1
+
+    return step
+
+
+def _env_step_fn(case: BenchCase) -> _StepFn:
+    config = case.env_config()
+    envs = [BJJMultiAgentEnv(config) for _ in range(case.batch_size)]
+    for idx, env in enumerate(envs):
+        env.reset(seed=idx)
+    actions = _zero_actions(envs[0])
+    batch_size = case.batch_size
+
+    def step() -> int:
+        for idx, env in enumerate(envs):
+            if env.step(actions).episode_truncated:
+                env.reset(seed=idx)
+        return batch_size
+
+    return step
+
+
+def _vector_step_fn(case: BenchCase) -> _StepFn:
+    import numpy as np
+
+    from bjjsim.env.array import VectorArrayEnv
+
+    venv = VectorArrayEnv.from_config(case.batch_size, case.env_config())
+    venv.reset(seed=0)
+    actions = np.zeros((case.batch_size, case.num_agents, case.action_dim), dtype=np.float64)
+    batch_size = case.batch_size
+
+    def step() -> int:
+        venv.step(actions)
+        return batch_size
+
+    return step
+
+
+_FACTORIES: Final[dict[Target, Callable[[BenchCase], _StepFn]]] = {
+    "physics": _physics_step_fn,
+    "env": _env_step_fn,
+    "vector": _vector_step_fn,
+}
+
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, round(q * (len(sorted_values) - 1)))
+    return sorted_values[idx]
+
+
+def run_case(
+    case: BenchCase,
+    *,
+    calls: int = 2_000,
+    warmup: int = 100,
+    memory_calls: int = 200,
+) -> BenchResult:
+    """Time ``calls`` step calls for ``case`` after ``warmup`` untimed calls."""
+
+    step = _FACTORIES[case.target](case)
+    for _ in range(warmup):
+        step()
+
+    latencies: list[float] = []
+    env_steps = 0
+    clock = time.perf_counter
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        started = clock()
+        for _ in range(calls):
+            t0 = clock()
+            env_steps += step()
+            latencies.append(clock() - t0)
+        seconds = clock() - started
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        for _ in range(memory_calls):
+            step()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return BenchResult(
+        name=case.name,
+        case=case,
+        calls=calls,
+        env_steps=env_steps,
+        seconds=seconds,
+        steps_per_s=env_steps / seconds if seconds > 0 else float("inf"),
+        latency_p50_us=_percentile(latencies, 0.50) * 1e6,
+        latency_p90_us=_percentile(latencies, 0.90) * 1e6,
+        latency_p99_us=_percentile(latencies, 0.99) * 1e6,
+        peak_memory_kib=peak / 1024,
+    )
+
+
+def _target_available(target: Target) -> bool:
+    if target != "vector":
+        return True
+    try:
+        import gymnasium  # noqa: F401
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def run(
+    cases: Iterable[BenchCase] | None = None,
+    *,
+    calls: int = 2_000,
+    warmup: int = 100,
+) -> ThroughputReport:
+    report = ThroughputReport(results=[])
+    available: dict[Target, bool] = {}
+    for case in cases if cases is not None else default_cases():
+        if not available.setdefault(case.target, _target_available(case.target)):
+            report.skipped.append(case.name)
+            continue
+        report.results.append(run_case(case, calls=calls, warmup=warmup))
+    return report
+
+
+def load_baseline(path: str | Path) -> dict[str, float]:
+    """Read a baseline file as a mapping of case name to steps/s."""
+
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {name: float(value) for name, value in payload["steps_per_s"].items()}
+
+
+def write_baseline(report: ThroughputReport, path: str | Path) -> None:
+    payload = {
+        "python": report.python,
+        "machine": report.machine,
+        "steps_per_s": {r.name: round(r.steps_per_s, 1) for r in report.results},
+    }
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def compare(
+    results: Iterable[BenchResult],
+    baseline: dict[str, float],
+    *,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[str]:
+    """Return cases whose steps/s fell more than ``tolerance`` below ``baseline``.
+
+    Cases missing from the baseline are ignored so new sweeps can land before
+    their baseline is recorded.
+    """
+
+    if not 0.0 <= tolerance < 1.0:
+        msg = "tolerance must lie in [0, 1)"
+        raise ValueError(msg)
+    regressions: list[str] = []
+    for result in results:
+        expected = baseline.get(result.name)
+        if expected is None:
+            continue
+        floor = expected * (1.0 - tolerance)
+        if result.steps_per_s < floor:
+            regressions.append(
+                f"{result.name}: {result.steps_per_s:.0f} steps/s < {floor:.0f} "
+                f"(baseline {expected:.0f}, tolerance {tolerance:.0%})"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--quick", action="store_true", help="run a smaller sweep")
+    parser.add_argument("--calls", type=int, default=2_000, help="timed calls per case")
+    parser.add_argument("--target", action="append", choices=TARGETS, help="limit targets")
+    parser.add_argument("--output", type=Path, help="write full results JSON here")
+    parser.add_argument("--baseline", type=Path, help="compare against this baseline")
+    parser.add_argument("--write-baseline", type=Path, help="store results as a baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    cases = default_cases(quick=args.quick)
+    if args.target:
+        cases = [case for case in cases if case.target in args.target]
+    report = run(cases, calls=args.calls)
+    if args.baseline is not None:
+        baseline = load_baseline(args.baseline)
+        report.regressions = compare(report.results, baseline, tolerance=args.tolerance)
+    if args.write_baseline is not None:
+        write_baseline(report, args.write_baseline)
+
+    text = json.dumps(asdict(report), indent=2)
+    if args.output is not None:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    for line in report.regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if report.regressions else 0
+
+
+__all__ = [
+    "BenchCase",
+    "BenchResult",
+    "TARGETS",
+    "ThroughputReport",
+    "compare",
+    "default_cases",
+    "load_baseline",
+    "run",
+    "run_case",
+    "write_baseline",
+]
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry
+    raise SystemExit(main())
@@ -2,11 +2,64 @@ from __future__ import annotations
 
 import math
 import random
-from collections.abc import Mapping, Sequence
+from collections.abc import Callable, Collection, Iterator, Mapping, MutableSequence, Sequence
 from dataclasses import dataclass, field
-from typing import Any, ClassVar
+from typing import Any, ClassVar, Final, Literal, Protocol
+
+from bjjsim.physics import (
+    HUMANOID,
+    DeterministicCounterAdapter,
+    PhysicsAdapter,
+    PoseFrame,
+    SupportsPoses,
+    SupportsStateDict,
+)
+from bjjsim.physics.pose import Vec3
+
+from .observations import (
+    OBSERVATION_GROUPS,
+    ObservationGroup,
+    ObservationLayout,
+)
+
+InfoMode = Literal["none", "summary", "full"]
+_INFO_MODES: tuple[InfoMode, ...] = ("none", "summary", "full")
+_DEFAULT_OBSERVATION_DIM: Final[int] = 12
+
+
+class _DerivedDim(int):
+    """An ``observation_dim`` that :class:`EnvConfig` derived itself.
+
+    ``dataclasses.replace`` passes the current value back to the constructor;
+    the type tells ``__post_init__`` to derive it again for the new
+    ``observation_groups`` instead of checking it as a caller's pinned value.
+    """
+
+    __slots__ = ()
+
+
+class RowBuffer(Protocol):
+    """2-D buffer written row by row, e.g. a list of lists or a NumPy array."""
+
+    def __getitem__(self, index: int, /) -> MutableSequence[float]: ...
+
+
+class ValueBuffer(Protocol):
+    """1-D buffer of floats, e.g. a list or a NumPy array."""
+
+    def __setitem__(self, index: int, value: float, /) -> None: ...
+
+
+class ChunkBuffer(Protocol):
+    """3-D buffer indexed by step, e.g. a list of row lists or a NumPy array."""
 
-from bjjsim.physics import DeterministicCounterAdapter, PhysicsAdapter
+    def __getitem__(self, index: int, /) -> RowBuffer: ...
+
+
+class RewardsBuffer(Protocol):
+    """2-D buffer of per-step reward rows, e.g. a list of lists or a NumPy array."""
+
+    def __getitem__(self, index: int, /) -> ValueBuffer: ...
 
 
 @dataclass(slots=True)
@@ -67,10 +120,19 @@ class EnvConfig:
     providing enough structure for deterministic testing.  Observation values are
     bounded so the environment can participate in automated validation and future
     RL experiments without additional wrappers.
+
+    ``observation_groups`` selects the observation pieces, in order (see
+    :mod:`bjjsim.env.observations`); ``observation_dim`` is then derived
+    from them, and an explicit value must match.  Left empty, observations
+    keep the legacy layout of step counters, agent index and seeded noise
+    padded to ``observation_dim`` (12 unless given).  ``observation_dim=0``,
+    the default, asks for the derived value.
+    ``num_links`` is the per-agent link count of the adapter's skeleton and
+    sizes the joint groups.
     """
 
     agent_names: tuple[str, ...] = ("agent1", "agent2")
-    observation_dim: int = 12
+    observation_dim: int = 0
     observation_low: float = -1000.0
     observation_high: float = 1000.0
     action_dim: int = 6
@@ -80,13 +142,16 @@ class EnvConfig:
     step_reward: float = 0.1
     energy_penalty_scale: float = 0.05
     physics_steps_per_action: int = 1
+    info_mode: InfoMode = "full"
+    observation_groups: tuple[ObservationGroup, ...] = ()
+    num_links: int = HUMANOID.num_links
 
     def __post_init__(self) -> None:
         if not self.agent_names:
             msg = "agent_names must contain at least one agent"
             raise ValueError(msg)
-        if self.observation_dim <= 0:
-            msg = "observation_dim must be positive"
+        if self.observation_dim < 0:
+            msg = "observation_dim must be positive, or 0 to derive it"
             raise ValueError(msg)
         if self.action_dim <= 0:
             msg = "action_dim must be positive"
@@ -103,6 +168,149 @@ class EnvConfig:
         if self.physics_steps_per_action <= 0:
             msg = "physics_steps_per_action must be positive"
             raise ValueError(msg)
+        if self.info_mode not in _INFO_MODES:
+            msg = f"info_mode must be one of {_INFO_MODES}, received {self.info_mode!r}"
+            raise ValueError(msg)
+        if self.num_links <= 0:
+            msg = "num_links must be positive"
+            raise ValueError(msg)
+        size = _DEFAULT_OBSERVATION_DIM
+        if self.observation_groups:
+            size = ObservationLayout.compile(self.observation_groups, self.num_links).size
+        if self.observation_dim == 0 or isinstance(self.observation_dim, _DerivedDim):
+            self.observation_dim = _DerivedDim(size)
+        elif self.observation_groups and self.observation_dim != size:
+            msg = (
+                f"observation_dim {self.observation_dim} does not match the "
+                f"{size} values selected by observation_groups"
+            )
+            raise ValueError(msg)
+
+
+class StepResult:
+    """Outcome of :meth:`BJJMultiAgentEnv.step`, stored as per-agent rows.
+
+    Values live in flat lists in :attr:`agents` order (``observation_rows``,
+    ``reward_values``, ``step_rewards``, ``energy_penalties``) so callers that
+    only need a few of them never pay for the per-agent dictionaries.  The
+    dict views (:attr:`observations`, :attr:`rewards`, :attr:`terminated`,
+    :attr:`truncated`, :attr:`infos`) are built on first access and cached.
+
+    Unpacking or indexing yields the familiar ``(observations, rewards,
+    terminated, truncated, infos)`` 5-tuple.  The contents of :attr:`infos`
+    follow :attr:`EnvConfig.info_mode`: ``"full"`` includes the
+    ``reward_components`` mapping, ``"summary"`` only ``step`` and
+    ``physics_step``, and ``"none"`` is an empty dict.
+    """
+
+    __slots__ = (
+        "_infos",
+        "_observations",
+        "_rewards",
+        "agents",
+        "energy_penalties",
+        "episode_terminated",
+        "episode_truncated",
+        "info_mode",
+        "observation_rows",
+        "physics_step",
+        "reward_values",
+        "step",
+        "step_rewards",
+    )
+
+    def __init__(
+        self,
+        agents: tuple[str, ...],
+        observation_rows: list[list[float]],
+        step_rewards: list[float],
+        energy_penalties: list[float],
+        *,
+        step: int,
+        physics_step: int,
+        episode_terminated: bool,
+        episode_truncated: bool,
+        info_mode: InfoMode = "full",
+    ) -> None:
+        self.agents = agents
+        self.observation_rows = observation_rows
+        self.step_rewards = step_rewards
+        self.energy_penalties = energy_penalties
+        self.reward_values = [r + p for r, p in zip(step_rewards, energy_penalties, strict=True)]
+        self.step = step
+        self.physics_step = physics_step
+        self.episode_terminated = episode_terminated
+        self.episode_truncated = episode_truncated
+        self.info_mode: InfoMode = info_mode
+        self._observations: dict[str, list[float]] | None = None
+        self._rewards: dict[str, float] | None = None
+        self._infos: dict[str, dict[str, Any]] | None = None
+
+    @property
+    def observations(self) -> dict[str, list[float]]:
+        if self._observations is None:
+            self._observations = dict(zip(self.agents, self.observation_rows, strict=True))
+        return self._observations
+
+    @property
+    def rewards(self) -> dict[str, float]:
+        if self._rewards is None:
+            self._rewards = dict(zip(self.agents, self.reward_values, strict=True))
+        return self._rewards
+
+    @property
+    def terminated(self) -> dict[str, bool]:
+        return dict.fromkeys(self.agents, self.episode_terminated)
+
+    @property
+    def truncated(self) -> dict[str, bool]:
+        return dict.fromkeys(self.agents, self.episode_truncated)
+
+    @property
+    def infos(self) -> dict[str, dict[str, Any]]:
+        if self._infos is None:
+            self._infos = self._build_infos()
+        return self._infos
+
+    def _build_infos(self) -> dict[str, dict[str, Any]]:
+        if self.info_mode == "none":
+            return {}
+        if self.info_mode == "summary":
+            return {
+                agent: {"step": self.step, "physics_step": self.physics_step}
+                for agent in self.agents
+            }
+        return {
+            agent: {
+                "reward_components": {
+                    "step_reward": self.step_rewards[idx],
+                    "energy_penalty": self.energy_penalties[idx],
+                },
+                "step": self.step,
+                "physics_step": self.physics_step,
+            }
+            for idx, agent in enumerate(self.agents)
+        }
+
+    def __iter__(self) -> Iterator[Any]:
+        yield self.observations
+        yield self.rewards
+        yield self.terminated
+        yield self.truncated
+        yield self.infos
+
+    def __len__(self) -> int:
+        return 5
+
+    def __getitem__(self, index: int) -> object:
+        return tuple(self)[index]
+
+    def __repr__(self) -> str:
+        return (
+            f"StepResult(step={self.step}, physics_step={self.physics_step}, "
+            f"rewards={self.reward_values!r}, terminated={self.episode_terminated}, "
+            f"truncated={self.episode_truncated})"
+        )
 
 
 class BJJMultiAgentEnv:
@@ -112,7 +320,10 @@ class BJJMultiAgentEnv:
     :class:`~bjjsim.physics.DeterministicCounterAdapter` by default.  It encodes
     the current episode and physics step counts into the observations and
     applies a simple reward made of a constant "step" reward minus an energy
-    penalty proportional to the L2 norm of each agent's action vector.  The goal
+    penalty proportional to the L2 norm of each agent's action vector.
+    Configs with ``observation_groups`` build observations from the selected
+    groups only; pose groups need an adapter implementing
+    :class:`~bjjsim.physics.SupportsPoses`.  The goal
     is to provide a stable target for wiring up future physics integrations and
     self-play experiments while exercising the multi-agent plumbing.
     """
@@ -143,6 +354,12 @@ class BJJMultiAgentEnv:
         )
         self.action_space = DictSpace({agent: action_space for agent in self.agents})
 
+        self.observation_layout: ObservationLayout | None = None
+        self._observation_writers: list[_GroupWriter] = []
+        self._pose_source: SupportsPoses | None = None
+        if self.config.observation_groups:
+            self._compile_observations()
+
         self._seed_source = random.Random()
         self._rng: random.Random = random.Random()
         self._last_seed: int | None = None
@@ -177,6 +394,48 @@ class BJJMultiAgentEnv:
 
         return self._total_steps
 
+    def state_dict(self) -> dict[str, Any]:
+        """Snapshot RNGs, seeds, counters and physics state.
+
+        Values are plain JSON-serializable Python objects.
+        :meth:`load_state_dict` on an env with the same config continues
+        exactly where this one was, including mid-episode.  The physics
+        state is included when the adapter implements
+        :class:`~bjjsim.physics.SupportsStateDict`.
+        """
+
+        physics = self._physics
+        return {
+            "seed_source": _rng_state(self._seed_source),
+            "rng": _rng_state(self._rng),
+            "last_seed": self._last_seed,
+            "episode_step": self._episode_step,
+            "total_steps": self._total_steps,
+            "episode_running": self._episode_running,
+            "last_actions": {agent: list(row) for agent, row in self._last_actions.items()},
+            "physics": physics.state_dict() if isinstance(physics, SupportsStateDict) else None,
+        }
+
+    def load_state_dict(self, state: Mapping[str, Any]) -> None:
+        if set(state["last_actions"]) != set(self.agents):
+            msg = "state was saved from an env with different agents"
+            raise ValueError(msg)
+        physics_state = state["physics"]
+        if physics_state is not None:
+            if not isinstance(self._physics, SupportsStateDict):
+                msg = f"{type(self._physics).__name__} cannot restore physics state"
+                raise ValueError(msg)
+            self._physics.load_state_dict(physics_state)
+        _set_rng_state(self._seed_source, state["seed_source"])
+        _set_rng_state(self._rng, state["rng"])
+        self._last_seed = state["last_seed"]
+        self._episode_step = int(state["episode_step"])
+        self._total_steps = int(state["total_steps"])
+        self._episode_running = bool(state["episode_running"])
+        self._last_actions = {
+            agent: [float(v) for v in row] for agent, row in state["last_actions"].items()
+        }
+
     def reset(
         self,
         *,
@@ -184,16 +443,7 @@ class BJJMultiAgentEnv:
         options: dict[str, Any] | None = None,
     ) -> tuple[dict[str, list[float]], dict[str, dict[str, Any]]]:
         del options  # Unused for API compatibility with Gymnasium-style resets.
-        if seed is None:
-            seed = self._seed_source.randrange(0, 2**32)
-        self._rng = random.Random(seed)
-        self._last_seed = int(seed)
-        self._episode_step = 0
-        self._episode_running = True
-        self._last_actions = {agent: [0.0] * self.config.action_dim for agent in self.agents}
-
-        self._physics.reset(seed)
-        self._physics.start(seed)
+        self._begin_episode(seed)
 
         observations = self._build_observations()
         infos = {
@@ -206,93 +456,418 @@ class BJJMultiAgentEnv:
         }
         return observations, infos
 
-    def step(
-        self, actions: Mapping[str, Sequence[float]]
-    ) -> tuple[
-        dict[str, list[float]],
-        dict[str, float],
-        dict[str, bool],
-        dict[str, bool],
-        dict[str, dict[str, Any]],
-    ]:
+    def step(self, actions: Mapping[str, Sequence[float]]) -> StepResult:
+        """Advance one action step.
+
+        The returned :class:`StepResult` unpacks to ``(observations, rewards,
+        terminated, truncated, infos)``; high-throughput callers can read its
+        row attributes instead and skip building the dictionaries.
+        """
+
         if not self._episode_running:
             msg = "reset() must be called before step() and episode must be active"
             raise RuntimeError(msg)
 
         processed_actions = self._process_actions(actions)
-        self._last_actions = processed_actions
+        action_rows = [processed_actions[agent] for agent in self.agents]
+        self._advance(action_rows)
+
+        observation_rows = [[0.0] * self.config.observation_dim for _ in self.agents]
+        self._write_observations(observation_rows)
+        step_rewards, energy_penalties = self._compute_rewards(action_rows)
+        step, physics_step = self._episode_step, self._physics.step_count
+        truncated = self._finish_step()
+        return StepResult(
+            self.agents,
+            observation_rows,
+            step_rewards,
+            energy_penalties,
+            step=step,
+            physics_step=physics_step,
+            episode_terminated=False,
+            episode_truncated=truncated,
+            info_mode=self.config.info_mode,
+        )
+
+    def reset_arrays(
+        self,
+        observations_out: RowBuffer,
+        *,
+        seed: int | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Array-mode :meth:`reset`: write observations into ``observations_out``.
 
+        ``observations_out`` is any 2-D row-indexable buffer shaped
+        ``(num_agents, observation_dim)`` (typically a NumPy array owned by an
+        array wrapper).  Values are identical to those :meth:`reset` returns
+        for the same seed; no per-agent lists or dicts are built.
+        """
+
+        del options  # Unused for API compatibility with Gymnasium-style resets.
+        self._begin_episode(seed)
+        self._write_observations(observations_out)
+        return {
+            "step": self._episode_step,
+            "seed": self._last_seed,
+            "physics_step": self._physics.step_count,
+        }
+
+    def step_arrays(
+        self,
+        actions: Collection[Sequence[float]],
+        observations_out: RowBuffer,
+        rewards_out: ValueBuffer,
+    ) -> tuple[bool, bool, dict[str, Any]]:
+        """Array-mode :meth:`step` writing into caller-owned buffers.
+
+        ``actions`` holds one row per agent in :attr:`agents` order.
+        Observations go to ``observations_out`` (``(num_agents,
+        observation_dim)``) and rewards to ``rewards_out`` (``(num_agents,)``).
+        Termination and truncation currently apply to all agents at once, so
+        they are returned as plain booleans alongside a flat info dict.
+        """
+
+        if not self._episode_running:
+            msg = "reset() must be called before step() and episode must be active"
+            raise RuntimeError(msg)
+        if len(actions) != len(self.agents):
+            msg = "actions must provide exactly one row per agent"
+            raise ValueError(msg)
+        action_rows = [
+            self._clip_action(agent, row) for agent, row in zip(self.agents, actions, strict=True)
+        ]
+        self._advance(action_rows)
+        self._write_observations(observations_out)
+        step_rewards, energy_penalties = self._compute_rewards(action_rows)
+        for idx in range(len(self.agents)):
+            rewards_out[idx] = step_rewards[idx] + energy_penalties[idx]
+        info: dict[str, Any] = {
+            "step": self._episode_step,
+            "physics_step": self._physics.step_count,
+            "energy_penalty": energy_penalties,
+        }
+        truncated = self._finish_step()
+        return False, truncated, info
+
+    def step_chunk(
+        self,
+        actions: Collection[Collection[Sequence[float]]],
+        observations_out: ChunkBuffer,
+        rewards_out: RewardsBuffer,
+    ) -> tuple[int, bool, bool, dict[str, Any]]:
+        """Array-mode macro step: run one action row per agent per step, open loop.
+
+        ``actions`` is shaped ``(T, num_agents, action_dim)``.  Step ``t``
+        writes its observations to ``observations_out[t]`` and rewards to
+        ``rewards_out[t]``, exactly as :meth:`step_arrays` would.  The chunk
+        stops early when the episode ends, so the first return value is the
+        number of steps run; ``terminated``, ``truncated`` and the info dict
+        describe the last of them.  Every row is validated before any step
+        runs.
+        """
+
+        if not self._episode_running:
+            msg = "reset() must be called before step() and episode must be active"
+            raise RuntimeError(msg)
+        if len(actions) == 0:
+            msg = "actions must contain at least one step"
+            raise ValueError(msg)
+        chunk: list[list[list[float]]] = []
+        for rows in actions:
+            if len(rows) != len(self.agents):
+                msg = "actions must provide exactly one row per agent for every step"
+                raise ValueError(msg)
+            chunk.append(
+                [
+                    self._clip_action(agent, row)
+                    for agent, row in zip(self.agents, rows, strict=True)
+                ]
+            )
+        steps = 0
+        truncated = False
+        energy_penalties: list[float] = []
+        for action_rows in chunk:
+            self._advance(action_rows)
+            self._write_observations(observations_out[steps])
+            step_rewards, energy_penalties = self._compute_rewards(action_rows)
+            rewards = rewards_out[steps]
+            for idx in range(len(self.agents)):
+                rewards[idx] = step_rewards[idx] + energy_penalties[idx]
+            steps += 1
+            truncated = self._finish_step()
+            if truncated:
+                break
+        info: dict[str, Any] = {
+            "step": self._episode_step,
+            "physics_step": self._physics.step_count,
+            "energy_penalty": energy_penalties,
+        }
+        return steps, False, truncated, info
+
+    def close(self) -> None:  # pragma: no cover - defensive
+        self._physics.stop()
+
+    def _begin_episode(self, seed: int | None) -> None:
+        if seed is None:
+            seed = self._seed_source.randrange(0, 2**32)
+        self._rng = random.Random(seed)
+        self._last_seed = int(seed)
+        self._episode_step = 0
+        self._episode_running = True
+        self._last_actions = {agent: [0.0] * self.config.action_dim for agent in self.agents}
+
+        self._physics.reset(seed)
+        self._physics.start(seed)
+
+    def _advance(self, action_rows: list[list[float]]) -> None:
+        self._last_actions = dict(zip(self.agents, action_rows, strict=True))
         self._physics.step(self.config.physics_steps_per_action)
         self._episode_step += 1
         self._total_steps += 1
 
-        observations = self._build_observations()
-        rewards: dict[str, float] = {}
-        infos: dict[str, dict[str, Any]] = {}
-
-        for agent, action in processed_actions.items():
-            step_reward = self.config.step_reward
-            energy_penalty = -self.config.energy_penalty_scale * _l2_norm(action)
-            total_reward = step_reward + energy_penalty
-            rewards[agent] = total_reward
-            infos[agent] = {
-                "reward_components": {
-                    "step_reward": step_reward,
-                    "energy_penalty": energy_penalty,
-                },
-                "step": self._episode_step,
-                "physics_step": self._physics.step_count,
-            }
+    def _compute_rewards(self, action_rows: list[list[float]]) -> tuple[list[float], list[float]]:
+        step_reward = self.config.step_reward
+        scale = self.config.energy_penalty_scale
+        penalties = [-scale * _l2_norm(action) for action in action_rows]
+        return [step_reward] * len(action_rows), penalties
 
-        terminated = {agent: False for agent in self.agents}
-        truncated = {agent: False for agent in self.agents}
+    def _finish_step(self) -> bool:
+        """End the episode at the step limit; return whether it was truncated."""
 
         if self._episode_step >= self.config.max_episode_steps:
-            truncated = {agent: True for agent in self.agents}
             self._episode_running = False
             self._physics.stop()
+            return True
+        return False
 
-        return observations, rewards, terminated, truncated, infos
-
-    def close(self) -> None:  # pragma: no cover - defensive
-        self._physics.stop()
+    def _clip_action(self, agent: str, value: Sequence[float]) -> list[float]:
+        space = self.action_space[agent]
+        try:
+            return space.clip(value)
+        except TypeError as exc:  # Non-iterable provided
+            msg = f"action for {agent} must be an iterable of floats"
+            raise ValueError(msg) from exc
 
     def _process_actions(self, actions: Mapping[str, Sequence[float]]) -> dict[str, list[float]]:
         if set(actions.keys()) != set(self.agents):
             msg = "actions must provide exactly one entry per agent"
             raise ValueError(msg)
 
-        processed: dict[str, list[float]] = {}
-        for agent, value in actions.items():
-            space = self.action_space[agent]
-            try:
-                clipped = space.clip(value)
-            except TypeError as exc:  # Non-iterable provided
-                msg = f"action for {agent} must be an iterable of floats"
-                raise ValueError(msg) from exc
-            processed[agent] = clipped
-        return processed
+        return {agent: self._clip_action(agent, value) for agent, value in actions.items()}
 
     def _build_observations(self) -> dict[str, list[float]]:
-        obs: dict[str, list[float]] = {}
+        rows = [[0.0] * self.config.observation_dim for _ in self.agents]
+        self._write_observations(rows)
+        return dict(zip(self.agents, rows, strict=True))
+
+    def _compile_observations(self) -> None:
+        layout = ObservationLayout.compile(self.config.observation_groups, self.config.num_links)
+        if layout.needs_poses:
+            physics = self._physics
+            if not isinstance(physics, SupportsPoses):
+                msg = f"{type(physics).__name__} reports no poses for the selected groups"
+                raise ValueError(msg)
+            if physics.skeleton.num_links != self.config.num_links:
+                msg = (
+                    f"adapter skeleton has {physics.skeleton.num_links} links, "
+                    f"config expects {self.config.num_links}"
+                )
+                raise ValueError(msg)
+            self._pose_source = physics
+        writers = {
+            "step_counters": self._observe_step_counters,
+            "agent_index": self._observe_agent_index,
+            "base_height": self._observe_base_height,
+            "own_joints": self._observe_own_joints,
+            "opponent_joints": self._observe_opponent_joints,
+            "contact_summary": self._observe_contact_summary,
+        }
+        self.observation_layout = layout
+        self._observation_writers = [writers[group] for group in layout.groups]
+
+    def _write_observations(self, out: RowBuffer) -> None:
+        """Fill ``out[agent_index][:]`` with observations.
+
+        ``out`` may be a list of lists (dict API) or a 2-D array (array API);
+        both receive identical values because the RNG is consumed in the same
+        order either way.
+        """
+
+        layout = self.observation_layout
+        if layout is not None:
+            # One poses() call per step, and none unless a pose group is selected.
+            poses = _NO_POSES if self._pose_source is None else self._pose_source.poses()
+            for idx in range(len(self.agents)):
+                vec = out[idx]
+                for write, offset in zip(self._observation_writers, layout.offsets, strict=True):
+                    write(vec, idx, offset, poses)
+            return
+
+        dim = self.config.observation_dim
+        low, high = self.config.observation_low, self.config.observation_high
+        uniform = self._rng.uniform
         base_step = float(self._episode_step)
         physics_step = float(self._physics.step_count)
-        for idx, agent in enumerate(self.agents):
-            vec = [0.0] * self.config.observation_dim
+        for idx in range(len(self.agents)):
+            vec = out[idx]
             vec[0] = base_step
-            if self.config.observation_dim > 1:
+            if dim > 1:
                 vec[1] = physics_step
-            if self.config.observation_dim > 2:
+            if dim > 2:
                 vec[2] = float(idx)
-            if self.config.observation_dim > 3:
-                remaining = self.config.observation_dim - 3
-                for pos in range(remaining):
-                    vec[3 + pos] = self._rng.uniform(
-                        self.config.observation_low,
-                        self.config.observation_high,
-                    )
-            obs[agent] = vec
-        return obs
+            if dim > 3:
+                vec[3:] = [uniform(low, high) for _ in range(dim - 3)]
+
+    # Group writers fill ``vec[offset:offset + group_size]`` for agent ``idx``.
+    def _observe_step_counters(
+        self, vec: MutableSequence[float], idx: int, offset: int, poses: PoseFrame
+    ) -> None:
+        vec[offset] = float(self._episode_step)
+        vec[offset + 1] = float(self._physics.step_count)
+
+    def _observe_agent_index(
+        self, vec: MutableSequence[float], idx: int, offset: int, poses: PoseFrame
+    ) -> None:
+        vec[offset] = float(idx)
+
+    def _observe_base_height(
+        self, vec: MutableSequence[float], idx: int, offset: int, poses: PoseFrame
+    ) -> None:
+        vec[offset] = poses.positions[idx][0][2]
+
+    def _observe_own_joints(
+        self, vec: MutableSequence[float], idx: int, offset: int, poses: PoseFrame
+    ) -> None:
+        _write_relative_links(vec, offset, poses.positions[idx], poses.positions[idx][0])
+
+    def _observe_opponent_joints(
+        self, vec: MutableSequence[float], idx: int, offset: int, poses: PoseFrame
+    ) -> None:
+        # The opponent is the next agent in order, wrapping around.
+        opponent = (idx + 1) % len(self.agents)
+        _write_relative_links(vec, offset, poses.positions[opponent], poses.positions[idx][0])
+
+    def _observe_contact_summary(
+        self, vec: MutableSequence[float], idx: int, offset: int, poses: PoseFrame
+    ) -> None:
+        count = 0
+        own_links: set[int] = set()
+        for agent_a, link_a, agent_b, link_b in poses.contacts:
+            if agent_a == idx:
+                count += 1
+                own_links.add(link_a)
+            elif agent_b == idx:
+                count += 1
+                own_links.add(link_b)
+        vec[offset] = float(count)
+        vec[offset + 1] = float(len(own_links))
+
+
+type _GroupWriter = Callable[[MutableSequence[float], int, int, PoseFrame], None]
+_NO_POSES: Final[PoseFrame] = PoseFrame(positions=(), orientations=())
+
+
+def _write_relative_links(
+    vec: MutableSequence[float],
+    offset: int,
+    links: Sequence[Vec3],
+    root: Vec3,
+) -> None:
+    rx, ry, rz = root
+    values: list[float] = []
+    for x, y, z in links:
+        values += (x - rx, y - ry, z - rz)
+    vec[offset : offset + len(values)] = values
+
+
+class EnvAdapter:
+    """:class:`~bjjsim.physics.PhysicsAdapter` that steps a :class:`BJJMultiAgentEnv`.
+
+    :meth:`step` repeats the most recent actions (zeros after a start) and
+    :meth:`step_chunk` applies explicit ones, which lets the web app's
+    ``/api/sim/step_chunk`` route drive scripted drills.  When the env's
+    episode ends, the next step restarts it, so the web app's own episode
+    limit stays in charge.
+    """
+
+    def __init__(self, env: BJJMultiAgentEnv | None = None) -> None:
+        self.env = env or BJJMultiAgentEnv()
+        config = self.env.config
+        self._actions = [[0.0] * config.action_dim for _ in self.env.agents]
+        self._step_count = 0
+        self._last_seed: int | None = None
+        self._running = False
+        self._needs_reset = True
+
+    @property
+    def num_agents(self) -> int:
+        return len(self.env.agents)
+
+    @property
+    def action_dim(self) -> int:
+        return self.env.config.action_dim
+
+    def reset(self, seed: int | None) -> None:
+        self._running = False
+        self._step_count = 0
+        if seed is not None:
+            self._last_seed = seed
+
+    def start(self, seed: int | None) -> None:
+        self.reset(seed)
+        self.env.reset(seed=seed)
+        self._actions = [[0.0] * self.action_dim for _ in self.env.agents]
+        self._running = True
+        self._needs_reset = False
+
+    def stop(self) -> None:
+        self._running = False
+
+    def step(self, num_steps: int) -> None:
+        remaining = num_steps
+        while remaining > 0 and self._running:
+            rewards = self.step_chunk([self._actions] * remaining)[1]
+            remaining -= len(rewards)
+
+    def step_chunk(
+        self, actions: Sequence[Sequence[Sequence[float]]]
+    ) -> tuple[list[list[list[float]]], list[list[float]]]:
+        """Run ``actions`` (``(T, num_agents, action_dim)``) and return the steps run.
+
+        Returns per-step observation rows and rewards.  Fewer than ``T``
+        entries mean the env's episode ended mid-chunk.
+        """
+
+        if not self._running or not actions:
+            return [], []
+        if self._needs_reset:
+            self.env.reset()
+        dim = self.env.config.observation_dim
+        observations = [[[0.0] * dim for _ in self.env.agents] for _ in actions]
+        rewards = [[0.0] * self.num_agents for _ in actions]
+        steps, terminated, truncated, _ = self.env.step_chunk(actions, observations, rewards)
+        self._actions = [list(row) for row in actions[steps - 1]]
+        self._step_count += steps
+        self._needs_reset = terminated or truncated
+        return observations[:steps], rewards[:steps]
+
+    @property
+    def step_count(self) -> int:
+        return self._step_count
+
+    @property
+    def last_seed(self) -> int | None:
+        return self._last_seed
+
+
+def _rng_state(rng: random.Random) -> dict[str, Any]:
+    version, internal, gauss_next = rng.getstate()
+    return {"version": version, "internal": list(internal), "gauss_next": gauss_next}
+
+
+def _set_rng_state(rng: random.Random, state: Mapping[str, Any]) -> None:
+    rng.setstate((state["version"], tuple(state["internal"]), state["gauss_next"]))
 
 
 def _l2_norm(values: Sequence[float]) -> float:
@@ -300,8 +875,18 @@ def _l2_norm(values: Sequence[float]) -> float:
 
 
 __all__ = [
+    "ChunkBuffer",
     "ContinuousSpace",
     "DictSpace",
+    "EnvAdapter",
     "EnvConfig",
     "BJJMultiAgentEnv",
+    "InfoMode",
+    "OBSERVATION_GROUPS",
+    "ObservationGroup",
+    "ObservationLayout",
+    "RewardsBuffer",
+    "RowBuffer",
+    "StepResult",
+    "ValueBuffer",
 ]
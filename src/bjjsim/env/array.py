@@ -0,0 +1,280 @@
+"""Array-based Gymnasium wrappers for :class:`~bjjsim.env.BJJMultiAgentEnv`.
+
+These wrappers expose real :class:`gymnasium.spaces.Box` spaces and return one
+array with an agent axis instead of per-agent dicts of lists:
+
+- :class:`ArrayEnv` wraps a single env; observations are shaped
+  ``(num_agents, observation_dim)`` and rewards ``(num_agents,)``.
+- :class:`VectorArrayEnv` is a :class:`gymnasium.vector.VectorEnv` over many
+  envs with ``(num_envs, num_agents, ...)`` batches and Gymnasium's autoreset.
+
+Both drive the env's array mode (:meth:`~bjjsim.env.BJJMultiAgentEnv.reset_arrays`
+and :meth:`~bjjsim.env.BJJMultiAgentEnv.step_arrays`), which writes straight
+into wrapper-owned buffers.  The returned arrays are those buffers, not
+copies: they are overwritten by the next ``step``/``reset``, so copy anything
+you need to keep (rollout buffers already do).
+
+This module needs NumPy and Gymnasium; importing :mod:`bjjsim.env` alone does
+not.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+import gymnasium
+import numpy as np
+import numpy.typing as npt
+from gymnasium import spaces
+from gymnasium.vector import VectorEnv
+
+from bjjsim.env import BJJMultiAgentEnv, EnvConfig
+
+
+def _spaces(config: EnvConfig, dtype: npt.DTypeLike) -> tuple[spaces.Box, spaces.Box]:
+    num_agents = len(config.agent_names)
+    observation_space = spaces.Box(
+        low=config.observation_low,
+        high=config.observation_high,
+        shape=(num_agents, int(config.observation_dim)),
+        dtype=dtype,  # type: ignore[arg-type]
+    )
+    action_space = spaces.Box(
+        low=config.action_low,
+        high=config.action_high,
+        shape=(num_agents, config.action_dim),
+        dtype=dtype,  # type: ignore[arg-type]
+    )
+    return observation_space, action_space
+
+
+class ArrayEnv(gymnasium.Env[npt.NDArray[Any], npt.NDArray[Any]]):
+    """Single :class:`BJJMultiAgentEnv` with array observations and actions.
+
+    ``terminated`` and ``truncated`` are boolean arrays with one entry per
+    agent, mirroring parallel multi-agent APIs; ``possible_agents`` gives the
+    agent order along the agent axis.
+    """
+
+    metadata: dict[str, Any] = {"render_modes": []}
+
+    def __init__(
+        self,
+        env: BJJMultiAgentEnv | None = None,
+        *,
+        dtype: npt.DTypeLike = np.float32,
+    ) -> None:
+        self.env = env or BJJMultiAgentEnv()
+        self.possible_agents: tuple[str, ...] = self.env.agents
+        self.observation_space, self.action_space = _spaces(self.env.config, dtype)
+        num_agents = len(self.possible_agents)
+        self._observations = np.zeros(self.observation_space.shape, dtype=dtype)
+        self._rewards = np.zeros(num_agents, dtype=np.float32)
+        self._terminated = np.zeros(num_agents, dtype=np.bool_)
+        self._truncated = np.zeros(num_agents, dtype=np.bool_)
+        self._dtype = dtype
+        # Grown on demand to the longest chunk passed to step_chunk.
+        self._chunk_observations = np.zeros((0, *self._observations.shape), dtype=dtype)
+        self._chunk_rewards = np.zeros((0, num_agents), dtype=np.float32)
+
+    @property
+    def num_agents(self) -> int:
+        return len(self.possible_agents)
+
+    def reset(
+        self,
+        *,
+        seed: int | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> tuple[npt.NDArray[Any], dict[str, Any]]:
+        info = self.env.reset_arrays(self._observations, seed=seed, options=options)
+        self._terminated.fill(False)
+        self._truncated.fill(False)
+        return self._observations, info
+
+    def step(  # type: ignore[override]  # per-agent rewards and flags
+        self, action: npt.ArrayLike
+    ) -> tuple[
+        npt.NDArray[Any],
+        npt.NDArray[np.float32],
+        npt.NDArray[np.bool_],
+        npt.NDArray[np.bool_],
+        dict[str, Any],
+    ]:
+        actions = np.asarray(action, dtype=np.float64)
+        if actions.shape != self.action_space.shape:
+            msg = f"expected actions shaped {self.action_space.shape}, received {actions.shape}"
+            raise ValueError(msg)
+        terminated, truncated, info = self.env.step_arrays(
+            actions, self._observations, self._rewards
+        )
+        self._terminated.fill(terminated)
+        self._truncated.fill(truncated)
+        return self._observations, self._rewards, self._terminated, self._truncated, info
+
+    def step_chunk(
+        self, actions: npt.ArrayLike
+    ) -> tuple[
+        npt.NDArray[Any],
+        npt.NDArray[np.float32],
+        npt.NDArray[np.bool_],
+        npt.NDArray[np.bool_],
+        dict[str, Any],
+    ]:
+        """Run a ``(T, num_agents, action_dim)`` action chunk in one call.
+
+        Returns observations shaped ``(k, num_agents, observation_dim)`` and
+        rewards ``(k, num_agents)`` for the ``k <= T`` steps run (the chunk
+        stops when the episode ends), plus the flags and info of the last
+        step.  Like :meth:`step`, the arrays are reused buffers.
+        """
+
+        chunk = np.asarray(actions, dtype=np.float64)
+        expected = (self.num_agents, self.env.config.action_dim)
+        if chunk.ndim != 3 or chunk.shape[1:] != expected:
+            msg = (
+                f"expected actions shaped (T, {expected[0]}, {expected[1]}), received {chunk.shape}"
+            )
+            raise ValueError(msg)
+        if len(chunk) > len(self._chunk_observations):
+            self._chunk_observations = np.zeros(
+                (len(chunk), *self._observations.shape), dtype=self._dtype
+            )
+            self._chunk_rewards = np.zeros((len(chunk), self.num_agents), dtype=np.float32)
+        steps, terminated, truncated, info = self.env.step_chunk(
+            chunk, self._chunk_observations, self._chunk_rewards
+        )
+        self._observations[:] = self._chunk_observations[steps - 1]
+        self._rewards[:] = self._chunk_rewards[steps - 1]
+        self._terminated.fill(terminated)
+        self._truncated.fill(truncated)
+        return (
+            self._chunk_observations[:steps],
+            self._chunk_rewards[:steps],
+            self._terminated,
+            self._truncated,
+            info,
+        )
+
+    def close(self) -> None:
+        self.env.close()
+
+
+class VectorArrayEnv(VectorEnv):
+    """Batch of :class:`BJJMultiAgentEnv` instances stepped in lockstep.
+
+    Each env writes its observations into its own row of one preallocated
+    ``(num_envs, num_agents, observation_dim)`` array, so a batched step does no
+    per-env stacking.  Finished envs are reset automatically; following
+    Gymnasium 0.29, their last observation is reported in
+    ``infos["final_observation"]`` with the ``infos["_final_observation"]``
+    mask.
+    """
+
+    def __init__(
+        self,
+        envs: Sequence[BJJMultiAgentEnv],
+        *,
+        dtype: npt.DTypeLike = np.float32,
+    ) -> None:
+        if not envs:
+            msg = "envs must contain at least one environment"
+            raise ValueError(msg)
+        config = envs[0].config
+        for env in envs[1:]:
+            if (
+                env.agents != envs[0].agents
+                or env.config.observation_dim != config.observation_dim
+                or env.config.action_dim != config.action_dim
+            ):
+                msg = "all envs must share agents and space dimensions"
+                raise ValueError(msg)
+        self.envs: list[BJJMultiAgentEnv] = list(envs)
+        self.possible_agents: tuple[str, ...] = envs[0].agents
+        single_obs, single_act = _spaces(config, dtype)
+        super().__init__(len(self.envs), single_obs, single_act)
+
+        num_envs, num_agents = len(self.envs), len(self.possible_agents)
+        self._observations = np.zeros((num_envs, *single_obs.shape), dtype=dtype)
+        self._rewards = np.zeros((num_envs, num_agents), dtype=np.float32)
+        self._terminated = np.zeros((num_envs, num_agents), dtype=np.bool_)
+        self._truncated = np.zeros((num_envs, num_agents), dtype=np.bool_)
+        self._actions: npt.NDArray[np.float64] | None = None
+
+    @classmethod
+    def from_config(
+        cls,
+        num_envs: int,
+        config: EnvConfig | None = None,
+        *,
+        dtype: npt.DTypeLike = np.float32,
+    ) -> VectorArrayEnv:
+        return cls([BJJMultiAgentEnv(config) for _ in range(num_envs)], dtype=dtype)
+
+    def reset_wait(
+        self,
+        seed: int | list[int] | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> tuple[npt.NDArray[Any], dict[str, Any]]:
+        if seed is None:
+            seeds: list[int | None] = [None] * self.num_envs
+        elif isinstance(seed, int):
+            seeds = [seed + idx for idx in range(self.num_envs)]
+        else:
+            if len(seed) != self.num_envs:
+                msg = f"expected {self.num_envs} seeds, received {len(seed)}"
+                raise ValueError(msg)
+            seeds = list(seed)
+        for idx, env in enumerate(self.envs):
+            env.reset_arrays(self._observations[idx], seed=seeds[idx], options=options)
+        self._terminated.fill(False)
+        self._truncated.fill(False)
+        return self._observations, {}
+
+    def step_async(self, actions: npt.ArrayLike) -> None:
+        batch = np.asarray(actions, dtype=np.float64)
+        if batch.shape != self.action_space.shape:
+            msg = f"expected actions shaped {self.action_space.shape}, received {batch.shape}"
+            raise ValueError(msg)
+        self._actions = batch
+
+    def step_wait(
+        self, **kwargs: object
+    ) -> tuple[
+        npt.NDArray[Any],
+        npt.NDArray[np.float32],
+        npt.NDArray[np.bool_],
+        npt.NDArray[np.bool_],
+        dict[str, Any],
+    ]:
+        del kwargs
+        if self._actions is None:
+            msg = "step_async() must be called before step_wait()"
+            raise RuntimeError(msg)
+        actions, self._actions = self._actions, None
+        infos: dict[str, Any] = {}
+        for idx, env in enumerate(self.envs):
+            obs_row = self._observations[idx]
+            terminated, truncated, _ = env.step_arrays(actions[idx], obs_row, self._rewards[idx])
+            self._terminated[idx] = terminated
+            self._truncated[idx] = truncated
+            if terminated or truncated:
+                if "final_observation" not in infos:
+                    infos["final_observation"] = np.full(self.num_envs, None, dtype=object)
+                    infos["_final_observation"] = np.zeros(self.num_envs, dtype=np.bool_)
+                infos["final_observation"][idx] = obs_row.copy()
+                infos["_final_observation"][idx] = True
+                env.reset_arrays(obs_row)
+        return self._observations, self._rewards, self._terminated, self._truncated, infos
+
+    def close_extras(self, **kwargs: object) -> None:
+        del kwargs
+        for env in self.envs:
+            env.close()
+
+
+__all__ = [
+    "ArrayEnv",
+    "VectorArrayEnv",
+]
@@ -0,0 +1,181 @@
+"""Zero-copy frame stacking for the array-based env wrappers.
+
+:class:`ObservationHistory` keeps the last ``k`` observations of every
+env/agent row in a circular buffer of ``2 * k`` frames.  Each new frame is
+written twice, at ``head`` and ``head + k``, so the ``k`` most recent frames
+are always the contiguous slice ``[head, head + k)`` and
+:attr:`ObservationHistory.frames` is a strided view rather than a
+concatenation.  A step therefore costs two row writes regardless of ``k``.
+
+:class:`FrameStackObservation` applies the history to
+:class:`~bjjsim.env.array.ArrayEnv`, :class:`~bjjsim.env.array.VectorArrayEnv`
+or :class:`~bjjsim.env.normalize.NormalizeObservation`, clearing the history
+of individual envs when a vector env autoresets them.
+
+This module needs NumPy; importing :mod:`bjjsim.env` alone does not.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Literal
+
+import numpy as np
+import numpy.typing as npt
+
+from bjjsim.env.array import ArrayEnv, VectorArrayEnv
+from bjjsim.env.normalize import NormalizeObservation
+
+PadMode = Literal["repeat", "zeros"]
+
+
+class ObservationHistory:
+    """Circular buffer of the last ``num_frames`` observations per row.
+
+    ``batch_shape`` is the shape of the leading axes, e.g. ``(num_agents,)``
+    for a single env or ``(num_envs, num_agents)`` for a vector env.  After a
+    reset, missing history is padded with the reset observation (``"repeat"``)
+    or with zeros.
+    """
+
+    def __init__(
+        self,
+        batch_shape: tuple[int, ...],
+        observation_dim: int,
+        num_frames: int,
+        *,
+        dtype: npt.DTypeLike = np.float32,
+        pad: PadMode = "repeat",
+    ) -> None:
+        if num_frames < 1:
+            msg = "num_frames must be at least 1"
+            raise ValueError(msg)
+        if pad not in ("repeat", "zeros"):
+            msg = f"unknown pad mode {pad!r}"
+            raise ValueError(msg)
+        self.num_frames = num_frames
+        self.pad: PadMode = pad
+        self._buffer = np.zeros((*batch_shape, 2 * num_frames, observation_dim), dtype=dtype)
+        self._head = 0
+
+    @property
+    def batch_shape(self) -> tuple[int, ...]:
+        return self._buffer.shape[:-2]
+
+    @property
+    def frames(self) -> npt.NDArray[Any]:
+        """View shaped ``(*batch_shape, num_frames, observation_dim)``, oldest first.
+
+        The view aliases the buffer and changes on the next :meth:`push`.
+        """
+
+        return self._buffer[..., self._head : self._head + self.num_frames, :]
+
+    def push(self, observations: npt.ArrayLike) -> npt.NDArray[Any]:
+        """Append one frame for every row and return the updated :attr:`frames`."""
+
+        k, slot = self.num_frames, self._head
+        self._buffer[..., slot, :] = observations
+        self._buffer[..., slot + k, :] = self._buffer[..., slot, :]
+        self._head = (slot + 1) % k
+        return self.frames
+
+    def reset(
+        self, observations: npt.ArrayLike, *, index: int | tuple[int, ...] | None = None
+    ) -> npt.NDArray[Any]:
+        """Restart history for all rows, or only for the rows under ``index``.
+
+        ``observations`` is the first observation of the new episode, shaped
+        like the selected rows without the frame axis.  With ``index`` the
+        other rows keep their history, so one env of a batch can be reset
+        without disturbing the rest.
+        """
+
+        rows = self._buffer if index is None else self._buffer[index]
+        obs = np.asarray(observations)
+        if self.pad == "zeros":
+            rows.fill(0)
+        else:
+            rows[...] = obs[..., np.newaxis, :]
+        # The newest frame sits just before the head in both buffer halves.
+        newest = (self._head - 1) % self.num_frames
+        rows[..., newest, :] = obs
+        rows[..., newest + self.num_frames, :] = obs
+        return self.frames
+
+
+class FrameStackObservation:
+    """Return the last ``num_frames`` observations with a frame axis.
+
+    Observations shaped ``(..., num_agents, observation_dim)`` become
+    ``(..., num_agents, num_frames, observation_dim)`` views into an
+    :class:`ObservationHistory`, so they must be copied if kept past the next
+    ``step``/``reset``.  For vector envs the ``final_observation`` entries are
+    stacked copies ending with the final frame, and the history of each
+    autoreset env restarts from its new first observation.
+    """
+
+    def __init__(
+        self,
+        env: ArrayEnv | VectorArrayEnv | NormalizeObservation,
+        num_frames: int,
+        *,
+        pad: PadMode = "repeat",
+    ) -> None:
+        if num_frames < 1:
+            msg = "num_frames must be at least 1"
+            raise ValueError(msg)
+        self.env = env
+        self.num_frames = num_frames
+        self.pad: PadMode = pad
+        self.history: ObservationHistory | None = None
+
+    def reset(
+        self,
+        *,
+        seed: int | list[int] | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> tuple[npt.NDArray[Any], dict[str, Any]]:
+        obs, info = self.env.reset(seed=seed, options=options)  # type: ignore[arg-type]
+        history = self._history_for(obs)
+        return history.reset(obs), info
+
+    def step(
+        self, actions: npt.ArrayLike
+    ) -> tuple[npt.NDArray[Any], Any, Any, Any, dict[str, Any]]:
+        if self.history is None:
+            msg = "reset() must be called before step()"
+            raise RuntimeError(msg)
+        obs, rewards, terminated, truncated, info = self.env.step(actions)
+        final = info.get("final_observation")
+        if final is None:
+            return self.history.push(obs), rewards, terminated, truncated, info
+
+        done = np.flatnonzero(info["_final_observation"])
+        for idx in done:
+            stacked = np.empty_like(self.history.frames[idx])
+            stacked[..., :-1, :] = self.history.frames[idx][..., 1:, :]
+            stacked[..., -1, :] = final[idx]
+            final[idx] = stacked
+        self.history.push(obs)
+        for idx in done:
+            self.history.reset(obs[idx], index=int(idx))
+        return self.history.frames, rewards, terminated, truncated, info
+
+    def close(self) -> None:
+        self.env.close()
+
+    def _history_for(self, obs: npt.NDArray[Any]) -> ObservationHistory:
+        history = self.history
+        if history is None or history.batch_shape != obs.shape[:-1]:
+            history = ObservationHistory(
+                obs.shape[:-1], obs.shape[-1], self.num_frames, dtype=obs.dtype, pad=self.pad
+            )
+            self.history = history
+        return history
+
+
+__all__ = [
+    "FrameStackObservation",
+    "ObservationHistory",
+    "PadMode",
+]
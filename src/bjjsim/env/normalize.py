@@ -0,0 +1,210 @@
+"""Running observation normalization for the array-based env wrappers.
+
+:class:`RunningMeanStd` keeps per-feature mean and variance and folds in whole
+observation blocks at once with the parallel variant of Welford's algorithm
+(Chan et al.): a block contributes its own mean, variance and count, which are
+merged with the running totals in a handful of vector operations instead of
+one Python-level update per element.  The same merge combines statistics
+gathered by separate worker processes, so workers only need to ship
+``(mean, var, count)``.
+
+:class:`NormalizeObservation` applies the statistics to
+:class:`~bjjsim.env.array.ArrayEnv` or :class:`~bjjsim.env.array.VectorArrayEnv`
+outputs.  Statistics are shared across agents (the agents are symmetric) and
+across envs in a batch.
+
+This module needs NumPy; importing :mod:`bjjsim.env` alone does not.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from bjjsim.env.array import ArrayEnv, VectorArrayEnv
+
+Float64Array = npt.NDArray[np.float64]
+
+
+class RunningMeanStd:
+    """Per-feature running mean and (population) variance."""
+
+    def __init__(self, shape: tuple[int, ...], *, epsilon: float = 1e-4) -> None:
+        self.mean: Float64Array = np.zeros(shape, dtype=np.float64)
+        self.var: Float64Array = np.ones(shape, dtype=np.float64)
+        # A small pseudo-count keeps the first merge well defined.
+        self.count: float = epsilon
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self.mean.shape
+
+    def update(self, batch: npt.ArrayLike) -> None:
+        """Fold in a block shaped ``(..., *shape)``; leading axes are samples."""
+
+        x = np.asarray(batch, dtype=np.float64)
+        if x.shape[x.ndim - len(self.shape) :] != self.shape:
+            msg = f"expected trailing shape {self.shape}, received {x.shape}"
+            raise ValueError(msg)
+        x = x.reshape(-1, *self.shape)
+        if x.shape[0] == 0:
+            return
+        self.update_from_moments(x.mean(axis=0), x.var(axis=0), x.shape[0])
+
+    def update_from_moments(
+        self, batch_mean: npt.ArrayLike, batch_var: npt.ArrayLike, batch_count: float
+    ) -> None:
+        """Merge another set of statistics into this one (Chan et al. update)."""
+
+        if batch_count <= 0:
+            return
+        batch_mean = np.asarray(batch_mean, dtype=np.float64)
+        batch_var = np.asarray(batch_var, dtype=np.float64)
+        total = self.count + batch_count
+        delta = batch_mean - self.mean
+        new_mean = self.mean + delta * (batch_count / total)
+        m2 = self.var * self.count + batch_var * batch_count
+        m2 += np.square(delta) * (self.count * batch_count / total)
+        self.mean = new_mean
+        self.var = m2 / total
+        self.count = total
+
+    def merge(self, other: RunningMeanStd) -> None:
+        """Fold in statistics collected elsewhere, e.g. by another worker."""
+
+        if other.shape != self.shape:
+            msg = f"cannot merge statistics of shape {other.shape} into {self.shape}"
+            raise ValueError(msg)
+        self.update_from_moments(other.mean, other.var, other.count)
+
+    @classmethod
+    def combine(cls, parts: Iterable[RunningMeanStd]) -> RunningMeanStd:
+        """Return the statistics of all ``parts`` pooled together."""
+
+        parts = list(parts)
+        if not parts:
+            msg = "combine() needs at least one RunningMeanStd"
+            raise ValueError(msg)
+        combined = cls(parts[0].shape, epsilon=0.0)
+        combined.mean[...] = parts[0].mean
+        combined.var[...] = parts[0].var
+        combined.count = parts[0].count
+        for part in parts[1:]:
+            combined.merge(part)
+        return combined
+
+    def state_dict(self) -> dict[str, Float64Array]:
+        """Arrays suitable for ``np.savez`` or any checkpoint format."""
+
+        return {
+            "mean": self.mean.copy(),
+            "var": self.var.copy(),
+            "count": np.array(self.count, dtype=np.float64),
+        }
+
+    def load_state_dict(self, state: Mapping[str, npt.ArrayLike]) -> None:
+        mean = np.asarray(state["mean"], dtype=np.float64)
+        var = np.asarray(state["var"], dtype=np.float64)
+        if mean.shape != self.shape or var.shape != self.shape:
+            msg = f"state has shape {mean.shape}, expected {self.shape}"
+            raise ValueError(msg)
+        self.mean = mean.copy()
+        self.var = var.copy()
+        self.count = float(np.asarray(state["count"]))
+
+
+class NormalizeObservation:
+    """Normalize observations of an array env with running statistics.
+
+    Observations are mapped to ``clip((obs - mean) / sqrt(var + epsilon))``.
+    While :attr:`training` is true every observation block returned by
+    ``reset``/``step`` updates the statistics first; :meth:`freeze` stops the
+    updates for evaluation so results are reproducible.  Autoreset
+    ``final_observation`` entries from a vector env are normalized too, but do
+    not update the statistics.
+
+    Like the wrapped env, the returned array is a reused buffer.
+    """
+
+    def __init__(
+        self,
+        env: ArrayEnv | VectorArrayEnv,
+        *,
+        clip: float = 10.0,
+        epsilon: float = 1e-8,
+    ) -> None:
+        if clip <= 0:
+            msg = "clip must be positive"
+            raise ValueError(msg)
+        self.env = env
+        self.clip = clip
+        self.epsilon = epsilon
+        self.training = True
+        base = env.envs[0] if isinstance(env, VectorArrayEnv) else env.env
+        self.obs_rms = RunningMeanStd((base.config.observation_dim,))
+        self._out: npt.NDArray[np.float32] | None = None
+
+    def freeze(self) -> None:
+        self.training = False
+
+    def unfreeze(self) -> None:
+        self.training = True
+
+    def reset(
+        self,
+        *,
+        seed: int | list[int] | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> tuple[npt.NDArray[np.float32], dict[str, Any]]:
+        obs, info = self.env.reset(seed=seed, options=options)  # type: ignore[arg-type]
+        return self._observe(obs), info
+
+    def step(
+        self, actions: npt.ArrayLike
+    ) -> tuple[npt.NDArray[np.float32], Any, Any, Any, dict[str, Any]]:
+        obs, rewards, terminated, truncated, info = self.env.step(actions)
+        final = info.get("final_observation")
+        if final is not None:
+            mask = info["_final_observation"]
+            for idx in np.flatnonzero(mask):
+                final[idx] = self.normalize(final[idx])
+        return self._observe(obs), rewards, terminated, truncated, info
+
+    def normalize(
+        self, obs: npt.ArrayLike, *, out: npt.NDArray[np.float32] | None = None
+    ) -> npt.NDArray[np.float32]:
+        """Normalize ``obs`` with the current statistics without updating them."""
+
+        x = np.asarray(obs)
+        if out is None:
+            out = np.empty(x.shape, dtype=np.float32)
+        scale = 1.0 / np.sqrt(self.obs_rms.var + self.epsilon)
+        np.subtract(x, self.obs_rms.mean, out=out, casting="unsafe")
+        np.multiply(out, scale, out=out, casting="unsafe")
+        np.clip(out, -self.clip, self.clip, out=out)
+        return out
+
+    def state_dict(self) -> dict[str, npt.NDArray[np.float64]]:
+        return self.obs_rms.state_dict()
+
+    def load_state_dict(self, state: Mapping[str, npt.ArrayLike]) -> None:
+        self.obs_rms.load_state_dict(state)
+
+    def close(self) -> None:
+        self.env.close()
+
+    def _observe(self, obs: npt.NDArray[Any]) -> npt.NDArray[np.float32]:
+        if self.training:
+            self.obs_rms.update(obs)
+        if self._out is None or self._out.shape != obs.shape:
+            self._out = np.empty(obs.shape, dtype=np.float32)
+        return self.normalize(obs, out=self._out)
+
+
+__all__ = [
+    "NormalizeObservation",
+    "RunningMeanStd",
+]
@@ -0,0 +1,101 @@
+"""Selectable observation groups and their compiled layout.
+
+:attr:`~bjjsim.env.EnvConfig.observation_groups` picks which pieces make up
+each agent's observation vector, in order.  :class:`ObservationLayout`
+resolves the selection to offsets once, when the environment is built, so
+consumers can slice groups out of the vector and the environment only
+computes (and only queries the physics adapter for) what is selected.
+
+Pose-based groups read :meth:`~bjjsim.physics.SupportsPoses.poses` once
+per step; positions are relative to the agent's own root link so they do
+not depend on where the pair stands on the mat.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Final, Literal, get_args
+
+ObservationGroup = Literal[
+    "step_counters",
+    "agent_index",
+    "base_height",
+    "own_joints",
+    "opponent_joints",
+    "contact_summary",
+]
+OBSERVATION_GROUPS: Final[tuple[ObservationGroup, ...]] = get_args(ObservationGroup)
+# Groups whose values come from the adapter's poses.
+POSE_GROUPS: Final[frozenset[ObservationGroup]] = frozenset(
+    ("base_height", "own_joints", "opponent_joints", "contact_summary")
+)
+
+
+def group_size(group: ObservationGroup, num_links: int) -> int:
+    """Width of ``group`` for skeletons with ``num_links`` links.
+
+    ``step_counters`` is ``(episode_step, physics_step)``; ``contact_summary``
+    is ``(contacts involving the agent, distinct own links in contact)``.
+    """
+
+    if group in ("own_joints", "opponent_joints"):
+        return 3 * num_links
+    if group in ("step_counters", "contact_summary"):
+        return 2
+    return 1
+
+
+@dataclass(frozen=True, slots=True)
+class ObservationLayout:
+    """Offsets of the selected groups within one observation vector."""
+
+    groups: tuple[ObservationGroup, ...]
+    offsets: tuple[int, ...]
+    size: int
+
+    @classmethod
+    def compile(cls, groups: tuple[str, ...], num_links: int) -> ObservationLayout:
+        if len(set(groups)) != len(groups):
+            msg = f"observation_groups must not repeat a group, got {groups}"
+            raise ValueError(msg)
+        offsets: list[int] = []
+        selected: list[ObservationGroup] = []
+        size = 0
+        for name in groups:
+            group = _as_group(name)
+            selected.append(group)
+            offsets.append(size)
+            size += group_size(group, num_links)
+        return cls(groups=tuple(selected), offsets=tuple(offsets), size=size)
+
+    @property
+    def needs_poses(self) -> bool:
+        return not POSE_GROUPS.isdisjoint(self.groups)
+
+    def slice(self, group: ObservationGroup) -> slice:
+        """Where ``group`` sits in the vector; ``KeyError`` if not selected."""
+
+        try:
+            idx = self.groups.index(group)
+        except ValueError:
+            msg = f"observation group {group!r} is not selected"
+            raise KeyError(msg) from None
+        stop = self.offsets[idx + 1] if idx + 1 < len(self.groups) else self.size
+        return slice(self.offsets[idx], stop)
+
+
+def _as_group(name: str) -> ObservationGroup:
+    for group in OBSERVATION_GROUPS:
+        if group == name:
+            return group
+    msg = f"unknown observation group {name!r}; expected one of {OBSERVATION_GROUPS}"
+    raise ValueError(msg)
+
+
+__all__ = [
+    "OBSERVATION_GROUPS",
+    "POSE_GROUPS",
+    "ObservationGroup",
+    "ObservationLayout",
+    "group_size",
+]
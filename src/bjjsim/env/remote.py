@@ -0,0 +1,659 @@
+"""Remote env workers: batches of envs served over a binary socket protocol.
+
+:class:`EnvWorkerServer` hosts a :class:`~bjjsim.env.array.VectorArrayEnv`
+behind a TCP socket, and :class:`RemoteVectorEnv` is a
+:class:`gymnasium.vector.VectorEnv` that spreads its envs over any number of
+such workers, so rollout collection can scale past one host.
+
+Wire format
+    Every message is a 9-byte little-endian header ``(payload_length: u32,
+    request_id: u32, kind: u8)`` followed by the payload.  Payloads are raw
+    little-endian arrays; nothing is JSON-encoded.
+
+    * ``HELLO`` (worker → client on connect): ``(version: u16, num_envs,
+      num_agents, observation_dim, action_dim: u32)``.
+    * ``RESET``: empty or ``int64[num_envs]`` seeds; the reply is
+      ``float32[num_envs, num_agents, observation_dim]`` observations.
+    * ``STEP``: ``float32[num_envs, num_agents, action_dim]`` actions; the
+      reply is observations, ``float32[num_envs, num_agents]`` rewards,
+      ``uint8[num_envs]`` flags (bit 0 terminated, bit 1 truncated) and the
+      final observations of every flagged env, in env order.
+    * ``CLOSE`` ends the connection; ``ERROR`` replies carry a UTF-8 message.
+
+    Requests are pipelined: a client may send several before reading any
+    reply, and replies come back in request order with the same
+    ``request_id``.  :class:`RemoteVectorEnv` sends to every worker before
+    reading from any, so workers step in parallel.
+
+If a connection drops, the client reconnects with exponential backoff.  The
+worker's envs are then in an unknown state, so they are reset and reported
+as truncated for that step, with ``infos["reconnected"]`` marking them.
+
+This module needs NumPy and Gymnasium.
+"""
+
+from __future__ import annotations
+
+import argparse
+import socket
+import socketserver
+import struct
+import threading
+import time
+from collections import deque
+from collections.abc import Buffer, Sequence
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any, Final
+
+import numpy as np
+import numpy.typing as npt
+from gymnasium.vector import VectorEnv
+
+from bjjsim.env import EnvConfig
+from bjjsim.env.array import VectorArrayEnv, _spaces
+
+PROTOCOL_VERSION: Final[int] = 1
+
+_FRAME: Final[struct.Struct] = struct.Struct("<IIB")
+_HELLO: Final[struct.Struct] = struct.Struct("<HIIII")
+
+HELLO: Final[int] = 1
+RESET: Final[int] = 2
+STEP: Final[int] = 3
+CLOSE: Final[int] = 4
+ERROR: Final[int] = 255
+
+_FLOAT: Final[np.dtype[np.float32]] = np.dtype("<f4")
+_SEED: Final[np.dtype[np.int64]] = np.dtype("<i8")
+
+
+_HAS_SENDMSG: Final[bool] = hasattr(socket.socket, "sendmsg")
+
+
+class RemoteEnvError(RuntimeError):
+    """Raised when a worker rejects a request or breaks the protocol."""
+
+
+def _send_frame(sock: socket.socket, kind: int, request_id: int, parts: Sequence[Buffer]) -> None:
+    views = [memoryview(part).cast("B") for part in parts]
+    header = _FRAME.pack(sum(view.nbytes for view in views), request_id, kind)
+    pending = [memoryview(header), *(view for view in views if view.nbytes)]
+    if not _HAS_SENDMSG:
+        # Windows has no sendmsg; one joined send keeps the frame in one segment.
+        sock.sendall(b"".join(pending))
+        return
+    # Scatter-gather send: array payloads go out without being joined first.
+    while pending:
+        sent = sock.sendmsg(pending)
+        while pending and sent >= pending[0].nbytes:
+            sent -= pending[0].nbytes
+            pending.pop(0)
+        if sent:
+            pending[0] = pending[0][sent:]
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytearray:
+    buf = bytearray(size)
+    view = memoryview(buf)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            msg = "connection closed by peer"
+            raise ConnectionError(msg)
+        received += count
+    return buf
+
+
+def _recv_frame(sock: socket.socket) -> tuple[int, int, bytearray]:
+    length, request_id, kind = _FRAME.unpack(_recv_exact(sock, _FRAME.size))
+    return kind, request_id, _recv_exact(sock, length)
+
+
+@dataclass(slots=True, frozen=True)
+class _Hello:
+    num_envs: int
+    num_agents: int
+    observation_dim: int
+    action_dim: int
+
+
+class EnvWorkerServer(socketserver.ThreadingTCPServer):
+    """Serve one batch of envs to remote clients.
+
+    The envs belong to the server, not to a connection, and requests from
+    all connections are applied one at a time.
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int] = ("127.0.0.1", 0),
+        *,
+        num_envs: int = 1,
+        config: EnvConfig | None = None,
+    ) -> None:
+        self.vector_env = VectorArrayEnv.from_config(num_envs, config)
+        self._env_lock = threading.Lock()
+        self._connections: set[socket.socket] = set()
+        self._connections_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        super().__init__(address, _WorkerHandler)
+
+    @property
+    def address(self) -> tuple[str, int]:
+        host, port = self.server_address[:2]
+        return str(host), int(port)
+
+    def serve_in_background(self) -> threading.Thread:
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="bjjsim-env-worker", daemon=True
+        )
+        self._thread.start()
+        return self._thread
+
+    def close_connections(self) -> None:
+        """Drop every client connection; clients reconnect on their next request."""
+
+        with self._connections_lock:
+            connections = list(self._connections)
+        for conn in connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop serving, drop connections, close the socket and the envs."""
+
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.close_connections()
+        self.server_close()
+        self.vector_env.close()  # type: ignore[no-untyped-call]
+
+    def _hello(self) -> bytes:
+        venv = self.vector_env
+        num_agents, observation_dim = venv.single_observation_space.shape or (0, 0)
+        action_dim = (venv.single_action_space.shape or (0, 0))[1]
+        return _HELLO.pack(PROTOCOL_VERSION, venv.num_envs, num_agents, observation_dim, action_dim)
+
+    def _serve_connection(self, sock: socket.socket) -> None:
+        with self._connections_lock:
+            self._connections.add(sock)
+        try:
+            _send_frame(sock, HELLO, 0, [self._hello()])
+            while True:
+                try:
+                    kind, request_id, payload = _recv_frame(sock)
+                except OSError:
+                    return
+                if kind == CLOSE:
+                    return
+                # The reply references the env's buffers, so it is sent before
+                # another connection may step them again.
+                with self._env_lock:
+                    try:
+                        reply_kind, parts = kind, self._dispatch(kind, payload)
+                    except Exception as exc:
+                        reply_kind, parts = ERROR, [str(exc).encode("utf-8")]
+                    try:
+                        _send_frame(sock, reply_kind, request_id, parts)
+                    except OSError:
+                        return
+        finally:
+            with self._connections_lock:
+                self._connections.discard(sock)
+
+    def _dispatch(self, kind: int, payload: bytearray) -> list[Buffer]:
+        venv = self.vector_env
+        if kind == RESET:
+            seeds: list[int] | None = None
+            if payload:
+                if len(payload) != venv.num_envs * _SEED.itemsize:
+                    msg = f"expected {venv.num_envs} seeds"
+                    raise ValueError(msg)
+                seeds = np.frombuffer(payload, dtype=_SEED).tolist()
+            observations, _ = venv.reset_wait(seed=seeds)
+            return [np.ascontiguousarray(observations, dtype=_FLOAT)]
+        if kind == STEP:
+            shape = venv.action_space.shape or ()
+            if len(payload) != int(np.prod(shape)) * _FLOAT.itemsize:
+                msg = f"expected float32 actions shaped {shape}"
+                raise ValueError(msg)
+            venv.step_async(np.frombuffer(payload, dtype=_FLOAT).reshape(shape))
+            observations, rewards, terminated, truncated, infos = venv.step_wait()
+            flags = terminated[:, 0].astype(np.uint8) | (truncated[:, 0].astype(np.uint8) << 1)
+            parts: list[Buffer] = [
+                np.ascontiguousarray(observations, dtype=_FLOAT),
+                np.ascontiguousarray(rewards, dtype=_FLOAT),
+                flags,
+            ]
+            if "final_observation" in infos:
+                finals = infos["final_observation"][np.flatnonzero(flags)]
+                parts.append(np.stack(list(finals)).astype(_FLOAT))
+            return parts
+        msg = f"unknown message kind {kind}"
+        raise ValueError(msg)
+
+
+class _WorkerHandler(socketserver.BaseRequestHandler):
+    server: EnvWorkerServer
+
+    def handle(self) -> None:
+        sock: socket.socket = self.request
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server._serve_connection(sock)
+
+
+@dataclass(slots=True, frozen=True)
+class WorkerStats:
+    """Round-trip latency of one worker's recent requests, in seconds."""
+
+    address: str
+    requests: int
+    reconnects: int
+    mean_s: float
+    p50_s: float
+    p95_s: float
+    max_s: float
+
+
+class _WorkerLink:
+    """Client side of one worker connection, with reconnects and latency tracking."""
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        *,
+        timeout_s: float,
+        max_reconnects: int,
+        latency_window: int,
+    ) -> None:
+        self.address = address
+        self.timeout_s = timeout_s
+        self.max_reconnects = max_reconnects
+        self.reconnects = 0
+        self.requests = 0
+        self.hello: _Hello | None = None
+        self._sock: socket.socket | None = None
+        self._next_id = 0
+        self._sent: deque[tuple[int, float]] = deque()
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+
+    def connect(self) -> _Hello:
+        delay = 0.05
+        error: OSError | None = None
+        for attempt in range(self.max_reconnects + 1):
+            if attempt:
+                time.sleep(delay)
+                delay *= 2
+            try:
+                sock = socket.create_connection(self.address, timeout=self.timeout_s)
+            except OSError as exc:
+                error = exc
+                continue
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                kind, _, payload = _recv_frame(sock)
+            except OSError as exc:
+                sock.close()
+                error = exc
+                continue
+            if kind != HELLO or len(payload) != _HELLO.size:
+                sock.close()
+                msg = f"env worker {self.name} did not send a valid hello"
+                raise RemoteEnvError(msg)
+            version, *dims = _HELLO.unpack(payload)
+            if version != PROTOCOL_VERSION:
+                sock.close()
+                msg = f"env worker {self.name} speaks protocol {version}, not {PROTOCOL_VERSION}"
+                raise RemoteEnvError(msg)
+            hello = _Hello(*dims)
+            if self.hello is not None and hello != self.hello:
+                sock.close()
+                msg = f"env worker {self.name} came back with a different env batch"
+                raise RemoteEnvError(msg)
+            self._sock, self.hello = sock, hello
+            self._sent.clear()
+            return hello
+        msg = f"could not connect to env worker {self.name}"
+        raise ConnectionError(msg) from error
+
+    def reconnect(self) -> _Hello:
+        self.close(graceful=False)
+        self.reconnects += 1
+        return self.connect()
+
+    @property
+    def name(self) -> str:
+        return f"{self.address[0]}:{self.address[1]}"
+
+    def send(self, kind: int, *parts: Buffer) -> int:
+        if self._sock is None:
+            msg = f"not connected to env worker {self.name}"
+            raise ConnectionError(msg)
+        request_id = self._next_id
+        self._next_id = (self._next_id + 1) % 2**32
+        self._sent.append((request_id, time.perf_counter()))
+        _send_frame(self._sock, kind, request_id, parts)
+        return request_id
+
+    def receive(self) -> bytearray:
+        """Read the reply to the oldest outstanding request."""
+
+        if self._sock is None or not self._sent:
+            msg = f"no outstanding request to env worker {self.name}"
+            raise RemoteEnvError(msg)
+        kind, request_id, payload = _recv_frame(self._sock)
+        expected_id, sent_at = self._sent.popleft()
+        if request_id != expected_id:
+            msg = f"env worker {self.name} answered request {request_id}, not {expected_id}"
+            raise RemoteEnvError(msg)
+        self._latencies.append(time.perf_counter() - sent_at)
+        self.requests += 1
+        if kind == ERROR:
+            raise RemoteEnvError(payload.decode("utf-8", errors="replace"))
+        return payload
+
+    def stats(self) -> WorkerStats:
+        samples = sorted(self._latencies)
+        if not samples:
+            return WorkerStats(self.name, self.requests, self.reconnects, 0.0, 0.0, 0.0, 0.0)
+        return WorkerStats(
+            self.name,
+            self.requests,
+            self.reconnects,
+            mean_s=sum(samples) / len(samples),
+            p50_s=samples[(len(samples) - 1) // 2],
+            p95_s=samples[min(len(samples) - 1, int(0.95 * len(samples)))],
+            max_s=samples[-1],
+        )
+
+    def close(self, *, graceful: bool = True) -> None:
+        if self._sock is None:
+            return
+        if graceful:
+            try:
+                _send_frame(self._sock, CLOSE, 0, [])
+            except OSError:
+                pass
+        self._sock.close()
+        self._sock = None
+
+
+def _parse_address(address: str | tuple[str, int]) -> tuple[str, int]:
+    if isinstance(address, tuple):
+        return address
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        msg = f"worker address {address!r} must look like host:port"
+        raise ValueError(msg)
+    return host, int(port)
+
+
+class RemoteVectorEnv(VectorEnv):
+    """:class:`gymnasium.vector.VectorEnv` over envs hosted by remote workers.
+
+    Envs are numbered worker by worker in ``addresses`` order.  Observations,
+    rewards and autoreset infos follow :class:`~bjjsim.env.array.VectorArrayEnv`
+    (float32 observations), and :meth:`worker_stats` reports per-worker
+    round-trip latency.
+    """
+
+    def __init__(
+        self,
+        addresses: Sequence[str | tuple[str, int]],
+        config: EnvConfig | None = None,
+        *,
+        timeout_s: float = 30.0,
+        max_reconnects: int = 5,
+        latency_window: int = 1024,
+    ) -> None:
+        if not addresses:
+            msg = "addresses must name at least one worker"
+            raise ValueError(msg)
+        config = config or EnvConfig()
+        self.links = [
+            _WorkerLink(
+                _parse_address(address),
+                timeout_s=timeout_s,
+                max_reconnects=max_reconnects,
+                latency_window=latency_window,
+            )
+            for address in addresses
+        ]
+        self.possible_agents: tuple[str, ...] = tuple(config.agent_names)
+        self._slices: list[slice] = []
+        start = 0
+        try:
+            for link in self.links:
+                hello = link.connect()
+                if (hello.num_agents, hello.observation_dim, hello.action_dim) != (
+                    len(self.possible_agents),
+                    config.observation_dim,
+                    config.action_dim,
+                ):
+                    msg = f"env worker {link.name} does not match the given EnvConfig"
+                    raise ValueError(msg)
+                self._slices.append(slice(start, start + hello.num_envs))
+                start += hello.num_envs
+        except BaseException:
+            for link in self.links:
+                link.close()
+            raise
+        single_obs, single_act = _spaces(config, np.float32)
+        super().__init__(start, single_obs, single_act)
+
+        num_agents = len(self.possible_agents)
+        self._observations = np.zeros((start, *single_obs.shape), dtype=np.float32)
+        self._rewards = np.zeros((start, num_agents), dtype=np.float32)
+        self._terminated = np.zeros((start, num_agents), dtype=np.bool_)
+        self._truncated = np.zeros((start, num_agents), dtype=np.bool_)
+        self._actions: npt.NDArray[np.float32] | None = None
+
+    def worker_stats(self) -> list[WorkerStats]:
+        return [link.stats() for link in self.links]
+
+    def reset_wait(
+        self,
+        seed: int | list[int] | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> tuple[npt.NDArray[Any], dict[str, Any]]:
+        del options  # Workers reset with their own defaults.
+        if seed is None:
+            seeds: npt.NDArray[np.int64] | None = None
+        elif isinstance(seed, int):
+            seeds = np.arange(seed, seed + self.num_envs, dtype=_SEED)
+        else:
+            if len(seed) != self.num_envs:
+                msg = f"expected {self.num_envs} seeds, received {len(seed)}"
+                raise ValueError(msg)
+            seeds = np.asarray(seed, dtype=_SEED)
+
+        def payload(rows: slice) -> list[Buffer]:
+            return [] if seeds is None else [seeds[rows]]
+
+        unsent: set[int] = set()
+        for idx, (link, rows) in enumerate(zip(self.links, self._slices, strict=True)):
+            try:
+                link.send(RESET, *payload(rows))
+            except OSError:
+                unsent.add(idx)
+        # Every link's reply is read before raising, so none is left queued
+        # to be taken for the answer to a later request.
+        errors: list[Exception] = []
+        for idx, (link, rows) in enumerate(zip(self.links, self._slices, strict=True)):
+            reply: bytearray | None = None
+            try:
+                if idx not in unsent:
+                    with suppress(OSError):
+                        reply = link.receive()
+                if reply is None:
+                    # Resets are idempotent, so simply ask again.
+                    link.reconnect()
+                    link.send(RESET, *payload(rows))
+                    reply = link.receive()
+                self._observations[rows] = self._unpack_observations(reply, rows)
+            except (OSError, RemoteEnvError) as exc:
+                errors.append(exc)
+        if errors:
+            raise errors[0]
+        self._terminated.fill(False)
+        self._truncated.fill(False)
+        return self._observations, {}
+
+    def step_async(self, actions: npt.ArrayLike) -> None:
+        batch = np.asarray(actions, dtype=_FLOAT)
+        if batch.shape != self.action_space.shape:
+            msg = f"expected actions shaped {self.action_space.shape}, received {batch.shape}"
+            raise ValueError(msg)
+        batch = np.ascontiguousarray(batch)
+        # Fan out before gathering anything so workers step concurrently.
+        for link, rows in zip(self.links, self._slices, strict=True):
+            try:
+                link.send(STEP, batch[rows])
+            except OSError:
+                pass  # Surfaces as a lost reply in step_wait.
+        self._actions = batch
+
+    def step_wait(
+        self, **kwargs: object
+    ) -> tuple[
+        npt.NDArray[Any],
+        npt.NDArray[np.float32],
+        npt.NDArray[np.bool_],
+        npt.NDArray[np.bool_],
+        dict[str, Any],
+    ]:
+        del kwargs
+        if self._actions is None:
+            msg = "step_async() must be called before step_wait()"
+            raise RuntimeError(msg)
+        self._actions = None
+        infos: dict[str, Any] = {}
+        # As in reset_wait, drain every link before raising the first error.
+        errors: list[Exception] = []
+        for link, rows in zip(self.links, self._slices, strict=True):
+            try:
+                try:
+                    reply = link.receive()
+                except OSError:
+                    self._recover(link, rows, infos)
+                    continue
+                self._unpack_step(reply, rows, infos)
+            except (OSError, RemoteEnvError) as exc:
+                errors.append(exc)
+        if errors:
+            raise errors[0]
+        return self._observations, self._rewards, self._terminated, self._truncated, infos
+
+    def close_extras(self, **kwargs: object) -> None:
+        del kwargs
+        for link in self.links:
+            link.close()
+
+    def _unpack_observations(self, reply: bytearray, rows: slice) -> npt.NDArray[np.float32]:
+        shape = (rows.stop - rows.start, *self.single_observation_space.shape)  # type: ignore[misc]
+        expected = int(np.prod(shape)) * _FLOAT.itemsize
+        if len(reply) != expected:
+            msg = f"reset reply has {len(reply)} bytes, expected {expected}"
+            raise RemoteEnvError(msg)
+        return np.frombuffer(reply, dtype=_FLOAT).reshape(shape)
+
+    def _unpack_step(self, reply: bytearray, rows: slice, infos: dict[str, Any]) -> None:
+        num_envs = rows.stop - rows.start
+        num_agents, observation_dim = self.single_observation_space.shape  # type: ignore[misc]
+        obs_count = num_envs * num_agents * observation_dim
+        offset = obs_count * _FLOAT.itemsize
+        reward_end = offset + num_envs * num_agents * _FLOAT.itemsize
+        if len(reply) < reward_end + num_envs:
+            msg = f"step reply of {len(reply)} bytes is truncated"
+            raise RemoteEnvError(msg)
+        self._observations[rows] = np.frombuffer(reply, dtype=_FLOAT, count=obs_count).reshape(
+            num_envs, num_agents, observation_dim
+        )
+        self._rewards[rows] = np.frombuffer(
+            reply, dtype=_FLOAT, count=num_envs * num_agents, offset=offset
+        ).reshape(num_envs, num_agents)
+        flags = np.frombuffer(reply, dtype=np.uint8, count=num_envs, offset=reward_end)
+        self._terminated[rows] = (flags & 1).astype(np.bool_)[:, np.newaxis]
+        self._truncated[rows] = (flags & 2).astype(np.bool_)[:, np.newaxis]
+        done = np.flatnonzero(flags)
+        if not len(done):
+            return
+        finals = np.frombuffer(
+            reply,
+            dtype=_FLOAT,
+            count=len(done) * num_agents * observation_dim,
+            offset=reward_end + num_envs,
+        ).reshape(len(done), num_agents, observation_dim)
+        final_observation, final_mask = self._final_infos(infos)
+        for idx, final in zip(done, finals, strict=True):
+            final_observation[rows.start + idx] = final.copy()
+            final_mask[rows.start + idx] = True
+
+    def _recover(self, link: _WorkerLink, rows: slice, infos: dict[str, Any]) -> None:
+        """Reconnect after a lost step and restart that worker's envs."""
+
+        previous = self._observations[rows].copy()
+        link.reconnect()
+        link.send(RESET)
+        self._observations[rows] = self._unpack_observations(link.receive(), rows)
+        self._rewards[rows] = 0.0
+        self._terminated[rows] = False
+        self._truncated[rows] = True
+        final_observation, final_mask = self._final_infos(infos)
+        for offset, final in enumerate(previous):
+            final_observation[rows.start + offset] = final
+            final_mask[rows.start + offset] = True
+        if "reconnected" not in infos:
+            infos["reconnected"] = np.zeros(self.num_envs, dtype=np.bool_)
+        infos["reconnected"][rows] = True
+
+    def _final_infos(
+        self, infos: dict[str, Any]
+    ) -> tuple[npt.NDArray[np.object_], npt.NDArray[np.bool_]]:
+        if "final_observation" not in infos:
+            infos["final_observation"] = np.full(self.num_envs, None, dtype=object)
+            infos["_final_observation"] = np.zeros(self.num_envs, dtype=np.bool_)
+        return infos["final_observation"], infos["_final_observation"]
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m bjjsim.env.remote",
+        description="Serve a batch of BJJSim envs to RemoteVectorEnv clients.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5600)
+    parser.add_argument("--num-envs", type=int, default=8)
+    parser.add_argument("--max-episode-steps", type=int, default=EnvConfig().max_episode_steps)
+    args = parser.parse_args(argv)
+    config = EnvConfig(max_episode_steps=args.max_episode_steps)
+    with EnvWorkerServer((args.host, args.port), num_envs=args.num_envs, config=config) as server:
+        host, port = server.address
+        print(f"serving {args.num_envs} envs on {host}:{port}", flush=True)
+        server.serve_forever()
+
+
+__all__ = [
+    "EnvWorkerServer",
+    "PROTOCOL_VERSION",
+    "RemoteEnvError",
+    "RemoteVectorEnv",
+    "WorkerStats",
+    "main",
+]
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry
+    main()
@@ -1,8 +1,21 @@
 from __future__ import annotations
 
-from .adapter import DeterministicCounterAdapter, PhysicsAdapter
+from .adapter import (
+    DeterministicCounterAdapter,
+    PhysicsAdapter,
+    SupportsActionChunks,
+    SupportsStateDict,
+)
+from .pose import HUMANOID, PoseFrame, Skeleton, SupportsPoses, scripted_poses
 
 __all__ = [
     "PhysicsAdapter",
     "DeterministicCounterAdapter",
+    "SupportsStateDict",
+    "SupportsActionChunks",
+    "SupportsPoses",
+    "PoseFrame",
+    "Skeleton",
+    "HUMANOID",
+    "scripted_poses",
 ]
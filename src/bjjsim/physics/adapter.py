@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
-from typing import Protocol, Self, runtime_checkable
+from typing import Any, Protocol, Self, runtime_checkable
+
+from .pose import HUMANOID, PoseFrame, Skeleton, scripted_poses
 
 
 @runtime_checkable
@@ -35,11 +38,58 @@ class PhysicsAdapter(Protocol):
         ...
 
 
+@runtime_checkable
+class SupportsStateDict(Protocol):
+    """Optional adapter interface for snapshotting and restoring its state.
+
+    Environments include the snapshot in their own ``state_dict`` so
+    checkpoints can resume an episode mid-way.  Values must be plain
+    JSON-serializable Python objects.
+    """
+
+    def state_dict(self) -> dict[str, Any]:
+        """Return the adapter state."""
+        ...
+
+    def load_state_dict(self, state: Mapping[str, Any]) -> None:
+        """Restore a state produced by :meth:`state_dict`."""
+
+
+@runtime_checkable
+class SupportsActionChunks(Protocol):
+    """Optional adapter interface for applying explicit per-agent actions.
+
+    The web app's ``/api/sim/step_chunk`` route runs open-loop action chunks
+    (scripted drills, action-chunking policies) through it.
+    """
+
+    @property
+    def num_agents(self) -> int:
+        """Rows expected per step."""
+        ...
+
+    @property
+    def action_dim(self) -> int:
+        """Values expected per row."""
+        ...
+
+    def step_chunk(
+        self, actions: Sequence[Sequence[Sequence[float]]]
+    ) -> tuple[list[list[list[float]]], list[list[float]]]:
+        """Apply ``(T, num_agents, action_dim)`` actions, one row per agent per step.
+
+        Returns per-step observation rows and rewards for the steps run;
+        fewer than ``T`` means the episode ended mid-chunk.
+        """
+        ...
+
+
 @dataclass
 class DeterministicCounterAdapter:
     """Trivial adapter used for UI scaffolding and tests.
 
-    Maintains an integer counter that advances on each call to ``step``.
+    Maintains an integer counter that advances on each call to ``step``, and
+    reports scripted :func:`~bjjsim.physics.pose.scripted_poses` for it.
     """
 
     _step_count: int = 0
@@ -75,3 +125,22 @@ class DeterministicCounterAdapter:
     @property
     def last_seed(self: Self) -> int | None:
         return self._last_seed
+
+    def state_dict(self: Self) -> dict[str, Any]:
+        return {
+            "step_count": self._step_count,
+            "last_seed": self._last_seed,
+            "running": self._running,
+        }
+
+    def load_state_dict(self: Self, state: Mapping[str, Any]) -> None:
+        self._step_count = int(state["step_count"])
+        self._last_seed = None if state["last_seed"] is None else int(state["last_seed"])
+        self._running = bool(state["running"])
+
+    @property
+    def skeleton(self: Self) -> Skeleton:
+        return HUMANOID
+
+    def poses(self: Self) -> PoseFrame:
+        return scripted_poses(self._step_count, self._last_seed)
@@ -0,0 +1,231 @@
+"""Per-link poses of the simulated humanoids.
+
+Adapters that can report where each body link is implement
+:class:`SupportsPoses`.  Clients use the poses to draw the match themselves
+(see ``/ws/poses`` in :mod:`bjjsim.web.app`) instead of fetching rendered
+frames.  Coordinates are metres in a right-handed world frame with ``z`` up.
+Orientations are unit quaternions in ``(x, y, z, w)`` order, as PyBullet
+reports them.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Final, Protocol, runtime_checkable
+
+type Vec3 = tuple[float, float, float]
+type Quat = tuple[float, float, float, float]
+# (agent_a, link_a, agent_b, link_b)
+type ContactPair = tuple[int, int, int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class Skeleton:
+    """Link names and the parent of each link (``-1`` for the root).
+
+    Clients draw a bone from every non-root link to its parent.
+    """
+
+    links: tuple[str, ...]
+    parents: tuple[int, ...]
+
+    def __post_init__(self) -> None:
+        if len(self.links) != len(self.parents):
+            msg = "links and parents must have the same length"
+            raise ValueError(msg)
+        for idx, parent in enumerate(self.parents):
+            if not -1 <= parent < idx:
+                msg = f"parent of link {idx} must precede it, got {parent}"
+                raise ValueError(msg)
+
+    @property
+    def num_links(self) -> int:
+        return len(self.links)
+
+
+HUMANOID: Final[Skeleton] = Skeleton(
+    links=(
+        "pelvis",
+        "chest",
+        "head",
+        "left_shoulder",
+        "left_elbow",
+        "left_hand",
+        "right_shoulder",
+        "right_elbow",
+        "right_hand",
+        "left_hip",
+        "left_knee",
+        "left_foot",
+        "right_hip",
+        "right_knee",
+        "right_foot",
+    ),
+    parents=(-1, 0, 1, 1, 3, 4, 1, 6, 7, 0, 9, 10, 0, 12, 13),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class PoseFrame:
+    """Poses of every link of every agent at one simulation step.
+
+    ``positions[agent][link]`` and ``orientations[agent][link]`` follow the
+    adapter's :class:`Skeleton`; ``contacts`` lists the touching link pairs
+    between agents.
+    """
+
+    positions: tuple[tuple[Vec3, ...], ...]
+    orientations: tuple[tuple[Quat, ...], ...]
+    contacts: tuple[ContactPair, ...] = ()
+
+    @property
+    def num_agents(self) -> int:
+        return len(self.positions)
+
+
+@runtime_checkable
+class SupportsPoses(Protocol):
+    """Optional adapter interface for reporting per-link poses."""
+
+    @property
+    def skeleton(self) -> Skeleton:
+        """Links every agent's pose is reported for."""
+        ...
+
+    def poses(self) -> PoseFrame:
+        """Return the poses at the current step."""
+        ...
+
+
+# Bone lengths (m) of the scripted figure, keyed by child link.
+_BONES: Final[dict[str, float]] = {
+    "chest": 0.45,
+    "head": 0.25,
+    "left_elbow": 0.3,
+    "left_hand": 0.28,
+    "right_elbow": 0.3,
+    "right_hand": 0.28,
+    "left_knee": 0.42,
+    "left_foot": 0.42,
+    "right_knee": 0.42,
+    "right_foot": 0.42,
+}
+_SHOULDER_HALF_WIDTH: Final[float] = 0.18
+_HIP_HALF_WIDTH: Final[float] = 0.1
+_PELVIS_HEIGHT: Final[float] = 0.9
+_STANCE_OFFSET: Final[float] = 0.45
+CONTACT_DISTANCE: Final[float] = 0.12
+
+
+def _quat_about_y(angle: float) -> Quat:
+    return (0.0, math.sin(angle / 2), 0.0, math.cos(angle / 2))
+
+
+def _scripted_agent(step: int, phase: float, facing: float, origin_x: float) -> list[Vec3]:
+    """Forward kinematics of one figure swaying in its sagittal plane.
+
+    Angles are measured from straight down, positive towards the opponent.
+    """
+
+    t = 0.08 * step + phase
+    lean = 0.25 + 0.15 * math.sin(t)
+    angles = {
+        "chest": math.pi - lean,
+        "head": math.pi - lean,
+        "left_elbow": 0.9 + 0.5 * math.sin(t),
+        "left_hand": 1.4 + 0.3 * math.sin(t + 0.6),
+        "right_elbow": 0.9 + 0.5 * math.sin(t + math.pi),
+        "right_hand": 1.4 + 0.3 * math.sin(t + math.pi + 0.6),
+        "left_knee": 0.35 + 0.2 * math.sin(t + 0.4),
+        "left_foot": -0.1,
+        "right_knee": -0.2 + 0.2 * math.sin(t + 0.4 + math.pi),
+        "right_foot": -0.25,
+    }
+    lateral = {"left": -facing, "right": facing}
+    positions: list[Vec3] = []
+    for name, parent in zip(HUMANOID.links, HUMANOID.parents, strict=True):
+        if parent == -1:
+            positions.append((origin_x, 0.0, _PELVIS_HEIGHT))
+            continue
+        px, py, pz = positions[parent]
+        if name.endswith(("_shoulder", "_hip")):
+            side, _ = name.split("_")
+            half_width = _SHOULDER_HALF_WIDTH if name.endswith("_shoulder") else _HIP_HALF_WIDTH
+            positions.append((px, py + lateral[side] * half_width, pz))
+            continue
+        angle, length = angles[name], _BONES[name]
+        positions.append(
+            (
+                px + facing * length * math.sin(angle),
+                py,
+                pz - length * math.cos(angle),
+            )
+        )
+    return positions
+
+
+def _bone_orientations(positions: list[Vec3], facing: float) -> tuple[Quat, ...]:
+    # Each link's frame points its -z axis along the bone from its parent.
+    orientations: list[Quat] = []
+    for idx, parent in enumerate(HUMANOID.parents):
+        if parent == -1:
+            orientations.append(_quat_about_y(0.0 if facing > 0 else math.pi))
+            continue
+        dx = positions[idx][0] - positions[parent][0]
+        dz = positions[idx][2] - positions[parent][2]
+        if dx == 0.0 and dz == 0.0:
+            orientations.append(orientations[parent])
+            continue
+        orientations.append(_quat_about_y(math.atan2(-dx, -dz)))
+    return tuple(orientations)
+
+
+def find_contacts(
+    positions: tuple[tuple[Vec3, ...], ...], distance: float = CONTACT_DISTANCE
+) -> tuple[ContactPair, ...]:
+    """Link pairs of different agents whose origins are within ``distance``."""
+
+    limit = distance * distance
+    contacts: list[ContactPair] = []
+    for agent_a, links_a in enumerate(positions):
+        for agent_b in range(agent_a + 1, len(positions)):
+            for link_a, (ax, ay, az) in enumerate(links_a):
+                for link_b, (bx, by, bz) in enumerate(positions[agent_b]):
+                    if (ax - bx) ** 2 + (ay - by) ** 2 + (az - bz) ** 2 <= limit:
+                        contacts.append((agent_a, link_a, agent_b, link_b))
+    return tuple(contacts)
+
+
+def scripted_poses(step: int, seed: int | None = None) -> PoseFrame:
+    """Deterministic two-figure :data:`HUMANOID` poses for ``step``.
+
+    Stands in for real physics so clients can be built and tested against
+    the pose stream; ``seed`` offsets the figures' sway.
+    """
+
+    phase = 0.0 if seed is None else (seed % 360) * math.pi / 180
+    figures = [
+        (_scripted_agent(step, phase, facing, -facing * _STANCE_OFFSET), facing)
+        for facing in (1.0, -1.0)
+    ]
+    positions = tuple(tuple(links) for links, _ in figures)
+    return PoseFrame(
+        positions=positions,
+        orientations=tuple(_bone_orientations(links, facing) for links, facing in figures),
+        contacts=find_contacts(positions),
+    )
+
+
+__all__ = [
+    "CONTACT_DISTANCE",
+    "HUMANOID",
+    "ContactPair",
+    "PoseFrame",
+    "Quat",
+    "Skeleton",
+    "SupportsPoses",
+    "Vec3",
+    "find_contacts",
+    "scripted_poses",
+]
@@ -0,0 +1,19 @@
+"""Recorded episodes: on-disk trajectories and offline rendering.
+
+Rendering lives in :mod:`bjjsim.replay.render` and imports Pillow on first use.
+"""
+
+from __future__ import annotations
+
+from .store import ReplayNotFoundError, ReplayStore
+from .trajectory import FIELDS, FieldSpec, Trajectory, TrajectoryWriter, record_episode
+
+__all__ = [
+    "FIELDS",
+    "FieldSpec",
+    "ReplayNotFoundError",
+    "ReplayStore",
+    "Trajectory",
+    "TrajectoryWriter",
+    "record_episode",
+]
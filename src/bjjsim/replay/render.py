@@ -0,0 +1,479 @@
+"""Parallel offline rendering of recorded trajectories to video.
+
+Frames are drawn by a process pool.  Each worker keeps one palette-mode
+canvas per resolution and one memory-mapped :class:`Trajectory` open, and
+returns frames as raw palette indices (one byte per pixel), which keeps the
+data shipped between processes small.  The parent writes frames to the
+output as they arrive, in order, with only a bounded number of chunks in
+flight, so an episode is never held in memory as a whole.
+
+Output formats:
+
+- ``apng``: animated PNG, encoded incrementally (frame count is known up front).
+- ``gif``: animated GIF; every frame shares the fixed :data:`PALETTE`, so
+  frames are appended without re-quantizing.
+- ``png-frames``: a directory of ``frame_000000.png`` files.
+- ``raw``: headerless ``rgb24`` bytes, e.g. for piping into ``ffmpeg -f rawvideo``.
+
+Run as::
+
+    python -m bjjsim.replay.render TRAJECTORY_DIR... --output-dir videos [--format gif]
+        [--size 160x120] [--frame-step 2] [--workers 4]
+
+Needs Pillow for drawing; imported on first use.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Final, Literal, Protocol
+
+import numpy as np
+
+from bjjsim.replay.trajectory import Trajectory
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+VideoFormat = Literal["apng", "gif", "png-frames", "raw"]
+
+FORMATS: Final[tuple[VideoFormat, ...]] = ("apng", "gif", "png-frames", "raw")
+SUFFIXES: Final[dict[VideoFormat, str]] = {
+    "apng": ".png",
+    "gif": ".gif",
+    "png-frames": "",
+    "raw": ".rgb",
+}
+
+# Fixed palette shared by every frame: background, text, axis, bar track,
+# then one colour per agent (cycled for more agents).
+PALETTE: Final[tuple[tuple[int, int, int], ...]] = (
+    (255, 255, 255),
+    (0, 0, 0),
+    (128, 128, 128),
+    (225, 225, 225),
+    (31, 119, 180),
+    (214, 39, 40),
+    (44, 160, 44),
+    (255, 127, 14),
+)
+_BACKGROUND, _TEXT, _AXIS, _TRACK = 0, 1, 2, 3
+_AGENT_COLORS: Final[tuple[int, ...]] = (4, 5, 6, 7)
+_PALETTE_BYTES: Final[bytes] = bytes(c for rgb in PALETTE for c in rgb)
+_PNG_SIGNATURE: Final[bytes] = b"\x89PNG\r\n\x1a\n"
+
+
+@dataclass(slots=True, frozen=True)
+class RenderOptions:
+    width: int = 320
+    height: int = 240
+    frame_step: int = 1  # render every n-th recorded frame
+    start: int = 0
+    stop: int | None = None
+    fps: int = 15
+    chunk_size: int = 16  # frames per worker task
+
+    def __post_init__(self) -> None:
+        if self.width < 16 or self.height < 16:
+            msg = "width and height must be at least 16 pixels"
+            raise ValueError(msg)
+        if self.frame_step < 1 or self.chunk_size < 1:
+            msg = "frame_step and chunk_size must be at least 1"
+            raise ValueError(msg)
+        if not 1 <= self.fps <= 1000:
+            msg = "fps must lie in [1, 1000]"
+            raise ValueError(msg)
+
+    def frame_indices(self, num_frames: int) -> range:
+        stop = num_frames if self.stop is None else min(self.stop, num_frames)
+        return range(max(0, self.start), stop, self.frame_step)
+
+
+@dataclass(slots=True)
+class RenderResult:
+    trajectory: str
+    output: str
+    frames: int
+    seconds: float
+
+
+class FrameCanvas:
+    """Palette-mode image reused for every frame of one resolution."""
+
+    def __init__(self, width: int, height: int) -> None:
+        from PIL import Image, ImageDraw, ImageFont
+
+        self.width, self.height = width, height
+        self.image = Image.new("P", (width, height), _BACKGROUND)
+        self.image.putpalette(_PALETTE_BYTES)
+        self.draw = ImageDraw.Draw(self.image)
+        self.font = ImageFont.load_default()
+
+    def render(self, trajectory: Trajectory, index: int, cumulative_reward: np.ndarray) -> bytes:
+        """Draw frame ``index`` and return it as palette indices, row-major."""
+
+        draw, w, h = self.draw, self.width, self.height
+        draw.rectangle((0, 0, w, h), fill=_BACKGROUND)
+        physics_step = int(trajectory.physics_steps[index])
+        draw.text(
+            (4, 2),
+            f"{trajectory.trajectory_id}  frame {index}/{len(trajectory) - 1}  phys {physics_step}",
+            fill=_TEXT,
+            font=self.font,
+        )
+
+        actions = trajectory.actions[index]
+        num_agents, action_dim = actions.shape
+        column = w / num_agents
+        top = 16
+        bar_area = max(1, h - top - 18)
+        bar_h = max(1, min(10, bar_area // max(1, action_dim) - 2))
+        for a, agent in enumerate(trajectory.agents):
+            color = _AGENT_COLORS[a % len(_AGENT_COLORS)]
+            x0, x1 = int(a * column) + 4, int((a + 1) * column) - 4
+            mid = (x0 + x1) // 2
+            half = max(1, (x1 - x0) // 2)
+            draw.text(
+                (x0, top),
+                f"{agent} R={float(cumulative_reward[a]):.2f}",
+                fill=color,
+                font=self.font,
+            )
+            for j in range(action_dim):
+                y = top + 14 + j * (bar_h + 2)
+                if y + bar_h > h:
+                    break
+                draw.rectangle((x0, y, x1, y + bar_h), fill=_TRACK)
+                value = float(np.clip(actions[a, j], -1.0, 1.0))
+                end = mid + int(value * half)
+                draw.rectangle((min(mid, end), y, max(mid, end), y + bar_h), fill=color)
+                draw.line((mid, y, mid, y + bar_h), fill=_AXIS)
+        return self.image.tobytes()
+
+
+# Per-process caches for pool workers (and the inline path).
+_canvases: dict[tuple[int, int], FrameCanvas] = {}
+_open_trajectory: Trajectory | None = None
+
+
+def _trajectory(path: str) -> Trajectory:
+    global _open_trajectory
+    if _open_trajectory is None or str(_open_trajectory.path) != path:
+        _open_trajectory = Trajectory(path)
+    return _open_trajectory
+
+
+def _render_chunk(path: str, width: int, height: int, indices: Sequence[int]) -> list[bytes]:
+    canvas = _canvases.get((width, height))
+    if canvas is None:
+        canvas = _canvases[(width, height)] = FrameCanvas(width, height)
+    trajectory = _trajectory(path)
+    rewards = trajectory.rewards
+    cumulative = rewards[: indices[0] + 1].sum(axis=0, dtype=np.float64)
+    frames: list[bytes] = []
+    previous = indices[0]
+    for index in indices:
+        if index > previous:
+            cumulative += rewards[previous + 1 : index + 1].sum(axis=0, dtype=np.float64)
+            previous = index
+        frames.append(canvas.render(trajectory, index, cumulative))
+    return frames
+
+
+class FrameSink(Protocol):
+    def write(self, frame: bytes) -> None: ...
+
+    def close(self) -> None: ...
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def _png_image_data(frame: bytes, width: int, height: int) -> bytes:
+    # Filter type 0 (None) per scanline; palette indices compress well as-is.
+    rows = (b"\x00" + frame[y * width : (y + 1) * width] for y in range(height))
+    return zlib.compress(b"".join(rows), 6)
+
+
+def _png_header(width: int, height: int) -> bytes:
+    return _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0))
+
+
+class ApngWriter:
+    """Streaming animated PNG encoder for palette frames."""
+
+    def __init__(
+        self, path: str | os.PathLike[str], width: int, height: int, num_frames: int, *, fps: int
+    ) -> None:
+        if num_frames < 1:
+            msg = "an animated PNG needs at least one frame"
+            raise ValueError(msg)
+        self.width, self.height, self.num_frames, self.fps = width, height, num_frames, fps
+        self._fp: IO[bytes] = open(path, "wb")
+        self._fp.write(_PNG_SIGNATURE)
+        self._fp.write(_png_header(width, height))
+        self._fp.write(_png_chunk(b"acTL", struct.pack(">II", num_frames, 0)))
+        self._fp.write(_png_chunk(b"PLTE", _PALETTE_BYTES))
+        self._frames = 0
+        self._sequence = 0
+
+    def write(self, frame: bytes) -> None:
+        if self._frames >= self.num_frames:
+            msg = "more frames written than declared"
+            raise ValueError(msg)
+        fctl = struct.pack(
+            ">IIIIIHHBB", self._sequence, self.width, self.height, 0, 0, 1, self.fps, 0, 0
+        )
+        self._fp.write(_png_chunk(b"fcTL", fctl))
+        self._sequence += 1
+        data = _png_image_data(frame, self.width, self.height)
+        if self._frames == 0:
+            self._fp.write(_png_chunk(b"IDAT", data))
+        else:
+            self._fp.write(_png_chunk(b"fdAT", struct.pack(">I", self._sequence) + data))
+            self._sequence += 1
+        self._frames += 1
+
+    def close(self) -> None:
+        if self._fp.closed:
+            return
+        self._fp.write(_png_chunk(b"IEND", b""))
+        self._fp.close()
+        if self._frames != self.num_frames:
+            msg = f"declared {self.num_frames} frames but wrote {self._frames}"
+            raise ValueError(msg)
+
+
+class GifWriter:
+    """Streaming animated GIF writer; relies on all frames sharing :data:`PALETTE`."""
+
+    def __init__(self, path: str | os.PathLike[str], width: int, height: int, *, fps: int) -> None:
+        self.width, self.height = width, height
+        self.duration_ms = max(20, round(1000 / fps))
+        self._fp: IO[bytes] = open(path, "wb")
+        self._started = False
+
+    def _image(self, frame: bytes) -> Image.Image:
+        from PIL import Image
+
+        image = Image.frombytes("P", (self.width, self.height), frame)
+        image.putpalette(_PALETTE_BYTES)
+        return image
+
+    def write(self, frame: bytes) -> None:
+        from PIL import GifImagePlugin
+
+        image = self._image(frame)
+        if not self._started:
+            header, _ = GifImagePlugin.getheader(image, None, {"loop": 0})
+            self._fp.writelines(header)
+            self._started = True
+        self._fp.writelines(GifImagePlugin.getdata(image, duration=self.duration_ms))
+
+    def close(self) -> None:
+        if not self._fp.closed:
+            self._fp.write(b";")
+            self._fp.close()
+
+
+class PngFramesWriter:
+    """One PNG file per frame in a directory."""
+
+    def __init__(self, directory: str | os.PathLike[str], width: int, height: int) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.width, self.height = width, height
+        self._count = 0
+
+    def write(self, frame: bytes) -> None:
+        png = (
+            _PNG_SIGNATURE
+            + _png_header(self.width, self.height)
+            + _png_chunk(b"PLTE", _PALETTE_BYTES)
+            + _png_chunk(b"IDAT", _png_image_data(frame, self.width, self.height))
+            + _png_chunk(b"IEND", b"")
+        )
+        (self.directory / f"frame_{self._count:06d}.png").write_bytes(png)
+        self._count += 1
+
+    def close(self) -> None:
+        return None
+
+
+class RawRgbWriter:
+    """Headerless ``rgb24`` frames, e.g. for ``ffmpeg -f rawvideo -pix_fmt rgb24``."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._lut = np.frombuffer(_PALETTE_BYTES, dtype=np.uint8).reshape(-1, 3)
+        self._fp: IO[bytes] = open(path, "wb")
+
+    def write(self, frame: bytes) -> None:
+        self._fp.write(self._lut[np.frombuffer(frame, dtype=np.uint8)].tobytes())
+
+    def close(self) -> None:
+        self._fp.close()
+
+
+def open_sink(
+    fmt: VideoFormat, output: str | os.PathLike[str], options: RenderOptions, num_frames: int
+) -> FrameSink:
+    if fmt == "apng":
+        return ApngWriter(output, options.width, options.height, num_frames, fps=options.fps)
+    if fmt == "gif":
+        return GifWriter(output, options.width, options.height, fps=options.fps)
+    if fmt == "png-frames":
+        return PngFramesWriter(output, options.width, options.height)
+    if fmt == "raw":
+        return RawRgbWriter(output)
+    msg = f"unknown video format {fmt!r}"
+    raise ValueError(msg)
+
+
+def _chunks(indices: range, size: int) -> Iterator[range]:
+    for start in range(0, len(indices), size):
+        yield indices[start : start + size]
+
+
+def _ordered_frames(
+    executor: Executor | None, path: str, options: RenderOptions, indices: range, max_in_flight: int
+) -> Iterator[bytes]:
+    """Yield rendered frames in order, keeping at most ``max_in_flight`` chunks queued."""
+
+    chunks = _chunks(indices, options.chunk_size)
+    if executor is None:
+        for chunk in chunks:
+            yield from _render_chunk(path, options.width, options.height, chunk)
+        return
+    pending: deque[Future[list[bytes]]] = deque()
+    for chunk in chunks:
+        pending.append(
+            executor.submit(_render_chunk, path, options.width, options.height, list(chunk))
+        )
+        if len(pending) >= max_in_flight:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+class TrajectoryRenderer:
+    """Render trajectories with a process pool that is reused across episodes.
+
+    ``workers=0`` renders in the calling process.  Use as a context manager
+    (or call :meth:`close`) to shut the pool down.
+    """
+
+    def __init__(self, options: RenderOptions | None = None, *, workers: int | None = None) -> None:
+        self.options = options or RenderOptions()
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self._executor: ProcessPoolExecutor | None = (
+            ProcessPoolExecutor(max_workers=self.workers) if self.workers > 0 else None
+        )
+
+    def render(
+        self,
+        trajectory: str | os.PathLike[str] | Trajectory,
+        output: str | os.PathLike[str],
+        *,
+        fmt: VideoFormat = "apng",
+    ) -> RenderResult:
+        started = time.perf_counter()
+        traj = trajectory if isinstance(trajectory, Trajectory) else Trajectory(trajectory)
+        indices = self.options.frame_indices(len(traj))
+        sink = open_sink(fmt, output, self.options, len(indices))
+        try:
+            for frame in _ordered_frames(
+                self._executor,
+                str(traj.path),
+                self.options,
+                indices,
+                max_in_flight=2 * max(1, self.workers),
+            ):
+                sink.write(frame)
+        finally:
+            sink.close()
+        return RenderResult(
+            str(traj.path), str(output), len(indices), time.perf_counter() - started
+        )
+
+    def render_many(
+        self,
+        trajectories: Iterable[str | os.PathLike[str]],
+        output_dir: str | os.PathLike[str],
+        *,
+        fmt: VideoFormat = "apng",
+    ) -> Iterator[RenderResult]:
+        """Render each trajectory to ``output_dir/<trajectory id><suffix>``."""
+
+        out = Path(output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        for path in trajectories:
+            traj = Trajectory(path)
+            yield self.render(traj, out / f"{traj.trajectory_id}{SUFFIXES[fmt]}", fmt=fmt)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> TrajectoryRenderer:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def _parse_size(value: str) -> tuple[int, int]:
+    width, _, height = value.lower().partition("x")
+    return int(width), int(height)
+
+
+def main(argv: list[str] | None = None) -> int:
+    import json
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("trajectories", nargs="+", type=Path)
+    parser.add_argument("--output-dir", type=Path, required=True)
+    parser.add_argument("--format", choices=FORMATS, default="apng")
+    parser.add_argument("--size", type=_parse_size, default=(320, 240), help="WIDTHxHEIGHT")
+    parser.add_argument("--frame-step", type=int, default=1)
+    parser.add_argument("--fps", type=int, default=15)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    width, height = args.size
+    options = RenderOptions(width=width, height=height, frame_step=args.frame_step, fps=args.fps)
+    results: list[dict[str, Any]] = []
+    with TrajectoryRenderer(options, workers=args.workers) as renderer:
+        for result in renderer.render_many(args.trajectories, args.output_dir, fmt=args.format):
+            results.append(asdict(result))
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+__all__ = [
+    "FORMATS",
+    "PALETTE",
+    "ApngWriter",
+    "FrameCanvas",
+    "FrameSink",
+    "GifWriter",
+    "PngFramesWriter",
+    "RawRgbWriter",
+    "RenderOptions",
+    "RenderResult",
+    "TrajectoryRenderer",
+    "open_sink",
+]
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry
+    raise SystemExit(main())
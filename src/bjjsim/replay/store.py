@@ -0,0 +1,72 @@
+"""Directory of recorded trajectories with a bounded cache of open memory maps."""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Final
+
+from bjjsim.replay.trajectory import META_FILENAME, Trajectory
+
+_REPLAY_ID: Final[re.Pattern[str]] = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,127}$")
+
+
+class ReplayNotFoundError(KeyError):
+    """Raised when a replay ID is malformed or has no complete trajectory."""
+
+
+class ReplayStore:
+    """Look up trajectories under ``root`` by directory name.
+
+    Opened trajectories stay in an LRU of ``cache_size`` entries so repeated
+    requests reuse the same memory maps; only the pages a request touches are
+    read from disk.  IDs are restricted to plain directory names, so a
+    request cannot escape ``root``.
+    """
+
+    def __init__(self, root: str | os.PathLike[str], *, cache_size: int = 16) -> None:
+        if cache_size < 1:
+            msg = "cache_size must be at least 1"
+            raise ValueError(msg)
+        self.root = Path(root)
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, Trajectory] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def replay_ids(self) -> list[str]:
+        """IDs of complete trajectories, sorted by name."""
+
+        if not self.root.is_dir():
+            return []
+        return sorted(
+            entry.name
+            for entry in self.root.iterdir()
+            if _REPLAY_ID.match(entry.name) and (entry / META_FILENAME).is_file()
+        )
+
+    def open(self, replay_id: str) -> Trajectory:
+        if not _REPLAY_ID.match(replay_id):
+            raise ReplayNotFoundError(replay_id)
+        with self._lock:
+            cached = self._cache.get(replay_id)
+            if cached is not None:
+                self._cache.move_to_end(replay_id)
+                return cached
+        try:
+            trajectory = Trajectory(self.root / replay_id)
+        except FileNotFoundError as exc:
+            raise ReplayNotFoundError(replay_id) from exc
+        with self._lock:
+            self._cache[replay_id] = trajectory
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return trajectory
+
+
+__all__ = [
+    "ReplayNotFoundError",
+    "ReplayStore",
+]
@@ -0,0 +1,251 @@
+"""On-disk trajectory format for recorded episodes.
+
+A trajectory is a directory holding one raw little-endian array file per
+field plus a ``meta.json`` describing dtypes and shapes:
+
+- ``observations.bin``: ``float32`` ``(num_frames, num_agents, observation_dim)``
+- ``actions.bin``: ``float32`` ``(num_frames, num_agents, action_dim)``
+- ``rewards.bin``: ``float32`` ``(num_frames, num_agents)``
+- ``physics_steps.bin``: ``int64`` ``(num_frames,)``
+
+Frame 0 is the reset observation (with zero actions and rewards); frame
+``i`` is the state after the ``i``-th step.  Fields have no header, so frame
+``i`` of a field starts at byte ``i * frame_nbytes(field)`` — readers can
+memory-map a file or fetch a byte range for any frame in O(1).  ``meta.json``
+is written last, so a directory without it is an incomplete recording.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Final, Self
+
+import numpy as np
+import numpy.typing as npt
+
+from bjjsim.env import BJJMultiAgentEnv
+
+FORMAT_VERSION: Final[int] = 1
+META_FILENAME: Final[str] = "meta.json"
+FIELDS: Final[tuple[str, ...]] = ("observations", "actions", "rewards", "physics_steps")
+
+type ActionFn = Callable[[npt.NDArray[np.float32]], npt.ArrayLike]
+
+
+@dataclass(slots=True, frozen=True)
+class FieldSpec:
+    dtype: str
+    frame_shape: tuple[int, ...]
+
+    @property
+    def frame_nbytes(self) -> int:
+        return int(np.dtype(self.dtype).itemsize * np.prod(self.frame_shape, dtype=np.int64))
+
+
+def _field_specs(num_agents: int, observation_dim: int, action_dim: int) -> dict[str, FieldSpec]:
+    return {
+        "observations": FieldSpec("<f4", (num_agents, observation_dim)),
+        "actions": FieldSpec("<f4", (num_agents, action_dim)),
+        "rewards": FieldSpec("<f4", (num_agents,)),
+        "physics_steps": FieldSpec("<i8", ()),
+    }
+
+
+class TrajectoryWriter:
+    """Append frames to a trajectory directory without buffering the episode.
+
+    Use as a context manager; :meth:`close` writes ``meta.json``.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        agents: Sequence[str],
+        observation_dim: int,
+        action_dim: int,
+        *,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        self.path = Path(path)
+        if (self.path / META_FILENAME).exists():
+            msg = f"trajectory {self.path} already exists"
+            raise FileExistsError(msg)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.agents: tuple[str, ...] = tuple(agents)
+        self.metadata = dict(metadata or {})
+        self.specs = _field_specs(len(self.agents), observation_dim, action_dim)
+        self._files = {name: open(self.path / f"{name}.bin", "wb") for name in FIELDS}
+        self.num_frames = 0
+        self.closed = False
+
+    def append(
+        self,
+        observations: npt.ArrayLike,
+        actions: npt.ArrayLike,
+        rewards: npt.ArrayLike,
+        physics_step: int,
+    ) -> None:
+        values = {
+            "observations": observations,
+            "actions": actions,
+            "rewards": rewards,
+            "physics_steps": physics_step,
+        }
+        for name, value in values.items():
+            spec = self.specs[name]
+            row = np.asarray(value, dtype=spec.dtype)
+            if row.shape != spec.frame_shape:
+                msg = f"{name} frame has shape {row.shape}, expected {spec.frame_shape}"
+                raise ValueError(msg)
+            self._files[name].write(row.tobytes())
+        self.num_frames += 1
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        for handle in self._files.values():
+            handle.close()
+        meta = {
+            "version": FORMAT_VERSION,
+            "agents": list(self.agents),
+            "num_frames": self.num_frames,
+            "fields": {
+                name: {"dtype": spec.dtype, "frame_shape": list(spec.frame_shape)}
+                for name, spec in self.specs.items()
+            },
+            "metadata": self.metadata,
+        }
+        tmp = self.path / f".{META_FILENAME}.tmp"
+        tmp.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path / META_FILENAME)
+        self.closed = True
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class Trajectory:
+    """Read-only, memory-mapped view of a recorded trajectory."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        meta_path = self.path / META_FILENAME
+        if not meta_path.exists():
+            msg = f"no complete trajectory at {self.path}"
+            raise FileNotFoundError(msg)
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("version") != FORMAT_VERSION:
+            msg = f"unsupported trajectory format version {meta.get('version')!r}"
+            raise ValueError(msg)
+        self.agents: tuple[str, ...] = tuple(meta["agents"])
+        self.num_frames: int = int(meta["num_frames"])
+        self.metadata: dict[str, Any] = dict(meta.get("metadata", {}))
+        self.specs = {
+            name: FieldSpec(str(spec["dtype"]), tuple(int(d) for d in spec["frame_shape"]))
+            for name, spec in meta["fields"].items()
+        }
+        self._arrays: dict[str, npt.NDArray[Any]] = {}
+
+    def __len__(self) -> int:
+        return self.num_frames
+
+    @property
+    def trajectory_id(self) -> str:
+        return self.path.name
+
+    def field_path(self, name: str) -> Path:
+        if name not in self.specs:
+            raise KeyError(name)
+        return self.path / f"{name}.bin"
+
+    def frame_nbytes(self, name: str) -> int:
+        return self.specs[name].frame_nbytes
+
+    def array(self, name: str) -> npt.NDArray[Any]:
+        """Memory-map field ``name`` shaped ``(num_frames, *frame_shape)``."""
+
+        arr = self._arrays.get(name)
+        if arr is None:
+            spec = self.specs[name]
+            shape = (self.num_frames, *spec.frame_shape)
+            if self.num_frames == 0:
+                arr = np.zeros(shape, dtype=spec.dtype)
+            else:
+                arr = np.memmap(self.field_path(name), dtype=spec.dtype, mode="r", shape=shape)
+            self._arrays[name] = arr
+        return arr
+
+    @property
+    def observations(self) -> npt.NDArray[np.float32]:
+        return self.array("observations")
+
+    @property
+    def actions(self) -> npt.NDArray[np.float32]:
+        return self.array("actions")
+
+    @property
+    def rewards(self) -> npt.NDArray[np.float32]:
+        return self.array("rewards")
+
+    @property
+    def physics_steps(self) -> npt.NDArray[np.int64]:
+        return self.array("physics_steps")
+
+
+def record_episode(
+    env: BJJMultiAgentEnv,
+    path: str | os.PathLike[str],
+    *,
+    seed: int | None = None,
+    action_fn: ActionFn | None = None,
+    max_steps: int | None = None,
+) -> Trajectory:
+    """Run one episode on ``env`` and record it to ``path``.
+
+    ``action_fn`` maps the ``(num_agents, observation_dim)`` observation block
+    to a ``(num_agents, action_dim)`` action block; zeros are used without
+    one.
+    """
+
+    num_agents, config = len(env.agents), env.config
+    obs = np.zeros((num_agents, config.observation_dim), dtype=np.float32)
+    rewards = np.zeros(num_agents, dtype=np.float32)
+    actions = np.zeros((num_agents, config.action_dim), dtype=np.float32)
+    info = env.reset_arrays(obs, seed=seed)
+    metadata = {"seed": env.last_seed, "max_episode_steps": config.max_episode_steps}
+    with TrajectoryWriter(
+        path, env.agents, config.observation_dim, config.action_dim, metadata=metadata
+    ) as writer:
+        writer.append(obs, actions, rewards, int(info["physics_step"]))
+        steps = 0
+        while max_steps is None or steps < max_steps:
+            if action_fn is not None:
+                actions[...] = action_fn(obs)
+            terminated, truncated, info = env.step_arrays(actions, obs, rewards)
+            writer.append(obs, actions, rewards, int(info["physics_step"]))
+            steps += 1
+            if terminated or truncated:
+                break
+    return Trajectory(path)
+
+
+__all__ = [
+    "FIELDS",
+    "FieldSpec",
+    "Trajectory",
+    "TrajectoryWriter",
+    "record_episode",
+]
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from .checkpoint import Checkpoint, CheckpointCorruptError, CheckpointManager
+from .eval_cache import EvaluationCache, evaluation_key, physics_fingerprint, policy_digest
+from .inference import InferenceServer, PolicyAdapter
+from .opponents import OpponentPool, PolicySnapshot, SamplingScheme, SnapshotStats
+from .policy import MLPPolicy
+from .rollout import MiniBatch, RolloutBuffer
+from .telemetry import RewardTelemetry
+from .tournament import (
+    EloRatings,
+    MatchResult,
+    MatchSpec,
+    Standing,
+    Tournament,
+    TrueSkillRatings,
+    play_match,
+)
+
+__all__ = [
+    "Checkpoint",
+    "CheckpointCorruptError",
+    "CheckpointManager",
+    "EloRatings",
+    "EvaluationCache",
+    "InferenceServer",
+    "MLPPolicy",
+    "MatchResult",
+    "MatchSpec",
+    "MiniBatch",
+    "OpponentPool",
+    "PolicyAdapter",
+    "PolicySnapshot",
+    "RewardTelemetry",
+    "RolloutBuffer",
+    "SamplingScheme",
+    "SnapshotStats",
+    "Standing",
+    "Tournament",
+    "TrueSkillRatings",
+    "evaluation_key",
+    "physics_fingerprint",
+    "play_match",
+    "policy_digest",
+]
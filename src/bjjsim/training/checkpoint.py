@@ -0,0 +1,406 @@
+"""Asynchronous, atomic checkpoints of env, normalizer and policy state.
+
+:meth:`CheckpointManager.save` only copies the in-memory state (env RNGs and
+counters, physics state, normalizer statistics, policy arrays and any extra
+arrays) and returns; a background thread writes it out, so a collection
+loop can checkpoint every few hundred steps without stalling on disk I/O.
+
+Each checkpoint is a directory ``ckpt-<step>``:
+
+* one ``.npy`` file per array, named ``00000.npy``, ``00001.npy``, ... and
+  loaded with ``mmap_mode="r"``, so opening a checkpoint reads no array data
+  until it is touched;
+* ``manifest.json`` with the nested state, in which arrays are
+  ``{"__array__": "<file>"}`` references, plus the SHA-256 and size of every
+  array file.
+
+The directory is assembled under a hidden temporary name, fsynced and then
+renamed into place, so readers (and a crashed run being resumed) see whole
+checkpoints or none.  :meth:`Checkpoint.verify` checks the checksums.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Final, Protocol, Self
+
+import numpy as np
+import numpy.typing as npt
+
+from bjjsim.env import BJJMultiAgentEnv
+from bjjsim.training.policy import MLPPolicy
+
+CHECKPOINT_VERSION: Final[int] = 1
+MANIFEST_FILENAME: Final[str] = "manifest.json"
+
+_CHECKPOINT_DIR: Final[re.Pattern[str]] = re.compile(r"^ckpt-(\d{10})$")
+_TMP_PREFIX: Final[str] = ".ckpt-"
+_ARRAY_KEY: Final[str] = "__array__"
+_HASH_CHUNK: Final[int] = 1 << 20
+
+
+class CheckpointCorruptError(ValueError):
+    """Raised when a checkpoint's manifest or array files fail validation."""
+
+
+class _ArrayStateful(Protocol):
+    def state_dict(self) -> Mapping[str, npt.NDArray[Any]]: ...
+
+    def load_state_dict(self, state: Mapping[str, npt.ArrayLike]) -> None: ...
+
+
+def _snapshot(value: object) -> object:
+    """Deep-copy ``value`` so later mutations cannot reach the writer thread."""
+
+    if isinstance(value, np.ndarray):
+        return np.array(value, copy=True, order="C")
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, Mapping):
+        return {str(key): _snapshot(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return [_snapshot(item) for item in value]
+    if value is None or isinstance(value, bool | int | float | str):
+        return value
+    msg = f"cannot checkpoint values of type {type(value).__name__}"
+    raise TypeError(msg)
+
+
+class _HashingWriter:
+    """File wrapper that hashes everything written through it."""
+
+    def __init__(self, handle: BinaryIO) -> None:
+        self._handle = handle
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.digest.update(data)
+        self.size += len(data)
+        return self._handle.write(data)
+
+
+def _fsync_dir(path: Path) -> None:
+    if os.name == "nt":
+        # Directories cannot be opened for fsync on Windows; NTFS journals
+        # the rename itself.
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _discard(path: Path) -> bool:
+    """Move ``path`` out of the checkpoint namespace, then delete it.
+
+    The rename is atomic, so a deletion that stops halfway (a file still
+    mapped by a reader on Windows, say) leaves a hidden temporary directory
+    for the next :class:`CheckpointManager` to clean up rather than a
+    ``ckpt-*`` directory with missing arrays.  Returns ``False`` if the
+    rename itself failed and ``path`` is untouched.
+    """
+
+    trash = path.with_name(f"{_TMP_PREFIX}{path.name}-{os.urandom(4).hex()}")
+    try:
+        os.rename(path, trash)
+    except OSError:
+        return False
+    shutil.rmtree(trash, ignore_errors=True)
+    return True
+
+
+def _write_checkpoint(root: Path, step: int, state: dict[str, Any]) -> Path:
+    tmp = Path(tempfile.mkdtemp(prefix=f"{_TMP_PREFIX}{step:010d}-", dir=root))
+    try:
+        files: dict[str, dict[str, Any]] = {}
+
+        def encode(value: object) -> object:
+            if isinstance(value, np.ndarray):
+                name = f"{len(files):05d}.npy"
+                with open(tmp / name, "wb") as handle:
+                    writer = _HashingWriter(handle)
+                    np.lib.format.write_array(writer, value, allow_pickle=False)  # type: ignore[no-untyped-call, unused-ignore]
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                files[name] = {"sha256": writer.digest.hexdigest(), "bytes": writer.size}
+                return {_ARRAY_KEY: name}
+            if isinstance(value, dict):
+                return {key: encode(item) for key, item in value.items()}
+            if isinstance(value, list):
+                return [encode(item) for item in value]
+            return value
+
+        manifest = {
+            "version": CHECKPOINT_VERSION,
+            "step": step,
+            "created": time.time(),
+            "state": encode(state),
+            "files": files,
+        }
+        with open(tmp / MANIFEST_FILENAME, "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, sort_keys=True)
+            handle.flush()
+            os.fsync(handle.fileno())
+        _fsync_dir(tmp)
+        final = root / f"ckpt-{step:010d}"
+        if final.exists() and not _discard(final):
+            msg = f"cannot replace existing checkpoint {final}"
+            raise OSError(msg)
+        os.rename(tmp, final)
+        _fsync_dir(root)
+        return final
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+
+class Checkpoint:
+    """A saved checkpoint; array data is memory-mapped on first access."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        try:
+            manifest = json.loads((self.path / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            msg = f"{self.path} has no readable manifest"
+            raise CheckpointCorruptError(msg) from exc
+        if manifest.get("version") != CHECKPOINT_VERSION:
+            msg = f"{self.path} has unsupported checkpoint version {manifest.get('version')!r}"
+            raise CheckpointCorruptError(msg)
+        self.step: int = manifest["step"]
+        self.created: float = manifest["created"]
+        self.files: dict[str, dict[str, Any]] = manifest["files"]
+        self._encoded: dict[str, Any] = manifest["state"]
+        self._arrays: dict[str, npt.NDArray[Any]] = {}
+
+    def __repr__(self) -> str:
+        return f"Checkpoint(step={self.step}, path={str(self.path)!r})"
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._encoded
+
+    def __getitem__(self, key: str) -> dict[str, Any]:
+        """Top-level state entry with arrays resolved to read-only memory maps."""
+
+        value = self._decode(self._encoded[key])
+        if not isinstance(value, dict):
+            msg = f"{self.path} entry {key!r} is not a mapping"
+            raise CheckpointCorruptError(msg)
+        return value
+
+    def keys(self) -> list[str]:
+        return list(self._encoded)
+
+    def array(self, name: str) -> npt.NDArray[Any]:
+        if name not in self.files:
+            msg = f"{self.path} has no array file {name!r}"
+            raise CheckpointCorruptError(msg)
+        if name not in self._arrays:
+            self._arrays[name] = np.load(self.path / name, mmap_mode="r", allow_pickle=False)
+        return self._arrays[name]
+
+    def verify(self) -> None:
+        """Check every array file against its recorded size and SHA-256."""
+
+        for name, expected in self.files.items():
+            digest = hashlib.sha256()
+            size = 0
+            try:
+                with open(self.path / name, "rb") as handle:
+                    while chunk := handle.read(_HASH_CHUNK):
+                        digest.update(chunk)
+                        size += len(chunk)
+            except OSError as exc:
+                msg = f"{self.path / name} is unreadable"
+                raise CheckpointCorruptError(msg) from exc
+            if size != expected["bytes"] or digest.hexdigest() != expected["sha256"]:
+                msg = f"{self.path / name} does not match its checksum"
+                raise CheckpointCorruptError(msg)
+
+    def policy(self, key: str = "policy") -> MLPPolicy:
+        """Rebuild a policy; its weights stay memory-mapped views."""
+
+        params = self[key]
+        return MLPPolicy.from_parameters(params)
+
+    def restore(
+        self,
+        *,
+        env: BJJMultiAgentEnv | None = None,
+        normalizer: _ArrayStateful | None = None,
+    ) -> None:
+        """Load the saved env and/or normalizer state into live objects."""
+
+        if env is not None:
+            env.load_state_dict(self["env"])
+        if normalizer is not None:
+            normalizer.load_state_dict(self["normalizer"])
+
+    def _decode(self, value: object) -> object:
+        if isinstance(value, dict):
+            if set(value) == {_ARRAY_KEY}:
+                return self.array(value[_ARRAY_KEY])
+            return {key: self._decode(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._decode(item) for item in value]
+        return value
+
+
+class CheckpointManager:
+    """Save checkpoints on a background thread and keep the newest few.
+
+    At most ``max_pending`` snapshots wait for the writer; a further
+    :meth:`save` blocks until one is written, so a disk that cannot keep up
+    slows the caller instead of buffering snapshots without bound.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        keep_last: int | None = 3,
+        max_pending: int = 2,
+    ) -> None:
+        if keep_last is not None and keep_last < 1:
+            msg = "keep_last must be positive or None"
+            raise ValueError(msg)
+        if max_pending < 1:
+            msg = "max_pending must be positive"
+            raise ValueError(msg)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.keep_last = keep_last
+        self.saves = 0
+        self.last_snapshot_s = 0.0
+        self.last_write_s = 0.0
+        # Leftovers from a run that died mid-write are never valid checkpoints.
+        for stale in self.directory.glob(f"{_TMP_PREFIX}*"):
+            shutil.rmtree(stale, ignore_errors=True)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bjjsim-checkpoint")
+        self._pending: list[Future[Path]] = []
+        self._closed = False
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def save(
+        self,
+        step: int,
+        *,
+        env: BJJMultiAgentEnv | None = None,
+        normalizer: _ArrayStateful | None = None,
+        policy: MLPPolicy | Mapping[str, npt.ArrayLike] | None = None,
+        extra: Mapping[str, Any] | None = None,
+    ) -> Future[Path]:
+        """Snapshot the given state now and write it as checkpoint ``step``.
+
+        ``extra`` holds anything else worth saving (optimizer moments, RNG
+        state of the learner, counters): nested mappings and lists of arrays
+        and JSON scalars.  The returned future resolves to the checkpoint
+        directory once it is on disk.
+        """
+
+        if self._closed:
+            msg = "checkpoint manager is closed"
+            raise RuntimeError(msg)
+        if step < 0:
+            msg = "step must be non-negative"
+            raise ValueError(msg)
+        started = time.perf_counter()
+        state: dict[str, Any] = {}
+        if env is not None:
+            state["env"] = _snapshot(env.state_dict())
+        if normalizer is not None:
+            state["normalizer"] = _snapshot(normalizer.state_dict())
+        if policy is not None:
+            params = policy.parameters() if isinstance(policy, MLPPolicy) else policy
+            state["policy"] = {name: np.array(value, copy=True) for name, value in params.items()}
+        if extra is not None:
+            state["extra"] = _snapshot(extra)
+        self.last_snapshot_s = time.perf_counter() - started
+
+        self._slots.acquire()
+        try:
+            future = self._writer.submit(self._write, step, state)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._pending = [f for f in self._pending if not f.done()]
+        self._pending.append(future)
+        return future
+
+    def wait(self) -> None:
+        """Block until every submitted checkpoint is written; re-raise failures."""
+
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def checkpoints(self) -> list[Path]:
+        """Complete checkpoint directories, oldest first."""
+
+        found = [
+            (int(match.group(1)), path)
+            for path in self.directory.iterdir()
+            if (match := _CHECKPOINT_DIR.match(path.name)) and (path / MANIFEST_FILENAME).is_file()
+        ]
+        return [path for _, path in sorted(found)]
+
+    def load(self, step: int) -> Checkpoint:
+        return Checkpoint(self.directory / f"ckpt-{step:010d}")
+
+    def latest(self, *, verify: bool = False) -> Checkpoint | None:
+        """Newest readable checkpoint, skipping any that fail validation."""
+
+        for path in reversed(self.checkpoints()):
+            try:
+                checkpoint = Checkpoint(path)
+                if verify:
+                    checkpoint.verify()
+            except CheckpointCorruptError:
+                continue
+            return checkpoint
+        return None
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._writer.shutdown(wait=True)
+        self.wait()
+
+    def _write(self, step: int, state: dict[str, Any]) -> Path:
+        started = time.perf_counter()
+        path = _write_checkpoint(self.directory, step, state)
+        self.saves += 1
+        if self.keep_last is not None:
+            for old in self.checkpoints()[: -self.keep_last]:
+                # A checkpoint still open elsewhere is retried on the next save.
+                _discard(old)
+        self.last_write_s = time.perf_counter() - started
+        return path
+
+
+__all__ = [
+    "CHECKPOINT_VERSION",
+    "Checkpoint",
+    "CheckpointCorruptError",
+    "CheckpointManager",
+]
@@ -0,0 +1,300 @@
+"""Content-addressed on-disk cache of evaluation results.
+
+:class:`~bjjsim.env.BJJMultiAgentEnv` is deterministic given its config, its
+physics adapter, the policies and the seed, so an evaluation outcome can be
+stored under a hash of exactly those inputs (:func:`evaluation_key`) and
+replayed instead of recomputed.
+
+Each entry is a small JSON file at ``<directory>/<key[:2]>/<key>.json``,
+written to a temporary file and renamed into place, so concurrent readers in
+other processes see either the whole entry or none of it.  A hit refreshes
+the file's modification time, which serves as the LRU clock; when the cache
+grows past ``max_bytes`` the least recently used entries are removed under
+an exclusive file lock until it is back below ``low_watermark * max_bytes``.
+The lock is ``flock`` on POSIX and ``msvcrt.locking`` on Windows.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import errno
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import Any, BinaryIO, Final
+
+import numpy as np
+import numpy.typing as npt
+
+from bjjsim.env import EnvConfig
+from bjjsim.physics import DeterministicCounterAdapter, PhysicsAdapter
+
+if sys.platform == "win32":  # pragma: no cover - Windows only
+    import msvcrt
+
+    def _lock(handle: BinaryIO) -> None:
+        handle.seek(0)
+        while True:
+            # LK_LOCK gives up after about ten seconds; keep waiting like flock.
+            try:
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+            except OSError as exc:
+                if exc.errno not in (errno.EDEADLOCK, errno.EACCES):
+                    raise
+                continue
+            return
+
+    def _unlock(handle: BinaryIO) -> None:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock(handle: BinaryIO) -> None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+
+    def _unlock(handle: BinaryIO) -> None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+KEY_VERSION: Final[int] = 1
+LOCK_FILENAME: Final[str] = ".lock"
+
+# Windows refuses to replace a file another process has open; such a reader
+# is usually gone within milliseconds.
+_REPLACE_ATTEMPTS: Final[int] = 5
+_REPLACE_BACKOFF_S: Final[float] = 0.01
+
+_KEY: Final[re.Pattern[str]] = re.compile(r"^[0-9a-f]{64}$")
+
+
+def policy_digest(params: Mapping[str, npt.ArrayLike]) -> str:
+    """Hash policy parameters by name, dtype, shape and raw bytes."""
+
+    digest = hashlib.blake2b(digest_size=32)
+    for name in sorted(params):
+        array = np.ascontiguousarray(params[name])
+        digest.update(name.encode("utf-8"))
+        digest.update(array.dtype.str.encode("ascii"))
+        digest.update(repr(array.shape).encode("ascii"))
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def physics_fingerprint(adapter: PhysicsAdapter | None = None) -> dict[str, Any]:
+    """Describe a physics adapter by type and public dataclass fields.
+
+    Private fields hold per-episode state (counters, the last seed) rather
+    than parameters, so they are left out of the fingerprint.
+    """
+
+    adapter = adapter if adapter is not None else DeterministicCounterAdapter()
+    cls = type(adapter)
+    fingerprint: dict[str, Any] = {"type": f"{cls.__module__}.{cls.__qualname__}"}
+    if dataclasses.is_dataclass(adapter):
+        for field in dataclasses.fields(adapter):
+            if not field.name.startswith("_"):
+                fingerprint[field.name] = getattr(adapter, field.name)
+    return fingerprint
+
+
+def evaluation_key(
+    config: EnvConfig,
+    seed: int,
+    *,
+    policies: Sequence[str],
+    physics: PhysicsAdapter | Mapping[str, Any] | None = None,
+    extra: Mapping[str, Any] | None = None,
+) -> str:
+    """Return the cache key for one evaluation.
+
+    ``policies`` are :func:`policy_digest` values in seat order.  ``physics``
+    is an adapter or a precomputed :func:`physics_fingerprint` (default
+    adapter when omitted).  ``extra`` covers anything else that changes the
+    outcome, such as scoring thresholds; all values must be JSON-serializable.
+    """
+
+    fingerprint = physics if isinstance(physics, Mapping) else physics_fingerprint(physics)
+    payload = {
+        "version": KEY_VERSION,
+        "config": dataclasses.asdict(config),
+        "physics": dict(fingerprint),
+        "policies": list(policies),
+        "seed": int(seed),
+        "extra": dict(extra or {}),
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class EvaluationCache:
+    """Size-bounded, multi-process-safe LRU of JSON evaluation results."""
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        max_bytes: int = 64 * 2**20,
+        low_watermark: float = 0.9,
+    ) -> None:
+        if max_bytes < 1:
+            msg = "max_bytes must be positive"
+            raise ValueError(msg)
+        if not 0.0 < low_watermark <= 1.0:
+            msg = "low_watermark must lie in (0, 1]"
+            raise ValueError(msg)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.low_watermark = low_watermark
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Other processes write too, so this is only an estimate; eviction
+        # rescans the directory before deleting anything.
+        self._approx_bytes = sum(size for _, size, _ in self._entries())
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._entries())
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._path(key).exists()
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the stored value for ``key`` or ``None`` on a miss."""
+
+        path = self._path(key)
+        try:
+            payload = json.loads(path.read_bytes())
+        except (FileNotFoundError, ValueError):
+            # Missing, or evicted and replaced mid-read by another process.
+            self.misses += 1
+            return None
+        if not isinstance(payload, dict) or payload.get("key") != key:
+            self.misses += 1
+            return None
+        with suppress(FileNotFoundError):
+            os.utime(path)
+        self.hits += 1
+        value: dict[str, Any] = payload["value"]
+        return value
+
+    def put(self, key: str, value: Mapping[str, Any]) -> None:
+        """Store ``value`` under ``key``, replacing any previous entry."""
+
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        data = json.dumps({"key": key, "value": dict(value)}, sort_keys=True).encode("utf-8")
+        fd, tmp = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            replaced = _replace(tmp, path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.unlink(tmp)
+            raise
+        if not replaced:
+            return
+        self._approx_bytes += len(data)
+        if self._approx_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used entries until under the low watermark."""
+
+        removed = 0
+        with self._exclusive():
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            target = int(self.max_bytes * self.low_watermark)
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass  # already evicted by another process
+                except PermissionError:
+                    continue  # open elsewhere (Windows); it stays and still counts
+                else:
+                    removed += 1
+                total -= size
+        self._approx_bytes = total
+        self.evictions += removed
+        return removed
+
+    def clear(self) -> None:
+        with self._exclusive():
+            for _, _, path in self._entries():
+                # Entries open in another process cannot be deleted on Windows.
+                with suppress(FileNotFoundError, PermissionError):
+                    path.unlink()
+        self._approx_bytes = 0
+
+    def _path(self, key: str) -> Path:
+        if not _KEY.match(key):
+            msg = "cache keys must be 64 lowercase hex characters (see evaluation_key)"
+            raise ValueError(msg)
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _entries(self) -> Iterator[tuple[int, int, Path]]:
+        """Yield ``(mtime_ns, size, path)`` for every committed entry."""
+
+        for path in self.directory.glob("??/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            yield stat.st_mtime_ns, stat.st_size, path
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        with open(self.directory / LOCK_FILENAME, "a+b") as handle:
+            _lock(handle)
+            try:
+                yield
+            finally:
+                _unlock(handle)
+
+
+def _replace(tmp: str, path: Path) -> bool:
+    """Rename ``tmp`` over ``path``; ``False`` if a locked entry was kept.
+
+    Keys are content hashes, so an entry that stays locked past the retries
+    already holds the same value and ``tmp`` is simply dropped.
+    """
+
+    for attempt in range(_REPLACE_ATTEMPTS):
+        try:
+            os.replace(tmp, path)
+        except PermissionError:
+            if attempt + 1 < _REPLACE_ATTEMPTS:
+                time.sleep(_REPLACE_BACKOFF_S * 2**attempt)
+        else:
+            return True
+    if not path.exists():
+        msg = f"cannot write cache entry {path}"
+        raise PermissionError(msg)
+    os.unlink(tmp)
+    return False
+
+
+__all__ = [
+    "EvaluationCache",
+    "evaluation_key",
+    "physics_fingerprint",
+    "policy_digest",
+]
@@ -0,0 +1,346 @@
+"""Dynamic-batching policy inference on a background thread.
+
+Running one :class:`~bjjsim.training.MLPPolicy` forward pass per agent per
+step spends most of its time in Python and NumPy call overhead rather than
+arithmetic.  :class:`InferenceServer` instead collects observation requests
+from any number of threads (env loops, rollout workers) for up
+to ``max_delay_s`` after the first one arrives, or until ``max_batch_rows``
+rows are queued, then runs a single batched forward pass per policy and
+hands each caller its slice of the output through a
+:class:`~concurrent.futures.Future`.
+
+:class:`PolicyAdapter` drives a :class:`~bjjsim.env.BJJMultiAgentEnv`
+through a server and implements :class:`~bjjsim.physics.PhysicsAdapter`, so
+policy-controlled matches plug into the web app through its
+:class:`~bjjsim.web.sessions.AdapterPool`.  The web app steps every session
+on one thread, so there is nothing to batch; use ``batched=False`` there.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+from collections.abc import Mapping, Sequence
+from concurrent.futures import Future
+from dataclasses import dataclass
+from time import monotonic
+from typing import Final, Self
+
+import numpy as np
+import numpy.typing as npt
+
+from bjjsim.env import BJJMultiAgentEnv, EnvConfig
+from bjjsim.training.policy import FloatArray, MLPPolicy
+
+DEFAULT_POLICY: Final[str] = "default"
+
+
+@dataclass(slots=True)
+class _Request:
+    policy_id: str
+    observations: FloatArray
+    future: Future[FloatArray]
+
+
+class InferenceServer:
+    """Batch forward passes of registered policies across concurrent callers.
+
+    ``policies`` is one policy (registered as ``"default"``) or a mapping of
+    policy IDs to policies.  ``max_delay_s=0`` disables waiting: each batch
+    takes whatever is queued when the worker thread gets to it.
+    """
+
+    def __init__(
+        self,
+        policies: MLPPolicy | Mapping[str, MLPPolicy],
+        *,
+        max_batch_rows: int = 1024,
+        max_delay_s: float = 0.001,
+        thread_name: str = "bjjsim-inference",
+    ) -> None:
+        if max_batch_rows < 1:
+            msg = "max_batch_rows must be positive"
+            raise ValueError(msg)
+        if max_delay_s < 0:
+            msg = "max_delay_s must be non-negative"
+            raise ValueError(msg)
+        if isinstance(policies, MLPPolicy):
+            policies = {DEFAULT_POLICY: policies}
+        self._policies: dict[str, MLPPolicy] = dict(policies)
+        self.max_batch_rows = max_batch_rows
+        self.max_delay_s = max_delay_s
+        self.batches_run = 0
+        self.requests_served = 0
+        self.rows_served = 0
+        self._queue: queue.SimpleQueue[_Request | None] = queue.SimpleQueue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._serve, name=thread_name, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def policy_ids(self) -> list[str]:
+        return list(self._policies)
+
+    @property
+    def mean_batch_rows(self) -> float:
+        return self.rows_served / self.batches_run if self.batches_run else 0.0
+
+    def policy(self, policy_id: str = DEFAULT_POLICY) -> MLPPolicy:
+        try:
+            return self._policies[policy_id]
+        except KeyError:
+            msg = f"unknown policy {policy_id!r}"
+            raise KeyError(msg) from None
+
+    def register(self, policy_id: str, policy: MLPPolicy) -> None:
+        """Add or replace a policy; requests already queued use the new one."""
+
+        self._policies = {**self._policies, policy_id: policy}
+
+    def unregister(self, policy_id: str) -> None:
+        self.policy(policy_id)
+        self._policies = {k: v for k, v in self._policies.items() if k != policy_id}
+
+    def submit(
+        self, observations: npt.ArrayLike, *, policy: str = DEFAULT_POLICY
+    ) -> Future[FloatArray]:
+        """Queue a ``(rows, observation_dim)`` block and return its pending actions.
+
+        A single observation vector is accepted too and yields a
+        ``(1, action_dim)`` result.
+        """
+
+        obs = np.asarray(observations, dtype=np.float32)
+        if obs.ndim == 1:
+            obs = obs[np.newaxis]
+        expected = self.policy(policy).observation_dim
+        if obs.ndim != 2 or obs.shape[1] != expected:
+            msg = f"observations must have shape (rows, {expected}), got {obs.shape}"
+            raise ValueError(msg)
+        future: Future[FloatArray] = Future()
+        with self._close_lock:
+            if self._closed:
+                msg = "inference server is closed"
+                raise RuntimeError(msg)
+            self._queue.put(_Request(policy, obs, future))
+        return future
+
+    def infer(
+        self,
+        observations: npt.ArrayLike,
+        *,
+        policy: str = DEFAULT_POLICY,
+        timeout: float | None = None,
+    ) -> FloatArray:
+        """Blocking :meth:`submit`."""
+
+        return self.submit(observations, policy=policy).result(timeout)
+
+    async def infer_async(
+        self, observations: npt.ArrayLike, *, policy: str = DEFAULT_POLICY
+    ) -> FloatArray:
+        return await asyncio.wrap_future(self.submit(observations, policy=policy))
+
+    def act(
+        self,
+        observations: Mapping[str, Sequence[float]],
+        *,
+        policy: str | Mapping[str, str] = DEFAULT_POLICY,
+    ) -> dict[str, list[float]]:
+        """Actions for a :meth:`BJJMultiAgentEnv.step` loop.
+
+        ``policy`` is one policy ID for every agent or a per-agent mapping.
+        Agents sharing a policy go out as one request, and requests for
+        different policies are queued together so they land in the same
+        batch.
+        """
+
+        by_policy: dict[str, list[str]] = {}
+        for agent in observations:
+            policy_id = policy if isinstance(policy, str) else policy[agent]
+            by_policy.setdefault(policy_id, []).append(agent)
+        pending = [
+            (agents, self.submit([observations[a] for a in agents], policy=policy_id))
+            for policy_id, agents in by_policy.items()
+        ]
+        actions: dict[str, list[float]] = {}
+        for agents, future in pending:
+            rows = future.result()
+            for agent, row in zip(agents, rows, strict=True):
+                actions[agent] = row.tolist()
+        return actions
+
+    def close(self) -> None:
+        """Serve everything already queued, then stop the worker thread."""
+
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    def _serve(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            rows = len(first.observations)
+            deadline = monotonic() + self.max_delay_s
+            while rows < self.max_batch_rows:
+                remaining = deadline - monotonic()
+                try:
+                    request = (
+                        self._queue.get(timeout=remaining)
+                        if remaining > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+                rows += len(request.observations)
+            self._run(batch)
+
+    def _run(self, batch: list[_Request]) -> None:
+        groups: dict[str, list[_Request]] = {}
+        for request in batch:
+            groups.setdefault(request.policy_id, []).append(request)
+        policies = self._policies
+        for policy_id, requests in groups.items():
+            live = [r for r in requests if r.future.set_running_or_notify_cancel()]
+            if not live:
+                continue
+            try:
+                policy = policies[policy_id]
+                stacked = (
+                    live[0].observations
+                    if len(live) == 1
+                    else np.concatenate([r.observations for r in live])
+                )
+                actions = policy.forward(stacked)
+            except Exception as exc:
+                for request in live:
+                    request.future.set_exception(exc)
+                continue
+            offset = 0
+            for request in live:
+                end = offset + len(request.observations)
+                request.future.set_result(actions[offset:end])
+                offset = end
+            self.batches_run += 1
+            self.requests_served += len(live)
+            self.rows_served += len(stacked)
+
+
+class PolicyAdapter:
+    """:class:`~bjjsim.physics.PhysicsAdapter` whose steps are policy-driven env steps.
+
+    Each :meth:`step` advances ``env`` one action at a time with actions from
+    ``server``; ``seats`` names the policy for each agent in order.  Truncated
+    episodes restart transparently so the web app's own episode limit stays
+    in charge.  Many adapters sharing one server batch their forward passes
+    whenever they step concurrently from different threads.
+
+    ``batched=False`` calls the server's policies directly on the stepping
+    thread instead of queueing.  A lone caller gains nothing from batching
+    and would wait out ``max_delay_s`` on every step, which is the case in
+    the web app, where all sessions step on one simulation thread.
+    """
+
+    def __init__(
+        self,
+        server: InferenceServer,
+        *,
+        seats: Sequence[str] = (DEFAULT_POLICY, DEFAULT_POLICY),
+        env: BJJMultiAgentEnv | None = None,
+        batched: bool = True,
+    ) -> None:
+        self.server = server
+        self.batched = batched
+        self.env = env or BJJMultiAgentEnv(EnvConfig())
+        if len(seats) != len(self.env.agents):
+            msg = f"need one policy per agent ({len(self.env.agents)}), got {len(seats)}"
+            raise ValueError(msg)
+        for policy_id in seats:
+            server.policy(policy_id)
+        self.seats = tuple(seats)
+        config = self.env.config
+        num_agents = len(self.env.agents)
+        self.observations = np.zeros((num_agents, config.observation_dim), dtype=np.float32)
+        self.rewards = np.zeros(num_agents, dtype=np.float32)
+        self.returns = np.zeros(num_agents, dtype=np.float64)
+        self._actions = np.zeros((num_agents, config.action_dim), dtype=np.float32)
+        self._groups: dict[str, list[int]] = {}
+        for idx, policy_id in enumerate(self.seats):
+            self._groups.setdefault(policy_id, []).append(idx)
+        self._step_count = 0
+        self._last_seed: int | None = None
+        self._running = False
+
+    def reset(self, seed: int | None) -> None:
+        self._running = False
+        self._step_count = 0
+        if seed is not None:
+            self._last_seed = seed
+
+    def start(self, seed: int | None) -> None:
+        self.reset(seed)
+        self.env.reset_arrays(self.observations, seed=seed)
+        self.returns[:] = 0.0
+        self._running = True
+
+    def stop(self) -> None:
+        self._running = False
+
+    def step(self, num_steps: int) -> None:
+        if not self._running:
+            return
+        for _ in range(num_steps):
+            if self.batched:
+                self._batched_actions()
+            else:
+                # Looked up per step so server.register() swaps take effect.
+                for policy_id, seats in self._groups.items():
+                    policy = self.server.policy(policy_id)
+                    self._actions[seats] = policy.forward(self.observations[seats])
+            _, truncated, _ = self.env.step_arrays(self._actions, self.observations, self.rewards)
+            self.returns += self.rewards
+            self._step_count += 1
+            if truncated:
+                self.env.reset_arrays(self.observations)
+
+    def _batched_actions(self) -> None:
+        pending = [
+            (seats, self.server.submit(self.observations[seats], policy=policy_id))
+            for policy_id, seats in self._groups.items()
+        ]
+        for seats, future in pending:
+            self._actions[seats] = future.result()
+
+    @property
+    def step_count(self) -> int:
+        return self._step_count
+
+    @property
+    def last_seed(self) -> int | None:
+        return self._last_seed
+
+
+__all__ = [
+    "DEFAULT_POLICY",
+    "InferenceServer",
+    "PolicyAdapter",
+]
@@ -0,0 +1,235 @@
+"""Opponent pool (league) of past policy snapshots for self-play.
+
+Snapshots are written once as one ``.npy`` file per parameter array and read
+back with ``np.load(mmap_mode="r")``, so opening an opponent maps its weights
+instead of deserializing them; pages are only read when a forward pass touches
+them.  Recently used snapshots stay open in a bounded LRU cache, which makes
+switching opponents at every ``reset`` a dictionary lookup.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Final, Literal
+
+import numpy as np
+import numpy.typing as npt
+
+SamplingScheme = Literal["latest", "uniform", "prioritized"]
+
+INDEX_FILENAME: Final[str] = "pool.json"
+
+
+@dataclass(slots=True)
+class SnapshotStats:
+    """Bookkeeping for one snapshot; scores are from the learner's perspective."""
+
+    snapshot_id: str
+    step: int
+    games: int = 0
+    learner_score: float = 0.0
+
+    @property
+    def learner_win_rate(self) -> float:
+        """Learner's mean score against this snapshot; 0.5 before any games."""
+
+        return self.learner_score / self.games if self.games else 0.5
+
+
+@dataclass(slots=True, frozen=True)
+class PolicySnapshot:
+    snapshot_id: str
+    step: int
+    params: Mapping[str, npt.NDArray[np.generic]]
+
+
+class OpponentPool:
+    """Directory-backed pool of policy snapshots with an in-memory LRU.
+
+    ``sample`` supports three schemes:
+
+    - ``latest``: the most recently added snapshot (symmetric self-play).
+    - ``uniform``: any snapshot with equal probability.
+    - ``prioritized``: weight ``(1 - learner_win_rate) ** exponent``, favouring
+      opponents the learner still struggles against.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        cache_size: int = 8,
+        max_snapshots: int | None = None,
+        priority_exponent: float = 2.0,
+    ) -> None:
+        if cache_size < 1:
+            msg = "cache_size must be at least 1"
+            raise ValueError(msg)
+        if max_snapshots is not None and max_snapshots < 1:
+            msg = "max_snapshots must be at least 1"
+            raise ValueError(msg)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.cache_size = cache_size
+        self.max_snapshots = max_snapshots
+        self.priority_exponent = priority_exponent
+        self._stats: OrderedDict[str, SnapshotStats] = OrderedDict()
+        self._cache: OrderedDict[str, PolicySnapshot] = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+        self._load_index()
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    def __contains__(self, snapshot_id: object) -> bool:
+        return snapshot_id in self._stats
+
+    @property
+    def snapshot_ids(self) -> list[str]:
+        """Snapshot IDs, oldest first."""
+
+        return list(self._stats)
+
+    def stats(self, snapshot_id: str) -> SnapshotStats:
+        return self._stats[snapshot_id]
+
+    def add(
+        self,
+        params: Mapping[str, npt.ArrayLike],
+        *,
+        step: int,
+        snapshot_id: str | None = None,
+    ) -> str:
+        """Persist ``params`` as a new snapshot and return its ID.
+
+        Arrays are written to a temporary directory that is renamed into place,
+        so readers never observe a partially written snapshot.
+        """
+
+        sid = snapshot_id or f"step-{step:010d}"
+        if sid in self._stats:
+            msg = f"snapshot {sid!r} already exists"
+            raise ValueError(msg)
+        staging = Path(tempfile.mkdtemp(prefix=f".{sid}-", dir=self.directory))
+        try:
+            for name, value in params.items():
+                np.save(staging / f"{name}.npy", np.asarray(value), allow_pickle=False)
+            os.replace(staging, self.directory / sid)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        with self._lock:
+            self._stats[sid] = SnapshotStats(sid, int(step))
+            evicted = self._enforce_max_snapshots()
+            self._save_index()
+        for old in evicted:
+            shutil.rmtree(self.directory / old, ignore_errors=True)
+        return sid
+
+    def load(self, snapshot_id: str) -> PolicySnapshot:
+        """Return the snapshot, memory-mapping it on a cache miss."""
+
+        with self._lock:
+            cached = self._cache.get(snapshot_id)
+            if cached is not None:
+                self._cache.move_to_end(snapshot_id)
+                self.cache_hits += 1
+                return cached
+            stats = self._stats.get(snapshot_id)
+            if stats is None:
+                raise KeyError(snapshot_id)
+        params = {
+            path.stem: np.load(path, mmap_mode="r", allow_pickle=False)
+            for path in sorted((self.directory / snapshot_id).glob("*.npy"))
+        }
+        snapshot = PolicySnapshot(snapshot_id, stats.step, params)
+        with self._lock:
+            self.cache_misses += 1
+            self._cache[snapshot_id] = snapshot
+            self._cache.move_to_end(snapshot_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return snapshot
+
+    def sample(
+        self,
+        scheme: SamplingScheme = "uniform",
+        *,
+        rng: np.random.Generator | None = None,
+    ) -> PolicySnapshot:
+        """Pick an opponent according to ``scheme`` and return it loaded."""
+
+        if not self._stats:
+            msg = "opponent pool is empty"
+            raise LookupError(msg)
+        ids = list(self._stats)
+        if scheme == "latest":
+            return self.load(ids[-1])
+        rng = rng or np.random.default_rng()
+        if scheme == "uniform":
+            return self.load(ids[int(rng.integers(len(ids)))])
+        if scheme == "prioritized":
+            win_rates = np.array([self._stats[i].learner_win_rate for i in ids])
+            weights = np.clip(1.0 - win_rates, 1e-3, None) ** self.priority_exponent
+            return self.load(ids[int(rng.choice(len(ids), p=weights / weights.sum()))])
+        msg = f"unknown sampling scheme {scheme!r}"
+        raise ValueError(msg)
+
+    def record_result(self, snapshot_id: str, learner_score: float) -> None:
+        """Record a finished game: 1.0 learner win, 0.5 draw, 0.0 learner loss."""
+
+        if not 0.0 <= learner_score <= 1.0:
+            msg = "learner_score must lie in [0, 1]"
+            raise ValueError(msg)
+        with self._lock:
+            stats = self._stats[snapshot_id]
+            stats.games += 1
+            stats.learner_score += learner_score
+
+    def flush(self) -> None:
+        """Persist game statistics to the pool index."""
+
+        with self._lock:
+            self._save_index()
+
+    def _enforce_max_snapshots(self) -> list[str]:
+        evicted: list[str] = []
+        if self.max_snapshots is None:
+            return evicted
+        while len(self._stats) > self.max_snapshots:
+            old, _ = self._stats.popitem(last=False)
+            self._cache.pop(old, None)
+            evicted.append(old)
+        return evicted
+
+    def _load_index(self) -> None:
+        index = self.directory / INDEX_FILENAME
+        if not index.exists():
+            return
+        for entry in json.loads(index.read_text(encoding="utf-8"))["snapshots"]:
+            stats = SnapshotStats(**entry)
+            self._stats[stats.snapshot_id] = stats
+
+    def _save_index(self) -> None:
+        payload = {"snapshots": [asdict(s) for s in self._stats.values()]}
+        tmp = self.directory / f".{INDEX_FILENAME}.tmp"
+        tmp.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp, self.directory / INDEX_FILENAME)
+
+
+__all__ = [
+    "OpponentPool",
+    "PolicySnapshot",
+    "SamplingScheme",
+    "SnapshotStats",
+]
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+FloatArray = npt.NDArray[np.float32]
+
+
+class MLPPolicy:
+    """Deterministic multilayer perceptron policy evaluated with NumPy.
+
+    Hidden layers use ``tanh`` and the output is squashed with ``tanh`` so
+    actions land in ``[-1, 1]``, matching the default ``EnvConfig`` action
+    bounds.  Parameters are plain arrays named ``w0, b0, w1, b1, ...`` so they
+    can be stored, memory-mapped and shared without any framework.
+    """
+
+    def __init__(self, weights: Sequence[npt.ArrayLike], biases: Sequence[npt.ArrayLike]) -> None:
+        if not weights or len(weights) != len(biases):
+            msg = "weights and biases must be non-empty and of equal length"
+            raise ValueError(msg)
+        # np.asarray keeps memory-mapped inputs as views instead of copying them.
+        self.weights: list[FloatArray] = [np.asarray(w, dtype=np.float32) for w in weights]
+        self.biases: list[FloatArray] = [np.asarray(b, dtype=np.float32) for b in biases]
+        for idx, (w, b) in enumerate(zip(self.weights, self.biases, strict=True)):
+            if w.ndim != 2 or b.shape != (w.shape[1],):
+                msg = f"layer {idx} has inconsistent shapes {w.shape} and {b.shape}"
+                raise ValueError(msg)
+            if idx and w.shape[0] != self.weights[idx - 1].shape[1]:
+                msg = f"layer {idx} input size does not match previous layer output"
+                raise ValueError(msg)
+
+    @classmethod
+    def random(
+        cls,
+        observation_dim: int,
+        action_dim: int,
+        *,
+        hidden_sizes: Sequence[int] = (64, 64),
+        rng: np.random.Generator | None = None,
+    ) -> MLPPolicy:
+        """Build a policy with scaled Gaussian initial weights."""
+
+        rng = rng or np.random.default_rng()
+        sizes = [observation_dim, *hidden_sizes, action_dim]
+        weights = [
+            rng.normal(0.0, 1.0 / np.sqrt(fan_in), size=(fan_in, fan_out)).astype(np.float32)
+            for fan_in, fan_out in zip(sizes[:-1], sizes[1:], strict=True)
+        ]
+        biases = [np.zeros(fan_out, dtype=np.float32) for fan_out in sizes[1:]]
+        return cls(weights, biases)
+
+    @classmethod
+    def from_parameters(cls, params: Mapping[str, npt.ArrayLike]) -> MLPPolicy:
+        num_layers = sum(1 for key in params if key.startswith("w"))
+        return cls(
+            [params[f"w{i}"] for i in range(num_layers)],
+            [params[f"b{i}"] for i in range(num_layers)],
+        )
+
+    @property
+    def observation_dim(self) -> int:
+        return int(self.weights[0].shape[0])
+
+    @property
+    def action_dim(self) -> int:
+        return int(self.weights[-1].shape[1])
+
+    def parameters(self) -> dict[str, FloatArray]:
+        params: dict[str, FloatArray] = {}
+        for idx, (w, b) in enumerate(zip(self.weights, self.biases, strict=True)):
+            params[f"w{idx}"] = w
+            params[f"b{idx}"] = b
+        return params
+
+    def forward(self, observations: npt.ArrayLike) -> FloatArray:
+        """Map a ``(batch, observation_dim)`` block to ``(batch, action_dim)`` actions."""
+
+        x = np.asarray(observations, dtype=np.float32)
+        for w, b in zip(self.weights, self.biases, strict=True):
+            x = np.tanh(x @ w + b)
+        return x
+
+    __call__ = forward
+
+
+__all__ = [
+    "MLPPolicy",
+]
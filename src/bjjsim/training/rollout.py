@@ -0,0 +1,285 @@
+"""Preallocated rollout storage for PPO-style training.
+
+:class:`RolloutBuffer` holds ``num_steps`` steps of observations, actions,
+log-probabilities, values, rewards and episode flags for a vector of envs in
+fixed NumPy arrays allocated once, so collecting a rollout only copies step
+outputs into place.  Advantages and returns are computed in place with GAE,
+and :meth:`RolloutBuffer.minibatches` hands out :class:`MiniBatch` views of a
+reused shuffle buffer instead of fresh copies.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from bjjsim.env import BJJMultiAgentEnv
+
+FloatArray = npt.NDArray[np.float32]
+BoolArray = npt.NDArray[np.bool_]
+
+# One env's step output keyed by agent name, as returned by ``BJJMultiAgentEnv``.
+AgentDict = Mapping[str, Any]
+
+
+@dataclass(slots=True, frozen=True)
+class MiniBatch:
+    """Flattened views into a :class:`RolloutBuffer`'s shuffled scratch storage."""
+
+    observations: FloatArray
+    actions: FloatArray
+    log_probs: FloatArray
+    values: FloatArray
+    advantages: FloatArray
+    returns: FloatArray
+
+
+class RolloutBuffer:
+    """Preallocated PPO rollout storage shaped ``(T, N_envs, num_agents, ...)``.
+
+    Step outputs are written straight into the preallocated arrays, either as
+    arrays with a leading ``(N_envs, num_agents)`` shape via :meth:`add` or as
+    the per-env agent dictionaries produced by
+    :meth:`~bjjsim.env.BJJMultiAgentEnv.step` via :meth:`add_dicts`.
+
+    :meth:`compute_returns_and_advantages` runs GAE in a single backward pass
+    over ``T`` that is vectorized across envs and agents.  Episodes that end by
+    ``truncated`` rather than ``terminated`` are bootstrapped from
+    ``final_values``, the value estimate of the last observation before the
+    env was reset.
+    """
+
+    def __init__(
+        self,
+        num_steps: int,
+        num_envs: int,
+        agents: Sequence[str],
+        observation_dim: int,
+        action_dim: int,
+        *,
+        gamma: float = 0.99,
+        gae_lambda: float = 0.95,
+    ) -> None:
+        if num_steps <= 0 or num_envs <= 0:
+            msg = "num_steps and num_envs must be positive"
+            raise ValueError(msg)
+        if not agents:
+            msg = "agents must contain at least one agent"
+            raise ValueError(msg)
+        if not 0.0 <= gamma <= 1.0 or not 0.0 <= gae_lambda <= 1.0:
+            msg = "gamma and gae_lambda must lie in [0, 1]"
+            raise ValueError(msg)
+        self.num_steps = num_steps
+        self.num_envs = num_envs
+        self.agents: tuple[str, ...] = tuple(agents)
+        self.observation_dim = observation_dim
+        self.action_dim = action_dim
+        self.gamma = gamma
+        self.gae_lambda = gae_lambda
+
+        lead = (num_steps, num_envs, len(self.agents))
+        self.observations: FloatArray = np.zeros((*lead, observation_dim), dtype=np.float32)
+        self.actions: FloatArray = np.zeros((*lead, action_dim), dtype=np.float32)
+        self.rewards: FloatArray = np.zeros(lead, dtype=np.float32)
+        self.values: FloatArray = np.zeros(lead, dtype=np.float32)
+        self.log_probs: FloatArray = np.zeros(lead, dtype=np.float32)
+        self.final_values: FloatArray = np.zeros(lead, dtype=np.float32)
+        self.terminated: BoolArray = np.zeros(lead, dtype=np.bool_)
+        self.truncated: BoolArray = np.zeros(lead, dtype=np.bool_)
+        self.advantages: FloatArray = np.zeros(lead, dtype=np.float32)
+        self.returns: FloatArray = np.zeros(lead, dtype=np.float32)
+        self._scratch: dict[str, FloatArray] = {}
+        self.pos = 0
+
+    @classmethod
+    def for_env(
+        cls, env: BJJMultiAgentEnv, num_steps: int, num_envs: int = 1, **kwargs: float
+    ) -> RolloutBuffer:
+        """Size a buffer from an environment's agents and space dimensions."""
+
+        return cls(
+            num_steps,
+            num_envs,
+            env.agents,
+            env.config.observation_dim,
+            env.config.action_dim,
+            **kwargs,
+        )
+
+    @property
+    def full(self) -> bool:
+        return self.pos >= self.num_steps
+
+    def reset(self) -> None:
+        """Start a new rollout; arrays are reused, not reallocated."""
+
+        self.pos = 0
+        self.final_values.fill(0.0)
+
+    def add(
+        self,
+        *,
+        observations: npt.ArrayLike,
+        actions: npt.ArrayLike,
+        rewards: npt.ArrayLike,
+        terminated: npt.ArrayLike,
+        truncated: npt.ArrayLike,
+        values: npt.ArrayLike,
+        log_probs: npt.ArrayLike,
+        final_values: npt.ArrayLike | None = None,
+    ) -> None:
+        """Write one step of arrays shaped ``(N_envs, num_agents, ...)``."""
+
+        t = self._next_slot()
+        self.observations[t] = observations
+        self.actions[t] = actions
+        self.rewards[t] = rewards
+        self.terminated[t] = terminated
+        self.truncated[t] = truncated
+        self.values[t] = values
+        self.log_probs[t] = log_probs
+        if final_values is not None:
+            self.final_values[t] = final_values
+        self.pos += 1
+
+    def add_dicts(
+        self,
+        *,
+        observations: Sequence[AgentDict],
+        actions: Sequence[AgentDict],
+        rewards: Sequence[AgentDict],
+        terminated: Sequence[AgentDict],
+        truncated: Sequence[AgentDict],
+        values: npt.ArrayLike,
+        log_probs: npt.ArrayLike,
+        final_values: npt.ArrayLike | None = None,
+    ) -> None:
+        """Write one step of per-env agent dictionaries straight into the buffer.
+
+        Each sequence holds one env's output, e.g. ``observations[n]`` is the
+        observation dict returned by env ``n``.  Rows are assigned in place so
+        no intermediate ``(N_envs, num_agents, ...)`` array is built.
+        """
+
+        t = self._next_slot()
+        if len(observations) != self.num_envs:
+            msg = f"expected outputs for {self.num_envs} envs, received {len(observations)}"
+            raise ValueError(msg)
+        obs_t, act_t = self.observations[t], self.actions[t]
+        rew_t, term_t, trunc_t = self.rewards[t], self.terminated[t], self.truncated[t]
+        for n in range(self.num_envs):
+            obs_n, act_n, rew_n = observations[n], actions[n], rewards[n]
+            term_n, trunc_n = terminated[n], truncated[n]
+            for a, agent in enumerate(self.agents):
+                obs_t[n, a] = obs_n[agent]
+                act_t[n, a] = act_n[agent]
+                rew_t[n, a] = rew_n[agent]
+                term_t[n, a] = term_n[agent]
+                trunc_t[n, a] = trunc_n[agent]
+        self.values[t] = values
+        self.log_probs[t] = log_probs
+        if final_values is not None:
+            self.final_values[t] = final_values
+        self.pos += 1
+
+    def compute_returns_and_advantages(self, last_values: npt.ArrayLike) -> None:
+        """Fill :attr:`advantages` and :attr:`returns` with GAE(gamma, lambda).
+
+        ``last_values`` are value estimates, shaped ``(N_envs, num_agents)``,
+        of the observations following the final stored step.
+        """
+
+        steps = self.pos
+        if steps == 0:
+            msg = "buffer is empty"
+            raise RuntimeError(msg)
+        gamma, lam = np.float32(self.gamma), np.float32(self.gae_lambda)
+        rewards, values = self.rewards[:steps], self.values[:steps]
+
+        done = (self.terminated[:steps] | self.truncated[:steps]).astype(np.float32)
+        not_done = 1.0 - done
+        # A truncated (not terminated) step still has future value: bootstrap from
+        # the value of its final observation, since values[t + 1] already
+        # belongs to the next episode.
+        bootstrap = self.truncated[:steps] & ~self.terminated[:steps]
+        next_values = np.empty_like(values)
+        next_values[:-1] = values[1:]
+        next_values[-1] = np.asarray(last_values, dtype=np.float32)
+        deltas = (
+            rewards
+            + gamma * (next_values * not_done + self.final_values[:steps] * bootstrap)
+            - values
+        )
+        decay = gamma * lam * not_done
+
+        advantages = self.advantages[:steps]
+        running = np.zeros(values.shape[1:], dtype=np.float32)
+        for t in range(steps - 1, -1, -1):
+            running = deltas[t] + decay[t] * running
+            advantages[t] = running
+        np.add(advantages, values, out=self.returns[:steps])
+
+    def minibatches(
+        self,
+        batch_size: int,
+        *,
+        rng: np.random.Generator | None = None,
+        agent: int | None = None,
+    ) -> Iterator[MiniBatch]:
+        """Yield shuffled minibatches of ``batch_size`` samples as array views.
+
+        Samples are flattened over ``(T, N_envs[, num_agents])``.  The shuffle
+        is a single gather per field into reusable scratch buffers; every
+        yielded minibatch is then a contiguous slice view of that scratch, so
+        iterating allocates nothing per batch.  Pass ``agent`` to draw samples
+        for one agent index only (e.g. one policy in self-play).
+        """
+
+        if batch_size <= 0:
+            msg = "batch_size must be positive"
+            raise ValueError(msg)
+        rng = rng or np.random.default_rng()
+        steps = self.pos
+        sources = {
+            "observations": self.observations,
+            "actions": self.actions,
+            "log_probs": self.log_probs,
+            "values": self.values,
+            "advantages": self.advantages,
+            "returns": self.returns,
+        }
+        flat: dict[str, FloatArray] = {}
+        for name, arr in sources.items():
+            view = arr[:steps] if agent is None else arr[:steps, :, agent]
+            lead = view.shape[:3] if agent is None else view.shape[:2]
+            flat[name] = view.reshape(int(np.prod(lead)), *view.shape[len(lead) :])
+        total = len(flat["values"])
+        perm = rng.permutation(total)
+        shuffled: dict[str, FloatArray] = {}
+        for name, src in flat.items():
+            scratch = self._scratch.get(name)
+            if scratch is None or scratch.shape[0] < total or scratch.shape[1:] != src.shape[1:]:
+                scratch = np.empty_like(src)
+                self._scratch[name] = scratch
+            np.take(src, perm, axis=0, out=scratch[:total])
+            shuffled[name] = scratch
+        for start in range(0, total, batch_size):
+            stop = min(start + batch_size, total)
+            yield MiniBatch(**{name: arr[start:stop] for name, arr in shuffled.items()})
+
+    def _next_slot(self) -> int:
+        if self.full:
+            msg = "rollout buffer is full; call reset() before adding more steps"
+            raise RuntimeError(msg)
+        return self.pos
+
+
+__all__ = [
+    "MiniBatch",
+    "RolloutBuffer",
+]
@@ -0,0 +1,412 @@
+"""Columnar reward telemetry written from a background thread.
+
+:class:`RewardTelemetry` copies each step's rewards and reward components
+into preallocated column arrays.  When a batch fills up, it is handed to a
+writer thread and a recycled buffer takes its place, so the step loop never
+touches the filesystem.  Two tables are produced:
+
+- ``steps``: one row per agent per step with ``episode``, ``step``,
+  ``physics_step``, ``agent`` (index into the manifest's agents), ``reward``
+  and one column per reward component.
+- ``episodes``: one row per agent per finished episode with ``episode``,
+  ``agent``, ``length``, ``seed`` (``-1`` when unknown), ``return`` and the
+  per-component totals.
+
+Output goes to ``directory`` as gzip-compressed CSV parts (``fmt="csv"``)
+or NumPy ``.npz`` column archives (``fmt="npz"``).  A part is rotated
+once it holds ``rows_per_file`` rows.  ``telemetry.json`` records the agent
+names, component names and format.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import queue
+import threading
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from types import TracebackType
+from typing import IO, TYPE_CHECKING, Any, Final, Literal, Self
+
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from bjjsim.env import StepResult
+
+TelemetryFormat = Literal["csv", "npz"]
+
+MANIFEST_FILENAME: Final[str] = "telemetry.json"
+DEFAULT_COMPONENTS: Final[tuple[str, ...]] = ("step_reward", "energy_penalty")
+
+_STEP_INDEX_COLUMNS: Final[tuple[str, ...]] = ("episode", "step", "physics_step", "agent")
+_EPISODE_INDEX_COLUMNS: Final[tuple[str, ...]] = ("episode", "agent", "length", "seed")
+
+
+class _ColumnBatch:
+    """Fixed-capacity set of named columns filled row by row."""
+
+    __slots__ = ("columns", "size")
+
+    def __init__(self, dtypes: Mapping[str, npt.DTypeLike], capacity: int) -> None:
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in dtypes.items()}
+        self.size = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(next(iter(self.columns.values())))
+
+    def view(self) -> dict[str, npt.NDArray[Any]]:
+        return {name: column[: self.size] for name, column in self.columns.items()}
+
+
+class _TableSink:
+    """Writes batches of one table to rotating part files (writer thread only)."""
+
+    def __init__(
+        self,
+        directory: Path,
+        table: str,
+        dtypes: Mapping[str, npt.DTypeLike],
+        fmt: TelemetryFormat,
+        rows_per_file: int,
+        compress: bool,
+    ) -> None:
+        self.directory = directory
+        self.table = table
+        self.names = tuple(dtypes)
+        self.integer = tuple(np.dtype(dtype).kind in "iu" for dtype in dtypes.values())
+        self.fmt = fmt
+        self.rows_per_file = rows_per_file
+        self.compress = compress
+        self.part = 0
+        self.rows_in_part = 0
+        self._handle: IO[str] | None = None
+
+    def write(self, columns: Mapping[str, npt.NDArray[Any]]) -> None:
+        rows = len(columns[self.names[0]])
+        start = 0
+        while start < rows:
+            take = min(rows - start, self.rows_per_file - self.rows_in_part)
+            chunk = {name: column[start : start + take] for name, column in columns.items()}
+            if self.fmt == "csv":
+                self._write_csv(chunk)
+            else:
+                self._write_npz(chunk)
+            self.rows_in_part += take
+            start += take
+            # Archives cannot be appended to, so every npz write is its own part.
+            if self.fmt == "npz" or self.rows_in_part >= self.rows_per_file:
+                self._rotate()
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _part_path(self, suffix: str) -> Path:
+        return self.directory / f"{self.table}-{self.part:05d}{suffix}"
+
+    def _rotate(self) -> None:
+        self.close()
+        self.part += 1
+        self.rows_in_part = 0
+
+    def _write_csv(self, chunk: Mapping[str, npt.NDArray[Any]]) -> None:
+        if self._handle is None:
+            if self.compress:
+                self._handle = gzip.open(self._part_path(".csv.gz"), "wt", encoding="utf-8")
+            else:
+                self._handle = open(self._part_path(".csv"), "w", encoding="utf-8")
+            self._handle.write(",".join(self.names) + "\n")
+        fmt = ["%d" if integer else "%.9g" for integer in self.integer]
+        table = np.column_stack([chunk[name].astype(np.float64) for name in self.names])
+        np.savetxt(self._handle, table, fmt=fmt, delimiter=",")
+
+    def _write_npz(self, chunk: Mapping[str, npt.NDArray[Any]]) -> None:
+        path = self._part_path(".npz")
+        arrays: dict[str, Any] = dict(chunk)
+        if self.compress:
+            np.savez_compressed(path, **arrays)
+        else:
+            np.savez(path, **arrays)
+
+
+class RewardTelemetry:
+    """Accumulate reward components in columns and flush them in the background.
+
+    Call :meth:`record_step`, :meth:`record_result` or :meth:`record_infos`
+    after every step and :meth:`end_episode` when an episode finishes.  Full
+    batches of ``batch_rows`` rows are queued for the writer thread; at most
+    ``max_pending`` batches wait in the queue before recording blocks, which
+    bounds memory when the disk falls behind.  Errors raised by the writer
+    thread are re-raised from the next call on the recording thread.
+
+    Use as a context manager, or call :meth:`close` to flush and join.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        agents: Sequence[str],
+        *,
+        components: Sequence[str] = DEFAULT_COMPONENTS,
+        fmt: TelemetryFormat = "csv",
+        compress: bool = True,
+        batch_rows: int = 8192,
+        rows_per_file: int = 1_000_000,
+        max_pending: int = 4,
+    ) -> None:
+        if not agents:
+            msg = "agents must contain at least one agent"
+            raise ValueError(msg)
+        if fmt not in ("csv", "npz"):
+            msg = f"unknown telemetry format {fmt!r}"
+            raise ValueError(msg)
+        if batch_rows < len(agents) or rows_per_file < 1 or max_pending < 1:
+            msg = "batch_rows must hold one step and rows_per_file/max_pending must be positive"
+            raise ValueError(msg)
+        reserved = set(_STEP_INDEX_COLUMNS) | set(_EPISODE_INDEX_COLUMNS) | {"reward", "return"}
+        if reserved.intersection(components) or len(set(components)) != len(components):
+            msg = "component names must be unique and must not shadow index columns"
+            raise ValueError(msg)
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.agents: tuple[str, ...] = tuple(agents)
+        self.components: tuple[str, ...] = tuple(components)
+        self.fmt: TelemetryFormat = fmt
+        self.batch_rows = batch_rows
+        self.episode = 0
+        self.closed = False
+
+        num_agents = len(self.agents)
+        self._step_dtypes: dict[str, npt.DTypeLike] = {
+            "episode": np.int64,
+            "step": np.int64,
+            "physics_step": np.int64,
+            "agent": np.int32,
+            "reward": np.float32,
+            **{name: np.float32 for name in self.components},
+        }
+        self._episode_dtypes: dict[str, npt.DTypeLike] = {
+            "episode": np.int64,
+            "agent": np.int32,
+            "length": np.int64,
+            "seed": np.int64,
+            "return": np.float64,
+            **{name: np.float64 for name in self.components},
+        }
+        # Whole steps per batch, so a step's rows are never split across batches.
+        self._step_capacity = batch_rows - batch_rows % num_agents
+        self._agent_ids = np.arange(num_agents, dtype=np.int32)
+        self._steps = _ColumnBatch(self._step_dtypes, self._step_capacity)
+        self._episodes = _ColumnBatch(self._episode_dtypes, max(num_agents, 256))
+        self._free: queue.SimpleQueue[_ColumnBatch] = queue.SimpleQueue()
+        self._episode_length = 0
+        self._episode_return = np.zeros(num_agents, dtype=np.float64)
+        self._episode_totals = np.zeros((len(self.components), num_agents), dtype=np.float64)
+
+        manifest = {
+            "agents": list(self.agents),
+            "components": list(self.components),
+            "format": fmt,
+            "compress": compress,
+            "tables": {
+                "steps": list(self._step_dtypes),
+                "episodes": list(self._episode_dtypes),
+            },
+        }
+        (self.directory / MANIFEST_FILENAME).write_text(
+            json.dumps(manifest, indent=2), encoding="utf-8"
+        )
+        self._sinks = {
+            "steps": _TableSink(
+                self.directory, "steps", self._step_dtypes, fmt, rows_per_file, compress
+            ),
+            "episodes": _TableSink(
+                self.directory, "episodes", self._episode_dtypes, fmt, rows_per_file, compress
+            ),
+        }
+        self._queue: queue.Queue[tuple[str, _ColumnBatch] | None] = queue.Queue(max_pending)
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(
+            target=self._write_loop, name="bjjsim-telemetry", daemon=True
+        )
+        self._thread.start()
+
+    def record_step(
+        self,
+        rewards: npt.ArrayLike,
+        components: Mapping[str, npt.ArrayLike],
+        *,
+        step: int,
+        physics_step: int,
+    ) -> None:
+        """Record one step: per-agent ``rewards`` and each component's per-agent values."""
+
+        self._check_open()
+        batch = self._steps
+        if batch.size == batch.capacity:
+            self._submit("steps")
+            batch = self._steps
+        rows = slice(batch.size, batch.size + len(self.agents))
+        columns = batch.columns
+        columns["episode"][rows] = self.episode
+        columns["step"][rows] = step
+        columns["physics_step"][rows] = physics_step
+        columns["agent"][rows] = self._agent_ids
+        columns["reward"][rows] = rewards
+        self._episode_return += columns["reward"][rows]
+        for idx, name in enumerate(self.components):
+            columns[name][rows] = components[name]
+            self._episode_totals[idx] += columns[name][rows]
+        batch.size = rows.stop
+        self._episode_length += 1
+
+    def record_infos(
+        self, rewards: Mapping[str, float], infos: Mapping[str, Mapping[str, Any]]
+    ) -> None:
+        """Record a step from the dict outputs of :meth:`BJJMultiAgentEnv.step`."""
+
+        first = infos[self.agents[0]]
+        self.record_step(
+            [rewards[agent] for agent in self.agents],
+            {
+                name: [infos[agent]["reward_components"][name] for agent in self.agents]
+                for name in self.components
+            },
+            step=int(first["step"]),
+            physics_step=int(first["physics_step"]),
+        )
+
+    def record_result(self, result: StepResult) -> None:
+        """Record a step from a :class:`~bjjsim.env.StepResult` without touching its dicts.
+
+        Only the ``step_reward`` and ``energy_penalty`` components are available.
+        """
+
+        rows = {"step_reward": result.step_rewards, "energy_penalty": result.energy_penalties}
+        self.record_step(
+            result.reward_values,
+            {name: rows[name] for name in self.components},
+            step=result.step,
+            physics_step=result.physics_step,
+        )
+
+    def end_episode(self, *, seed: int | None = None) -> None:
+        """Write the episode summary rows and start counting the next episode."""
+
+        self._check_open()
+        batch = self._episodes
+        if batch.size + len(self.agents) > batch.capacity:
+            self._submit("episodes")
+            batch = self._episodes
+        rows = slice(batch.size, batch.size + len(self.agents))
+        columns = batch.columns
+        columns["episode"][rows] = self.episode
+        columns["agent"][rows] = self._agent_ids
+        columns["length"][rows] = self._episode_length
+        columns["seed"][rows] = -1 if seed is None else seed
+        columns["return"][rows] = self._episode_return
+        for idx, name in enumerate(self.components):
+            columns[name][rows] = self._episode_totals[idx]
+        batch.size = rows.stop
+        self.episode += 1
+        self._episode_length = 0
+        self._episode_return.fill(0.0)
+        self._episode_totals.fill(0.0)
+
+    def flush(self) -> None:
+        """Queue partially filled batches and wait until everything is written."""
+
+        self._check_open()
+        for table in ("steps", "episodes"):
+            if self._batch(table).size:
+                self._submit(table)
+        self._queue.join()
+        self._raise_pending_error()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            if self._error is None:
+                self.flush()
+        finally:
+            self.closed = True
+            self._queue.put(None)
+            self._thread.join()
+        self._raise_pending_error()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _batch(self, table: str) -> _ColumnBatch:
+        return self._steps if table == "steps" else self._episodes
+
+    def _submit(self, table: str) -> None:
+        """Hand the current batch of ``table`` to the writer and swap in a fresh one."""
+
+        self._raise_pending_error()
+        full = self._batch(table)
+        self._queue.put((table, full))
+        if table == "steps":
+            try:
+                self._steps = self._free.get_nowait()
+            except queue.Empty:
+                self._steps = _ColumnBatch(self._step_dtypes, self._step_capacity)
+        else:
+            self._episodes = _ColumnBatch(self._episode_dtypes, full.capacity)
+
+    def _write_loop(self) -> None:
+        try:
+            while True:
+                item = self._queue.get()
+                try:
+                    if item is None:
+                        return
+                    table, batch = item
+                    if self._error is None:
+                        try:
+                            self._sinks[table].write(batch.view())
+                        except BaseException as exc:  # surfaced on the recording thread
+                            self._error = exc
+                    if table == "steps":
+                        batch.size = 0
+                        self._free.put(batch)
+                finally:
+                    self._queue.task_done()
+        finally:
+            for sink in self._sinks.values():
+                sink.close()
+
+    def _check_open(self) -> None:
+        if self.closed:
+            msg = "telemetry writer is closed"
+            raise RuntimeError(msg)
+        self._raise_pending_error()
+
+    def _raise_pending_error(self) -> None:
+        error = self._error
+        if error is not None:
+            msg = "telemetry writer thread failed"
+            raise RuntimeError(msg) from error
+
+
+__all__ = [
+    "DEFAULT_COMPONENTS",
+    "MANIFEST_FILENAME",
+    "RewardTelemetry",
+    "TelemetryFormat",
+]
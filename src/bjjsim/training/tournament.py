@@ -0,0 +1,460 @@
+"""Round-robin tournaments between policy snapshots with incremental ratings.
+
+Every pair of snapshots in an :class:`~bjjsim.training.OpponentPool` plays
+matches over a range of seeds.  Matches run on a process pool whose workers
+each open the pool (snapshots are memory-mapped, so workers share the page
+cache) and keep one warmed :class:`~bjjsim.env.BJJMultiAgentEnv` that is
+reset, not rebuilt, between matches.  Results are yielded as they finish and
+folded into Elo and TrueSkill ratings straight away; pairings whose TrueSkill
+uncertainty has converged stop receiving new seeds.
+
+The env has no win condition yet, so a match is scored by episode return:
+the snapshot with the higher return wins, equal returns (within
+``draw_margin``) draw.  Seats alternate with the seed parity to cancel any
+first-seat advantage.
+
+With an :class:`~bjjsim.training.EvaluationCache`, results are stored under
+a key derived from the env config, both policies' weight digests and the
+seed, and matches already played by any earlier tournament are served from
+the cache instead of being replayed.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import os
+from collections import deque
+from collections.abc import Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from statistics import NormalDist
+
+import numpy as np
+
+from bjjsim.env import BJJMultiAgentEnv, EnvConfig
+from bjjsim.training.eval_cache import EvaluationCache, evaluation_key, policy_digest
+from bjjsim.training.opponents import OpponentPool
+from bjjsim.training.policy import MLPPolicy
+
+_NORMAL = NormalDist()
+
+
+@dataclass(slots=True, frozen=True)
+class MatchSpec:
+    player_a: str
+    player_b: str
+    seed: int
+
+
+@dataclass(slots=True, frozen=True)
+class MatchResult:
+    player_a: str
+    player_b: str
+    seed: int
+    score_a: float  # 1.0 win, 0.5 draw, 0.0 loss for player_a
+    return_a: float
+    return_b: float
+    steps: int
+
+
+@dataclass(slots=True, frozen=True)
+class Standing:
+    snapshot_id: str
+    games: int
+    score: float
+    elo: float
+    mu: float
+    sigma: float
+
+    @property
+    def conservative(self) -> float:
+        """TrueSkill's ``mu - 3 * sigma`` lower bound, used for ranking."""
+
+        return self.mu - 3.0 * self.sigma
+
+
+def play_match(
+    env: BJJMultiAgentEnv,
+    policy_a: MLPPolicy,
+    policy_b: MLPPolicy,
+    spec: MatchSpec,
+    *,
+    draw_margin: float = 1e-6,
+) -> MatchResult:
+    """Play one episode between two policies on an already constructed env.
+
+    ``player_a`` takes the first agent seat on even seeds and the second on
+    odd seeds.  Only the first two agents are controlled; any others act
+    with zeros.
+    """
+
+    if len(env.agents) < 2:
+        msg = "a match needs an env with at least two agents"
+        raise ValueError(msg)
+    swap = spec.seed % 2 == 1
+    seat_a, seat_b = (1, 0) if swap else (0, 1)
+    obs = np.zeros((len(env.agents), env.config.observation_dim), dtype=np.float64)
+    rewards = np.zeros(len(env.agents), dtype=np.float64)
+    actions = np.zeros((len(env.agents), env.config.action_dim), dtype=np.float64)
+    returns = np.zeros(len(env.agents), dtype=np.float64)
+
+    env.reset_arrays(obs, seed=spec.seed)
+    steps = 0
+    while True:
+        actions[seat_a] = policy_a(obs[seat_a : seat_a + 1])[0]
+        actions[seat_b] = policy_b(obs[seat_b : seat_b + 1])[0]
+        terminated, truncated, _ = env.step_arrays(actions, obs, rewards)
+        returns += rewards
+        steps += 1
+        if terminated or truncated:
+            break
+
+    return_a, return_b = float(returns[seat_a]), float(returns[seat_b])
+    if abs(return_a - return_b) <= draw_margin:
+        score_a = 0.5
+    else:
+        score_a = 1.0 if return_a > return_b else 0.0
+    return MatchResult(spec.player_a, spec.player_b, spec.seed, score_a, return_a, return_b, steps)
+
+
+class EloRatings:
+    """Classic Elo with a fixed K-factor."""
+
+    def __init__(self, *, k_factor: float = 16.0, initial: float = 1500.0) -> None:
+        self.k_factor = k_factor
+        self.initial = initial
+        self.ratings: dict[str, float] = {}
+
+    def rating(self, player: str) -> float:
+        return self.ratings.get(player, self.initial)
+
+    def expected(self, player_a: str, player_b: str) -> float:
+        diff = self.rating(player_b) - self.rating(player_a)
+        return 1.0 / (1.0 + math.pow(10.0, diff / 400.0))
+
+    def update(self, player_a: str, player_b: str, score_a: float) -> None:
+        delta = self.k_factor * (score_a - self.expected(player_a, player_b))
+        self.ratings[player_a] = self.rating(player_a) + delta
+        self.ratings[player_b] = self.rating(player_b) - delta
+
+
+class TrueSkillRatings:
+    """Two-player TrueSkill (Herbrich et al.) with draws."""
+
+    def __init__(
+        self,
+        *,
+        mu: float = 25.0,
+        sigma: float = 25.0 / 3.0,
+        beta: float = 25.0 / 6.0,
+        tau: float = 25.0 / 300.0,
+        draw_probability: float = 0.1,
+    ) -> None:
+        if not 0.0 <= draw_probability < 1.0:
+            msg = "draw_probability must lie in [0, 1)"
+            raise ValueError(msg)
+        self.initial = (mu, sigma)
+        self.beta = beta
+        self.tau = tau
+        self.draw_margin = _NORMAL.inv_cdf((draw_probability + 1.0) / 2.0) * math.sqrt(2.0) * beta
+        self.ratings: dict[str, tuple[float, float]] = {}
+
+    def rating(self, player: str) -> tuple[float, float]:
+        """Return ``(mu, sigma)`` for ``player``."""
+
+        return self.ratings.get(player, self.initial)
+
+    def update(self, player_a: str, player_b: str, score_a: float) -> None:
+        if score_a == 0.5:
+            self._update(player_a, player_b, draw=True)
+        elif score_a > 0.5:
+            self._update(player_a, player_b, draw=False)
+        else:
+            self._update(player_b, player_a, draw=False)
+
+    def _update(self, winner: str, loser: str, *, draw: bool) -> None:
+        mu_w, sigma_w = self.rating(winner)
+        mu_l, sigma_l = self.rating(loser)
+        var_w = sigma_w**2 + self.tau**2
+        var_l = sigma_l**2 + self.tau**2
+        c = math.sqrt(2.0 * self.beta**2 + var_w + var_l)
+        t = (mu_w - mu_l) / c
+        eps = self.draw_margin / c
+        if draw:
+            v, w = _v_draw(t, eps), _w_draw(t, eps)
+        else:
+            v, w = _v_win(t, eps), _w_win(t, eps)
+        self.ratings[winner] = (
+            mu_w + var_w / c * v,
+            math.sqrt(var_w * max(1.0 - var_w / c**2 * w, 1e-12)),
+        )
+        self.ratings[loser] = (
+            mu_l - var_l / c * v,
+            math.sqrt(var_l * max(1.0 - var_l / c**2 * w, 1e-12)),
+        )
+
+
+def _v_win(t: float, eps: float) -> float:
+    denom = _NORMAL.cdf(t - eps)
+    if denom < 1e-300:
+        return -t + eps
+    return _NORMAL.pdf(t - eps) / denom
+
+
+def _w_win(t: float, eps: float) -> float:
+    v = _v_win(t, eps)
+    return v * (v + t - eps)
+
+
+def _v_draw(t: float, eps: float) -> float:
+    denom = _NORMAL.cdf(eps - t) - _NORMAL.cdf(-eps - t)
+    if denom < 1e-300:
+        return -t + (eps if t < 0 else -eps)
+    return (_NORMAL.pdf(-eps - t) - _NORMAL.pdf(eps - t)) / denom
+
+
+def _w_draw(t: float, eps: float) -> float:
+    denom = _NORMAL.cdf(eps - t) - _NORMAL.cdf(-eps - t)
+    if denom < 1e-300:
+        return 1.0
+    v = _v_draw(t, eps)
+    return v**2 + ((eps - t) * _NORMAL.pdf(eps - t) + (eps + t) * _NORMAL.pdf(eps + t)) / denom
+
+
+# Per-process state for pool workers, created once by ``_init_worker``.
+_worker_pool: OpponentPool | None = None
+_worker_env: BJJMultiAgentEnv | None = None
+_worker_draw_margin: float = 1e-6
+
+
+def _init_worker(directory: str, config: EnvConfig, cache_size: int, draw_margin: float) -> None:
+    global _worker_pool, _worker_env, _worker_draw_margin
+    _worker_pool = OpponentPool(directory, cache_size=cache_size)
+    _worker_env = BJJMultiAgentEnv(config)
+    _worker_draw_margin = draw_margin
+
+
+def _run_in_worker(spec: MatchSpec) -> MatchResult:
+    if _worker_pool is None or _worker_env is None:
+        msg = "tournament worker was not initialized"
+        raise RuntimeError(msg)
+    return play_match(
+        _worker_env,
+        MLPPolicy.from_parameters(_worker_pool.load(spec.player_a).params),
+        MLPPolicy.from_parameters(_worker_pool.load(spec.player_b).params),
+        spec,
+        draw_margin=_worker_draw_margin,
+    )
+
+
+class Tournament:
+    """Round-robin between snapshots of an :class:`OpponentPool`.
+
+    ``seeds_per_pairing`` bounds the matches per pairing.  With
+    ``sigma_threshold`` set, a pairing stops once it has played ``min_games``
+    and both players' TrueSkill ``sigma`` is below the threshold.  Matches
+    are scheduled seed-major, so every pairing gets early games before any
+    pairing gets many.  ``workers=0`` plays matches in the calling process.
+    Results found in ``cache`` are rated without playing the match, and new
+    results are added to it.
+    """
+
+    def __init__(
+        self,
+        pool: OpponentPool,
+        *,
+        snapshot_ids: Sequence[str] | None = None,
+        seeds_per_pairing: int = 16,
+        base_seed: int = 0,
+        workers: int | None = None,
+        env_config: EnvConfig | None = None,
+        min_games: int = 4,
+        sigma_threshold: float | None = None,
+        draw_margin: float = 1e-6,
+        elo: EloRatings | None = None,
+        trueskill: TrueSkillRatings | None = None,
+        cache: EvaluationCache | None = None,
+    ) -> None:
+        ids = list(snapshot_ids) if snapshot_ids is not None else pool.snapshot_ids
+        if len(ids) < 2:
+            msg = "a tournament needs at least two snapshots"
+            raise ValueError(msg)
+        if seeds_per_pairing < 1:
+            msg = "seeds_per_pairing must be at least 1"
+            raise ValueError(msg)
+        self.pool = pool
+        self.snapshot_ids = ids
+        self.seeds_per_pairing = seeds_per_pairing
+        self.base_seed = base_seed
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.env_config = env_config or EnvConfig()
+        self.min_games = min_games
+        self.sigma_threshold = sigma_threshold
+        self.draw_margin = draw_margin
+        self.elo = elo or EloRatings()
+        self.trueskill = trueskill or TrueSkillRatings()
+        self.cache = cache
+        self.results: list[MatchResult] = []
+        self.skipped_matches = 0
+        self.cached_matches = 0
+        self._games: dict[tuple[str, str], int] = {}
+        self._digests: dict[str, str] = {}
+
+    @property
+    def pairings(self) -> list[tuple[str, str]]:
+        return list(itertools.combinations(self.snapshot_ids, 2))
+
+    def converged(self, player_a: str, player_b: str) -> bool:
+        """Whether the pairing may stop early under ``sigma_threshold``."""
+
+        if self.sigma_threshold is None:
+            return False
+        if self._games.get((player_a, player_b), 0) < self.min_games:
+            return False
+        return (
+            self.trueskill.rating(player_a)[1] < self.sigma_threshold
+            and self.trueskill.rating(player_b)[1] < self.sigma_threshold
+        )
+
+    def run(self) -> Iterator[MatchResult]:
+        """Play the tournament, yielding each result as soon as it is rated."""
+
+        schedule = deque(
+            MatchSpec(a, b, self.base_seed + s)
+            for s in range(self.seeds_per_pairing)
+            for a, b in self.pairings
+        )
+        if self.workers <= 0:
+            yield from self._run_inline(schedule)
+        else:
+            yield from self._run_pool(schedule)
+
+    def standings(self) -> list[Standing]:
+        """Current ratings, best conservative TrueSkill estimate first."""
+
+        games = dict.fromkeys(self.snapshot_ids, 0)
+        score = dict.fromkeys(self.snapshot_ids, 0.0)
+        for r in self.results:
+            games[r.player_a] += 1
+            games[r.player_b] += 1
+            score[r.player_a] += r.score_a
+            score[r.player_b] += 1.0 - r.score_a
+        rows = [
+            Standing(sid, games[sid], score[sid], self.elo.rating(sid), *self.trueskill.rating(sid))
+            for sid in self.snapshot_ids
+        ]
+        return sorted(rows, key=lambda row: row.conservative, reverse=True)
+
+    def _next_spec(self, schedule: deque[MatchSpec]) -> MatchSpec | None:
+        while schedule:
+            spec = schedule.popleft()
+            if not self.converged(spec.player_a, spec.player_b):
+                return spec
+            self.skipped_matches += 1
+        return None
+
+    def _match_key(self, spec: MatchSpec) -> str:
+        for sid in (spec.player_a, spec.player_b):
+            if sid not in self._digests:
+                self._digests[sid] = policy_digest(self.pool.load(sid).params)
+        return evaluation_key(
+            self.env_config,
+            spec.seed,
+            policies=(self._digests[spec.player_a], self._digests[spec.player_b]),
+            extra={"kind": "match", "draw_margin": self.draw_margin},
+        )
+
+    def _cached(self, spec: MatchSpec) -> MatchResult | None:
+        if self.cache is None:
+            return None
+        value = self.cache.get(self._match_key(spec))
+        if value is None:
+            return None
+        self.cached_matches += 1
+        return MatchResult(
+            spec.player_a,
+            spec.player_b,
+            spec.seed,
+            float(value["score_a"]),
+            float(value["return_a"]),
+            float(value["return_b"]),
+            int(value["steps"]),
+        )
+
+    def _store(self, result: MatchResult) -> MatchResult:
+        if self.cache is not None:
+            spec = MatchSpec(result.player_a, result.player_b, result.seed)
+            # Snapshot IDs are not part of the outcome; the key already
+            # identifies both players by their weights.
+            value = asdict(result)
+            for name in ("player_a", "player_b", "seed"):
+                del value[name]
+            self.cache.put(self._match_key(spec), value)
+        return result
+
+    def _record(self, result: MatchResult) -> MatchResult:
+        self.elo.update(result.player_a, result.player_b, result.score_a)
+        self.trueskill.update(result.player_a, result.player_b, result.score_a)
+        key = (result.player_a, result.player_b)
+        self._games[key] = self._games.get(key, 0) + 1
+        self.results.append(result)
+        return result
+
+    def _run_inline(self, schedule: deque[MatchSpec]) -> Iterator[MatchResult]:
+        env = BJJMultiAgentEnv(self.env_config)
+        while (spec := self._next_spec(schedule)) is not None:
+            cached = self._cached(spec)
+            if cached is not None:
+                yield self._record(cached)
+                continue
+            result = play_match(
+                env,
+                MLPPolicy.from_parameters(self.pool.load(spec.player_a).params),
+                MLPPolicy.from_parameters(self.pool.load(spec.player_b).params),
+                spec,
+                draw_margin=self.draw_margin,
+            )
+            yield self._record(self._store(result))
+
+    def _run_pool(self, schedule: deque[MatchSpec]) -> Iterator[MatchResult]:
+        # Keep a short queue in flight so early stopping can still drop
+        # matches that have not been submitted yet.
+        max_in_flight = 2 * self.workers
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(
+                str(self.pool.directory),
+                self.env_config,
+                len(self.snapshot_ids),
+                self.draw_margin,
+            ),
+        ) as executor:
+            in_flight: set[Future[MatchResult]] = set()
+            while True:
+                while len(in_flight) < max_in_flight:
+                    spec = self._next_spec(schedule)
+                    if spec is None:
+                        break
+                    cached = self._cached(spec)
+                    if cached is not None:
+                        yield self._record(cached)
+                        continue
+                    in_flight.add(executor.submit(_run_in_worker, spec))
+                if not in_flight:
+                    return
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield self._record(self._store(future.result()))
+
+
+__all__ = [
+    "EloRatings",
+    "MatchResult",
+    "MatchSpec",
+    "Standing",
+    "Tournament",
+    "TrueSkillRatings",
+    "play_match",
+]
@@ -1,21 +1,57 @@
 from __future__ import annotations
 
 import asyncio
+import os
+import secrets
+import threading
 from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from contextlib import asynccontextmanager, suppress
 from dataclasses import dataclass, field
+from functools import cache, partial
 from io import BytesIO
 from pathlib import Path
-from time import monotonic
-from typing import Final
-
-from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, Response
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-from PIL import Image, ImageDraw, ImageFont
+from time import monotonic, perf_counter
+from types import ModuleType
+from typing import TYPE_CHECKING, Annotated, Any, Final
+
+from fastapi import (
+    Depends,
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
-
-from bjjsim.physics import DeterministicCounterAdapter, PhysicsAdapter
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from bjjsim.physics import PhysicsAdapter, SupportsActionChunks, SupportsPoses
+from bjjsim.web.executor import SimulationExecutor
+from bjjsim.web.metrics import (
+    CONTENT_TYPE,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    WindowedRate,
+)
+from bjjsim.web.poses import ORIENTATION_SCALE, POSE_FORMAT_VERSION, POSITION_SCALE, encode_poses
+from bjjsim.web.sessions import (
+    DEFAULT_SESSION_ID,
+    AdapterPool,
+    SessionManager,
+    SessionNotFoundError,
+)
+
+if TYPE_CHECKING:
+    from fastapi.templating import Jinja2Templates
+
+    from bjjsim.replay import ReplayStore, Trajectory
+    from bjjsim.web.shared_state import SharedStateSegment
 
 
 class ResetRequest(BaseModel):
@@ -36,11 +72,24 @@ class StepRequest(BaseModel):
     num_steps: int = Field(default=1, ge=1, le=1000)
 
 
+class StepChunkRequest(BaseModel):
+    """Open-loop action chunk: for each step, one action row per agent."""
+
+    actions: list[list[list[float]]] = Field(min_length=1, max_length=1000)
+
+
 class StateResponse(BaseModel):
     episode_running: bool = False
     last_seed: int | None = None
     step: int = 0
     metrics: dict[str, float] = Field(default_factory=dict)
+    version: int = 0
+
+
+class StepChunkResponse(StateResponse):
+    steps_run: int = 0
+    observations: list[list[list[float]]] = Field(default_factory=list)
+    rewards: list[list[float]] = Field(default_factory=list)
 
 
 class HealthResponse(BaseModel):
@@ -73,6 +122,109 @@ class EventsResponse(BaseModel):
     events: list[Event]
 
 
+class SessionResponse(BaseModel):
+    session_id: str
+
+
+class SessionSummary(BaseModel):
+    session_id: str
+    idle_seconds: float
+    pinned: bool
+
+
+class SessionsResponse(BaseModel):
+    sessions: list[SessionSummary]
+    max_sessions: int
+
+
+class ReplayField(BaseModel):
+    dtype: str
+    frame_shape: list[int]
+    frame_nbytes: int
+
+
+class ReplaySummary(BaseModel):
+    replay_id: str
+    num_frames: int
+    agents: list[str]
+    metadata: dict[str, Any]
+
+
+class ReplayDetail(ReplaySummary):
+    fields: dict[str, ReplayField]
+
+
+class ReplaysResponse(BaseModel):
+    replays: list[ReplaySummary]
+
+
+class ReplayStep(BaseModel):
+    index: int
+    physics_step: int
+    observations: list[list[float]]
+    actions: list[list[float]]
+    rewards: list[float]
+
+
+class ReplayStepsResponse(BaseModel):
+    replay_id: str
+    start: int
+    stop: int
+    num_frames: int
+    steps: list[ReplayStep]
+
+
+class _StateVersion:
+    """Monotonic change counter that coroutines on any event loop can wait on.
+
+    :meth:`bump` runs on the simulation thread; waiters are futures resolved
+    through their own loop's ``call_soon_threadsafe``, so neither side needs
+    to share an event loop with the other.
+    """
+
+    def __init__(self) -> None:
+        self.value = 0
+        self._lock = threading.Lock()
+        self._waiters: set[asyncio.Future[None]] = set()
+
+    def bump(self) -> int:
+        with self._lock:
+            self.value += 1
+            value = self.value
+            waiters, self._waiters = self._waiters, set()
+        for waiter in waiters:
+            # The waiter's loop may already be closed (e.g. a torn-down test client).
+            with suppress(RuntimeError):
+                waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+        return value
+
+    async def wait_for(self, target: int, timeout_s: float) -> int:
+        """Wait until the version reaches ``target`` or ``timeout_s`` passes."""
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_s
+        while True:
+            with self._lock:
+                if self.value >= target:
+                    return self.value
+                waiter = loop.create_future()
+                self._waiters.add(waiter)
+            remaining = deadline - loop.time()
+            try:
+                if remaining <= 0:
+                    return self.value
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(waiter, remaining)
+            finally:
+                with self._lock:
+                    self._waiters.discard(waiter)
+
+
+def _wake(waiter: asyncio.Future[None]) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
 @dataclass
 class _ServerState:
     episode_running: bool = False
@@ -85,9 +237,61 @@ class _ServerState:
     steps_ema_sps: float = 0.0
     # In-memory event log (ring buffer)
     event_log: deque[Event] = field(default_factory=lambda: deque(maxlen=500))
+    # Bumped after every mutation; drives ETags and long-polling on /api/sim/state.
+    changes: _StateVersion = field(default_factory=_StateVersion)
+    # (version, encoded frame) shared by every /ws/poses client of the session.
+    pose_cache: tuple[int, bytes] | None = None
+
+    @property
+    def version(self) -> int:
+        return self.changes.value
 
 
 TEMPLATES_DIR: Final[Path] = Path(__file__).parent / "templates"
+# Where recorded trajectories are served from when ``create_app`` is not given
+# ``replay_dir`` (e.g. under ``uvicorn --factory``).
+REPLAY_DIR_ENV: Final[str] = "BJJSIM_REPLAY_DIR"
+MAX_REPLAY_PAGE: Final[int] = 500
+MAX_STATE_WAIT_S: Final[float] = 60.0
+DEFAULT_POSE_HZ: Final[int] = 60
+MAX_POSE_HZ: Final[int] = 240
+_RAW_CHUNK_BYTES: Final[int] = 64 * 1024
+
+
+# Jinja2, static file serving and Pillow are only needed once a page, asset or
+# frame is actually requested, so they are imported on first use to keep
+# ``import bjjsim.web.app`` and time-to-first-/healthz small.
+@cache
+def _templates() -> Jinja2Templates:
+    from fastapi.templating import Jinja2Templates
+
+    return Jinja2Templates(directory=str(TEMPLATES_DIR))
+
+
+@cache
+def _imaging() -> tuple[ModuleType, ModuleType, object]:
+    from PIL import Image, ImageDraw, ImageFont
+
+    try:
+        font: object = ImageFont.load_default()
+    except Exception:
+        font = None
+    return Image, ImageDraw, font
+
+
+class _LazyStaticFiles:
+    """ASGI app that builds :class:`~fastapi.staticfiles.StaticFiles` on first request."""
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = directory
+        self._app: ASGIApp | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self._app is None:
+            from fastapi.staticfiles import StaticFiles
+
+            self._app = StaticFiles(directory=str(self._directory))
+        await self._app(scope, receive, send)
 
 
 class AppConfig(BaseModel):
@@ -105,19 +309,309 @@ class AppConfigUpdate(BaseModel):
     max_steps_per_episode: int | None = Field(default=None, ge=1, le=100_000)
 
 
-def create_app() -> FastAPI:
+@dataclass
+class _Session:
+    """Everything one independent simulation needs: adapter, config and state."""
+
+    session_id: str
+    physics: PhysicsAdapter
+    config: AppConfig = field(default_factory=AppConfig)
+    state: _ServerState = field(default_factory=_ServerState)
+    # Set on the simulation thread just before the adapter goes back to the
+    # pool; work queued for a dropped session checks it instead of touching
+    # an adapter that may already belong to another session.
+    closed: bool = False
+
+
+def _ensure_open(session: _Session) -> None:
+    if session.closed:
+        raise HTTPException(status_code=404, detail="unknown session")
+
+
+class _RequestMetricsMiddleware:
+    """Pure ASGI middleware recording per-route latency and request counts.
+
+    Requests are labelled by route template (``/api/sessions/{session_id}``),
+    not raw path, to keep label cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp, *, latency: Histogram, requests: Counter) -> None:
+        self.app = app
+        self.latency = latency
+        self.requests = requests
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        started = perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = int(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = perf_counter() - started
+            route = getattr(scope.get("route"), "path", "<unmatched>")
+            method = str(scope.get("method", ""))
+            self.latency.labels(method, route).observe(elapsed)
+            self.requests.labels(method, route, str(status)).inc()
+
+
+def _lookup_session(sessions: SessionManager[_Session], session_id: str | None) -> _Session:
+    try:
+        return sessions.get(session_id or DEFAULT_SESSION_ID)
+    except SessionNotFoundError:
+        raise HTTPException(status_code=404, detail="unknown session") from None
+
+
+def _resolve_session(
+    request: Request,
+    session_id: Annotated[str | None, Query()] = None,
+    x_session_id: Annotated[str | None, Header()] = None,
+) -> _Session:
+    """Pick the session from ``?session_id=`` or ``X-Session-ID``, else the default."""
+
+    sessions: SessionManager[_Session] = request.app.state.sessions
+    return _lookup_session(sessions, session_id or x_session_id)
+
+
+SessionDep = Annotated[_Session, Depends(_resolve_session)]
+
+
+def _parse_byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single ``bytes=`` range into an inclusive ``(first, last)`` pair.
+
+    Returns ``None`` when the header should be ignored (malformed or
+    multi-range, which are then served in full as RFC 9110 allows) and raises
+    :class:`ValueError` when the range cannot be satisfied.
+    """
+
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first_s, sep, last_s = spec.strip().partition("-")
+    if not sep or (first_s and not first_s.isdigit()) or (last_s and not last_s.isdigit()):
+        return None
+    if first_s:
+        first = int(first_s)
+        if last_s and int(last_s) < first:
+            return None
+        if first >= size:
+            msg = "range starts past the end of the resource"
+            raise ValueError(msg)
+        return first, min(int(last_s), size - 1) if last_s else size - 1
+    if not last_s:
+        return None
+    suffix = int(last_s)
+    if suffix == 0 or size == 0:
+        msg = "empty suffix range"
+        raise ValueError(msg)
+    return max(0, size - suffix), size - 1
+
+
+def _iter_file(path: Path, first: int, length: int) -> Iterator[bytes]:
+    with path.open("rb") as handle:
+        handle.seek(first)
+        while length > 0:
+            chunk = handle.read(min(_RAW_CHUNK_BYTES, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison (RFC 9110 §13.1.2).
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def state_etag(epoch: str, session_id: str, version: int) -> str:
+    """Strong ETag for one version of a session's state within a server epoch."""
+    return f'"{epoch}-{session_id}-{version}"'
+
+
+def conditional_state(response: StateResponse, etag: str, if_none_match: str | None) -> Response:
+    """Serialize ``response`` with ``etag``, or answer 304 if the client has it."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(response.model_dump_json(), media_type="application/json", headers=headers)
+
+
+def ws_interval_s(ws: WebSocket) -> float:
+    """Seconds between ``/ws/events`` state messages, from ``interval_ms``."""
+    # Default 500 ms, overridable via query param (bounded 10..2000 ms)
+    raw_interval = ws.query_params.get("interval_ms") if ws.scope else None
+    try:
+        interval_ms = int(raw_interval) if raw_interval is not None else 500
+    except Exception:
+        interval_ms = 500
+    interval_ms = max(10, min(2000, interval_ms))
+    return interval_ms / 1000.0
+
+
+def _ws_pose_hz(ws: WebSocket) -> int:
+    # Upper bound on frames per second for /ws/poses (bounded 1..MAX_POSE_HZ)
+    raw_hz = ws.query_params.get("max_hz")
+    try:
+        max_hz = int(raw_hz) if raw_hz is not None else DEFAULT_POSE_HZ
+    except ValueError:
+        max_hz = DEFAULT_POSE_HZ
+    return max(1, min(MAX_POSE_HZ, max_hz))
+
+
+def create_app(
+    *,
+    max_sessions: int = 64,
+    session_idle_timeout_s: float = 900.0,
+    session_reap_interval_s: float = 30.0,
+    adapter_pool: AdapterPool | None = None,
+    replay_dir: str | os.PathLike[str] | None = None,
+    state_segment: str | None = None,
+) -> FastAPI:
+    """Build the UI app.
+
+    ``state_segment`` names a :class:`~bjjsim.web.shared_state.SharedStateSegment`
+    that the default session is published into after every change, for the
+    multi-worker deployment in :mod:`bjjsim.web.workers`.  Commits publish
+    only the scalar state; a preview frame is rendered when someone asks for
+    ``/api/frames/current`` and then published for the workers to reuse
+    until the next change.
+    """
+
     # Import locally to avoid any possibility of import cycles during app startup.
     from bjjsim import __version__ as pkg_version
 
-    app = FastAPI(title="BJJSim UI", version=pkg_version)
+    executor = SimulationExecutor()
+
+    def _retire_session(session: _Session, release: Callable[[], None]) -> None:
+        # Queued behind everything already submitted for the session, so its
+        # in-flight work finishes before the adapter is reset and pooled.
+        def retire() -> None:
+            session.closed = True
+            # Wake idle /ws/poses streams and long-polls so they see the close.
+            session.state.changes.bump()
+            release()
+
+        try:
+            executor.submit(retire)
+        except RuntimeError:  # executor shut down: nothing can use the adapter
+            retire()
+
+    sessions: SessionManager[_Session] = SessionManager(
+        _Session,
+        max_sessions=max_sessions,
+        idle_timeout_s=session_idle_timeout_s,
+        pool=adapter_pool,
+        retire=_retire_session,
+    )
+
+    async def _reap_sessions_periodically() -> None:
+        while True:
+            await asyncio.sleep(session_reap_interval_s)
+            sessions.reap_idle()
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        reaper = asyncio.create_task(_reap_sessions_periodically())
+        try:
+            yield
+        finally:
+            reaper.cancel()
+            with suppress(asyncio.CancelledError):
+                await reaper
+            executor.shutdown()
+            if publisher is not None:
+                publisher.close()
+
+    # Distinguishes versions across server restarts, which start again from 0.
+    state_epoch = secrets.token_hex(4)
+    publisher: SharedStateSegment | None = None
+    # Last frame published for the default session and the version it shows.
+    published_frame: tuple[int, bytes] = (-1, b"")
+
+    app = FastAPI(title="BJJSim UI", version=pkg_version, lifespan=lifespan)
+    app.state.sessions = sessions
+    app.state.executor = executor
+
+    registry = MetricsRegistry()
+    request_latency = registry.register(
+        Histogram(
+            "bjjsim_http_request_duration_seconds",
+            "HTTP request latency by route template.",
+            ("method", "route"),
+        )
+    )
+    requests_total = registry.register(
+        Counter(
+            "bjjsim_http_requests_total",
+            "HTTP requests by route template and status code.",
+            ("method", "route", "status"),
+        )
+    )
+    ws_connections = registry.register(
+        Gauge("bjjsim_websocket_connections", "Currently open WebSocket connections.")
+    )
+    ws_connections_total = registry.register(
+        Counter("bjjsim_websocket_connections_total", "WebSocket connections accepted.")
+    )
+    frame_render_seconds = registry.register(
+        Histogram("bjjsim_frame_render_seconds", "Time spent rendering preview frames.")
+    )
+    pose_encode_seconds = registry.register(
+        Histogram("bjjsim_pose_encode_seconds", "Time spent encoding /ws/poses frames.")
+    )
+    physics_step_seconds = registry.register(
+        Histogram("bjjsim_physics_step_seconds", "Duration of physics.step calls.")
+    )
+    sim_steps_total = registry.register(
+        Counter("bjjsim_sim_steps_total", "Simulation steps advanced across all sessions.")
+    )
+    step_batch_size = registry.register(
+        Histogram(
+            "bjjsim_sim_step_batch_requests",
+            "Step requests coalesced into one physics.step call.",
+            buckets=(1, 2, 4, 8, 16, 32, 64),
+        )
+    )
+    step_rate = WindowedRate(horizon_s=60)
+    registry.register(
+        Gauge(
+            "bjjsim_sim_steps_rate_10s",
+            "Simulation steps per second averaged over the last 10 whole seconds.",
+            function=lambda: step_rate.rate(10),
+        )
+    )
+    registry.register(
+        Gauge(
+            "bjjsim_sim_steps_rate_60s",
+            "Simulation steps per second averaged over the last 60 whole seconds.",
+            function=lambda: step_rate.rate(60),
+        )
+    )
+    registry.register(
+        Gauge("bjjsim_sessions", "Live simulation sessions.", function=lambda: len(sessions))
+    )
+    app.state.metrics = registry
+    app.add_middleware(_RequestMetricsMiddleware, latency=request_latency, requests=requests_total)
+
+    if state_segment is not None:
+        from bjjsim.web.shared_state import SharedStateSegment
 
-    templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
-    state = _ServerState()
-    physics: PhysicsAdapter = DeterministicCounterAdapter()
-    config = AppConfig()
+        publisher = SharedStateSegment.attach(state_segment)
 
-    def index(request: Request) -> HTMLResponse:
-        return templates.TemplateResponse(
+    def index(request: Request, session: SessionDep) -> HTMLResponse:
+        state = session.state
+        return _templates().TemplateResponse(
             "index.html",
             {
                 "request": request,
@@ -127,22 +621,23 @@ def create_app() -> FastAPI:
             },
         )
 
-    def _build_metrics() -> dict[str, float]:
+    def _build_metrics(state: _ServerState) -> dict[str, float]:
         return {
             "episodes_started": float(state.episodes_started_count),
             "total_steps": float(state.total_steps_count),
             "steps_per_second": float(state.steps_ema_sps),
         }
 
-    def _to_state_response() -> StateResponse:
+    def _to_state_response(state: _ServerState) -> StateResponse:
         return StateResponse(
             episode_running=state.episode_running,
             last_seed=state.last_seed,
             step=state.step,
-            metrics=_build_metrics(),
+            metrics=_build_metrics(state),
+            version=state.version,
         )
 
-    def _update_steps_per_second(num_steps: int) -> None:
+    def _update_steps_per_second(state: _ServerState, num_steps: int) -> None:
         now = monotonic()
         if state.last_step_monotonic is None:
             state.last_step_monotonic = now
@@ -158,97 +653,285 @@ def create_app() -> FastAPI:
         state.steps_ema_sps = (1 - alpha) * state.steps_ema_sps + alpha * instantaneous_sps
         state.last_step_monotonic = now
 
-    def _log_event(event_type: str, payload: dict[str, float | int | bool | str]) -> None:
+    def _log_event(
+        state: _ServerState, event_type: str, payload: dict[str, float | int | bool | str]
+    ) -> None:
         evt = Event(type=event_type, ts=monotonic(), payload=payload)
         state.event_log.append(evt)
 
-    def reset(req: ResetRequest) -> StateResponse:
+    def _publish(state: _ServerState) -> None:
+        # Runs on the executor thread only, which makes it the segment's single writer.
+        if publisher is None:
+            return
+        from bjjsim.web.shared_state import SharedSnapshot
+
+        metrics = _build_metrics(state)
+        frame_version, frame = published_frame
+        publisher.publish(
+            SharedSnapshot(
+                epoch=state_epoch,
+                version=state.version,
+                episode_running=state.episode_running,
+                last_seed=state.last_seed,
+                step=state.step,
+                episodes_started=metrics["episodes_started"],
+                total_steps=metrics["total_steps"],
+                steps_per_second=metrics["steps_per_second"],
+                frame=frame,
+                frame_version=frame_version,
+            )
+        )
+
+    def _publish_frame(state: _ServerState, version: int, frame: bytes) -> None:
+        """Attach a frame rendered at ``version`` unless the state has moved on."""
+
+        nonlocal published_frame
+        if publisher is None or state.version != version:
+            return
+        if len(frame) > publisher.frame_capacity:
+            # Too big to share; workers keep asking the owner for frames.
+            return
+        published_frame = (version, frame)
+        _publish(state)
+
+    def _commit(session: _Session) -> int:
+        """Mark a finished mutation: bump the version and publish the default session."""
+
+        version = session.state.changes.bump()
+        if session.session_id == DEFAULT_SESSION_ID:
+            _publish(session.state)
+        return version
+
+    # Simulation mutations below run only on the executor thread.
+    def _apply_reset(req: ResetRequest, session: _Session) -> StateResponse:
+        _ensure_open(session)
+        state = session.state
         state.episode_running = False
-        physics.reset(req.seed)
+        session.physics.reset(req.seed)
         state.step = 0
         if req.seed is not None:
             state.last_seed = req.seed
         # Reset per-episode timing; leave global counters intact
         state.last_step_monotonic = None
         state.steps_ema_sps = 0.0
-        _log_event("reset", {"seed": float(req.seed) if req.seed is not None else -1.0})
-        return _to_state_response()
+        _log_event(state, "reset", {"seed": float(req.seed) if req.seed is not None else -1.0})
+        _commit(session)
+        return _to_state_response(state)
 
-    def start(req: StartRequest) -> StateResponse:
+    def _apply_start(req: StartRequest, session: _Session) -> StateResponse:
+        _ensure_open(session)
+        state = session.state
         if state.episode_running:
             raise HTTPException(status_code=409, detail="episode already running")
         if req.seed is not None:
             state.last_seed = req.seed
         state.episode_running = True
-        physics.start(req.seed)
+        session.physics.start(req.seed)
         state.step = 0
         state.episodes_started_count += 1
         state.last_step_monotonic = None
         state.steps_ema_sps = 0.0
         _log_event(
+            state,
             "start",
             {"seed": float(state.last_seed) if state.last_seed is not None else -1.0},
         )
-        return _to_state_response()
+        _commit(session)
+        return _to_state_response(state)
 
-    def stop() -> StateResponse:
+    def _apply_stop(session: _Session) -> StateResponse:
+        _ensure_open(session)
+        state = session.state
         state.episode_running = False
-        physics.stop()
-        _log_event("stop", {"reason": 1.0})  # 1.0 means manual stop (placeholder)
-        return _to_state_response()
-
-    def get_state() -> StateResponse:
-        return _to_state_response()
-
-    def get_metrics() -> MetricsResponse:
-        m = _build_metrics()
-        return MetricsResponse(**m)
-
-    def do_step(req: StepRequest) -> StateResponse:
+        session.physics.stop()
+        _log_event(state, "stop", {"reason": 1.0})  # 1.0 means manual stop (placeholder)
+        _commit(session)
+        return _to_state_response(state)
+
+    def _apply_steps(
+        session: _Session, counts: Sequence[int]
+    ) -> list[StateResponse | BaseException]:
+        """Apply coalesced step requests with one ``physics.step`` call.
+
+        Requests are replayed in arrival order against a virtual step counter
+        so each caller gets the state it would have seen had the requests run
+        one by one, including 409s for requests that arrive after an
+        auto-stop.
+        """
+        _ensure_open(session)
+        state, physics = session.state, session.physics
+        max_steps = session.config.max_steps_per_episode
+        running = state.episode_running
+        step, total_steps = state.step, state.total_steps_count
+        planned: list[tuple[int, int, bool, int] | None] = []
+        for num_steps in counts:
+            if not running:
+                planned.append(None)
+                continue
+            step += num_steps
+            total_steps += num_steps
+            running = step < max_steps
+            planned.append((num_steps, step, running, total_steps))
+
+        advanced = total_steps - state.total_steps_count
+        if advanced:
+            # For now, use deterministic adapter; physics integration will replace this.
+            started = perf_counter()
+            physics.step(advanced)
+            physics_step_seconds.observe(perf_counter() - started)
+            sim_steps_total.inc(advanced)
+            step_rate.add(advanced)
+            step_batch_size.observe(len(counts))
+            state.step = max(state.step, physics.step_count)
+            state.total_steps_count = total_steps
+            _update_steps_per_second(state, advanced)
+
+        results: list[StateResponse | BaseException] = []
+        for plan in planned:
+            if plan is None:
+                results.append(HTTPException(status_code=409, detail="episode not running"))
+                continue
+            num_steps, caller_step, caller_running, caller_total = plan
+            if not caller_running and state.episode_running:
+                # Auto-stop when reaching max steps per episode
+                state.episode_running = False
+                physics.stop()
+                _log_event(state, "stop", {"reason": 2.0})  # 2.0 means auto stop at limit
+            _log_event(state, "step", {"num_steps": float(num_steps), "step": float(caller_step)})
+            response = _to_state_response(state)
+            response.step = caller_step
+            response.episode_running = caller_running
+            response.metrics["total_steps"] = float(caller_total)
+            results.append(response)
+        if advanced:
+            # Bump only once every mutation of the batch is done, so woken
+            # long-pollers never read a half-applied state.
+            version = _commit(session)
+            for result in results:
+                if isinstance(result, StateResponse):
+                    result.version = version
+        return results
+
+    def _apply_step_chunk(req: StepChunkRequest, session: _Session) -> StepChunkResponse:
+        """Run an action chunk; it ends early at the episode limit or the env's own end."""
+
+        _ensure_open(session)
+        state, physics = session.state, session.physics
+        if not isinstance(physics, SupportsActionChunks):
+            raise HTTPException(status_code=501, detail="physics adapter does not accept actions")
         if not state.episode_running:
             raise HTTPException(status_code=409, detail="episode not running")
-        # For now, use deterministic adapter; physics integration will replace this.
-        physics.step(req.num_steps)
-        state.step = max(state.step, physics.step_count)
-        state.total_steps_count += req.num_steps
-        _update_steps_per_second(req.num_steps)
-        if state.step >= config.max_steps_per_episode:
-            # Auto-stop when reaching max steps per episode
+        for rows in req.actions:
+            if len(rows) != physics.num_agents or any(
+                len(row) != physics.action_dim for row in rows
+            ):
+                detail = (
+                    f"every step needs {physics.num_agents} rows of {physics.action_dim} actions"
+                )
+                raise HTTPException(status_code=422, detail=detail)
+        max_steps = session.config.max_steps_per_episode
+        started = perf_counter()
+        observations, rewards = physics.step_chunk(req.actions[: max(0, max_steps - state.step)])
+        physics_step_seconds.observe(perf_counter() - started)
+        advanced = len(rewards)
+        if advanced:
+            sim_steps_total.inc(advanced)
+            step_rate.add(advanced)
+            state.step += advanced
+            state.total_steps_count += advanced
+            _update_steps_per_second(state, advanced)
+        _log_event(state, "step_chunk", {"num_steps": float(advanced), "step": float(state.step)})
+        if state.step >= max_steps:
             state.episode_running = False
             physics.stop()
-            _log_event("stop", {"reason": 2.0})  # 2.0 means auto stop at limit
-        _log_event("step", {"num_steps": float(req.num_steps), "step": float(state.step)})
-        return _to_state_response()
+            _log_event(state, "stop", {"reason": 2.0})  # 2.0 means auto stop at limit
+        _commit(session)
+        return StepChunkResponse(
+            **_to_state_response(state).model_dump(),
+            steps_run=advanced,
+            observations=observations,
+            rewards=rewards,
+        )
 
-    def get_frame() -> Response:
-        """
-        Return a small PNG preview image that encodes the current step.
+    async def reset(req: ResetRequest, session: SessionDep) -> StateResponse:
+        return await executor.run(partial(_apply_reset, req, session))
 
-        The pixel at (0, 0) encodes the current step in its red channel as
-        ``red = step % 256`` to enable lightweight, deterministic tests.
-        A text overlay ("step: N") is also drawn for human inspection.
+    async def start(req: StartRequest, session: SessionDep) -> StateResponse:
+        return await executor.run(partial(_apply_start, req, session))
+
+    async def stop(session: SessionDep) -> StateResponse:
+        return await executor.run(partial(_apply_stop, session))
+
+    async def get_state(
+        session: SessionDep,
+        wait_for_version: Annotated[int | None, Query(ge=0)] = None,
+        timeout: Annotated[float, Query(gt=0, le=MAX_STATE_WAIT_S)] = 30.0,
+        if_none_match: Annotated[str | None, Header()] = None,
+    ) -> Response:
+        """Current state with an ``ETag``; optionally long-poll for a newer version.
+
+        With ``wait_for_version=N`` the request is parked until the session
+        reaches version ``N`` or ``timeout`` seconds pass, then answers with
+        whatever the state is.  A matching ``If-None-Match`` yields 304.
         """
+
+        state = session.state
+        if wait_for_version is not None:
+            await state.changes.wait_for(wait_for_version, timeout)
+        response = _to_state_response(state)
+        etag = state_etag(state_epoch, session.session_id, response.version)
+        return conditional_state(response, etag, if_none_match)
+
+    def get_metrics(session: SessionDep) -> MetricsResponse:
+        m = _build_metrics(session.state)
+        return MetricsResponse(**m)
+
+    async def do_step(req: StepRequest, session: SessionDep) -> StateResponse:
+        return await executor.step(
+            session.session_id, req.num_steps, partial(_apply_steps, session)
+        )
+
+    async def do_step_chunk(req: StepChunkRequest, session: SessionDep) -> StepChunkResponse:
+        return await executor.run(partial(_apply_step_chunk, req, session))
+
+    def _render_frame(step: int) -> bytes:
+        started = perf_counter()
+        Image, ImageDraw, font = _imaging()
         # Image size chosen to match the UI preview box nicely.
         width, height = 200, 200
         img = Image.new("RGB", (width, height), color=(255, 255, 255))
         draw = ImageDraw.Draw(img)
 
         # Encode step in a single pixel for tests to assert without OCR.
-        encoded_red = int(state.step % 256)
+        encoded_red = int(step % 256)
         img.putpixel((0, 0), (encoded_red, 0, 0))
 
         # Draw a simple text overlay. Use default font to avoid system dependencies.
-        text = f"step: {state.step}"
-        try:
-            font = ImageFont.load_default()
-        except Exception:
-            font = None
+        text = f"step: {step}"
         draw.text((10, 10), text, fill=(0, 0, 0), font=font)
 
         buf = BytesIO()
         img.save(buf, format="PNG")
-        png_bytes = buf.getvalue()
-        return Response(content=png_bytes, media_type="image/png")
+        frame_render_seconds.observe(perf_counter() - started)
+        return buf.getvalue()
+
+    def get_frame(session: SessionDep) -> Response:
+        """
+        Return a small PNG preview image that encodes the current step.
+
+        The pixel at (0, 0) encodes the current step in its red channel as
+        ``red = step % 256`` to enable lightweight, deterministic tests.
+        A text overlay ("step: N") is also drawn for human inspection.
+        """
+        state = session.state
+        # Read the version first: if a step lands in between, the frame is
+        # newer than the version it is tagged with and _publish_frame drops it.
+        version = state.version
+        frame = _render_frame(state.step)
+        if publisher is not None and session.session_id == DEFAULT_SESSION_ID:
+            with suppress(RuntimeError):  # executor shut down
+                executor.submit(partial(_publish_frame, state, version, frame))
+        return Response(content=frame, media_type="image/png")
 
     async def ws_events(ws: WebSocket) -> None:
         """Minimal WebSocket endpoint for future live telemetry.
@@ -256,36 +939,132 @@ def create_app() -> FastAPI:
         Accepts the connection, sends a hello, then streams periodic state updates
         until the client disconnects.
         """
+        try:
+            session = _lookup_session(
+                sessions, ws.query_params.get("session_id") or ws.headers.get("x-session-id")
+            )
+        except HTTPException:
+            await ws.close(code=4404)
+            return
+        state = session.state
         await ws.accept()
+        ws_connections.inc()
+        ws_connections_total.inc()
         # First message: hello
         await ws.send_json(
             {
                 "type": "hello",
+                "session_id": session.session_id,
                 "episode_running": state.episode_running,
                 "step": state.step,
             }
         )
         # Periodic state messages
         try:
-            while True:
+            while not session.closed:
                 msg = {
                     "type": "state",
                     "episode_running": state.episode_running,
                     "step": state.step,
-                    "metrics": _build_metrics(),
+                    "metrics": _build_metrics(state),
                 }
                 await ws.send_json(msg)
-                # Default 500 ms, overridable via query param (bounded 10..2000 ms)
-                raw_interval = ws.query_params.get("interval_ms") if ws.scope else None
-                try:
-                    interval_ms = int(raw_interval) if raw_interval is not None else 500
-                except Exception:
-                    interval_ms = 500
-                interval_ms = max(10, min(2000, interval_ms))
-                await asyncio.sleep(interval_ms / 1000.0)
+                await asyncio.sleep(ws_interval_s(ws))
+            await ws.close(code=4404)
         except WebSocketDisconnect:
             # Client closed the connection; exit gracefully.
             return
+        finally:
+            ws_connections.dec()
+
+    def _encode_current_poses(
+        session: _Session, physics: SupportsPoses
+    ) -> tuple[int, bytes] | None:
+        # Runs on the simulation thread, so the poses and step match the version.
+        if session.closed:
+            return None
+        state = session.state
+        cached = state.pose_cache
+        if cached is None or cached[0] != state.version:
+            started = perf_counter()
+            poses = encode_poses(physics.poses(), step=state.step, version=state.version)
+            cached = (state.version, poses)
+            state.pose_cache = cached
+            pose_encode_seconds.observe(perf_counter() - started)
+        return cached
+
+    async def _stream_poses(
+        ws: WebSocket, session: _Session, physics: SupportsPoses, max_hz: int
+    ) -> None:
+        state = session.state
+        sent = -1
+        while True:
+            if session.closed:
+                await ws.close(code=4404)
+                return
+            cached = state.pose_cache
+            if cached is None or cached[0] != state.version:
+                cached = await executor.run(partial(_encode_current_poses, session, physics))
+                if cached is None:
+                    await ws.close(code=4404)
+                    return
+            if cached[0] != sent:
+                await ws.send_bytes(cached[1])
+                sent = cached[0]
+                # Changes during the pause collapse into the next frame.
+                await asyncio.sleep(1.0 / max_hz)
+            await state.changes.wait_for(sent + 1, MAX_STATE_WAIT_S)
+
+    async def ws_poses(ws: WebSocket) -> None:
+        """Stream binary pose frames (see :mod:`bjjsim.web.poses`) for client-side drawing.
+
+        A JSON hello describes the skeleton; then one frame goes out per state
+        version, at most ``max_hz`` per second, and nothing while idle.  All
+        clients of a session share one encoding per version.
+        """
+        try:
+            session = _lookup_session(
+                sessions, ws.query_params.get("session_id") or ws.headers.get("x-session-id")
+            )
+        except HTTPException:
+            await ws.close(code=4404)
+            return
+        physics = session.physics
+        if not isinstance(physics, SupportsPoses):
+            await ws.close(code=4415)  # adapter has no pose data
+            return
+        max_hz = _ws_pose_hz(ws)
+        skeleton = physics.skeleton
+        await ws.accept()
+        ws_connections.inc()
+        ws_connections_total.inc()
+        sender: asyncio.Task[None] | None = None
+        try:
+            await ws.send_json(
+                {
+                    "type": "hello",
+                    "session_id": session.session_id,
+                    "format_version": POSE_FORMAT_VERSION,
+                    "links": list(skeleton.links),
+                    "parents": list(skeleton.parents),
+                    "position_scale": POSITION_SCALE,
+                    "orientation_scale": ORIENTATION_SCALE,
+                    "max_hz": max_hz,
+                }
+            )
+            sender = asyncio.create_task(_stream_poses(ws, session, physics, max_hz))
+            # Frames only go out on changes, so watch the receive side to
+            # notice disconnects of idle clients.  Client messages are ignored.
+            while (await ws.receive())["type"] != "websocket.disconnect":
+                pass
+        except WebSocketDisconnect:
+            return
+        finally:
+            if sender is not None:
+                sender.cancel()
+                with suppress(asyncio.CancelledError, WebSocketDisconnect, RuntimeError):
+                    await sender
+            ws_connections.dec()
 
     def healthz() -> HealthResponse:
         # Import locally to avoid any possibility of import cycles during app startup.
@@ -299,34 +1078,210 @@ def create_app() -> FastAPI:
         return ReadinessResponse(ready=is_ready)
 
     # Config API
-    def get_config() -> AppConfig:
-        return config
+    def get_config(session: SessionDep) -> AppConfig:
+        return session.config
 
-    def update_config(req: AppConfigUpdate) -> AppConfig:
+    def _apply_config_update(req: AppConfigUpdate, session: _Session) -> AppConfig:
+        _ensure_open(session)
+        config = session.config
         if req.preview_hz is not None:
             config.preview_hz = req.preview_hz
         if req.max_steps_per_episode is not None:
             config.max_steps_per_episode = req.max_steps_per_episode
         return config
 
-    def get_events(limit: int = 100) -> EventsResponse:
+    async def update_config(req: AppConfigUpdate, session: SessionDep) -> AppConfig:
+        return await executor.run(partial(_apply_config_update, req, session))
+
+    def get_events(session: SessionDep, limit: int = 100) -> EventsResponse:
         # Return the most recent events up to limit (default 100)
         lim = max(1, min(500, limit))
-        items = list(state.event_log)[-lim:]
+        items = list(session.state.event_log)[-lim:]
         return EventsResponse(events=items)
 
+    def prometheus_metrics() -> PlainTextResponse:
+        return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
+    # Session API
+    def create_session() -> SessionResponse:
+        session_id, _ = sessions.create()
+        return SessionResponse(session_id=session_id)
+
+    def list_sessions() -> SessionsResponse:
+        now = monotonic()
+        return SessionsResponse(
+            sessions=[
+                SessionSummary(
+                    session_id=info.session_id,
+                    idle_seconds=max(0.0, now - info.last_access_monotonic),
+                    pinned=info.pinned,
+                )
+                for info in sessions.list_sessions()
+            ],
+            max_sessions=sessions.max_sessions,
+        )
+
+    def delete_session(session_id: str) -> Response:
+        try:
+            closed = sessions.close(session_id)
+        except ValueError as exc:
+            raise HTTPException(status_code=409, detail=str(exc)) from exc
+        if not closed:
+            raise HTTPException(status_code=404, detail="unknown session")
+        return Response(status_code=204)
+
+    # Replay browsing.  NumPy and the trajectory reader are imported on the
+    # first replay request so the rest of the app starts without them.
+    replay_root = Path(
+        replay_dir if replay_dir is not None else os.environ.get(REPLAY_DIR_ENV, "replays")
+    )
+
+    @cache
+    def _replay_store() -> ReplayStore:
+        from bjjsim.replay import ReplayStore
+
+        return ReplayStore(replay_root)
+
+    def _open_replay(replay_id: str) -> Trajectory:
+        from bjjsim.replay import ReplayNotFoundError
+
+        try:
+            return _replay_store().open(replay_id)
+        except ReplayNotFoundError as exc:
+            raise HTTPException(status_code=404, detail="unknown replay") from exc
+        except (KeyError, ValueError) as exc:
+            # Corrupt or newer-format metadata; /api/replays leaves these out too.
+            raise HTTPException(status_code=404, detail="unreadable replay") from exc
+
+    def _replay_summary(trajectory: Trajectory) -> ReplaySummary:
+        return ReplaySummary(
+            replay_id=trajectory.trajectory_id,
+            num_frames=len(trajectory),
+            agents=list(trajectory.agents),
+            metadata=trajectory.metadata,
+        )
+
+    def list_replays() -> ReplaysResponse:
+        store = _replay_store()
+        replays = []
+        for replay_id in store.replay_ids():
+            try:
+                replays.append(_replay_summary(store.open(replay_id)))
+            except (KeyError, ValueError):
+                # Unreadable or newer-format recordings are left out of the listing.
+                continue
+        return ReplaysResponse(replays=replays)
+
+    def get_replay(replay_id: str) -> ReplayDetail:
+        trajectory = _open_replay(replay_id)
+        summary = _replay_summary(trajectory)
+        return ReplayDetail(
+            **summary.model_dump(),
+            fields={
+                name: ReplayField(
+                    dtype=spec.dtype,
+                    frame_shape=list(spec.frame_shape),
+                    frame_nbytes=spec.frame_nbytes,
+                )
+                for name, spec in trajectory.specs.items()
+            },
+        )
+
+    def get_replay_steps(
+        replay_id: str,
+        from_: Annotated[int, Query(alias="from", ge=0)] = 0,
+        to: Annotated[int | None, Query(ge=0)] = None,
+    ) -> ReplayStepsResponse:
+        # Slicing the memory maps touches only the requested frames, so
+        # scrubbing to any point of a long recording costs the same.
+        trajectory = _open_replay(replay_id)
+        num_frames = len(trajectory)
+        start = min(from_, num_frames)
+        stop = num_frames if to is None else min(to, num_frames)
+        if stop < start:
+            raise HTTPException(status_code=422, detail="'to' must not be less than 'from'")
+        stop = min(stop, start + MAX_REPLAY_PAGE)
+        observations = trajectory.observations[start:stop].tolist()
+        actions = trajectory.actions[start:stop].tolist()
+        rewards = trajectory.rewards[start:stop].tolist()
+        physics_steps = trajectory.physics_steps[start:stop].tolist()
+        return ReplayStepsResponse(
+            replay_id=replay_id,
+            start=start,
+            stop=stop,
+            num_frames=num_frames,
+            steps=[
+                ReplayStep(
+                    index=start + offset,
+                    physics_step=physics_steps[offset],
+                    observations=observations[offset],
+                    actions=actions[offset],
+                    rewards=rewards[offset],
+                )
+                for offset in range(stop - start)
+            ],
+        )
+
+    def get_replay_raw(
+        replay_id: str,
+        field_name: str,
+        range_header: Annotated[str | None, Header(alias="range")] = None,
+    ) -> Response:
+        trajectory = _open_replay(replay_id)
+        try:
+            path = trajectory.field_path(field_name)
+        except KeyError as exc:
+            raise HTTPException(status_code=404, detail="unknown field") from exc
+        spec = trajectory.specs[field_name]
+        size = spec.frame_nbytes * len(trajectory)
+        headers = {
+            "Accept-Ranges": "bytes",
+            "X-Dtype": spec.dtype,
+            "X-Frame-Shape": ",".join(str(dim) for dim in spec.frame_shape),
+            "X-Frame-Bytes": str(spec.frame_nbytes),
+        }
+        byte_range = None
+        if range_header is not None:
+            try:
+                byte_range = _parse_byte_range(range_header, size)
+            except ValueError:
+                return Response(
+                    status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"}
+                )
+        if byte_range is None:
+            return StreamingResponse(
+                _iter_file(path, 0, size),
+                media_type="application/octet-stream",
+                headers={**headers, "Content-Length": str(size)},
+            )
+        first, last = byte_range
+        length = last - first + 1
+        return StreamingResponse(
+            _iter_file(path, first, length),
+            status_code=206,
+            media_type="application/octet-stream",
+            headers={
+                **headers,
+                "Content-Length": str(length),
+                "Content-Range": f"bytes {first}-{last}/{size}",
+            },
+        )
+
+    def replays_page(request: Request) -> HTMLResponse:
+        return _templates().TemplateResponse(request, "replays.html", {"max_page": MAX_REPLAY_PAGE})
+
     # Config page
-    def config_page(request: Request) -> HTMLResponse:
-        return templates.TemplateResponse(
+    def config_page(request: Request, session: SessionDep) -> HTMLResponse:
+        return _templates().TemplateResponse(
             "config.html",
             {
                 "request": request,
-                "config": config.model_dump(),
+                "config": session.config.model_dump(),
             },
         )
 
     # Mount static if needed later
-    app.mount("/static", StaticFiles(directory=str(TEMPLATES_DIR)), name="static")
+    app.mount("/static", _LazyStaticFiles(TEMPLATES_DIR), name="static")
 
     # Register routes explicitly to keep mypy happy with decorators
     app.add_api_route("/", index, methods=["GET"], response_class=HTMLResponse)
@@ -334,15 +1289,57 @@ def create_app() -> FastAPI:
     app.add_api_route("/api/sim/start", start, methods=["POST"], response_model=StateResponse)
     app.add_api_route("/api/sim/stop", stop, methods=["POST"], response_model=StateResponse)
     app.add_api_route("/api/sim/step", do_step, methods=["POST"], response_model=StateResponse)
+    app.add_api_route(
+        "/api/sim/step_chunk",
+        do_step_chunk,
+        methods=["POST"],
+        response_model=StepChunkResponse,
+    )
     app.add_api_route("/api/sim/state", get_state, methods=["GET"], response_model=StateResponse)
     app.add_api_route("/api/metrics", get_metrics, methods=["GET"], response_model=MetricsResponse)
+    app.add_api_route(
+        "/metrics", prometheus_metrics, methods=["GET"], response_class=PlainTextResponse
+    )
     app.add_api_route("/api/frames/current", get_frame, methods=["GET"], response_class=Response)
     app.add_api_websocket_route("/ws/events", ws_events)
+    app.add_api_websocket_route("/ws/poses", ws_poses)
     app.add_api_route("/healthz", healthz, methods=["GET"], response_model=HealthResponse)
     app.add_api_route("/readyz", readyz, methods=["GET"], response_model=ReadinessResponse)
     app.add_api_route("/api/config", get_config, methods=["GET"], response_model=AppConfig)
     app.add_api_route("/api/config", update_config, methods=["POST"], response_model=AppConfig)
     app.add_api_route("/api/events", get_events, methods=["GET"], response_model=EventsResponse)
+    app.add_api_route(
+        "/api/sessions", create_session, methods=["POST"], response_model=SessionResponse
+    )
+    app.add_api_route(
+        "/api/sessions", list_sessions, methods=["GET"], response_model=SessionsResponse
+    )
+    app.add_api_route(
+        "/api/sessions/{session_id}",
+        delete_session,
+        methods=["DELETE"],
+        status_code=204,
+        response_class=Response,
+    )
     app.add_api_route("/config", config_page, methods=["GET"], response_class=HTMLResponse)
-
+    app.add_api_route("/api/replays", list_replays, methods=["GET"], response_model=ReplaysResponse)
+    app.add_api_route(
+        "/api/replays/{replay_id}", get_replay, methods=["GET"], response_model=ReplayDetail
+    )
+    app.add_api_route(
+        "/api/replays/{replay_id}/steps",
+        get_replay_steps,
+        methods=["GET"],
+        response_model=ReplayStepsResponse,
+    )
+    app.add_api_route(
+        "/api/replays/{replay_id}/raw/{field_name}",
+        get_replay_raw,
+        methods=["GET"],
+        response_class=Response,
+    )
+    app.add_api_route("/replays", replays_page, methods=["GET"], response_class=HTMLResponse)
+
+    # Give attached workers a state to serve before the first mutation.
+    _publish(_lookup_session(sessions, None).state)
     return app
@@ -0,0 +1,121 @@
+"""Single-threaded executor that serializes simulation mutations.
+
+Route handlers hand every state-changing operation to one dedicated thread, so
+sessions are never mutated concurrently and a slow ``physics.step`` only
+delays simulation work, not unrelated routes on FastAPI's shared threadpool.
+
+Step requests additionally coalesce: while the simulation thread is busy,
+step requests for the same key queue up in a pending batch that is applied
+with a single call when the thread gets to it.  The batch function decides
+what each caller gets back, so every caller still sees the state that
+corresponds to its own position in the batch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Callable, Hashable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+type BatchFn[T] = Callable[[Sequence[int]], Sequence[T | BaseException]]
+
+
+@dataclass(slots=True)
+class _PendingBatch[T]:
+    batch_fn: BatchFn[T]
+    counts: list[int] = field(default_factory=list)
+    futures: list[Future[T]] = field(default_factory=list)
+
+
+class SimulationExecutor:
+    """Run callables on one dedicated thread, coalescing step requests per key."""
+
+    def __init__(self, *, thread_name_prefix: str = "bjjsim-sim") -> None:
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=thread_name_prefix)
+        self._pending: dict[Hashable, _PendingBatch[Any]] = {}
+        self._lock = threading.Lock()
+        self.batches_run: int = 0
+        self.requests_coalesced: int = 0
+
+    def submit[T](self, fn: Callable[[], T]) -> Future[T]:
+        """Queue ``fn`` behind all work submitted so far, from any thread."""
+
+        return self._pool.submit(fn)
+
+    async def run[T](self, fn: Callable[[], T]) -> T:
+        """Run ``fn`` on the simulation thread and await its result."""
+
+        return await asyncio.wrap_future(self.submit(fn))
+
+    async def step[T](self, key: Hashable, num_steps: int, batch_fn: BatchFn[T]) -> T:
+        """Queue ``num_steps`` for ``key`` and await this caller's result.
+
+        ``batch_fn`` receives the step counts of every request coalesced into
+        the batch, in arrival order, and must return one result (or exception
+        to raise) per count.  Requests for the same key share the batch_fn of
+        the request that opened the batch.
+        """
+
+        future: Future[T] = Future()
+        with self._lock:
+            batch = self._pending.get(key)
+            opened = batch is None
+            if batch is None:
+                batch = _PendingBatch(batch_fn)
+                self._pending[key] = batch
+            batch.counts.append(num_steps)
+            batch.futures.append(future)
+        if opened:
+            try:
+                self._pool.submit(self._drain, key)
+            except BaseException as exc:  # e.g. RuntimeError after shutdown
+                # Nothing will drain the batch, so fail everyone who joined it.
+                with self._lock:
+                    del self._pending[key]
+                for queued in batch.futures:
+                    if queued.set_running_or_notify_cancel():
+                        queued.set_exception(exc)
+        return await asyncio.wrap_future(future)
+
+    def _drain(self, key: Hashable) -> None:
+        with self._lock:
+            batch = self._pending.pop(key)
+        # Callers cancelled while queued (e.g. a client disconnect) drop out of
+        # the batch; the rest are marked running so they can no longer cancel.
+        live = [
+            (count, future)
+            for count, future in zip(batch.counts, batch.futures, strict=True)
+            if future.set_running_or_notify_cancel()
+        ]
+        if not live:
+            return
+        counts = [count for count, _ in live]
+        futures = [future for _, future in live]
+        self.batches_run += 1
+        self.requests_coalesced += len(counts) - 1
+        try:
+            results = batch.batch_fn(counts)
+            if len(results) != len(futures):
+                msg = "batch_fn must return exactly one result per request"
+                raise RuntimeError(msg)
+        except BaseException as exc:
+            for future in futures:
+                future.set_exception(exc)
+            return
+        for future, result in zip(futures, results, strict=True):
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=False)
+
+
+__all__ = [
+    "BatchFn",
+    "SimulationExecutor",
+]
@@ -0,0 +1,327 @@
+"""Prometheus text-exposition metrics for the web app.
+
+Metric updates happen on request hot paths, so every counter, gauge and
+histogram accumulates into a per-thread shard: the updating thread only ever
+writes its own list and never takes a lock.  A scrape sums the shards, which
+may observe an update mid-flight but never blocks a writer.  Locks are only
+taken the first time a thread (or a new label combination) touches a metric.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+from time import monotonic
+from typing import Any, Final
+
+CONTENT_TYPE: Final[str] = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_LATENCY_BUCKETS: Final[tuple[float, ...]] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+
+class _Shards:
+    """Per-thread accumulators of a fixed width, summed on demand."""
+
+    __slots__ = ("_all", "_local", "_lock", "_width")
+
+    def __init__(self, width: int) -> None:
+        self._width = width
+        self._local = threading.local()
+        self._all: list[list[float]] = []
+        self._lock = threading.Lock()
+
+    def local(self) -> list[float]:
+        try:
+            values: list[float] = self._local.values
+        except AttributeError:
+            values = [0.0] * self._width
+            with self._lock:
+                self._all.append(values)
+            self._local.values = values
+        return values
+
+    def totals(self) -> list[float]:
+        with self._lock:
+            shards = list(self._all)
+        totals = [0.0] * self._width
+        for shard in shards:
+            for idx, value in enumerate(shard):
+                totals[idx] += value
+        return totals
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    inner = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True))
+    return "{" + inner + "}"
+
+
+class _Metric[C](ABC):
+    kind: str = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: tuple[str, ...] = tuple(labelnames)
+        self._children: dict[tuple[str, ...], C] = {}
+        self._shards: dict[tuple[str, ...], _Shards] = {}
+        self._lock = threading.Lock()
+
+    def _width(self) -> int:
+        return 1
+
+    @abstractmethod
+    def _bind(self, shards: _Shards) -> C: ...
+
+    def labels(self, *labelvalues: str) -> C:
+        """Return the (cached) child for one label combination."""
+
+        child = self._children.get(labelvalues)
+        if child is None:
+            if len(labelvalues) != len(self.labelnames):
+                msg = f"{self.name} expects labels {self.labelnames}, got {labelvalues}"
+                raise ValueError(msg)
+            with self._lock:
+                if labelvalues not in self._children:
+                    shards = _Shards(self._width())
+                    self._shards[labelvalues] = shards
+                    self._children[labelvalues] = self._bind(shards)
+                child = self._children[labelvalues]
+        return child
+
+    def _totals(self) -> list[tuple[tuple[str, ...], list[float]]]:
+        with self._lock:
+            items = list(self._shards.items())
+        return [(labelvalues, shards.totals()) for labelvalues, shards in items]
+
+    def _samples(self) -> Iterable[tuple[str, tuple[str, ...], tuple[str, ...], float]]:
+        for labelvalues, totals in self._totals():
+            yield "", self.labelnames, labelvalues, totals[0]
+
+    def expose(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, names, values, sample in self._samples():
+            labels = _format_labels(names, values)
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(sample)}")
+        return lines
+
+
+class CounterChild:
+    __slots__ = ("_shards",)
+
+    def __init__(self, shards: _Shards) -> None:
+        self._shards = shards
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._shards.local()[0] += amount
+
+
+class GaugeChild(CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._shards.local()[0] -= amount
+
+
+class HistogramChild:
+    __slots__ = ("_buckets", "_shards")
+
+    def __init__(self, shards: _Shards, buckets: tuple[float, ...]) -> None:
+        self._shards = shards
+        self._buckets = buckets
+
+    def observe(self, value: float) -> None:
+        shard = self._shards.local()
+        shard[bisect_left(self._buckets, value)] += 1.0
+        shard[-1] += value
+
+
+class Counter(_Metric[CounterChild]):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def _bind(self, shards: _Shards) -> CounterChild:
+        return CounterChild(shards)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric[GaugeChild]):
+    """Value that can go up and down, or be read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        function: Callable[[], float] | None = None,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._function = function
+
+    def _bind(self, shards: _Shards) -> GaugeChild:
+        return GaugeChild(shards)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def _samples(self) -> Iterable[tuple[str, tuple[str, ...], tuple[str, ...], float]]:
+        if self._function is not None:
+            yield "", (), (), float(self._function())
+            return
+        yield from super()._samples()
+
+
+class Histogram(_Metric[HistogramChild]):
+    """Cumulative histogram with fixed upper bounds plus ``_sum``/``_count``.
+
+    Each shard stores one slot per bucket, one for ``+Inf`` and the running sum.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        bounds = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+        if not bounds:
+            msg = "buckets must contain at least one finite bound"
+            raise ValueError(msg)
+        self.buckets = bounds
+        super().__init__(name, documentation, labelnames)
+
+    def _width(self) -> int:
+        return len(self.buckets) + 2
+
+    def _bind(self, shards: _Shards) -> HistogramChild:
+        return HistogramChild(shards, self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self) -> Iterable[tuple[str, tuple[str, ...], tuple[str, ...], float]]:
+        names = (*self.labelnames, "le")
+        for labelvalues, totals in self._totals():
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, math.inf), totals[:-1], strict=True):
+                cumulative += count
+                yield "_bucket", names, (*labelvalues, _format_value(bound)), cumulative
+            yield "_sum", self.labelnames, labelvalues, totals[-1]
+            yield "_count", self.labelnames, labelvalues, cumulative
+
+
+class WindowedRate:
+    """Event rate over sliding windows, backed by one-second ring buckets.
+
+    Unlike an EMA over the last two calls, the rate reflects every event that
+    landed in the window, so bursts and idle gaps are both accounted for.
+    Only completed seconds count: the one in progress would be averaged as
+    if it were whole and drag the rate down.
+    """
+
+    def __init__(self, horizon_s: int = 60, *, clock: Callable[[], float] = monotonic) -> None:
+        if horizon_s < 1:
+            msg = "horizon_s must be at least 1"
+            raise ValueError(msg)
+        self._horizon = horizon_s
+        self._clock = clock
+        # One extra bucket for the second in progress.
+        self._counts = [0.0] * (horizon_s + 1)
+        self._stamps = [-1] * (horizon_s + 1)
+        self._lock = threading.Lock()
+
+    def add(self, amount: float = 1.0) -> None:
+        second = int(self._clock())
+        idx = second % len(self._stamps)
+        with self._lock:
+            if self._stamps[idx] != second:
+                self._stamps[idx] = second
+                self._counts[idx] = 0.0
+            self._counts[idx] += amount
+
+    def rate(self, window_s: int) -> float:
+        """Average events per second over the last ``window_s`` completed seconds."""
+
+        window_s = max(1, min(window_s, self._horizon))
+        now = int(self._clock())
+        oldest = now - window_s
+        with self._lock:
+            total = sum(
+                count
+                for count, stamp in zip(self._counts, self._stamps, strict=True)
+                if oldest <= stamp < now
+            )
+        return total / window_s
+
+
+class MetricsRegistry:
+    """Ordered collection of metrics rendered together on scrape."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric[Any]] = {}
+
+    def register[M: _Metric[Any]](self, metric: M) -> M:
+        if metric.name in self._metrics:
+            msg = f"metric {metric.name!r} already registered"
+            raise ValueError(msg)
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+
+__all__ = [
+    "CONTENT_TYPE",
+    "DEFAULT_LATENCY_BUCKETS",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "WindowedRate",
+]
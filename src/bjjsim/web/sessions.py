@@ -0,0 +1,255 @@
+"""Multi-session bookkeeping for the web UI.
+
+A :class:`SessionManager` keeps many independent simulations keyed by session
+ID.  Each session owns its own physics adapter (drawn from an
+:class:`AdapterPool`) plus whatever per-session payload the app builds around
+it.  The total number of sessions is capped with LRU eviction and idle
+sessions are reaped by :meth:`SessionManager.reap_idle`, which the app calls
+from a periodic background task.
+
+Dropped sessions hand their adapter to a ``retire`` hook instead of straight
+back to the pool, so the app can release it on the simulation thread once
+the session's queued work has run.
+"""
+
+from __future__ import annotations
+
+import secrets
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from time import monotonic
+from typing import Final
+
+from bjjsim.physics import DeterministicCounterAdapter, PhysicsAdapter
+
+DEFAULT_SESSION_ID: Final[str] = "default"
+
+
+class SessionNotFoundError(KeyError):
+    """Raised when a session ID is unknown or has already been evicted."""
+
+
+class AdapterPool:
+    """Pool of pre-initialized physics adapters.
+
+    Constructing a real physics backend (loading URDFs, connecting to the
+    engine) is far more expensive than resetting one, so released adapters are
+    stopped, reset and kept for the next session instead of being discarded.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], PhysicsAdapter] = DeterministicCounterAdapter,
+        *,
+        size: int = 4,
+    ) -> None:
+        if size < 0:
+            msg = "size must be non-negative"
+            raise ValueError(msg)
+        self._factory = factory
+        self._size = size
+        self._idle: deque[PhysicsAdapter] = deque(factory() for _ in range(size))
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._idle)
+
+    def acquire(self) -> PhysicsAdapter:
+        """Return a ready adapter, building a new one only if the pool is empty."""
+
+        with self._lock:
+            if self._idle:
+                return self._idle.popleft()
+        return self._factory()
+
+    def release(self, adapter: PhysicsAdapter) -> None:
+        """Reset ``adapter`` and keep it for reuse while the pool has room."""
+
+        adapter.stop()
+        adapter.reset(None)
+        with self._lock:
+            if len(self._idle) < self._size:
+                self._idle.append(adapter)
+
+
+@dataclass(slots=True)
+class _Entry[S]:
+    session: S
+    physics: PhysicsAdapter
+    created_monotonic: float
+    last_access_monotonic: float
+    pinned: bool = False
+
+
+@dataclass(slots=True, frozen=True)
+class SessionInfo:
+    """Read-only summary of a live session."""
+
+    session_id: str
+    created_monotonic: float
+    last_access_monotonic: float
+    pinned: bool
+
+
+class SessionManager[S]:
+    """LRU-bounded registry of simulation sessions.
+
+    ``factory`` builds the per-session payload around a pooled adapter.  The
+    :data:`DEFAULT_SESSION_ID` session is created eagerly and pinned so clients
+    that never ask for a session keep the historical single-simulation
+    behaviour; pinned sessions are never evicted or reaped.
+
+    ``retire`` is called, outside the manager's lock, with every closed,
+    evicted or reaped session and a callback that returns its adapter to the
+    pool.  It must make sure nothing uses the session's adapter once the
+    callback has run.  Without it the adapter is released immediately.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str, PhysicsAdapter], S],
+        *,
+        max_sessions: int = 64,
+        idle_timeout_s: float = 900.0,
+        pool: AdapterPool | None = None,
+        clock: Callable[[], float] = monotonic,
+        retire: Callable[[S, Callable[[], None]], None] | None = None,
+    ) -> None:
+        if max_sessions < 1:
+            msg = "max_sessions must be at least 1"
+            raise ValueError(msg)
+        if idle_timeout_s <= 0:
+            msg = "idle_timeout_s must be positive"
+            raise ValueError(msg)
+        self._factory = factory
+        self._max_sessions = max_sessions
+        self._idle_timeout_s = idle_timeout_s
+        self._pool = pool or AdapterPool()
+        self._clock = clock
+        self._retire = retire
+        self._entries: OrderedDict[str, _Entry[S]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted_count: int = 0
+        self.reaped_count: int = 0
+        self.create(DEFAULT_SESSION_ID, pinned=True)
+
+    @property
+    def max_sessions(self) -> int:
+        return self._max_sessions
+
+    @property
+    def idle_timeout_s(self) -> float:
+        return self._idle_timeout_s
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._entries
+
+    def create(self, session_id: str | None = None, *, pinned: bool = False) -> tuple[str, S]:
+        """Create a session and return ``(session_id, session)``.
+
+        When the manager is full, the least recently used unpinned session is
+        evicted first and its adapter returned to the pool.
+        """
+
+        sid = session_id or secrets.token_urlsafe(12)
+        physics = self._pool.acquire()
+        session = self._factory(sid, physics)
+        now = self._clock()
+        evicted: list[_Entry[S]] = []
+        error: Exception | None = None
+        with self._lock:
+            if sid in self._entries:
+                msg = f"session {sid!r} already exists"
+                error = ValueError(msg)
+            while error is None and len(self._entries) >= self._max_sessions:
+                victim = next(
+                    (key for key, entry in self._entries.items() if not entry.pinned), None
+                )
+                if victim is None:
+                    msg = "session limit reached and all sessions are pinned"
+                    error = RuntimeError(msg)
+                    break
+                evicted.append(self._entries.pop(victim))
+                self.evicted_count += 1
+            if error is None:
+                self._entries[sid] = _Entry(session, physics, now, now, pinned)
+        self._drop(evicted)
+        if error is not None:
+            # The new session was never visible to anyone, so no retire is needed.
+            self._pool.release(physics)
+            raise error
+        return sid, session
+
+    def get(self, session_id: str) -> S:
+        """Return the session and mark it as most recently used."""
+
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                raise SessionNotFoundError(session_id)
+            entry.last_access_monotonic = self._clock()
+            self._entries.move_to_end(session_id)
+            return entry.session
+
+    def close(self, session_id: str) -> bool:
+        """Drop an unpinned session; return ``False`` if it did not exist."""
+
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return False
+            if entry.pinned:
+                msg = f"session {session_id!r} is pinned and cannot be closed"
+                raise ValueError(msg)
+            del self._entries[session_id]
+        self._drop([entry])
+        return True
+
+    def reap_idle(self) -> list[str]:
+        """Drop unpinned sessions idle for longer than ``idle_timeout_s``."""
+
+        cutoff = self._clock() - self._idle_timeout_s
+        with self._lock:
+            # Entries are kept in LRU order, so idle ones are all at the front.
+            expired: list[str] = []
+            for key, entry in self._entries.items():
+                if entry.last_access_monotonic > cutoff:
+                    break
+                if not entry.pinned:
+                    expired.append(key)
+            dropped = [self._entries.pop(key) for key in expired]
+            self.reaped_count += len(expired)
+        self._drop(dropped)
+        return expired
+
+    def _drop(self, entries: list[_Entry[S]]) -> None:
+        for entry in entries:
+            release = partial(self._pool.release, entry.physics)
+            if self._retire is None:
+                release()
+            else:
+                self._retire(entry.session, release)
+
+    def list_sessions(self) -> list[SessionInfo]:
+        """Return summaries of all live sessions, least recently used first."""
+
+        with self._lock:
+            return [
+                SessionInfo(key, e.created_monotonic, e.last_access_monotonic, e.pinned)
+                for key, e in self._entries.items()
+            ]
+
+
+__all__ = [
+    "DEFAULT_SESSION_ID",
+    "AdapterPool",
+    "SessionInfo",
+    "SessionManager",
+    "SessionNotFoundError",
+]
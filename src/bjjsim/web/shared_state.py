@@ -0,0 +1,184 @@
+"""Seqlock-protected shared-memory snapshot of one simulation.
+
+In multi-worker deployments (:mod:`bjjsim.web.workers`) one owner process
+runs the simulation and publishes its state, metrics and the last preview
+frame it rendered into a :class:`SharedStateSegment`; any number of uvicorn worker processes
+attach to the segment and serve read-only routes from it without a round trip
+to the owner.
+
+The segment starts with a 64-bit sequence counter.  The single writer makes it
+odd, writes the payload, then makes it even again; a reader copies the payload
+and retries whenever the counter was odd or changed during the copy
+(:meth:`SharedStateSegment.read`).  Readers never block the writer and never
+take a lock, so a slow worker cannot stall the simulation.
+"""
+
+from __future__ import annotations
+
+import struct
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Final, Self
+
+# seq
+_HEADER: Final[struct.Struct] = struct.Struct("<Q")
+# epoch, version, episode_running, has_seed, last_seed, step,
+# episodes_started, total_steps, steps_per_second, frame_version, frame_len
+_PAYLOAD: Final[struct.Struct] = struct.Struct("<8sq??xxxxxxqqdddqI")
+_FRAME_OFFSET: Final[int] = _HEADER.size + _PAYLOAD.size
+
+DEFAULT_FRAME_CAPACITY: Final[int] = 256 * 1024
+
+
+class SegmentBusyError(RuntimeError):
+    """Raised when a reader cannot get a consistent copy within its retry budget."""
+
+
+@dataclass(slots=True, frozen=True)
+class SharedSnapshot:
+    """One published simulation state.
+
+    ``frame`` was rendered at state ``frame_version`` and may lag behind
+    ``version``; :attr:`frame_is_current` tells whether it still matches.
+    """
+
+    epoch: str
+    version: int
+    episode_running: bool
+    last_seed: int | None
+    step: int
+    episodes_started: float
+    total_steps: float
+    steps_per_second: float
+    frame: bytes = b""
+    frame_version: int = -1
+
+    @property
+    def frame_is_current(self) -> bool:
+        return bool(self.frame) and self.frame_version == self.version
+
+    @property
+    def metrics(self) -> dict[str, float]:
+        return {
+            "episodes_started": self.episodes_started,
+            "total_steps": self.total_steps,
+            "steps_per_second": self.steps_per_second,
+        }
+
+
+class SharedStateSegment:
+    """Named shared-memory block holding the latest :class:`SharedSnapshot`.
+
+    Use :meth:`create` in the supervising process (which also :meth:`unlink`\\ s
+    it at shutdown) and :meth:`attach` in processes it starts.  Exactly one process
+    may call :meth:`publish`.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory) -> None:
+        buf = shm.buf
+        if buf is None:
+            msg = f"shared memory block {shm.name!r} is closed"
+            raise ValueError(msg)
+        self._shm = shm
+        self._buf: memoryview = buf
+        self.frame_capacity = shm.size - _FRAME_OFFSET
+
+    @classmethod
+    def create(cls, *, frame_capacity: int = DEFAULT_FRAME_CAPACITY) -> Self:
+        if frame_capacity < 0:
+            msg = "frame_capacity must be non-negative"
+            raise ValueError(msg)
+        segment = cls(shared_memory.SharedMemory(create=True, size=_FRAME_OFFSET + frame_capacity))
+        segment._buf[:_FRAME_OFFSET] = bytes(_FRAME_OFFSET)
+        return segment
+
+    @classmethod
+    def attach(cls, name: str) -> Self:
+        # On Python < 3.13 attaching also registers the block with the
+        # resource tracker.  Processes started from the creator share its
+        # tracker, where the name is already registered, so this is harmless
+        # there; an unrelated process would unlink the block when it exits.
+        return cls(shared_memory.SharedMemory(name=name))
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def sequence(self) -> int:
+        seq: int = _HEADER.unpack_from(self._buf, 0)[0]
+        return seq
+
+    def publish(self, snapshot: SharedSnapshot) -> None:
+        frame = snapshot.frame
+        if len(frame) > self.frame_capacity:
+            msg = f"frame of {len(frame)} bytes exceeds segment capacity {self.frame_capacity}"
+            raise ValueError(msg)
+        buf = self._buf
+        seq = self.sequence
+        _HEADER.pack_into(buf, 0, seq + 1)
+        _PAYLOAD.pack_into(
+            buf,
+            _HEADER.size,
+            snapshot.epoch.encode("ascii")[:8],
+            snapshot.version,
+            snapshot.episode_running,
+            snapshot.last_seed is not None,
+            snapshot.last_seed if snapshot.last_seed is not None else 0,
+            snapshot.step,
+            snapshot.episodes_started,
+            snapshot.total_steps,
+            snapshot.steps_per_second,
+            snapshot.frame_version,
+            len(frame),
+        )
+        buf[_FRAME_OFFSET : _FRAME_OFFSET + len(frame)] = frame
+        _HEADER.pack_into(buf, 0, seq + 2)
+
+    def read(self, *, max_attempts: int = 10_000) -> SharedSnapshot | None:
+        """Return a consistent copy of the latest snapshot, or ``None`` before the first."""
+
+        buf = self._buf
+        for _ in range(max_attempts):
+            before = self.sequence
+            if before % 2:
+                time.sleep(0)
+                continue
+            if before == 0:
+                return None
+            fields = _PAYLOAD.unpack_from(buf, _HEADER.size)
+            frame_len = min(int(fields[-1]), self.frame_capacity)
+            frame = bytes(buf[_FRAME_OFFSET : _FRAME_OFFSET + frame_len])
+            if self.sequence == before:
+                epoch, version, running, has_seed, seed, step, started, total, sps, fv, _ = fields
+                return SharedSnapshot(
+                    epoch=epoch.rstrip(b"\0").decode("ascii"),
+                    version=version,
+                    episode_running=running,
+                    last_seed=seed if has_seed else None,
+                    step=step,
+                    episodes_started=started,
+                    total_steps=total,
+                    steps_per_second=sps,
+                    frame=frame,
+                    frame_version=fv,
+                )
+            time.sleep(0)
+        msg = "shared state kept changing while being read"
+        raise SegmentBusyError(msg)
+
+    def close(self) -> None:
+        self._buf = memoryview(b"")
+        self._shm.close()
+
+    def unlink(self) -> None:
+        self._shm.unlink()
+
+
+__all__ = [
+    "DEFAULT_FRAME_CAPACITY",
+    "SegmentBusyError",
+    "SharedSnapshot",
+    "SharedStateSegment",
+]
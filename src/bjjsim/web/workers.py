@@ -0,0 +1,378 @@
+"""Multi-process deployment: one simulation owner behind many uvicorn workers.
+
+Uvicorn's ``--workers`` flag would give every process its own sessions and
+simulation, so instead :func:`serve` runs
+
+* one **owner** process with the regular :func:`~bjjsim.web.app.create_app`
+  on a private Unix socket (a loopback TCP port on Windows, which has no
+  Unix sockets), publishing the default session into a
+  :class:`~bjjsim.web.shared_state.SharedStateSegment`, and
+* ``workers`` uvicorn processes running :func:`create_worker_app` on the
+  public port.
+
+Workers answer ``GET /api/sim/state``, ``/api/metrics``,
+``/api/frames/current`` and ``/ws/events`` for the default session straight
+from shared memory, so polling clients scale with the number of workers.
+The owner renders a frame only when asked for one, so the first frame
+request after a change is forwarded and later ones are read from memory.
+Everything else (mutations, other sessions, replays, pages) is forwarded to
+the owner, which keeps the single-writer simulation model.  WebSocket
+connections for non-default sessions are not forwarded and close with 4404.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import tempfile
+import time
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from typing import Annotated, Final
+
+import httpx
+from fastapi import FastAPI, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response
+from starlette.datastructures import Headers, QueryParams
+
+from bjjsim.web.app import (
+    MAX_STATE_WAIT_S,
+    HealthResponse,
+    MetricsResponse,
+    ReadinessResponse,
+    StateResponse,
+    conditional_state,
+    state_etag,
+    ws_interval_s,
+)
+from bjjsim.web.sessions import DEFAULT_SESSION_ID
+from bjjsim.web.shared_state import SharedSnapshot, SharedStateSegment
+
+SEGMENT_ENV: Final[str] = "BJJSIM_STATE_SEGMENT"
+OWNER_SOCKET_ENV: Final[str] = "BJJSIM_OWNER_SOCKET"
+STATE_POLL_INTERVAL_S: Final[float] = 0.02
+# Owner addresses with this prefix are loopback TCP; anything else is a socket path.
+_TCP_PREFIX: Final[str] = "tcp://"
+OWNER_STARTUP_TIMEOUT_S: Final[float] = 30.0
+
+# Connection-level headers (RFC 9110 §7.6.1) plus those httpx recomputes.
+_HOP_BY_HOP: Final[frozenset[str]] = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+        "host",
+        "content-length",
+        "content-encoding",
+    }
+)
+_PROXY_METHODS: Final[list[str]] = ["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+
+
+def _requested_session(params: QueryParams, headers: Headers) -> str | None:
+    return params.get("session_id") or headers.get("x-session-id")
+
+
+def _owner_endpoint(address: str) -> tuple[str | None, str]:
+    """``(uds, base_url)`` for reaching the owner at ``address``."""
+
+    if address.startswith(_TCP_PREFIX):
+        return None, f"http://{address.removeprefix(_TCP_PREFIX)}"
+    return address, "http://owner"
+
+
+def _free_loopback_address() -> str:
+    # The port is released before the owner binds it; on a loopback
+    # interface the window for another process to take it is negligible.
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    return f"{_TCP_PREFIX}127.0.0.1:{port}"
+
+
+def create_worker_app(
+    *,
+    segment: str | None = None,
+    owner_socket: str | None = None,
+    owner_transport: httpx.AsyncBaseTransport | None = None,
+) -> FastAPI:
+    """Build a worker app reading ``segment`` and forwarding to the owner.
+
+    ``segment`` and ``owner_socket`` default to the ``BJJSIM_STATE_SEGMENT``
+    and ``BJJSIM_OWNER_SOCKET`` environment variables set by :func:`serve`;
+    ``owner_socket`` is a Unix socket path or ``tcp://host:port``.
+    ``owner_transport`` replaces the transport to the owner, e.g. with an
+    :class:`httpx.ASGITransport` in tests.
+    """
+
+    from bjjsim import __version__ as pkg_version
+
+    segment = segment or os.environ.get(SEGMENT_ENV)
+    if not segment:
+        msg = f"no shared state segment given (pass segment= or set {SEGMENT_ENV})"
+        raise ValueError(msg)
+    base_url = "http://owner"
+    if owner_transport is None:
+        owner_socket = owner_socket or os.environ.get(OWNER_SOCKET_ENV)
+        if not owner_socket:
+            msg = f"no owner socket given (pass owner_socket= or set {OWNER_SOCKET_ENV})"
+            raise ValueError(msg)
+        uds, base_url = _owner_endpoint(owner_socket)
+        owner_transport = httpx.AsyncHTTPTransport(uds=uds)
+
+    shared = SharedStateSegment.attach(segment)
+    owner = httpx.AsyncClient(transport=owner_transport, base_url=base_url, timeout=None)
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        try:
+            yield
+        finally:
+            await owner.aclose()
+            shared.close()
+
+    app = FastAPI(title="BJJSim UI worker", version=pkg_version, lifespan=lifespan)
+
+    def _snapshot() -> SharedSnapshot:
+        snapshot = shared.read()
+        if snapshot is None:
+            raise HTTPException(status_code=503, detail="simulation owner has not published yet")
+        return snapshot
+
+    def _is_default(request: Request) -> bool:
+        session_id = _requested_session(request.query_params, request.headers)
+        return session_id in (None, DEFAULT_SESSION_ID)
+
+    async def forward(request: Request) -> Response:
+        """Replay ``request`` against the owner and relay its answer."""
+
+        url = request.url.path
+        if request.url.query:
+            url = f"{url}?{request.url.query}"
+        upstream = await owner.request(
+            request.method,
+            url,
+            headers=[
+                (key, value)
+                for key, value in request.headers.items()
+                if key.lower() not in _HOP_BY_HOP
+            ],
+            content=await request.body(),
+        )
+        response = Response(content=upstream.content, status_code=upstream.status_code)
+        for key, value in upstream.headers.multi_items():
+            if key.lower() not in _HOP_BY_HOP:
+                response.headers.append(key, value)
+        return response
+
+    async def get_state(
+        request: Request,
+        wait_for_version: Annotated[int | None, Query(ge=0)] = None,
+        timeout: Annotated[float, Query(gt=0, le=MAX_STATE_WAIT_S)] = 30.0,
+        if_none_match: Annotated[str | None, Header()] = None,
+    ) -> Response:
+        if not _is_default(request):
+            return await forward(request)
+        snapshot = _snapshot()
+        if wait_for_version is not None:
+            # Workers cannot be woken by the owner, so long-polls re-read the
+            # segment; reads are lock-free and cost a few microseconds.
+            deadline = time.monotonic() + timeout
+            while snapshot.version < wait_for_version:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(STATE_POLL_INTERVAL_S, remaining))
+                snapshot = _snapshot()
+        response = StateResponse(
+            episode_running=snapshot.episode_running,
+            last_seed=snapshot.last_seed,
+            step=snapshot.step,
+            metrics=snapshot.metrics,
+            version=snapshot.version,
+        )
+        etag = state_etag(snapshot.epoch, DEFAULT_SESSION_ID, snapshot.version)
+        return conditional_state(response, etag, if_none_match)
+
+    async def get_metrics(request: Request) -> Response:
+        if not _is_default(request):
+            return await forward(request)
+        metrics = MetricsResponse(**_snapshot().metrics)
+        return Response(metrics.model_dump_json(), media_type="application/json")
+
+    async def get_frame(request: Request) -> Response:
+        if not _is_default(request):
+            return await forward(request)
+        snapshot = _snapshot()
+        if not snapshot.frame_is_current:
+            # The owner renders it and publishes it for the next request.
+            return await forward(request)
+        return Response(content=snapshot.frame, media_type="image/png")
+
+    async def ws_events(ws: WebSocket) -> None:
+        """Same messages as the owner's ``/ws/events``, for the default session only."""
+
+        if _requested_session(ws.query_params, ws.headers) not in (None, DEFAULT_SESSION_ID):
+            await ws.close(code=4404)
+            return
+        snapshot = shared.read()
+        if snapshot is None:
+            await ws.close(code=1013)  # try again later
+            return
+        await ws.accept()
+        await ws.send_json(
+            {
+                "type": "hello",
+                "session_id": DEFAULT_SESSION_ID,
+                "episode_running": snapshot.episode_running,
+                "step": snapshot.step,
+            }
+        )
+        try:
+            while True:
+                snapshot = shared.read() or snapshot
+                await ws.send_json(
+                    {
+                        "type": "state",
+                        "episode_running": snapshot.episode_running,
+                        "step": snapshot.step,
+                        "metrics": snapshot.metrics,
+                    }
+                )
+                await asyncio.sleep(ws_interval_s(ws))
+        except WebSocketDisconnect:
+            return
+
+    def healthz() -> HealthResponse:
+        return HealthResponse(status="ok", version=pkg_version)
+
+    def readyz() -> ReadinessResponse:
+        return ReadinessResponse(ready=shared.read() is not None)
+
+    app.add_api_route("/api/sim/state", get_state, methods=["GET"], response_model=StateResponse)
+    app.add_api_route("/api/metrics", get_metrics, methods=["GET"], response_model=MetricsResponse)
+    app.add_api_route("/api/frames/current", get_frame, methods=["GET"], response_class=Response)
+    app.add_api_websocket_route("/ws/events", ws_events)
+    app.add_api_route("/healthz", healthz, methods=["GET"], response_model=HealthResponse)
+    app.add_api_route("/readyz", readyz, methods=["GET"], response_model=ReadinessResponse)
+    # Registered last so the routes above take precedence.
+    app.add_api_route("/{path:path}", forward, methods=_PROXY_METHODS, include_in_schema=False)
+    return app
+
+
+def _run_owner(segment: str, address: str, log_level: str) -> None:
+    import uvicorn
+
+    from bjjsim.web.app import create_app
+
+    app = create_app(state_segment=segment)
+    uds, base_url = _owner_endpoint(address)
+    if uds is not None:
+        uvicorn.run(app, uds=uds, log_level=log_level)
+        return
+    host, _, port = base_url.removeprefix("http://").rpartition(":")
+    uvicorn.run(app, host=host, port=int(port), log_level=log_level)
+
+
+def _wait_for_owner(
+    address: str, process: multiprocessing.process.BaseProcess, timeout_s: float
+) -> None:
+    deadline = time.monotonic() + timeout_s
+    uds, base_url = _owner_endpoint(address)
+    with httpx.Client(transport=httpx.HTTPTransport(uds=uds), base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            if not process.is_alive():
+                msg = f"simulation owner exited with code {process.exitcode}"
+                raise RuntimeError(msg)
+            try:
+                if client.get("/healthz").status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            time.sleep(0.05)
+    msg = f"simulation owner did not become healthy within {timeout_s:.0f}s"
+    raise RuntimeError(msg)
+
+
+def serve(
+    *,
+    workers: int,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    log_level: str = "info",
+    access_log: bool = True,
+) -> None:
+    """Run the owner process and ``workers`` uvicorn workers until interrupted."""
+
+    import uvicorn
+
+    if workers < 1:
+        msg = "workers must be at least 1"
+        raise ValueError(msg)
+    shared = SharedStateSegment.create()
+    try:
+        with tempfile.TemporaryDirectory(prefix="bjjsim-") as tmp:
+            if os.name == "nt":
+                address = _free_loopback_address()
+            else:
+                address = os.path.join(tmp, "owner.sock")
+            owner = multiprocessing.get_context("spawn").Process(
+                target=_run_owner,
+                args=(shared.name, address, log_level),
+                name="bjjsim-owner",
+            )
+            owner.start()
+            try:
+                _wait_for_owner(address, owner, OWNER_STARTUP_TIMEOUT_S)
+                # Uvicorn's worker processes inherit the environment.
+                os.environ[SEGMENT_ENV] = shared.name
+                os.environ[OWNER_SOCKET_ENV] = address
+                uvicorn.run(
+                    "bjjsim.web.workers:create_worker_app",
+                    factory=True,
+                    host=host,
+                    port=port,
+                    workers=workers,
+                    log_level=log_level,
+                    access_log=access_log,
+                )
+            finally:
+                owner.terminate()
+                owner.join(timeout=10)
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m bjjsim.web.workers",
+        description="Serve the BJJSim UI from several worker processes sharing one simulation.",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+    serve(workers=args.workers, host=args.host, port=args.port, log_level=args.log_level)
+
+
+__all__ = [
+    "OWNER_SOCKET_ENV",
+    "SEGMENT_ENV",
+    "create_worker_app",
+    "main",
+    "serve",
+]
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry
+    main()
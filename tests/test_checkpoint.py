@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from bjjsim.env import BJJMultiAgentEnv, EnvConfig
+from bjjsim.env.array import VectorArrayEnv
+from bjjsim.env.normalize import NormalizeObservation
+from bjjsim.training import (
+    Checkpoint,
+    CheckpointCorruptError,
+    CheckpointManager,
+    MLPPolicy,
+)
+
+CONFIG = EnvConfig(max_episode_steps=20)
+
+
+def _actions(env: BJJMultiAgentEnv, value: float) -> dict[str, list[float]]:
+    return {agent: [value] * CONFIG.action_dim for agent in env.agents}
+
+
+def test_env_state_roundtrip_resumes_mid_episode() -> None:
+    env = BJJMultiAgentEnv(CONFIG)
+    env.reset(seed=4)
+    for _ in range(3):
+        env.step(_actions(env, 0.2))
+    state = json.loads(json.dumps(env.state_dict()))
+
+    expected = [env.step(_actions(env, 0.1)).observations for _ in range(3)]
+    restored = BJJMultiAgentEnv(CONFIG)
+    restored.load_state_dict(state)
+    assert restored.episode_step_count == 3
+    assert [restored.step(_actions(env, 0.1)).observations for _ in range(3)] == expected
+    assert restored.physics.step_count == env.physics.step_count
+
+
+def test_save_is_asynchronous_atomic_and_lazily_loaded(tmp_path: Path) -> None:
+    env = BJJMultiAgentEnv(CONFIG)
+    env.reset(seed=1)
+    env.step(_actions(env, 0.5))
+    normalizer = NormalizeObservation(VectorArrayEnv.from_config(2, CONFIG))
+    normalizer.reset(seed=0)
+    policy = MLPPolicy.random(CONFIG.observation_dim, CONFIG.action_dim, hidden_sizes=(8,))
+    weights = [w.copy() for w in policy.weights]
+
+    with CheckpointManager(tmp_path, keep_last=2) as manager:
+        future = manager.save(
+            7,
+            env=env,
+            normalizer=normalizer,
+            policy=policy,
+            extra={"optimizer": {"m": np.ones(3)}, "epoch": 2},
+        )
+        # The snapshot is taken before save() returns.
+        policy.weights[0][:] = 0.0
+        assert future.result() == tmp_path / "ckpt-0000000007"
+        for step in (8, 9):
+            manager.save(step, policy=policy)
+        manager.wait()
+        assert [p.name for p in manager.checkpoints()] == ["ckpt-0000000008", "ckpt-0000000009"]
+        assert manager.saves == 3
+
+    assert not list(tmp_path.glob(".ckpt-*"))
+    checkpoint = CheckpointManager(tmp_path).latest(verify=True)
+    assert checkpoint is not None and checkpoint.step == 9
+    assert not checkpoint.policy().weights[0].any()
+
+    manager = CheckpointManager(tmp_path, keep_last=None)
+    manager.save(7, env=env, normalizer=normalizer, policy=MLPPolicy(weights, policy.biases))
+    manager.close()
+    first = manager.load(7)
+    assert set(first.keys()) == {"env", "normalizer", "policy"}
+    assert isinstance(first["policy"]["w0"], np.memmap)
+    np.testing.assert_array_equal(first.policy().weights[0], weights[0])
+
+    resumed_env = BJJMultiAgentEnv(CONFIG)
+    resumed_norm = NormalizeObservation(VectorArrayEnv.from_config(2, CONFIG))
+    first.restore(env=resumed_env, normalizer=resumed_norm)
+    assert resumed_env.state_dict() == env.state_dict()
+    np.testing.assert_array_equal(resumed_norm.obs_rms.mean, normalizer.obs_rms.mean)
+
+
+def test_corrupt_checkpoints_are_detected_and_skipped(tmp_path: Path) -> None:
+    with CheckpointManager(tmp_path, keep_last=None) as manager:
+        manager.save(1, policy={"w0": np.ones((2, 2)), "b0": np.zeros(2)})
+        manager.save(2, policy={"w0": np.ones((2, 2)), "b0": np.zeros(2)})
+    newest = Checkpoint(tmp_path / "ckpt-0000000002")
+    array_file = tmp_path / "ckpt-0000000002" / next(iter(newest.files))
+    data = bytearray(array_file.read_bytes())
+    data[-1] ^= 0xFF
+    array_file.write_bytes(bytes(data))
+    with pytest.raises(CheckpointCorruptError, match="checksum"):
+        newest.verify()
+
+    (tmp_path / ".ckpt-0000000003-abandoned").mkdir()
+    # A half-deleted directory without its manifest is not a checkpoint.
+    (tmp_path / "ckpt-0000000004").mkdir()
+    manager = CheckpointManager(tmp_path)
+    assert not list(tmp_path.glob(".ckpt-*"))
+    assert [p.name for p in manager.checkpoints()] == ["ckpt-0000000001", "ckpt-0000000002"]
+    latest = manager.latest(verify=True)
+    assert latest is not None and latest.step == 1
+    assert manager.latest() is not None and manager.latest().step == 2  # type: ignore[union-attr]
+    with pytest.raises(TypeError, match="set"):
+        manager.save(3, extra={"bad": {1, 2}})
+    manager.close()
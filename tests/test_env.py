@@ -103,3 +103,54 @@ def test_invalid_actions_raise() -> None:
         env.step(cast(Mapping[str, Sequence[float]], non_iterable_raw))
 
     env.close()
+
+
+def test_step_result_unpacks_and_exposes_rows() -> None:
+    env = BJJMultiAgentEnv(EnvConfig(max_episode_steps=2))
+    env.reset(seed=5)
+    actions = {agent: [0.5] * env.config.action_dim for agent in env.agents}
+    result = env.step(actions)
+
+    obs, rewards, terminated, truncated, infos = result
+    assert len(result) == 5
+    assert result[1] == rewards
+    assert obs == dict(zip(env.agents, result.observation_rows, strict=True))
+    assert [rewards[agent] for agent in env.agents] == result.reward_values
+    assert terminated == {agent: False for agent in env.agents}
+    assert truncated == {agent: False for agent in env.agents}
+    assert infos["agent1"]["reward_components"]["energy_penalty"] == result.energy_penalties[0]
+    assert (result.step, result.physics_step) == (1, env.physics.step_count)
+
+    final = env.step(actions)
+    assert final.episode_truncated
+    assert all(final.truncated.values())
+
+
+@pytest.mark.parametrize(
+    ("info_mode", "expected_keys"),
+    [
+        ("full", {"reward_components", "step", "physics_step"}),
+        ("summary", {"step", "physics_step"}),
+    ],
+)
+def test_info_mode_controls_info_contents(info_mode: str, expected_keys: set[str]) -> None:
+    env = BJJMultiAgentEnv(EnvConfig(info_mode=info_mode))  # type: ignore[arg-type]
+    env.reset(seed=1)
+    infos = env.step(make_zero_actions(env)).infos
+    assert set(infos) == set(env.agents)
+    assert set(infos["agent1"]) == expected_keys
+
+
+def test_info_mode_none_matches_full_mode_values() -> None:
+    quiet = BJJMultiAgentEnv(EnvConfig(info_mode="none"))
+    full = BJJMultiAgentEnv()
+    quiet.reset(seed=9)
+    full.reset(seed=9)
+    actions = {agent: [0.25] * quiet.config.action_dim for agent in quiet.agents}
+    a, b = quiet.step(actions), full.step(actions)
+    assert a.infos == {}
+    assert a.observation_rows == b.observation_rows
+    assert a.reward_values == b.reward_values
+
+    with pytest.raises(ValueError, match="info_mode"):
+        EnvConfig(info_mode="verbose")  # type: ignore[arg-type]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from gymnasium import spaces
+
+from bjjsim.env import BJJMultiAgentEnv, EnvConfig
+from bjjsim.env.array import ArrayEnv, VectorArrayEnv
+
+
+def test_array_env_matches_dict_api() -> None:
+    config = EnvConfig(max_episode_steps=5)
+    dict_env = BJJMultiAgentEnv(config)
+    array_env = ArrayEnv(BJJMultiAgentEnv(config), dtype=np.float64)
+
+    assert isinstance(array_env.observation_space, spaces.Box)
+    assert array_env.observation_space.shape == (2, config.observation_dim)
+    assert array_env.action_space.shape == (2, config.action_dim)
+
+    obs_dict, _ = dict_env.reset(seed=3)
+    obs_arr, info = array_env.reset(seed=3)
+    assert info["seed"] == 3
+    for idx, agent in enumerate(dict_env.agents):
+        assert obs_arr[idx].tolist() == obs_dict[agent]
+
+    actions = np.array([[0.5, -2.0, 0, 0, 0, 0], [0.1] * 6])
+    obs_dict, rew_dict, _, _, _ = dict_env.step(
+        {agent: actions[idx].tolist() for idx, agent in enumerate(dict_env.agents)}
+    )
+    obs_arr2, rew_arr, terminated, truncated, _ = array_env.step(actions)
+    for idx, agent in enumerate(dict_env.agents):
+        assert obs_arr2[idx].tolist() == obs_dict[agent]
+        assert rew_arr[idx] == pytest.approx(rew_dict[agent])
+    assert terminated.shape == truncated.shape == (2,)
+    assert not truncated.any()
+
+    # Outputs are the wrapper's own buffers, reused across steps (no copies).
+    assert obs_arr2 is obs_arr
+
+
+def test_array_env_rejects_bad_action_shape() -> None:
+    env = ArrayEnv()
+    env.reset(seed=0)
+    with pytest.raises(ValueError):
+        env.step(np.zeros((2, 5)))
+
+
+def test_vector_env_batches_and_autoresets() -> None:
+    config = EnvConfig(max_episode_steps=2)
+    venv = VectorArrayEnv.from_config(3, config)
+    assert venv.single_observation_space.shape == (2, config.observation_dim)
+    assert venv.observation_space.shape == (3, 2, config.observation_dim)
+
+    obs, _ = venv.reset(seed=10)
+    assert obs.shape == (3, 2, config.observation_dim)
+    reference, _ = BJJMultiAgentEnv(config).reset(seed=11)
+    np.testing.assert_allclose(obs[1, 0], np.float32(reference["agent1"]))
+
+    actions = np.zeros((3, 2, config.action_dim))
+    obs1, rewards, _, truncated, infos = venv.step(actions)
+    assert rewards.shape == (3, 2)
+    assert not truncated.any()
+    assert infos == {}
+
+    obs2, _, _, truncated, infos = venv.step(actions)
+    assert obs2 is obs1
+    assert truncated.all()
+    assert infos["_final_observation"].all()
+    assert infos["final_observation"][0][0, 0] == 2.0  # episode step before reset
+    assert (obs2[:, :, 0] == 0.0).all()  # autoreset observations
+    venv.close()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import dataclasses
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from bjjsim.env import EnvConfig
+from bjjsim.training import (
+    EvaluationCache,
+    MLPPolicy,
+    OpponentPool,
+    Tournament,
+    evaluation_key,
+    policy_digest,
+)
+
+CONFIG = EnvConfig(max_episode_steps=10)
+
+
+def _key(seed: int = 0, **config: object) -> str:
+    return evaluation_key(
+        dataclasses.replace(CONFIG, **config), seed, policies=("a" * 64, "b" * 64)
+    )
+
+
+def test_keys_cover_config_seed_and_policy_weights() -> None:
+    assert _key() == _key()
+    assert len({_key(), _key(seed=1), _key(step_reward=0.2), _key(physics_steps_per_action=2)}) == 4
+    # A derived observation_dim keys the same as the equal explicit one.
+    assert _key() == _key(observation_dim=12)
+
+    rng = np.random.default_rng(0)
+    policy = MLPPolicy.random(12, 6, hidden_sizes=(4,), rng=rng)
+    params = policy.parameters()
+    assert policy_digest(params) == policy_digest(dict(reversed(params.items())))
+    nudged = {**params, "w0": params["w0"] + np.float32(1e-6)}
+    assert policy_digest(nudged) != policy_digest(params)
+
+
+def test_get_put_roundtrip_and_lru_eviction(tmp_path: Path) -> None:
+    cache = EvaluationCache(tmp_path, max_bytes=10_000)
+    keys = [_key(seed) for seed in range(8)]
+    assert cache.get(keys[0]) is None
+    for idx, key in enumerate(keys):
+        cache.put(key, {"score": idx, "pad": "x" * 800})
+        # Distinct, increasing access times regardless of filesystem resolution.
+        os.utime(cache.directory / key[:2] / f"{key}.json", ns=(idx * 10**9, idx * 10**9))
+    assert cache.get(keys[3]) == {"score": 3, "pad": "x" * 800}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Touching keys[0] makes it the most recently used entry.
+    assert cache.get(keys[0]) is not None
+    for seed in range(8, 12):
+        cache.put(_key(seed), {"score": seed, "pad": "x" * 800})
+
+    assert cache.size_bytes <= 10_000
+    assert cache.evictions > 0
+    assert keys[0] in cache and keys[3] in cache
+    assert keys[1] not in cache
+    with pytest.raises(ValueError, match="hex"):
+        cache.get("../../etc/passwd")
+
+
+def test_put_retries_and_tolerates_locked_entries(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = EvaluationCache(tmp_path)
+    key = _key()
+    real_replace = os.replace
+    failures = [2]
+
+    def flaky_replace(src: str, dst: Path) -> None:
+        # Windows raises PermissionError while another process has dst open.
+        if failures[0]:
+            failures[0] -= 1
+            raise PermissionError(dst)
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", flaky_replace)
+    cache.put(key, {"score": 1})
+    assert cache.get(key) == {"score": 1}
+
+    failures[0] = 100
+    cache.put(key, {"score": 1})
+    assert cache.get(key) == {"score": 1}
+    assert not list(tmp_path.glob("??/.*.tmp"))
+    with pytest.raises(PermissionError):
+        cache.put(_key(seed=1), {"score": 2})
+
+
+def test_evict_skips_entries_open_elsewhere(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = EvaluationCache(tmp_path, max_bytes=10_000)
+    keys = [_key(seed) for seed in range(6)]
+    for idx, key in enumerate(keys):
+        cache.put(key, {"score": idx})
+        os.utime(cache.directory / key[:2] / f"{key}.json", ns=(idx * 10**9, idx * 10**9))
+    locked = cache.directory / keys[0][:2] / f"{keys[0]}.json"
+    real_unlink = Path.unlink
+
+    def unlink(path: Path, missing_ok: bool = False) -> None:
+        # Windows refuses to delete a file another process has open.
+        if path == locked:
+            raise PermissionError(path)
+        real_unlink(path, missing_ok)
+
+    monkeypatch.setattr(Path, "unlink", unlink)
+    cache.max_bytes = cache.size_bytes // 2
+    removed = cache.evict()
+    assert keys[0] in cache
+    assert removed == len(keys) - len(cache)
+    assert cache.size_bytes <= cache.max_bytes * cache.low_watermark
+    cache.clear()
+    assert len(cache) == 1
+
+
+def _put_many(directory: str, worker: int) -> int:
+    cache = EvaluationCache(directory, max_bytes=4_000)
+    for seed in range(40):
+        key = _key(seed)
+        cache.put(key, {"worker": worker, "seed": seed})
+        value = cache.get(key)
+        assert value is None or value["seed"] == seed
+    return cache.evictions
+
+
+def test_concurrent_writers_keep_entries_whole(tmp_path: Path) -> None:
+    with ProcessPoolExecutor(max_workers=3) as executor:
+        list(executor.map(_put_many, [str(tmp_path)] * 3, range(3)))
+    cache = EvaluationCache(tmp_path, max_bytes=4_000)
+    assert 0 < len(cache) < 40
+    for seed in range(40):
+        value = cache.get(_key(seed))
+        assert value is None or value["seed"] == seed
+    assert not list(tmp_path.glob("*/.*.tmp"))
+
+
+def test_tournament_replays_cached_matches(tmp_path: Path) -> None:
+    pool = OpponentPool(tmp_path / "pool")
+    for step, scale in enumerate((0.0, 1.0, 50.0)):
+        rng = np.random.default_rng(0)
+        policy = MLPPolicy.random(12, 6, hidden_sizes=(8,), rng=rng)
+        pool.add(
+            MLPPolicy([w * scale for w in policy.weights], policy.biases).parameters(), step=step
+        )
+    cache = EvaluationCache(tmp_path / "cache")
+
+    first = Tournament(pool, seeds_per_pairing=3, workers=0, env_config=CONFIG, cache=cache)
+    fresh = list(first.run())
+    assert first.cached_matches == 0
+    assert len(cache) == 9
+
+    again = Tournament(pool, seeds_per_pairing=3, workers=0, env_config=CONFIG, cache=cache)
+    replayed = list(again.run())
+    assert again.cached_matches == 9
+    assert replayed == fresh
+    assert [s.snapshot_id for s in again.standings()] == [s.snapshot_id for s in first.standings()]
+
+    other = dataclasses.replace(CONFIG, max_episode_steps=5)
+    changed = Tournament(pool, seeds_per_pairing=1, workers=0, env_config=other, cache=cache)
+    list(changed.run())
+    assert changed.cached_matches == 0
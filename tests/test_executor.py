@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Sequence
+
+import pytest
+
+from bjjsim.web.executor import SimulationExecutor
+
+
+def test_run_executes_on_single_dedicated_thread() -> None:
+    executor = SimulationExecutor()
+
+    async def main() -> set[str]:
+        names = await asyncio.gather(
+            *(executor.run(lambda: threading.current_thread().name) for _ in range(8))
+        )
+        return set(names)
+
+    names = asyncio.run(main())
+    executor.shutdown()
+    assert len(names) == 1
+    assert next(iter(names)).startswith("bjjsim-sim")
+
+
+def test_step_requests_coalesce_while_thread_is_busy() -> None:
+    executor = SimulationExecutor()
+    gate = threading.Event()
+    calls: list[list[int]] = []
+
+    def apply(counts: Sequence[int]) -> list[int | BaseException]:
+        calls.append(list(counts))
+        results: list[int | BaseException] = []
+        running_total = 0
+        for n in counts:
+            if n < 0:
+                results.append(ValueError("negative"))
+                continue
+            running_total += n
+            results.append(running_total)
+        return results
+
+    async def main() -> list[int | BaseException]:
+        blocker = executor.run(gate.wait)
+        blocker_task = asyncio.ensure_future(blocker)
+        await asyncio.sleep(0.01)  # let the blocker occupy the thread
+        steps = [asyncio.ensure_future(executor.step("s", n, apply)) for n in (1, 2, -1, 3)]
+        await asyncio.sleep(0.01)
+        gate.set()
+        await blocker_task
+        return await asyncio.gather(*steps, return_exceptions=True)
+
+    results = asyncio.run(main())
+    executor.shutdown()
+    assert calls == [[1, 2, -1, 3]]
+    assert results[:2] == [1, 3]
+    assert isinstance(results[2], ValueError)
+    assert results[3] == 6
+    assert executor.batches_run == 1
+    assert executor.requests_coalesced == 3
+
+
+def test_batch_fn_failure_propagates_to_every_caller() -> None:
+    executor = SimulationExecutor()
+
+    def broken(counts: Sequence[int]) -> list[int | BaseException]:
+        raise RuntimeError("boom")
+
+    async def main() -> None:
+        await executor.step("s", 1, broken)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(main())
+    executor.shutdown()
+
+
+def test_step_after_shutdown_raises_instead_of_hanging() -> None:
+    executor = SimulationExecutor()
+    executor.shutdown()
+
+    def apply(counts: Sequence[int]) -> list[int | BaseException]:
+        return list(counts)
+
+    async def main() -> None:
+        await asyncio.wait_for(executor.step("s", 1, apply), timeout=5)
+
+    # The failed batch is not left pending, so the next caller fails too.
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="shutdown"):
+            asyncio.run(main())
+
+
+def test_cancelled_caller_drops_out_and_others_still_resolve() -> None:
+    executor = SimulationExecutor()
+    gate = threading.Event()
+    calls: list[list[int]] = []
+
+    def apply(counts: Sequence[int]) -> list[int | BaseException]:
+        calls.append(list(counts))
+        return list(counts)
+
+    async def main() -> list[int | BaseException]:
+        blocker_task = asyncio.ensure_future(executor.run(gate.wait))
+        await asyncio.sleep(0.01)  # let the blocker occupy the thread
+        steps = [asyncio.ensure_future(executor.step("s", n, apply)) for n in (1, 2, 3)]
+        await asyncio.sleep(0.01)
+        steps[0].cancel()
+        await asyncio.sleep(0.01)
+        gate.set()
+        await blocker_task
+        return await asyncio.wait_for(asyncio.gather(*steps[1:], return_exceptions=True), 2)
+
+    results = asyncio.run(main())
+    executor.shutdown()
+    assert results == [2, 3]
+    assert calls == [[2, 3]]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import numpy as np
+
+from bjjsim.env import EnvConfig
+from bjjsim.env.array import ArrayEnv, VectorArrayEnv
+from bjjsim.env.frame_stack import FrameStackObservation, ObservationHistory
+
+
+def test_history_returns_views_of_last_k_frames() -> None:
+    history = ObservationHistory((2,), 1, 3)
+    history.reset(np.array([[0.0], [10.0]]))
+    for value in (1.0, 2.0, 3.0, 4.0):
+        frames = history.push(np.array([[value], [10.0 + value]]))
+    assert frames[:, :, 0].tolist() == [[2.0, 3.0, 4.0], [12.0, 13.0, 14.0]]
+    assert frames.base is not None  # a view, not a copy
+
+
+def test_history_reset_of_one_row_keeps_the_others() -> None:
+    history = ObservationHistory((3,), 2, 2, pad="zeros")
+    history.reset(np.ones((3, 2)))
+    history.push(np.full((3, 2), 2.0))
+    frames = history.reset(np.full(2, 7.0), index=1)
+    assert frames[0, :, 0].tolist() == [1.0, 2.0]
+    assert frames[1, :, 0].tolist() == [0.0, 7.0]
+    assert frames[2, :, 0].tolist() == [1.0, 2.0]
+
+
+def test_wrapper_stacks_single_env_observations() -> None:
+    env = FrameStackObservation(ArrayEnv(), 4)
+    obs, _ = env.reset(seed=0)
+    assert obs.shape == (2, 4, 12)
+    assert (obs[:, :, 0] == 0.0).all()  # padded by repeating the reset frame
+    for _ in range(2):
+        obs, *_ = env.step(np.zeros((2, 6)))
+    assert obs[0, :, 0].tolist() == [0.0, 0.0, 1.0, 2.0]
+
+
+def test_vector_wrapper_restarts_history_of_autoreset_envs() -> None:
+    env = FrameStackObservation(VectorArrayEnv.from_config(2, EnvConfig(max_episode_steps=2)), 3)
+    obs, _ = env.reset(seed=0)
+    assert obs.shape == (2, 2, 3, 12)
+    env.step(np.zeros((2, 2, 6)))
+    obs, _, _, truncated, infos = env.step(np.zeros((2, 2, 6)))
+    assert truncated.all()
+    assert infos["final_observation"][0][0, :, 0].tolist() == [0.0, 1.0, 2.0]
+    assert (obs[:, :, :, 0] == 0.0).all()
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import importlib.util
+import threading
+
+import numpy as np
+import pytest
+
+from bjjsim.env import BJJMultiAgentEnv, EnvConfig
+from bjjsim.training import InferenceServer, MLPPolicy, PolicyAdapter
+
+CONFIG = EnvConfig(max_episode_steps=6)
+
+
+def _policy(seed: int) -> MLPPolicy:
+    rng = np.random.default_rng(seed)
+    return MLPPolicy.random(CONFIG.observation_dim, CONFIG.action_dim, hidden_sizes=(16,), rng=rng)
+
+
+def test_concurrent_requests_share_batches_and_get_their_own_rows() -> None:
+    policy = _policy(0)
+    rng = np.random.default_rng(1)
+    blocks = [rng.normal(size=(1 + i % 3, CONFIG.observation_dim)) for i in range(32)]
+    results: list[object] = [None] * len(blocks)
+    barrier = threading.Barrier(len(blocks))
+
+    with InferenceServer(policy, max_delay_s=0.05) as server:
+
+        def call(idx: int) -> None:
+            barrier.wait()
+            results[idx] = server.infer(blocks[idx])
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(len(blocks))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    for block, result in zip(blocks, results, strict=True):
+        np.testing.assert_allclose(result, policy(block), rtol=1e-6)
+    assert server.requests_served == len(blocks)
+    assert server.rows_served == sum(len(b) for b in blocks)
+    assert server.batches_run < len(blocks)
+    assert server.mean_batch_rows > 2
+
+
+def test_act_drives_dict_env_loop_with_per_agent_policies() -> None:
+    policies = {"a": _policy(0), "b": _policy(1)}
+    env = BJJMultiAgentEnv(CONFIG)
+    seats = dict(zip(env.agents, ("a", "b"), strict=True))
+    obs, _ = env.reset(seed=3)
+    with InferenceServer(policies, max_delay_s=0.0) as server:
+        for _ in range(CONFIG.max_episode_steps):
+            actions = server.act(obs, policy=seats)
+            for agent, policy_id in seats.items():
+                expected = policies[policy_id](np.asarray([obs[agent]]))[0]
+                np.testing.assert_allclose(actions[agent], expected, rtol=1e-6)
+            obs = env.step(actions).observations
+
+
+def test_invalid_requests_fail_fast() -> None:
+    server = InferenceServer(_policy(0))
+    with pytest.raises(KeyError, match="unknown policy"):
+        server.submit(np.zeros(CONFIG.observation_dim), policy="missing")
+    with pytest.raises(ValueError, match="shape"):
+        server.submit(np.zeros((2, CONFIG.observation_dim + 1)))
+    assert server.infer(np.zeros(CONFIG.observation_dim)).shape == (1, CONFIG.action_dim)
+    server.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        server.submit(np.zeros(CONFIG.observation_dim))
+
+
+@pytest.mark.parametrize("batched", [True, False])
+def test_policy_adapter_matches_direct_array_loop(batched: bool) -> None:
+    policy = _policy(2)
+    with InferenceServer(policy, max_delay_s=0.0) as server:
+        adapter = PolicyAdapter(server, env=BJJMultiAgentEnv(CONFIG), batched=batched)
+        adapter.start(seed=5)
+        adapter.step(4)
+        assert adapter.step_count == 4
+    assert server.rows_served == (8 if batched else 0)
+
+    env = BJJMultiAgentEnv(CONFIG)
+    obs = np.zeros((2, CONFIG.observation_dim), dtype=np.float32)
+    rewards = np.zeros(2, dtype=np.float32)
+    returns = np.zeros(2)
+    env.reset_arrays(obs, seed=5)
+    for _ in range(4):
+        env.step_arrays(policy(obs), obs, rewards)
+        returns += rewards
+    np.testing.assert_allclose(adapter.returns, returns, rtol=1e-6)
+    np.testing.assert_allclose(adapter.observations, obs)
+
+
+@pytest.mark.skipif(importlib.util.find_spec("fastapi") is None, reason="fastapi missing")
+def test_web_sessions_step_through_shared_server() -> None:
+    from fastapi.testclient import TestClient
+
+    from bjjsim.web.app import create_app
+    from bjjsim.web.sessions import AdapterPool
+
+    # A long delay would stall every step if the adapter went through the queue.
+    with InferenceServer(_policy(0), max_delay_s=5.0) as server:
+        pool = AdapterPool(
+            lambda: PolicyAdapter(server, env=BJJMultiAgentEnv(CONFIG), batched=False), size=1
+        )
+        client = TestClient(create_app(adapter_pool=pool))
+        assert client.post("/api/sim/start", json={"seed": 1}).status_code == 200
+        # Runs past the env's own episode limit; the adapter restarts it.
+        res = client.post("/api/sim/step", json={"num_steps": 10})
+        assert res.json()["step"] == 10
+        assert res.elapsed.total_seconds() < 5.0
+    assert server.rows_served == 0
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+
+import pytest
+
+from bjjsim.bench.loadtest import WS_CONNECT, WS_MESSAGE, LoadTestConfig, TrafficMix, run
+from bjjsim.bench.startup import local_server
+
+
+def test_traffic_mix_rejects_empty_or_negative_weights() -> None:
+    with pytest.raises(ValueError):
+        TrafficMix(0.0, 0.0, 0.0, 0.0).weights()
+    with pytest.raises(ValueError):
+        TrafficMix(step=-1.0).weights()
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("uvicorn") is None or importlib.util.find_spec("websockets") is None,
+    reason="uvicorn and websockets are required to serve the app",
+)
+def test_load_test_reports_per_route_stats_against_local_server() -> None:
+    config = LoadTestConfig(
+        clients=4,
+        websocket_clients=2,
+        duration_s=1.0,
+        isolated_sessions=True,
+        ws_interval_ms=50,
+    )
+    with local_server() as server:
+        report = asyncio.run(run(server.base_url, config))
+
+    assert report.total_errors == 0
+    step = report.route("POST /api/sim/step")
+    assert step.requests > 0
+    assert step.throughput_rps > 0
+    assert step.latency_p50_ms <= step.latency_p95_ms <= step.latency_p99_ms
+    assert report.route("GET /api/sim/state").requests > 0
+    assert report.route(WS_CONNECT).requests == 2
+    assert report.route(WS_MESSAGE).requests > 0
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("uvicorn") is None,
+    reason="uvicorn is required to serve the app",
+)
+def test_shared_session_clients_treat_concurrent_starts_as_success() -> None:
+    # Short episodes make clients race to restart the one shared episode.
+    config = LoadTestConfig(clients=4, websocket_clients=0, duration_s=1.0, num_steps=50)
+    with local_server() as server:
+        report = asyncio.run(run(server.base_url, config))
+
+    assert report.total_errors == 0
+    assert report.route("POST /api/sim/start").requests > 4
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from bjjsim.web.metrics import Counter, Gauge, Histogram, MetricsRegistry, WindowedRate
+
+
+def test_histogram_exposes_cumulative_buckets() -> None:
+    registry = MetricsRegistry()
+    hist = registry.register(Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1)))
+    hist.labels("/a").observe(0.05)
+    hist.labels("/a").observe(0.1)
+    hist.labels("/a").observe(5.0)
+
+    text = registry.render()
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+    assert 'latency_seconds_sum{route="/a"} 5.15' in text
+
+
+def test_counter_sums_per_thread_shards() -> None:
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("events_total", "Events."))
+
+    def work() -> None:
+        for _ in range(1000):
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert "events_total 4000" in registry.render()
+
+
+def test_gauge_and_label_validation() -> None:
+    registry = MetricsRegistry()
+    gauge = registry.register(Gauge("open", "Open things."))
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    registry.register(Gauge("live", "Live things.", function=lambda: 7))
+    text = registry.render()
+    assert "open 1" in text
+    assert "live 7" in text
+
+    labelled = Counter("x_total", "X.", ("a",))
+    with pytest.raises(ValueError):
+        labelled.labels("1", "2")
+    with pytest.raises(ValueError):
+        registry.register(Gauge("open", "Duplicate."))
+
+
+def test_windowed_rate_counts_completed_seconds_only() -> None:
+    now = [100.0]
+    rate = WindowedRate(horizon_s=10, clock=lambda: now[0])
+    rate.add(20)
+    now[0] = 101.5
+    rate.add(10)
+    # Second 101 is still in progress, so only second 100 counts.
+    assert rate.rate(10) == pytest.approx(2.0)
+    assert rate.rate(1) == pytest.approx(20.0)
+    now[0] = 102.0
+    assert rate.rate(1) == pytest.approx(10.0)
+
+    now[0] = 110.0
+    assert rate.rate(10) == pytest.approx(3.0)
+    now[0] = 111.0  # the sample at t=100 is now outside the 10 s window
+    assert rate.rate(10) == pytest.approx(1.0)
+    now[0] = 200.0
+    assert rate.rate(10) == 0.0
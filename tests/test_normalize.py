@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from bjjsim.env import EnvConfig
+from bjjsim.env.array import ArrayEnv, VectorArrayEnv
+from bjjsim.env.normalize import NormalizeObservation, RunningMeanStd
+
+
+def test_batched_updates_match_full_dataset_moments() -> None:
+    rng = np.random.default_rng(0)
+    data = rng.normal(5.0, 3.0, size=(1000, 4))
+    rms = RunningMeanStd((4,), epsilon=0.0)
+    for block in np.array_split(data, 7):
+        rms.update(block)
+    np.testing.assert_allclose(rms.mean, data.mean(axis=0))
+    np.testing.assert_allclose(rms.var, data.var(axis=0))
+    assert rms.count == 1000
+
+
+def test_worker_statistics_combine_like_one_stream() -> None:
+    rng = np.random.default_rng(1)
+    chunks = [rng.uniform(-100, 100, size=(n, 3, 2)) for n in (10, 250, 40)]
+    workers = []
+    for chunk in chunks:
+        rms = RunningMeanStd((2,), epsilon=0.0)
+        rms.update(chunk)
+        workers.append(rms)
+    pooled = RunningMeanStd.combine(workers)
+    everything = np.concatenate(chunks).reshape(-1, 2)
+    np.testing.assert_allclose(pooled.mean, everything.mean(axis=0))
+    np.testing.assert_allclose(pooled.var, everything.var(axis=0))
+
+    restored = RunningMeanStd((2,))
+    restored.load_state_dict(pooled.state_dict())
+    np.testing.assert_array_equal(restored.mean, pooled.mean)
+    assert restored.count == pooled.count
+    with pytest.raises(ValueError):
+        RunningMeanStd((3,)).merge(pooled)
+
+
+def test_wrapper_normalizes_and_freezes() -> None:
+    env = NormalizeObservation(ArrayEnv(), clip=5.0)
+    obs, _ = env.reset(seed=0)
+    assert obs.dtype == np.float32
+    assert np.abs(obs).max() <= 5.0
+    for _ in range(20):
+        env.step(np.zeros((2, 6)))
+    count = env.obs_rms.count
+
+    env.freeze()
+    frozen = env.state_dict()
+    obs, *_ = env.step(np.zeros((2, 6)))
+    assert np.abs(obs).max() <= 5.0
+    assert env.obs_rms.count == count
+
+    other = NormalizeObservation(ArrayEnv())
+    other.load_state_dict(frozen)
+    np.testing.assert_array_equal(other.obs_rms.var, env.obs_rms.var)
+
+
+def test_vector_wrapper_normalizes_final_observations() -> None:
+    venv = NormalizeObservation(VectorArrayEnv.from_config(2, EnvConfig(max_episode_steps=2)))
+    venv.reset(seed=0)
+    venv.step(np.zeros((2, 2, 6)))
+    count = venv.obs_rms.count
+    _, _, _, truncated, infos = venv.step(np.zeros((2, 2, 6)))
+    assert truncated.all()
+    assert venv.obs_rms.count == count + 2 * 2
+    final = infos["final_observation"][0]
+    assert np.abs(final).max() <= venv.clip
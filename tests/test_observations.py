@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from bjjsim.env import BJJMultiAgentEnv, EnvConfig, ObservationLayout
+from bjjsim.physics import HUMANOID, DeterministicCounterAdapter, PoseFrame, scripted_poses
+
+LINKS = HUMANOID.num_links
+
+
+class _CountingAdapter(DeterministicCounterAdapter):
+    def __init__(self) -> None:
+        super().__init__()
+        self.pose_calls = 0
+
+    def poses(self) -> PoseFrame:
+        self.pose_calls += 1
+        return super().poses()
+
+
+class _NoPoseAdapter(DeterministicCounterAdapter):
+    skeleton = None  # type: ignore[assignment]
+    poses = None  # type: ignore[assignment]
+
+
+def test_layout_offsets_and_derived_observation_dim() -> None:
+    groups = ("step_counters", "own_joints", "contact_summary")
+    layout = ObservationLayout.compile(groups, LINKS)
+    assert layout.offsets == (0, 2, 2 + 3 * LINKS)
+    assert layout.slice("contact_summary") == slice(2 + 3 * LINKS, 4 + 3 * LINKS)
+    assert layout.needs_poses
+    assert not ObservationLayout.compile(("step_counters", "agent_index"), LINKS).needs_poses
+    with pytest.raises(KeyError, match="not selected"):
+        layout.slice("base_height")
+
+    assert EnvConfig(observation_groups=groups).observation_dim == layout.size
+    assert EnvConfig(observation_groups=groups, observation_dim=layout.size).observation_dim == 49
+    with pytest.raises(ValueError, match="does not match"):
+        EnvConfig(observation_groups=groups, observation_dim=5)
+    with pytest.raises(ValueError, match="does not match"):
+        EnvConfig(observation_groups=groups, observation_dim=12)
+    with pytest.raises(ValueError, match="unknown observation group"):
+        EnvConfig(observation_groups=("own_joints", "velocity"))  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="repeat"):
+        EnvConfig(observation_groups=("agent_index", "agent_index"))
+
+
+def test_replace_rederives_observation_dim_unless_it_was_explicit() -> None:
+    groups = ("step_counters", "own_joints", "contact_summary")
+    config = EnvConfig(observation_groups=groups[:2])
+    narrower = replace(config, observation_groups=groups[:1])
+    assert narrower.observation_dim == 2
+    assert replace(narrower, observation_groups=groups).observation_dim == 49
+    assert replace(narrower, observation_groups=()).observation_dim == 12
+    assert replace(EnvConfig(observation_dim=3), max_episode_steps=4).observation_dim == 3
+
+    pinned = EnvConfig(observation_groups=groups[:1], observation_dim=2)
+    with pytest.raises(ValueError, match="does not match"):
+        replace(pinned, observation_groups=groups[:2])
+    # Pinning the value a derived config would have picked still pins it.
+    with pytest.raises(ValueError, match="does not match"):
+        replace(replace(narrower, observation_dim=2), observation_groups=groups[:2])
+    assert "_derived" not in repr(narrower) and narrower == pinned
+
+
+def test_groups_are_filled_from_one_poses_call_per_step() -> None:
+    config = EnvConfig(
+        observation_groups=(
+            "agent_index",
+            "base_height",
+            "own_joints",
+            "opponent_joints",
+            "contact_summary",
+            "step_counters",
+        )
+    )
+    adapter = _CountingAdapter()
+    env = BJJMultiAgentEnv(config, physics=adapter)
+    layout = env.observation_layout
+    assert layout is not None
+    env.reset(seed=4)
+    obs = env.step({agent: [0.0] * config.action_dim for agent in env.agents}).observations
+    assert adapter.pose_calls == 2
+
+    frame = scripted_poses(1, seed=4)
+    for idx, agent in enumerate(env.agents):
+        row = obs[agent]
+        assert len(row) == config.observation_dim
+        assert row[layout.slice("agent_index")] == [float(idx)]
+        assert row[layout.slice("step_counters")] == [1.0, 1.0]
+        assert row[layout.slice("base_height")] == [frame.positions[idx][0][2]]
+        own = row[layout.slice("own_joints")]
+        assert own[:3] == [0.0, 0.0, 0.0]
+        root = frame.positions[idx][0]
+        opponent = frame.positions[1 - idx]
+        assert row[layout.slice("opponent_joints")][:3] == pytest.approx(
+            [opponent[0][k] - root[k] for k in range(3)]
+        )
+        involved = [c for c in frame.contacts if idx in (c[0], c[2])]
+        assert row[layout.slice("contact_summary")][0] == len(involved)
+
+
+def test_unselected_pose_groups_never_query_the_adapter() -> None:
+    config = EnvConfig(observation_groups=("step_counters",), max_episode_steps=3)
+    adapter = _CountingAdapter()
+    env = BJJMultiAgentEnv(config, physics=adapter)
+    obs, _ = env.reset(seed=0)
+    assert obs == {agent: [0.0, 0.0] for agent in env.agents}
+    for _ in range(3):
+        env.step({agent: [0.0] * config.action_dim for agent in env.agents})
+    assert adapter.pose_calls == 0
+
+    # Adapters without poses work as long as no pose group is selected.
+    BJJMultiAgentEnv(config, physics=_NoPoseAdapter()).reset(seed=0)
+    with pytest.raises(ValueError, match="reports no poses"):
+        BJJMultiAgentEnv(EnvConfig(observation_groups=("own_joints",)), physics=_NoPoseAdapter())
+    with pytest.raises(ValueError, match="links"):
+        BJJMultiAgentEnv(EnvConfig(observation_groups=("own_joints",), num_links=3))
+
+
+def test_array_api_matches_dict_api_with_groups() -> None:
+    config = EnvConfig(observation_groups=("own_joints", "contact_summary"))
+    dict_env, array_env = BJJMultiAgentEnv(config), BJJMultiAgentEnv(config)
+    obs = np.zeros((2, config.observation_dim))
+    rewards = np.zeros(2)
+    expected, _ = dict_env.reset(seed=9)
+    array_env.reset_arrays(obs, seed=9)
+    for _ in range(3):
+        np.testing.assert_allclose(obs, [expected[a] for a in dict_env.agents])
+        actions = [[0.5] * config.action_dim] * 2
+        expected = dict_env.step(dict(zip(dict_env.agents, actions, strict=True))).observations
+        array_env.step_arrays(actions, obs, rewards)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from bjjsim.training import MLPPolicy, OpponentPool
+
+
+def make_policy(seed: int) -> MLPPolicy:
+    return MLPPolicy.random(12, 6, hidden_sizes=(8,), rng=np.random.default_rng(seed))
+
+
+def test_snapshots_roundtrip_as_memory_maps(tmp_path: Path) -> None:
+    pool = OpponentPool(tmp_path)
+    policy = make_policy(0)
+    sid = pool.add(policy.parameters(), step=100)
+
+    snapshot = pool.load(sid)
+    assert snapshot.step == 100
+    assert all(isinstance(arr, np.memmap) for arr in snapshot.params.values())
+    restored = MLPPolicy.from_parameters(snapshot.params)
+    obs = np.random.default_rng(1).normal(size=(4, 12))
+    np.testing.assert_allclose(restored(obs), policy(obs))
+
+    # Reopening the directory finds the same snapshots.
+    reopened = OpponentPool(tmp_path)
+    assert reopened.snapshot_ids == [sid]
+
+
+def test_lru_cache_bounds_open_snapshots(tmp_path: Path) -> None:
+    pool = OpponentPool(tmp_path, cache_size=2)
+    ids = [pool.add(make_policy(i).parameters(), step=i) for i in range(3)]
+
+    first = pool.load(ids[0])
+    assert pool.load(ids[0]) is first
+    pool.load(ids[1])
+    pool.load(ids[2])  # evicts ids[0]
+    assert pool.load(ids[0]) is not first
+    assert pool.cache_hits == 1
+    assert pool.cache_misses == 4
+
+
+def test_sampling_schemes(tmp_path: Path) -> None:
+    pool = OpponentPool(tmp_path, priority_exponent=4.0)
+    ids = [pool.add(make_policy(i).parameters(), step=i) for i in range(3)]
+    rng = np.random.default_rng(0)
+
+    assert pool.sample("latest").snapshot_id == ids[-1]
+    uniform = {pool.sample("uniform", rng=rng).snapshot_id for _ in range(50)}
+    assert uniform == set(ids)
+
+    # The learner always beats ids[0] and ids[1] but always loses to ids[2].
+    for _ in range(10):
+        pool.record_result(ids[0], 1.0)
+        pool.record_result(ids[1], 1.0)
+        pool.record_result(ids[2], 0.0)
+    picks = [pool.sample("prioritized", rng=rng).snapshot_id for _ in range(200)]
+    assert picks.count(ids[2]) > 190
+
+    pool.flush()
+    assert OpponentPool(tmp_path).stats(ids[2]).games == 10
+    with pytest.raises(ValueError):
+        pool.sample("bogus")  # type: ignore[arg-type]
+
+
+def test_max_snapshots_drops_oldest(tmp_path: Path) -> None:
+    pool = OpponentPool(tmp_path, max_snapshots=2)
+    ids = [pool.add(make_policy(i).parameters(), step=i) for i in range(3)]
+    assert pool.snapshot_ids == ids[1:]
+    assert not (tmp_path / ids[0]).exists()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import importlib.util
+import math
+
+import pytest
+
+from bjjsim.physics import HUMANOID, DeterministicCounterAdapter, PoseFrame, scripted_poses
+from bjjsim.web.poses import decode_poses, encode_poses
+
+FASTAPI_SPEC = importlib.util.find_spec("fastapi")
+
+
+def test_scripted_poses_are_deterministic_unit_quaternions_with_contacts() -> None:
+    assert scripted_poses(12, seed=3) == scripted_poses(12, seed=3)
+    assert scripted_poses(12, seed=3) != scripted_poses(13, seed=3)
+    frames = [scripted_poses(step, seed=3) for step in range(100)]
+    for frame in frames:
+        assert frame.num_agents == 2
+        for orientations in frame.orientations:
+            assert len(orientations) == HUMANOID.num_links
+            for quat in orientations:
+                assert math.isclose(sum(c * c for c in quat), 1.0)
+        for agent_a, link_a, agent_b, link_b in frame.contacts:
+            assert agent_a != agent_b
+            assert max(link_a, link_b) < HUMANOID.num_links
+    assert any(frame.contacts for frame in frames)
+    assert not all(frame.contacts for frame in frames)
+
+
+def test_encode_decode_roundtrip_within_quantization() -> None:
+    frame = scripted_poses(40, seed=1)
+    data = encode_poses(frame, step=40, version=7)
+    assert len(data) == 16 + 2 * 7 * 2 * HUMANOID.num_links + 4 * len(frame.contacts)
+    decoded = decode_poses(data)
+    assert (decoded.step, decoded.version) == (40, 7)
+    assert decoded.poses.contacts == frame.contacts
+    pairs = [
+        (got, want)
+        for got_agent, want_agent in (
+            *zip(decoded.poses.positions, frame.positions, strict=True),
+            *zip(decoded.poses.orientations, frame.orientations, strict=True),
+        )
+        for got_link, want_link in zip(got_agent, want_agent, strict=True)
+        for got, want in zip(got_link, want_link, strict=True)
+    ]
+    assert all(abs(got - want) <= 5e-4 for got, want in pairs)
+
+
+def test_encode_rejects_ragged_frames_and_decode_rejects_bad_lengths() -> None:
+    frame = scripted_poses(0)
+    ragged = PoseFrame(
+        positions=(frame.positions[0], frame.positions[1][:-1]),
+        orientations=frame.orientations,
+    )
+    with pytest.raises(ValueError, match="one position"):
+        encode_poses(ragged, step=0, version=0)
+    data = encode_poses(frame, step=0, version=0)
+    with pytest.raises(ValueError, match="bytes"):
+        decode_poses(data[:-1])
+    with pytest.raises(ValueError, match="version"):
+        decode_poses(b"\x09" + data[1:])
+
+
+class _NoPoseAdapter(DeterministicCounterAdapter):
+    skeleton = None  # type: ignore[assignment]
+    poses = None  # type: ignore[assignment]
+
+
+@pytest.mark.skipif(FASTAPI_SPEC is None, reason="fastapi missing")
+def test_ws_poses_streams_one_frame_per_change() -> None:
+    from fastapi.testclient import TestClient
+    from starlette.websockets import WebSocketDisconnect
+
+    from bjjsim.web.app import create_app
+    from bjjsim.web.sessions import AdapterPool
+
+    client = TestClient(create_app())
+    client.post("/api/sim/start", json={"seed": 3})
+    with client.websocket_connect("/ws/poses?max_hz=240") as ws:
+        hello = ws.receive_json()
+        assert hello["type"] == "hello"
+        assert hello["links"] == list(HUMANOID.links)
+        assert hello["parents"] == list(HUMANOID.parents)
+        first = decode_poses(ws.receive_bytes())
+        assert first.step == 0
+        assert first.poses.contacts == scripted_poses(0, seed=3).contacts
+
+        version = client.post("/api/sim/step", json={"num_steps": 5}).json()["version"]
+        second = decode_poses(ws.receive_bytes())
+        assert (second.step, second.version) == (5, version)
+        assert second.poses.contacts == scripted_poses(5, seed=3).contacts
+    assert "bjjsim_pose_encode_seconds_count" in client.get("/metrics").text
+
+    blind = TestClient(create_app(adapter_pool=AdapterPool(_NoPoseAdapter, size=1)))
+    with pytest.raises(WebSocketDisconnect) as excinfo:
+        with blind.websocket_connect("/ws/poses") as ws:
+            ws.receive_json()
+    assert excinfo.value.code == 4415
+
+
+@pytest.mark.skipif(FASTAPI_SPEC is None, reason="fastapi missing")
+def test_ws_poses_closes_idle_stream_when_its_session_closes() -> None:
+    from fastapi.testclient import TestClient
+    from starlette.websockets import WebSocketDisconnect
+
+    from bjjsim.web.app import create_app
+
+    client = TestClient(create_app())
+    session_id = client.post("/api/sessions").json()["session_id"]
+    client.post("/api/sim/start", json={}, headers={"X-Session-ID": session_id})
+    with client.websocket_connect(f"/ws/poses?session_id={session_id}") as ws:
+        ws.receive_json()
+        ws.receive_bytes()
+        assert client.delete(f"/api/sessions/{session_id}").status_code == 204
+        with pytest.raises(WebSocketDisconnect) as excinfo:
+            ws.receive_bytes()
+    assert excinfo.value.code == 4404
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import numpy as np
+import pytest
+
+from bjjsim.env import EnvConfig
+from bjjsim.env.array import VectorArrayEnv
+from bjjsim.env.remote import (
+    RESET,
+    STEP,
+    EnvWorkerServer,
+    RemoteEnvError,
+    RemoteVectorEnv,
+)
+
+CONFIG = EnvConfig(max_episode_steps=4)
+
+
+@pytest.fixture()
+def workers() -> Iterator[list[EnvWorkerServer]]:
+    servers = [EnvWorkerServer(num_envs=n, config=CONFIG) for n in (2, 3)]
+    for server in servers:
+        server.serve_in_background()
+    yield servers
+    for server in servers:
+        server.close()
+
+
+def _addresses(servers: list[EnvWorkerServer]) -> list[str]:
+    return [f"{host}:{port}" for host, port in (s.address for s in servers)]
+
+
+def test_remote_envs_match_local_vector_env(workers: list[EnvWorkerServer]) -> None:
+    remote = RemoteVectorEnv(_addresses(workers), CONFIG)
+    local = VectorArrayEnv.from_config(5, CONFIG)
+    assert remote.num_envs == 5
+    assert remote.action_space.shape == local.action_space.shape
+
+    np.testing.assert_allclose(remote.reset(seed=11)[0], local.reset(seed=11)[0], rtol=1e-6)
+    rng = np.random.default_rng(0)
+    for _ in range(CONFIG.max_episode_steps):
+        actions = rng.uniform(-1, 1, size=remote.action_space.shape).astype(np.float32)
+        r_obs, r_rew, r_term, r_trunc, r_info = remote.step(actions)
+        l_obs, l_rew, l_term, l_trunc, l_info = local.step(actions)
+        np.testing.assert_allclose(r_rew, l_rew, rtol=1e-6)
+        np.testing.assert_array_equal(r_term, l_term)
+        np.testing.assert_array_equal(r_trunc, l_trunc)
+        if not l_trunc.any():
+            np.testing.assert_allclose(r_obs, l_obs, rtol=1e-6)
+    # The last step truncated every env; autoreset picks fresh random seeds,
+    # so only the final observations are comparable.
+    assert r_info["_final_observation"].all()
+    np.testing.assert_allclose(
+        np.stack(list(r_info["final_observation"])),
+        np.stack(list(l_info["final_observation"])),
+        rtol=1e-6,
+    )
+
+    stats = remote.worker_stats()
+    assert [s.requests for s in stats] == [CONFIG.max_episode_steps + 1] * 2
+    assert all(0 < s.p50_s <= s.p95_s <= s.max_s for s in stats)
+    remote.close()
+
+
+def test_requests_pipeline_on_one_connection(workers: list[EnvWorkerServer]) -> None:
+    remote = RemoteVectorEnv(_addresses(workers[:1]), CONFIG)
+    link = remote.links[0]
+    actions = np.zeros((2, 2, CONFIG.action_dim), dtype=np.float32)
+    link.send(RESET, np.array([1, 2], dtype=np.int64))
+    link.send(STEP, actions)
+    link.send(STEP, actions)
+    replies = [link.receive() for _ in range(3)]
+    assert len(replies[0]) == 2 * 2 * CONFIG.observation_dim * 4
+    assert len(replies[1]) == len(replies[2]) > len(replies[0])
+
+    link.send(STEP, actions[:1])
+    with pytest.raises(RemoteEnvError, match="actions shaped"):
+        link.receive()
+    remote.close()
+
+
+def test_dropped_connection_reconnects_and_restarts_envs(
+    workers: list[EnvWorkerServer],
+) -> None:
+    remote = RemoteVectorEnv(_addresses(workers), CONFIG)
+    remote.reset(seed=0)
+    actions = np.zeros(remote.action_space.shape, dtype=np.float32)
+    remote.step(actions)
+
+    workers[1].close_connections()
+    _, _, _, truncated, infos = remote.step(actions)
+    assert infos["reconnected"].tolist() == [False, False, True, True, True]
+    assert truncated[2:].all() and not truncated[:2].any()
+    assert infos["_final_observation"][2:].all()
+    assert [s.reconnects for s in remote.worker_stats()] == [0, 1]
+
+    # The session keeps working after the reconnect.
+    obs, *_ = remote.step(actions)
+    assert obs.shape == remote.observation_space.shape
+    remote.close()
+
+
+def test_mismatched_config_is_rejected(workers: list[EnvWorkerServer]) -> None:
+    with pytest.raises(ValueError, match="EnvConfig"):
+        RemoteVectorEnv(_addresses(workers), EnvConfig(observation_dim=3))
+
+
+def test_frames_fall_back_to_sendall_without_sendmsg(
+    workers: list[EnvWorkerServer], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("bjjsim.env.remote._HAS_SENDMSG", False)
+    remote = RemoteVectorEnv(_addresses(workers[:1]), CONFIG)
+    obs, _ = remote.reset(seed=5)
+    assert obs.shape == remote.observation_space.shape
+    remote.close()
+
+
+def test_server_context_manager_closes_vector_env() -> None:
+    with EnvWorkerServer(num_envs=1, config=CONFIG) as server:
+        server.serve_in_background()
+        closed: list[bool] = []
+        server.vector_env.close = lambda: closed.append(True)  # type: ignore[method-assign]
+    assert closed == [True]
+
+
+def test_worker_error_drains_other_replies(workers: list[EnvWorkerServer]) -> None:
+    remote = RemoteVectorEnv(_addresses(workers), CONFIG)
+    # Only the second worker has started episodes, so the first one errors.
+    link = remote.links[1]
+    link.send(RESET)
+    link.receive()
+    actions = np.zeros(remote.action_space.shape, dtype=np.float32)
+    with pytest.raises(RemoteEnvError, match="reset"):
+        remote.step(actions)
+    assert [len(link._sent) for link in remote.links] == [0, 0]
+
+    # Replies line up with their requests again afterwards.
+    local = VectorArrayEnv.from_config(5, CONFIG)
+    np.testing.assert_allclose(remote.reset(seed=3)[0], local.reset(seed=3)[0], rtol=1e-6)
+    np.testing.assert_allclose(remote.step(actions)[0], local.step(actions)[0], rtol=1e-6)
+    remote.close()
+
+
+def test_reset_reconnects_when_the_request_cannot_be_sent(
+    workers: list[EnvWorkerServer], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    remote = RemoteVectorEnv(_addresses(workers), CONFIG)
+    link = remote.links[0]
+    real_send = link.send
+    failures = [1]
+
+    def flaky_send(kind: int, *parts: object) -> int:
+        if failures[0]:
+            failures[0] -= 1
+            raise ConnectionResetError
+        return real_send(kind, *parts)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(link, "send", flaky_send)
+    obs, _ = remote.reset(seed=1)
+    assert obs.shape == remote.observation_space.shape
+    assert [s.reconnects for s in remote.worker_stats()] == [1, 0]
+    remote.close()
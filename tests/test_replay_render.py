@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from bjjsim.env import BJJMultiAgentEnv, EnvConfig
+from bjjsim.replay import Trajectory, TrajectoryWriter, record_episode
+from bjjsim.replay.render import PALETTE, RenderOptions, TrajectoryRenderer
+
+
+def _record(tmp_path: Path, name: str = "ep-0", steps: int = 9) -> Trajectory:
+    env = BJJMultiAgentEnv(EnvConfig(max_episode_steps=steps))
+    return record_episode(
+        env, tmp_path / name, seed=3, action_fn=lambda obs: np.full((2, 6), 0.5, dtype=np.float32)
+    )
+
+
+def test_recorded_trajectory_is_memory_mapped_and_complete(tmp_path: Path) -> None:
+    traj = _record(tmp_path)
+    assert len(traj) == 10  # reset frame plus nine steps
+    assert traj.observations.shape == (10, 2, 12)
+    assert isinstance(traj.observations, np.memmap)
+    assert traj.physics_steps.tolist() == list(range(10))
+    assert traj.actions[0].tolist() == [[0.0] * 6] * 2
+    assert traj.metadata["seed"] == 3
+    assert traj.frame_nbytes("observations") == 2 * 12 * 4
+    with pytest.raises(FileExistsError):
+        TrajectoryWriter(traj.path, traj.agents, 12, 6)
+
+
+def test_incomplete_trajectory_is_rejected(tmp_path: Path) -> None:
+    writer = TrajectoryWriter(tmp_path / "partial", ("a", "b"), 12, 6)
+    writer.append(np.zeros((2, 12)), np.zeros((2, 6)), np.zeros(2), 0)
+    with pytest.raises(FileNotFoundError):
+        Trajectory(tmp_path / "partial")
+    with pytest.raises(ValueError):
+        writer.append(np.zeros((3, 12)), np.zeros((2, 6)), np.zeros(2), 1)
+    writer.close()
+    assert len(Trajectory(tmp_path / "partial")) == 1
+
+
+@pytest.mark.parametrize("fmt", ["apng", "gif"])
+def test_animated_output_has_expected_frames(tmp_path: Path, fmt: str) -> None:
+    traj = _record(tmp_path)
+    options = RenderOptions(width=64, height=48, frame_step=2, chunk_size=2)
+    with TrajectoryRenderer(options, workers=0) as renderer:
+        result = renderer.render(traj, tmp_path / f"out.{fmt}", fmt=fmt)  # type: ignore[arg-type]
+    assert result.frames == 5
+    with Image.open(tmp_path / f"out.{fmt}") as video:
+        assert video.size == (64, 48)
+        assert video.n_frames == 5
+        colors = {rgb for _, rgb in video.convert("RGB").getcolors()}
+        assert colors <= set(PALETTE)
+
+
+def test_process_pool_matches_inline_raw_frames(tmp_path: Path) -> None:
+    trajectories = [_record(tmp_path, f"ep-{i}").path for i in range(2)]
+    options = RenderOptions(width=40, height=32, chunk_size=3)
+    with TrajectoryRenderer(options, workers=0) as inline:
+        list(inline.render_many(trajectories, tmp_path / "inline", fmt="raw"))
+    with TrajectoryRenderer(options, workers=2) as pooled:
+        results = list(pooled.render_many(trajectories, tmp_path / "pooled", fmt="raw"))
+    assert [r.frames for r in results] == [10, 10]
+    for path in trajectories:
+        expected = (tmp_path / "inline" / f"{path.name}.rgb").read_bytes()
+        assert len(expected) == 10 * 40 * 32 * 3
+        assert (tmp_path / "pooled" / f"{path.name}.rgb").read_bytes() == expected
+
+
+def test_png_frames_directory(tmp_path: Path) -> None:
+    traj = _record(tmp_path, steps=3)
+    options = RenderOptions(width=32, height=32, start=1)
+    with TrajectoryRenderer(options, workers=0) as renderer:
+        renderer.render(traj, tmp_path / "frames", fmt="png-frames")
+    files = sorted((tmp_path / "frames").glob("*.png"))
+    assert [f.name for f in files] == ["frame_000000.png", "frame_000001.png", "frame_000002.png"]
+    with Image.open(files[0]) as frame:
+        assert frame.mode == "P"
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+if importlib.util.find_spec("fastapi") is None:
+    pytest.skip("fastapi not installed", allow_module_level=True)
+
+from fastapi.testclient import TestClient
+
+from bjjsim.env import BJJMultiAgentEnv, EnvConfig
+from bjjsim.replay import Trajectory, record_episode
+from bjjsim.web.app import create_app
+
+
+def _record(root: Path, name: str, steps: int) -> Trajectory:
+    env = BJJMultiAgentEnv(EnvConfig(max_episode_steps=steps))
+    return record_episode(
+        env, root / name, seed=5, action_fn=lambda obs: np.full((2, 6), 0.25, dtype=np.float32)
+    )
+
+
+def test_list_and_page_replay_steps(tmp_path: Path) -> None:
+    traj = _record(tmp_path, "ep-b", steps=12)
+    _record(tmp_path, "ep-a", steps=3)
+    (tmp_path / "incomplete").mkdir()
+    client = TestClient(create_app(replay_dir=tmp_path))
+
+    listing = client.get("/api/replays").json()["replays"]
+    assert [r["replay_id"] for r in listing] == ["ep-a", "ep-b"]
+    assert listing[1]["num_frames"] == 13
+
+    detail = client.get("/api/replays/ep-b").json()
+    assert detail["fields"]["observations"] == {
+        "dtype": "<f4",
+        "frame_shape": [2, 12],
+        "frame_nbytes": 96,
+    }
+
+    page = client.get("/api/replays/ep-b/steps", params={"from": 4, "to": 7}).json()
+    assert (page["start"], page["stop"], page["num_frames"]) == (4, 7, 13)
+    assert [s["index"] for s in page["steps"]] == [4, 5, 6]
+    np.testing.assert_allclose(page["steps"][0]["observations"], traj.observations[4])
+    assert page["steps"][0]["physics_step"] == int(traj.physics_steps[4])
+
+    tail = client.get("/api/replays/ep-b/steps", params={"from": 11, "to": 100}).json()
+    assert (tail["start"], tail["stop"]) == (11, 13)
+    assert client.get("/api/replays/ep-b/steps", params={"from": 5, "to": 2}).status_code == 422
+
+
+def test_unknown_or_unsafe_replay_ids_are_404(tmp_path: Path) -> None:
+    _record(tmp_path / "inner", "ep", steps=2)
+    client = TestClient(create_app(replay_dir=tmp_path / "inner"))
+    assert client.get("/api/replays/missing").status_code == 404
+    assert client.get("/api/replays/..%2F..%2Fetc").status_code == 404
+    assert client.get("/api/replays/.hidden/steps").status_code == 404
+    assert client.get("/api/replays/ep/raw/secrets").status_code == 404
+
+
+def test_corrupt_replays_are_404_and_left_out_of_the_listing(tmp_path: Path) -> None:
+    _record(tmp_path, "good", steps=2)
+    broken = _record(tmp_path, "broken", steps=2).path
+    (broken / "meta.json").write_text("{broken", encoding="utf-8")
+    client = TestClient(create_app(replay_dir=tmp_path))
+    listing = client.get("/api/replays").json()["replays"]
+    assert [r["replay_id"] for r in listing] == ["good"]
+    for route in ("", "/steps", "/raw/observations"):
+        assert client.get(f"/api/replays/broken{route}").status_code == 404
+
+
+def test_raw_field_supports_byte_ranges(tmp_path: Path) -> None:
+    traj = _record(tmp_path, "ep", steps=6)
+    client = TestClient(create_app(replay_dir=tmp_path))
+    frame = traj.frame_nbytes("observations")
+    size = frame * len(traj)
+    whole = (tmp_path / "ep" / "observations.bin").read_bytes()
+
+    full = client.get("/api/replays/ep/raw/observations")
+    assert full.status_code == 200
+    assert full.content == whole
+    assert full.headers["accept-ranges"] == "bytes"
+    assert full.headers["x-frame-bytes"] == str(frame)
+
+    # Frame 3 alone, as the UI would fetch it.
+    part = client.get(
+        "/api/replays/ep/raw/observations",
+        headers={"Range": f"bytes={3 * frame}-{4 * frame - 1}"},
+    )
+    assert part.status_code == 206
+    assert part.headers["content-range"] == f"bytes {3 * frame}-{4 * frame - 1}/{size}"
+    decoded = np.frombuffer(part.content, dtype="<f4").reshape(2, 12)
+    np.testing.assert_array_equal(decoded, traj.observations[3])
+
+    suffix = client.get("/api/replays/ep/raw/observations", headers={"Range": "bytes=-8"})
+    assert suffix.status_code == 206
+    assert suffix.content == whole[-8:]
+
+    past_end = client.get("/api/replays/ep/raw/observations", headers={"Range": f"bytes={size}-"})
+    assert past_end.status_code == 416
+    assert past_end.headers["content-range"] == f"bytes */{size}"
+
+    multi = client.get("/api/replays/ep/raw/observations", headers={"Range": "bytes=0-1,4-5"})
+    assert multi.status_code == 200
+    assert multi.content == whole
+
+
+def test_replays_page_renders(tmp_path: Path) -> None:
+    pytest.importorskip("jinja2", reason="Jinja2 not installed")
+    client = TestClient(create_app(replay_dir=tmp_path))
+    res = client.get("/replays")
+    assert res.status_code == 200
+    assert 'data-testid="input-scrub"' in res.text
+    assert client.get("/api/replays").json() == {"replays": []}
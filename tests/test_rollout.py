@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from bjjsim.env import BJJMultiAgentEnv, EnvConfig
+from bjjsim.training import RolloutBuffer
+
+
+def reference_gae(
+    rewards: np.ndarray,
+    values: np.ndarray,
+    terminated: np.ndarray,
+    truncated: np.ndarray,
+    final_values: np.ndarray,
+    last_value: float,
+    gamma: float,
+    lam: float,
+) -> np.ndarray:
+    adv = np.zeros_like(rewards)
+    running = 0.0
+    for t in reversed(range(len(rewards))):
+        next_value = last_value if t == len(rewards) - 1 else values[t + 1]
+        if terminated[t]:
+            delta = rewards[t] - values[t]
+            running = delta
+        elif truncated[t]:
+            delta = rewards[t] + gamma * final_values[t] - values[t]
+            running = delta
+        else:
+            delta = rewards[t] + gamma * next_value - values[t]
+            running = delta + gamma * lam * running
+        adv[t] = running
+    return adv
+
+
+def test_gae_matches_scalar_reference_with_truncation_bootstrap() -> None:
+    rng = np.random.default_rng(0)
+    steps, gamma, lam = 12, 0.9, 0.8
+    buf = RolloutBuffer(steps, 2, ("agent1", "agent2"), 3, 2, gamma=gamma, gae_lambda=lam)
+    rewards = rng.normal(size=(steps, 2, 2)).astype(np.float32)
+    values = rng.normal(size=(steps, 2, 2)).astype(np.float32)
+    terminated = np.zeros((steps, 2, 2), dtype=bool)
+    truncated = np.zeros((steps, 2, 2), dtype=bool)
+    terminated[4, 0, :] = True
+    truncated[7, 1, :] = True
+    final_values = np.zeros((steps, 2, 2), dtype=np.float32)
+    final_values[7, 1, :] = 5.0
+    for t in range(steps):
+        buf.add(
+            observations=np.zeros((2, 2, 3)),
+            actions=np.zeros((2, 2, 2)),
+            rewards=rewards[t],
+            terminated=terminated[t],
+            truncated=truncated[t],
+            values=values[t],
+            log_probs=np.zeros((2, 2)),
+            final_values=final_values[t],
+        )
+    last_values = np.array([[0.5, -0.5], [1.0, 2.0]], dtype=np.float32)
+    buf.compute_returns_and_advantages(last_values)
+
+    for n in range(2):
+        for a in range(2):
+            expected = reference_gae(
+                rewards[:, n, a],
+                values[:, n, a],
+                terminated[:, n, a],
+                truncated[:, n, a],
+                final_values[:, n, a],
+                float(last_values[n, a]),
+                gamma,
+                lam,
+            )
+            np.testing.assert_allclose(buf.advantages[:, n, a], expected, rtol=1e-5, atol=1e-5)
+    np.testing.assert_allclose(buf.returns, buf.advantages + buf.values, rtol=1e-6)
+
+
+def test_add_dicts_ingests_env_outputs() -> None:
+    config = EnvConfig(max_episode_steps=3)
+    envs = [BJJMultiAgentEnv(config) for _ in range(2)]
+    buf = RolloutBuffer.for_env(envs[0], num_steps=3, num_envs=2)
+    obs = [env.reset(seed=i)[0] for i, env in enumerate(envs)]
+    actions = {agent: [0.5] * config.action_dim for agent in envs[0].agents}
+    for _ in range(3):
+        outputs = [env.step(actions) for env in envs]
+        buf.add_dicts(
+            observations=obs,
+            actions=[actions, actions],
+            rewards=[o[1] for o in outputs],
+            terminated=[o[2] for o in outputs],
+            truncated=[o[3] for o in outputs],
+            values=np.zeros((2, 2)),
+            log_probs=np.zeros((2, 2)),
+        )
+        obs = [o[0] for o in outputs]
+
+    assert buf.full
+    assert buf.truncated[-1].all()
+    assert not buf.truncated[0].any()
+    first_obs, _ = BJJMultiAgentEnv(config).reset(seed=1)
+    np.testing.assert_allclose(buf.observations[0, 1, 0], first_obs["agent1"])
+    with pytest.raises(RuntimeError):
+        buf.add_dicts(
+            observations=obs,
+            actions=[actions, actions],
+            rewards=[o[1] for o in outputs],
+            terminated=[o[2] for o in outputs],
+            truncated=[o[3] for o in outputs],
+            values=np.zeros((2, 2)),
+            log_probs=np.zeros((2, 2)),
+        )
+
+
+def test_minibatches_are_views_covering_every_sample_once() -> None:
+    buf = RolloutBuffer(4, 3, ("a", "b"), 2, 1)
+    for t in range(4):
+        ids = np.arange(6, dtype=np.float32).reshape(3, 2) + 6 * t
+        buf.add(
+            observations=np.repeat(ids[..., None], 2, axis=-1),
+            actions=np.zeros((3, 2, 1)),
+            rewards=np.zeros((3, 2)),
+            terminated=np.zeros((3, 2), dtype=bool),
+            truncated=np.zeros((3, 2), dtype=bool),
+            values=ids,
+            log_probs=np.zeros((3, 2)),
+        )
+    buf.compute_returns_and_advantages(np.zeros((3, 2)))
+
+    batches = list(buf.minibatches(5, rng=np.random.default_rng(1)))
+    assert [len(b.values) for b in batches] == [5, 5, 5, 5, 4]
+    seen = np.concatenate([b.values for b in batches])
+    assert sorted(seen.tolist()) == list(range(24))
+    for b in batches:
+        assert b.values.base is not None  # slice view, not a fresh copy
+        np.testing.assert_array_equal(b.observations[:, 0], b.values)
+
+    agent_b = np.concatenate([b.values for b in buf.minibatches(4, agent=1)])
+    assert sorted(agent_b.tolist()) == list(range(1, 24, 2))
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import pytest
+
+from bjjsim.physics import DeterministicCounterAdapter, PhysicsAdapter
+from bjjsim.web.sessions import (
+    DEFAULT_SESSION_ID,
+    AdapterPool,
+    SessionManager,
+    SessionNotFoundError,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_manager(**kwargs: object) -> SessionManager[PhysicsAdapter]:
+    return SessionManager(lambda _sid, physics: physics, **kwargs)
+
+
+def test_default_session_is_pinned_and_cannot_be_closed() -> None:
+    manager = make_manager()
+    assert DEFAULT_SESSION_ID in manager
+    assert len(manager) == 1
+    with pytest.raises(ValueError):
+        manager.close(DEFAULT_SESSION_ID)
+
+
+def test_sessions_are_independent() -> None:
+    manager = make_manager()
+    sid_a, physics_a = manager.create()
+    sid_b, physics_b = manager.create()
+    assert sid_a != sid_b
+    assert physics_a is not physics_b
+
+    physics_a.start(1)
+    physics_a.step(3)
+    assert manager.get(sid_a).step_count == 3
+    assert manager.get(sid_b).step_count == 0
+
+
+def test_lru_eviction_skips_recently_used_and_pinned() -> None:
+    manager = make_manager(max_sessions=3)
+    sid_a, _ = manager.create()
+    sid_b, _ = manager.create()
+    manager.get(sid_a)  # a is now more recent than b
+
+    sid_c, _ = manager.create()
+    assert sid_b not in manager
+    assert {DEFAULT_SESSION_ID, sid_a, sid_c} == {i.session_id for i in manager.list_sessions()}
+    assert manager.evicted_count == 1
+    with pytest.raises(SessionNotFoundError):
+        manager.get(sid_b)
+
+
+def test_reap_idle_drops_only_expired_sessions() -> None:
+    clock = FakeClock()
+    manager = make_manager(idle_timeout_s=10.0, clock=clock)
+    sid_old, _ = manager.create()
+    clock.now = 8.0
+    sid_new, _ = manager.create()
+
+    clock.now = 12.0
+    assert manager.reap_idle() == [sid_old]
+    assert sid_new in manager
+    assert DEFAULT_SESSION_ID in manager
+
+    clock.now = 30.0
+    assert manager.reap_idle() == [sid_new]
+    assert manager.reaped_count == 2
+
+
+def test_adapter_pool_reuses_released_adapters() -> None:
+    built: list[DeterministicCounterAdapter] = []
+
+    def factory() -> DeterministicCounterAdapter:
+        adapter = DeterministicCounterAdapter()
+        built.append(adapter)
+        return adapter
+
+    pool = AdapterPool(factory, size=2)
+    assert len(built) == 2
+    manager: SessionManager[PhysicsAdapter] = SessionManager(
+        lambda _sid, physics: physics, pool=pool
+    )
+    sid, physics = manager.create()
+    physics.start(5)
+    physics.step(4)
+    assert manager.close(sid) is True
+    assert len(pool) == 1
+
+    _, reused = manager.create()
+    assert reused is physics
+    assert reused.step_count == 0
+    assert len(built) == 2
+
+
+def test_retire_hook_defers_returning_adapters_to_the_pool() -> None:
+    pool = AdapterPool(size=2)
+    retired: list[tuple[PhysicsAdapter, object]] = []
+    manager: SessionManager[PhysicsAdapter] = SessionManager(
+        lambda _sid, physics: physics,
+        pool=pool,
+        max_sessions=2,
+        retire=lambda session, release: retired.append((session, release)),
+    )
+    sid, physics = manager.create()
+    physics.start(1)
+    physics.step(2)
+    manager.create()  # evicts ``sid``
+    assert sid not in manager
+    assert [session for session, _ in retired] == [physics]
+    # Still owned by the dropped session: not reset, not reusable yet.
+    assert physics.step_count == 2
+    assert len(pool) == 0
+
+    release = retired[0][1]
+    assert callable(release)
+    release()
+    assert physics.step_count == 0
+    assert len(pool) == 1
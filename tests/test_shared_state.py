@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import importlib.util
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import replace
+from io import BytesIO
+
+import pytest
+
+from bjjsim.web.shared_state import SharedSnapshot, SharedStateSegment
+
+FASTAPI_SPEC = importlib.util.find_spec("fastapi")
+PIL_SPEC = importlib.util.find_spec("PIL")
+
+
+@pytest.fixture()
+def segment() -> Iterator[SharedStateSegment]:
+    created = SharedStateSegment.create(frame_capacity=64 * 1024)
+    yield created
+    created.close()
+    created.unlink()
+
+
+def _snapshot(version: int, frame: bytes = b"") -> SharedSnapshot:
+    return SharedSnapshot(
+        epoch="abcd1234",
+        version=version,
+        episode_running=version % 2 == 1,
+        last_seed=None if version == 0 else version * 10,
+        step=version,
+        episodes_started=float(version),
+        total_steps=float(version * 3),
+        steps_per_second=0.5,
+        frame=frame,
+        frame_version=version if frame else -1,
+    )
+
+
+def test_publish_and_read_roundtrip(segment: SharedStateSegment) -> None:
+    reader = SharedStateSegment.attach(segment.name)
+    try:
+        assert reader.read() is None
+        segment.publish(_snapshot(0))
+        assert reader.read() == _snapshot(0)
+        segment.publish(_snapshot(3, frame=b"\x89PNG" * 10))
+        assert reader.read() == _snapshot(3, frame=b"\x89PNG" * 10)
+        assert reader.read().frame_is_current  # type: ignore[union-attr]
+        segment.publish(replace(_snapshot(4), frame=b"\x89PNG", frame_version=3))
+        assert not reader.read().frame_is_current  # type: ignore[union-attr]
+        assert segment.sequence == 6
+    finally:
+        reader.close()
+    with pytest.raises(ValueError, match="capacity"):
+        segment.publish(_snapshot(1, frame=bytes(segment.frame_capacity + 1)))
+
+
+def test_readers_never_see_torn_snapshots(segment: SharedStateSegment) -> None:
+    stop = threading.Event()
+
+    def writer() -> None:
+        version = 0
+        while not stop.is_set():
+            version += 1
+            segment.publish(_snapshot(version, frame=bytes([version % 256]) * (version % 4096)))
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        seen = 0
+        while seen < 2_000:
+            snap = segment.read()
+            if snap is None:
+                continue
+            assert snap == _snapshot(
+                snap.version, frame=bytes([snap.version % 256]) * (snap.version % 4096)
+            )
+            seen += 1
+    finally:
+        stop.set()
+        thread.join()
+
+
+@pytest.mark.skipif(FASTAPI_SPEC is None or PIL_SPEC is None, reason="fastapi/Pillow missing")
+def test_worker_serves_owner_state_from_shared_memory(segment: SharedStateSegment) -> None:
+    import httpx
+    from fastapi.testclient import TestClient
+    from PIL import Image
+
+    from bjjsim.web.app import create_app
+    from bjjsim.web.workers import create_worker_app
+
+    owner_app = create_app(state_segment=segment.name)
+    worker = TestClient(
+        create_worker_app(segment=segment.name, owner_transport=httpx.ASGITransport(app=owner_app))
+    )
+    assert worker.get("/readyz").json() == {"ready": True}
+    initial = worker.get("/api/sim/state")
+    assert initial.json()["step"] == 0
+
+    # Mutations are forwarded to the owner, which publishes the result.
+    assert worker.post("/api/sim/start", json={"seed": 5}).status_code == 200
+    stepped = worker.post("/api/sim/step", json={"num_steps": 4})
+    assert stepped.status_code == 200
+    version = stepped.json()["version"]
+
+    res = worker.get("/api/sim/state", params={"wait_for_version": version, "timeout": 1})
+    assert res.json()["step"] == 4
+    assert res.json()["last_seed"] == 5
+    assert res.headers["etag"] != initial.headers["etag"]
+    assert (
+        worker.get("/api/sim/state", headers={"If-None-Match": res.headers["etag"]}).status_code
+        == 304
+    )
+    assert worker.get("/api/metrics").json()["total_steps"] == 4
+
+    # Commits publish no frame; the first request is forwarded, and the
+    # owner publishes what it rendered for the requests after it.
+    assert not segment.read().frame_is_current  # type: ignore[union-attr]
+    frame = worker.get("/api/frames/current")
+    assert frame.headers["content-type"] == "image/png"
+    assert Image.open(BytesIO(frame.content)).convert("RGB").getpixel((0, 0))[0] == 4
+    deadline = time.monotonic() + 5
+    while not segment.read().frame_is_current and time.monotonic() < deadline:  # type: ignore[union-attr]
+        time.sleep(0.01)
+    assert segment.read().frame == frame.content  # type: ignore[union-attr]
+    assert worker.get("/api/frames/current").content == frame.content
+
+    with worker.websocket_connect("/ws/events?interval_ms=10") as ws:
+        assert ws.receive_json()["step"] == 4
+        assert ws.receive_json()["type"] == "state"
+
+    # Other sessions live only in the owner and are proxied there.
+    session_id = worker.post("/api/sessions").json()["session_id"]
+    other = worker.get("/api/sim/state", headers={"X-Session-ID": session_id})
+    assert other.status_code == 200
+    assert other.json()["step"] == 0
+    assert worker.get("/api/sim/state", params={"session_id": "nope"}).status_code == 404
+
+
+@pytest.mark.skipif(FASTAPI_SPEC is None or PIL_SPEC is None, reason="fastapi/Pillow missing")
+def test_frames_too_big_for_the_segment_are_served_but_not_shared() -> None:
+    from fastapi.testclient import TestClient
+
+    from bjjsim.web.app import create_app
+
+    tiny = SharedStateSegment.create(frame_capacity=16)
+    try:
+        with TestClient(create_app(state_segment=tiny.name)) as client:
+            client.post("/api/sim/start", json={"seed": 1})
+            client.post("/api/sim/step", json={"num_steps": 2})
+            # Commits publish state without rendering a frame.
+            assert "bjjsim_frame_render_seconds_count" not in client.get("/metrics").text
+            assert client.get("/api/frames/current").status_code == 200
+            stepped = client.post("/api/sim/step", json={"num_steps": 1})
+            assert stepped.status_code == 200
+        snapshot = tiny.read()
+        assert snapshot is not None
+        assert (snapshot.step, snapshot.version) == (3, stepped.json()["version"])
+        assert snapshot.frame == b""
+    finally:
+        tiny.close()
+        tiny.unlink()
+
+
+def test_owner_endpoint_is_a_socket_path_or_loopback_tcp() -> None:
+    pytest.importorskip("fastapi", reason="fastapi missing")
+    from bjjsim.web.workers import _free_loopback_address, _owner_endpoint
+
+    assert _owner_endpoint("/tmp/owner.sock") == ("/tmp/owner.sock", "http://owner")
+    address = _free_loopback_address()
+    uds, base_url = _owner_endpoint(address)
+    assert uds is None
+    assert base_url.startswith("http://127.0.0.1:")
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import importlib.util
+
+import pytest
+
+from bjjsim.bench.startup import (
+    ENV_FORBIDDEN_MODULES,
+    WEB_DEFERRED_MODULES,
+    ImportTiming,
+    StartupBudget,
+    StartupReport,
+    check_budget,
+    measure_import,
+    measure_time_to_healthz,
+)
+
+BUDGET = StartupBudget()
+
+
+def test_env_import_skips_web_and_imaging_stack() -> None:
+    timing = measure_import("bjjsim.env", forbidden=ENV_FORBIDDEN_MODULES)
+    assert timing.unexpected_modules == []
+    assert timing.seconds < BUDGET.import_env_s
+
+
+@pytest.mark.skipif(importlib.util.find_spec("fastapi") is None, reason="fastapi not installed")
+def test_web_app_import_defers_templates_and_pillow() -> None:
+    timing = measure_import("bjjsim.web.app", forbidden=WEB_DEFERRED_MODULES)
+    assert timing.unexpected_modules == []
+    assert timing.seconds < BUDGET.import_web_s
+
+
+@pytest.mark.skipif(importlib.util.find_spec("uvicorn") is None, reason="uvicorn not installed")
+def test_time_to_first_healthz_within_budget() -> None:
+    assert measure_time_to_healthz() < BUDGET.time_to_healthz_s
+
+
+def test_check_budget_reports_violations() -> None:
+    report = StartupReport(
+        imports=[ImportTiming("bjjsim.env", 9.0, ["PIL"])],
+        time_to_healthz_s=99.0,
+    )
+    violations = check_budget(report, BUDGET)
+    assert len(violations) == 3
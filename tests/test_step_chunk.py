@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import importlib.util
+
+import numpy as np
+import pytest
+
+from bjjsim.env import BJJMultiAgentEnv, EnvAdapter, EnvConfig
+from bjjsim.env.array import ArrayEnv
+
+FASTAPI_SPEC = importlib.util.find_spec("fastapi")
+CONFIG = EnvConfig(max_episode_steps=5)
+
+
+def _actions(steps: int, num_agents: int = 2) -> list[list[list[float]]]:
+    return [
+        [[0.1 * (t + 1) * (a + 1)] * CONFIG.action_dim for a in range(num_agents)]
+        for t in range(steps)
+    ]
+
+
+def _buffers(steps: int) -> tuple[list[list[list[float]]], list[list[float]]]:
+    obs = [[[0.0] * CONFIG.observation_dim for _ in range(2)] for _ in range(steps)]
+    return obs, [[0.0, 0.0] for _ in range(steps)]
+
+
+def test_chunk_matches_step_by_step_and_stops_at_episode_end() -> None:
+    chunked, stepped = BJJMultiAgentEnv(CONFIG), BJJMultiAgentEnv(CONFIG)
+    chunked.reset(seed=2)
+    stepped.reset(seed=2)
+    actions = _actions(8)
+    obs, rewards = _buffers(8)
+
+    steps, terminated, truncated, info = chunked.step_chunk(actions, obs, rewards)
+
+    assert (steps, terminated, truncated) == (5, False, True)
+    assert info["step"] == 5
+    for t in range(steps):
+        expected_obs, expected_rewards = _buffers(1)
+        stepped.step_arrays(actions[t], expected_obs[0], expected_rewards[0])
+        assert obs[t] == expected_obs[0]
+        assert rewards[t] == expected_rewards[0]
+    assert obs[5] == [[0.0] * CONFIG.observation_dim] * 2
+    with pytest.raises(RuntimeError, match="reset"):
+        chunked.step_chunk(actions, obs, rewards)
+
+
+def test_chunk_validates_every_row_before_stepping() -> None:
+    env = BJJMultiAgentEnv(CONFIG)
+    env.reset(seed=0)
+    bad = [*_actions(2), _actions(1, num_agents=1)[0]]
+    with pytest.raises(ValueError, match="one row per agent"):
+        env.step_chunk(bad, *_buffers(3))
+    with pytest.raises(ValueError, match="at least one step"):
+        env.step_chunk([], *_buffers(1))
+    assert env.episode_step_count == 0
+
+
+def test_env_adapter_restarts_env_episodes_between_chunks() -> None:
+    adapter = EnvAdapter(BJJMultiAgentEnv(CONFIG))
+    assert adapter.step_chunk(_actions(2)) == ([], [])
+    adapter.start(seed=1)
+    observations, rewards = adapter.step_chunk(_actions(7))
+    assert len(observations) == len(rewards) == 5
+    observations, _ = adapter.step_chunk(_actions(3))
+    assert [row[0][0] for row in observations] == [1.0, 2.0, 3.0]
+    adapter.step(9)
+    assert adapter.step_count == 17
+
+
+def test_array_env_chunk_returns_stacked_views() -> None:
+    env = ArrayEnv(BJJMultiAgentEnv(CONFIG))
+    env.reset(seed=3)
+    obs, rewards, terminated, truncated, _ = env.step_chunk(np.asarray(_actions(3)))
+    assert obs.shape == (3, 2, CONFIG.observation_dim)
+    assert rewards.shape == (3, 2)
+    np.testing.assert_array_equal(obs[:, 0, 0], [1.0, 2.0, 3.0])
+    assert not truncated.any() and not terminated.any()
+    obs, _, _, truncated, _ = env.step_chunk(np.asarray(_actions(4)))
+    assert len(obs) == 2
+    assert truncated.all()
+    with pytest.raises(ValueError, match="shaped"):
+        env.step_chunk(np.zeros((2, 2, CONFIG.action_dim + 1)))
+
+
+@pytest.mark.skipif(FASTAPI_SPEC is None, reason="fastapi missing")
+def test_step_chunk_route() -> None:
+    from fastapi.testclient import TestClient
+
+    from bjjsim.web.app import create_app
+    from bjjsim.web.sessions import AdapterPool
+
+    counter = TestClient(create_app())
+    counter.post("/api/sim/start", json={"seed": 1})
+    assert counter.post("/api/sim/step_chunk", json={"actions": _actions(1)}).status_code == 501
+
+    client = TestClient(create_app(adapter_pool=AdapterPool(EnvAdapter, size=1)))
+    assert client.post("/api/sim/step_chunk", json={"actions": _actions(1)}).status_code == 409
+    client.post("/api/config", json={"max_steps_per_episode": 6})
+    client.post("/api/sim/start", json={"seed": 1})
+    res = client.post("/api/sim/step_chunk", json={"actions": _actions(4)})
+    assert res.status_code == 200
+    body = res.json()
+    assert (body["steps_run"], body["step"], body["episode_running"]) == (4, 4, True)
+    assert len(body["observations"]) == len(body["rewards"]) == 4
+    assert body["version"] == client.get("/api/sim/state").json()["version"]
+
+    bad = client.post("/api/sim/step_chunk", json={"actions": [[[0.0]]]})
+    assert bad.status_code == 422
+    # Only the steps left before max_steps_per_episode run.
+    body = client.post("/api/sim/step_chunk", json={"actions": _actions(5)}).json()
+    assert (body["steps_run"], body["step"], body["episode_running"]) == (2, 6, False)
+    assert body["metrics"]["total_steps"] == 6.0
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from bjjsim.env import BJJMultiAgentEnv, EnvConfig
+from bjjsim.training import RewardTelemetry
+
+
+def _read_csv_parts(directory: Path, table: str) -> list[dict[str, str]]:
+    rows: list[dict[str, str]] = []
+    for path in sorted(directory.glob(f"{table}-*.csv.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            rows.extend(csv.DictReader(handle))
+    return rows
+
+
+def test_env_infos_are_written_as_rotated_compressed_csv(tmp_path: Path) -> None:
+    env = BJJMultiAgentEnv(EnvConfig(max_episode_steps=5))
+    expected_returns = {agent: 0.0 for agent in env.agents}
+    with RewardTelemetry(tmp_path, env.agents, batch_rows=4, rows_per_file=6) as telemetry:
+        env.reset(seed=7)
+        actions = {agent: [0.5] * env.config.action_dim for agent in env.agents}
+        done = False
+        while not done:
+            _, rewards, _, truncated, infos = env.step(actions)
+            telemetry.record_infos(rewards, infos)
+            for agent, reward in rewards.items():
+                expected_returns[agent] += reward
+            done = any(truncated.values())
+        telemetry.end_episode(seed=7)
+
+    manifest = json.loads((tmp_path / "telemetry.json").read_text())
+    assert manifest["agents"] == list(env.agents)
+    assert len(sorted(tmp_path.glob("steps-*.csv.gz"))) == 2  # 10 rows, 6 per file
+
+    steps = _read_csv_parts(tmp_path, "steps")
+    assert len(steps) == 5 * len(env.agents)
+    assert [int(row["step"]) for row in steps[:: len(env.agents)]] == [1, 2, 3, 4, 5]
+    first = steps[0]
+    assert float(first["step_reward"]) == pytest.approx(env.config.step_reward)
+    assert float(first["reward"]) == pytest.approx(
+        float(first["step_reward"]) + float(first["energy_penalty"])
+    )
+
+    episodes = _read_csv_parts(tmp_path, "episodes")
+    assert [int(row["agent"]) for row in episodes] == [0, 1]
+    assert all(int(row["length"]) == 5 and int(row["seed"]) == 7 for row in episodes)
+    for row in episodes:
+        agent = env.agents[int(row["agent"])]
+        assert float(row["return"]) == pytest.approx(expected_returns[agent], rel=1e-5)
+
+
+def test_npz_output_keeps_columns_and_episode_counter(tmp_path: Path) -> None:
+    agents = ("a", "b")
+    with RewardTelemetry(tmp_path, agents, components=("x",), fmt="npz", batch_rows=8) as sink:
+        for episode in range(3):
+            for step in range(1, 4):
+                sink.record_step([1.0, 2.0], {"x": [0.5, -0.5]}, step=step, physics_step=step)
+            sink.end_episode()
+            assert sink.episode == episode + 1
+
+    parts = sorted(tmp_path.glob("steps-*.npz"))
+    steps = {
+        name: np.concatenate([np.load(part)[name] for part in parts])
+        for name in ("episode", "agent", "reward", "x")
+    }
+    assert len(steps["reward"]) == 18
+    assert steps["episode"].tolist() == [e for e in range(3) for _ in range(6)]
+    assert steps["agent"].tolist() == [0, 1] * 9
+    episodes = np.load(tmp_path / "episodes-00000.npz")
+    assert episodes["return"].tolist() == [3.0, 6.0] * 3
+    assert episodes["x"].tolist() == [1.5, -1.5] * 3
+    assert episodes["seed"].tolist() == [-1] * 6
+
+
+def test_writer_errors_surface_on_the_recording_thread(tmp_path: Path) -> None:
+    sink = RewardTelemetry(tmp_path / "out", ("a",), components=(), batch_rows=1)
+    sink.record_step([1.0], {}, step=1, physics_step=1)
+    # Replace the output directory with a file so the background write fails.
+    (tmp_path / "out" / "telemetry.json").unlink()
+    (tmp_path / "out").rmdir()
+    (tmp_path / "out").write_text("not a directory")
+    with pytest.raises(RuntimeError, match="writer thread failed"):
+        sink.flush()
+    with pytest.raises(RuntimeError):
+        sink.close()
+    assert sink.closed
+
+
+def test_invalid_configuration(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="format"):
+        RewardTelemetry(tmp_path, ("a",), fmt="parquet")  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="component"):
+        RewardTelemetry(tmp_path, ("a",), components=("reward",))
+
+
+def test_record_result_matches_record_infos(tmp_path: Path) -> None:
+    quiet = BJJMultiAgentEnv(EnvConfig(max_episode_steps=3, info_mode="none"))
+    full = BJJMultiAgentEnv(EnvConfig(max_episode_steps=3))
+    actions = {agent: [0.3] * quiet.config.action_dim for agent in quiet.agents}
+    with (
+        RewardTelemetry(tmp_path / "a", quiet.agents, fmt="npz") as from_rows,
+        RewardTelemetry(tmp_path / "b", full.agents, fmt="npz") as from_infos,
+    ):
+        quiet.reset(seed=2)
+        full.reset(seed=2)
+        for _ in range(3):
+            from_rows.record_result(quiet.step(actions))
+            _, rewards, _, _, infos = full.step(actions)
+            from_infos.record_infos(rewards, infos)
+
+    a = np.load(tmp_path / "a" / "steps-00000.npz")
+    b = np.load(tmp_path / "b" / "steps-00000.npz")
+    for name in ("step", "reward", "step_reward", "energy_penalty"):
+        np.testing.assert_array_equal(a[name], b[name])
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from bjjsim.bench.throughput import (
+    BenchCase,
+    compare,
+    default_cases,
+    load_baseline,
+    run,
+    run_case,
+    write_baseline,
+)
+
+
+def test_run_case_reports_throughput_latency_and_memory() -> None:
+    result = run_case(BenchCase("env", num_agents=3, batch_size=2), calls=50, warmup=5)
+    assert result.name == "env/obs12/act6/agents3/batch2/phys1"
+    assert result.env_steps == 100
+    assert result.steps_per_s > 0
+    assert 0 < result.latency_p50_us <= result.latency_p90_us <= result.latency_p99_us
+    assert result.peak_memory_kib > 0
+
+
+def test_default_sweep_varies_one_knob_at_a_time() -> None:
+    cases = default_cases(quick=True)
+    names = [case.name for case in cases]
+    assert len(names) == len(set(names))
+    assert {case.target for case in cases} == {"physics", "env", "vector"}
+    assert all(case.batch_size == 1 for case in cases if case.target == "physics")
+
+
+def test_baseline_roundtrip_and_regression_detection(tmp_path: Path) -> None:
+    report = run([BenchCase("physics"), BenchCase("env")], calls=20, warmup=1)
+    path = tmp_path / "baseline.json"
+    write_baseline(report, path)
+    baseline = load_baseline(path)
+    assert set(baseline) == {r.name for r in report.results}
+
+    inflated = {name: value * 10 for name, value in baseline.items()}
+    assert len(compare(report.results, inflated, tolerance=0.25)) == 2
+    assert compare(report.results, {name: 0.0 for name in baseline}) == []
+    assert compare(report.results, {}) == []
+
+
+def test_committed_baseline_covers_default_sweep() -> None:
+    path = Path(__file__).resolve().parents[1] / "benchmarks" / "throughput_baseline.json"
+    baseline = load_baseline(path)
+    assert {case.name for case in default_cases()} <= set(baseline)
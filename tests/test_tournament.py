@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from bjjsim.env import BJJMultiAgentEnv, EnvConfig
+from bjjsim.training import (
+    EloRatings,
+    MatchSpec,
+    MLPPolicy,
+    OpponentPool,
+    Tournament,
+    TrueSkillRatings,
+    play_match,
+)
+
+CONFIG = EnvConfig(max_episode_steps=10)
+
+
+def _policy(scale: float) -> MLPPolicy:
+    rng = np.random.default_rng(0)
+    policy = MLPPolicy.random(CONFIG.observation_dim, CONFIG.action_dim, hidden_sizes=(8,), rng=rng)
+    # Larger weights saturate tanh, so actions (and energy penalties) grow with scale.
+    return MLPPolicy([w * scale for w in policy.weights], policy.biases)
+
+
+def _pool(tmp_path: Path) -> OpponentPool:
+    pool = OpponentPool(tmp_path / "pool")
+    for step, scale in enumerate((0.0, 1.0, 50.0)):
+        pool.add(_policy(scale).parameters(), step=step)
+    return pool
+
+
+def test_play_match_scores_by_return_and_alternates_seats() -> None:
+    env = BJJMultiAgentEnv(CONFIG)
+    calm, frantic = _policy(0.0), _policy(50.0)
+    even = play_match(env, calm, frantic, MatchSpec("calm", "frantic", 0))
+    odd = play_match(env, calm, frantic, MatchSpec("calm", "frantic", 1))
+    assert even.score_a == odd.score_a == 1.0
+    assert even.steps == 10
+    assert even.return_a > even.return_b
+    draw = play_match(env, calm, calm, MatchSpec("calm", "calm", 2))
+    assert draw.score_a == 0.5
+
+
+def test_rating_updates_favour_winner_and_shrink_uncertainty() -> None:
+    elo = EloRatings()
+    elo.update("a", "b", 1.0)
+    assert elo.rating("a") > 1500.0 > elo.rating("b")
+
+    ts = TrueSkillRatings()
+    ts.update("a", "b", 0.0)
+    (mu_a, sigma_a), (mu_b, sigma_b) = ts.rating("a"), ts.rating("b")
+    assert mu_b > 25.0 > mu_a
+    assert sigma_a < 25.0 / 3.0 and sigma_b < 25.0 / 3.0
+    ts.update("c", "d", 0.5)
+    assert ts.rating("c")[0] == pytest.approx(ts.rating("d")[0])
+
+
+def test_inline_tournament_ranks_snapshots(tmp_path: Path) -> None:
+    tournament = Tournament(_pool(tmp_path), seeds_per_pairing=4, workers=0, env_config=CONFIG)
+    results = list(tournament.run())
+    assert len(results) == 3 * 4
+    ranking = [row.snapshot_id for row in tournament.standings()]
+    assert ranking == ["step-0000000000", "step-0000000001", "step-0000000002"]
+    assert tournament.standings()[0].games == 8
+
+
+def test_early_stopping_skips_converged_pairings(tmp_path: Path) -> None:
+    tournament = Tournament(
+        _pool(tmp_path),
+        seeds_per_pairing=50,
+        workers=0,
+        env_config=CONFIG,
+        min_games=2,
+        sigma_threshold=4.0,
+    )
+    played = len(list(tournament.run()))
+    assert tournament.skipped_matches > 0
+    assert played + tournament.skipped_matches == 3 * 50
+
+
+def test_process_pool_streams_same_results(tmp_path: Path) -> None:
+    pool = _pool(tmp_path)
+    inline = Tournament(pool, seeds_per_pairing=2, workers=0, env_config=CONFIG)
+    parallel = Tournament(pool, seeds_per_pairing=2, workers=2, env_config=CONFIG)
+    expected = sorted(list(inline.run()), key=lambda r: (r.player_a, r.player_b, r.seed))
+    actual = sorted(list(parallel.run()), key=lambda r: (r.player_a, r.player_b, r.seed))
+    assert actual == expected
@@ -223,3 +223,163 @@ def test_events_endpoint_basic() -> None:
     assert any(t == "reset" for t in types)
     assert any(t == "start" for t in types)
     assert any(t == "step" for t in types)
+
+
+def test_sessions_isolate_simulations() -> None:
+    app = create_app()
+    client = TestClient(app)
+
+    res = client.post("/api/sessions")
+    assert res.status_code == 200
+    session_id = res.json()["session_id"]
+    headers = {"X-Session-ID": session_id}
+
+    assert client.post("/api/sim/start", json={}, headers=headers).status_code == 200
+    assert client.post("/api/sim/step", json={"num_steps": 4}, headers=headers).status_code == 200
+
+    # Query parameter selects the same session; the default session is untouched.
+    res = client.get("/api/sim/state", params={"session_id": session_id})
+    assert res.json()["step"] == 4
+    assert client.get("/api/sim/state").json()["step"] == 0
+
+    listed = client.get("/api/sessions").json()
+    assert {s["session_id"] for s in listed["sessions"]} == {"default", session_id}
+
+    assert client.delete(f"/api/sessions/{session_id}").status_code == 204
+    assert client.get("/api/sim/state", headers=headers).status_code == 404
+    assert client.delete("/api/sessions/default").status_code == 409
+
+
+def test_closed_session_keeps_adapter_until_queued_work_finishes() -> None:
+    import asyncio
+    import threading
+
+    import httpx
+
+    from bjjsim.web.sessions import AdapterPool
+
+    pool = AdapterPool(size=1)
+    app = create_app(adapter_pool=pool)
+    gate = threading.Event()
+
+    async def main() -> tuple[int, int, int]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            session_id = (await client.post("/api/sessions")).json()["session_id"]
+            headers = {"X-Session-ID": session_id}
+            await client.post("/api/sim/start", json={}, headers=headers)
+            physics = app.state.sessions.get(session_id).physics
+            app.state.executor.submit(gate.wait)
+            step = asyncio.ensure_future(
+                client.post("/api/sim/step", json={"num_steps": 3}, headers=headers)
+            )
+            await asyncio.sleep(0.05)
+            assert (await client.delete(f"/api/sessions/{session_id}")).status_code == 204
+            # The queued step still owns the adapter, so it is not pooled yet.
+            pooled_before = len(pool)
+            gate.set()
+            res = await step
+            await asyncio.to_thread(app.state.executor.submit(lambda: None).result)
+            assert len(pool) == 1
+            assert physics.step_count == 0
+            return pooled_before, res.status_code, res.json()["step"]
+
+    assert asyncio.run(main()) == (0, 200, 3)
+
+
+def test_prometheus_metrics_endpoint() -> None:
+    app = create_app()
+    client = TestClient(app)
+
+    assert client.post("/api/sim/start", json={}).status_code == 200
+    assert client.post("/api/sim/step", json={"num_steps": 4}).status_code == 200
+    assert client.get("/api/frames/current").status_code == 200
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = res.text
+    assert 'bjjsim_http_requests_total{method="POST",route="/api/sim/step",status="200"} 1' in text
+    assert 'bjjsim_http_request_duration_seconds_count{method="POST",route="/api/sim/step"}' in text
+    assert "bjjsim_sim_steps_total 4" in text
+    assert "bjjsim_frame_render_seconds_count 1" in text
+    assert "bjjsim_physics_step_seconds_count 1" in text
+    assert "bjjsim_websocket_connections" in text
+
+
+def test_concurrent_steps_each_get_their_own_state() -> None:
+    import asyncio
+
+    import httpx
+
+    app = create_app()
+
+    async def main() -> list[dict[str, Any]]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.post("/api/config", json={"max_steps_per_episode": 12})
+            await client.post("/api/sim/start", json={})
+            responses = await asyncio.gather(
+                *(client.post("/api/sim/step", json={"num_steps": 5}) for _ in range(4))
+            )
+            return [{"status": r.status_code, **r.json()} for r in responses]
+
+    results = asyncio.run(main())
+    ok = sorted((r for r in results if r["status"] == 200), key=lambda r: r["step"])
+    assert [r["step"] for r in ok] == [5, 10, 15]
+    assert [r["episode_running"] for r in ok] == [True, True, False]
+    assert [r["status"] for r in results].count(409) == 1
+
+
+def test_state_etag_and_conditional_get() -> None:
+    client = TestClient(create_app())
+    first = client.get("/api/sim/state")
+    etag = first.headers["etag"]
+    assert first.json()["version"] == 0
+
+    unchanged = client.get("/api/sim/state", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.headers["etag"] == etag
+
+    client.post("/api/sim/reset", json={"seed": 3})
+    changed = client.get("/api/sim/state", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["version"] == 1
+    assert changed.headers["etag"] != etag
+
+
+def test_state_long_poll_wakes_on_change_and_times_out() -> None:
+    import asyncio
+    import time
+
+    import httpx
+
+    app = create_app()
+
+    async def main() -> tuple[dict[str, Any], dict[str, Any], float]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            started = (await client.post("/api/sim/start", json={})).json()
+            waiter = asyncio.create_task(
+                client.get(
+                    "/api/sim/state",
+                    params={"wait_for_version": started["version"] + 1, "timeout": 10},
+                )
+            )
+            await asyncio.sleep(0.05)
+            assert not waiter.done()
+            await client.post("/api/sim/step", json={"num_steps": 2})
+            woken = (await asyncio.wait_for(waiter, 5)).json()
+
+            t0 = time.perf_counter()
+            stale = await client.get(
+                "/api/sim/state",
+                params={"wait_for_version": woken["version"] + 1, "timeout": 0.1},
+            )
+            return woken, stale.json(), time.perf_counter() - t0
+
+    woken, stale, waited = asyncio.run(main())
+    assert woken["step"] == 2
+    assert woken["version"] == 2
+    assert stale["version"] == woken["version"]
+    assert 0.1 <= waited < 2.0